@@ -0,0 +1,79 @@
+"""기록해 둔 카세트를 재생해 LotteryClient의 주요 흐름을 네트워크 없이 측정한다.
+
+    # 1) 실제 사이트와 통신하며 카세트 기록 (아이디/비밀번호, 쿠키 값은 가려진다)
+    #    저장된 세션이 있으면 로그인 요청이 기록되지 않으므로 ~/.dhapi/sessions 를 먼저 비운다.
+    DHAPI_CASSETTE=bench.cassette.json.gz DHAPI_CASSETTE_MODE=record dhapi show-balance
+    DHAPI_CASSETTE=bench.cassette.json.gz DHAPI_CASSETTE_MODE=record dhapi show-buy-list
+    ...
+    # 2) 재생하며 측정
+    PYTHONPATH=src python benchmarks/client_replay.py bench.cassette.json.gz --repeat 20 --latency-scale 1
+
+카세트에 없는 요청을 보내는 흐름은 실패로 표시된다. (예: 가상계좌 흐름을 기록하지 않은 카세트)
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import time
+
+from dhapi.domain.deposit import Deposit
+from dhapi.domain.user import User
+from dhapi.endpoint.lottery_result_collector import LotteryResultCollector
+from dhapi.port.http_cassette import Cassette, ReplayAdapter, install
+from dhapi.port.lottery_client import LotteryClient
+
+FLOWS = ("login", "show_balance", "show_buy_list", "assign_virtual_account")
+
+
+def _new_client(cassette, latency_seconds, latency_scale):
+    # 로그인 전에 재생 어댑터를 붙여야 하므로 from_cookies로 세션만 만든 뒤 로그인한다.
+    client = LotteryClient.from_cookies(User("bench", "bench"), LotteryResultCollector(), [])
+    install(client._session, ReplayAdapter(cassette, latency_seconds=latency_seconds, latency_scale=latency_scale))
+    return client
+
+
+def _run_flow(flow, cassette, latency_seconds, latency_scale):
+    client = _new_client(cassette, latency_seconds, latency_scale)
+    if flow != "login":
+        client._login()
+
+    started = time.perf_counter()
+    if flow == "login":
+        client._login()
+    elif flow == "show_balance":
+        client.show_balance()
+    elif flow == "show_buy_list":
+        client.show_buy_list(output_format="json")
+    else:
+        client.assign_virtual_account(Deposit(5000), force_refresh=True)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cassette")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0, help="응답마다 더할 고정 지연 시간(초)")
+    parser.add_argument("--latency-scale", type=float, default=0.0, help="기록된 응답 시간에 곱할 배율")
+    parser.add_argument("--flows", nargs="*", default=list(FLOWS), choices=FLOWS)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    cassette = Cassette.load(args.cassette)
+    results = {}
+    for flow in args.flows:
+        samples = []
+        try:
+            for _ in range(args.repeat):
+                samples.append(_run_flow(flow, cassette, args.latency, args.latency_scale))
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            results[flow] = {"error": f"{type(error).__name__}: {error}"}
+            continue
+        results[flow] = {"median_ms": round(statistics.median(samples) * 1000, 3), "min_ms": round(min(samples) * 1000, 3), "repeat": len(samples)}
+
+    print(json.dumps({"cassette": args.cassette, "interactions": len(cassette.interactions), "results": results}, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
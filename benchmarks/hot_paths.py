@@ -0,0 +1,302 @@
+"""파싱/도메인 경로의 마이크로벤치마크를 실행하고 저장해 둔 기준값과 비교한다.
+
+    PYTHONPATH=src python benchmarks/hot_paths.py --save-baseline        # 기준값 저장
+    PYTHONPATH=src python benchmarks/hot_paths.py                        # 기준값과 비교 (느려진 항목이 있으면 exit 1)
+    PYTHONPATH=src python benchmarks/hot_paths.py -k buy_list --output result.json
+
+- 케이스마다 한 번 실행 시간이 --min-time 이상이 되도록 반복 횟수를 정한 뒤 --repeat 번 측정해 중앙값을 사용한다.
+- 기준값보다 --threshold(기본 20%) 넘게 느려진 케이스를 regression으로 표시한다.
+- 기준값은 측정한 기계에 따라 다르므로 같은 기계에서 저장/비교한다. (기본 경로는 git에 포함하지 않는다)
+"""
+
+import argparse
+import glob
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from dhapi.domain.lotto645_draw import normalize_draw_history_item
+from dhapi.domain.lotto645_ticket import Lotto645Ticket
+from dhapi.domain.user import User
+from dhapi.endpoint.lottery_stdout_printer import LotteryStdoutPrinter
+from dhapi.port.draw_history_store import DrawHistoryStore
+from dhapi.port.lottery_client import LotteryClient
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_BASELINE = ROOT / "benchmarks" / "results" / "hot_paths_baseline.json"
+# 측정이 끝날 때까지 케이스가 만든 임시 디렉터리를 지우지 않는다.
+_TMP_DIRS = []
+
+
+class SkipCase(Exception):
+    pass
+
+
+def _random_numbers(rng, count):
+    return ",".join(map(str, rng.sample(range(1, 46), count)))
+
+
+def _ledger_items(rows, seed=0):
+    rng = random.Random(seed)
+    items = []
+    for index in range(rows):
+        lotto = index % 4 != 3
+        items.append(
+            {
+                "eltOrdrDt": f"2025-{index % 12 + 1:02d}-{index % 28 + 1:02d}",
+                "ltGdsNm": "로또6/45" if lotto else "연금복권720+",
+                "ltEpsdView": str(1100 + index % 100),
+                "gmInfo": f"{rng.randrange(10**19):020d}",
+                "prchsQty": rng.randint(1, 5),
+                "ltWnResult": rng.choice(["낙첨", "미추첨", "5등"]),
+                "ltWnAmt": rng.choice([0, 0, 0, 5000]),
+                "epsdRflDt": f"2025-{index % 12 + 1:02d}-{index % 28 + 1:02d}",
+                "ntslOrdrNo": f"{index:010d}",
+            }
+        )
+    return items
+
+
+def _draw_archive(rounds, seed=0):
+    rng = random.Random(seed)
+    items = []
+    for round_no in range(1, rounds + 1):
+        numbers = rng.sample(range(1, 46), 7)
+        item = {"ltEpsd": round_no, "ltRflYmd": f"2020{round_no % 12 + 1:02d}{round_no % 28 + 1:02d}", "bnsWnNo": numbers.pop()}
+        item.update({f"tm{index}WnNo": number for index, number in enumerate(sorted(numbers), start=1)})
+        item.update({"wholEpsdSumNtslAmt": "112,345,678,000", "sumWnNope": 1_234_567, "winType0": 0, "winType1": 5, "winType2": 3, "winType3": 1})
+        for rank in range(1, 6):
+            item.update({f"rnk{rank}WnNope": rank * 100, f"rnk{rank}WnAmt": 10 ** (10 - rank), f"rnk{rank}SumWnAmt": rank * 100 * 10 ** (10 - rank)})
+        items.append(item)
+    return items
+
+
+def _client():
+    client = LotteryClient.from_cookies(User("bench", "bench"), LotteryStdoutPrinter(), [])
+    # 상세 번호 조회는 네트워크 요청이므로 파싱 비용만 재도록 비워 둔다.
+    client._fetch_lotto645_ticket_details = lambda items: {}
+    return client
+
+
+def case_create_tickets():
+    rng = random.Random(0)
+    numbers_list = [_random_numbers(rng, rng.choice([0, 3, 6])) if index % 3 else "" for index in range(10_000)]
+    return lambda: Lotto645Ticket.create_tickets(numbers_list)
+
+
+def case_make_buy_param():
+    client = _client()
+    tickets = Lotto645Ticket.create_tickets(["", "1,2,3", "4,5,6,7,8,9", "", "10,20,30,40,41,42"])
+    return lambda: client._make_buy_loyyo645_param(tickets)
+
+
+def case_format_lotto_numbers():
+    client = _client()
+    lines = ["A|01|02|04|27|39|443", "B|11|23|25|27|28|452", "C|03|08|19|22|31|451", "D|05|06|13|24|40|453", "E|07|14|21|28|35|423"]
+    return lambda: client._format_lotto_numbers(lines)
+
+
+def case_parse_buy_list_10k():
+    client = _client()
+    response_data = {"data": {"list": _ledger_items(10_000), "total": 10_000}}
+    return lambda: client._parse_buy_list_json(response_data)
+
+
+def case_build_json_results_10k():
+    printer = LotteryStdoutPrinter()
+    data = _client()._parse_buy_list_json({"data": {"list": _ledger_items(10_000)}})
+    for index, row in enumerate(data[0]["rows"]):
+        if index % 2 == 0:
+            row[3] = "[A] 자동: 01 02 04 27 39 44\n[B] 수동: 11 23 25 27 28 45"
+    return lambda: printer._build_json_results(data)
+
+
+def case_extract_virtual_account_html():
+    pages = [Path(page).read_text(encoding="utf-8") for page in sorted(glob.glob(str(ROOT / "tmp_debug" / "*.html")))]
+    if not pages:
+        raise SkipCase("tmp_debug/*.html 이 없습니다.")
+    client = _client()
+    return lambda: [client._extract_virtual_account_from_html(page) for page in pages]
+
+
+def case_extract_virtual_account_payload():
+    client = _client()
+    # 계좌 정보가 없는 엔드포인트 응답(목록)을 끝까지 훑은 뒤 마지막 resVO에서 찾는 경우
+    payload = {
+        "data": {
+            "list": _ledger_items(300),
+            "resVO": {"resultCode": "0000", "vbankNum": "70190059159906", "vbankBankName": "케이뱅크", "buyerName": "홍길동", "amt": 5000},
+        }
+    }
+    return lambda: client._extract_virtual_account_fields_from_payload(payload, default_amount=5000)
+
+
+def case_normalize_draw_history():
+    archive = _draw_archive(1200)
+    return lambda: [normalize_draw_history_item(item) for item in archive]
+
+
+def _draw_store(rounds):
+    tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+    _TMP_DIRS.append(tmp_dir)
+    store = DrawHistoryStore(Path(tmp_dir.name) / "draws.sqlite3")
+    store.save(normalize_draw_history_item(item) for item in _draw_archive(rounds))
+    return store, Path(tmp_dir.name)
+
+
+def case_load_draw_store():
+    store, _ = _draw_store(1200)
+    return store.recent
+
+
+def case_open_draw_archive():
+    try:
+        from dhapi.analysis.draw_archive import DrawArchive, update_draw_archive  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        raise SkipCase("numpy가 없습니다. (pip install 'dhapi[analytics]')") from error
+    store, tmp_dir = _draw_store(1200)
+    path = tmp_dir / "draw_archive"
+    update_draw_archive(store, path)
+    return lambda: DrawArchive.open(path)
+
+
+def case_compute_draw_stats():
+    try:
+        from dhapi.analysis.draw_archive import update_draw_archive  # pylint: disable=import-outside-toplevel
+        from dhapi.analysis.draw_stats import compute_draw_stats  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        raise SkipCase("numpy가 없습니다. (pip install 'dhapi[analytics]')") from error
+    store, tmp_dir = _draw_store(1200)
+    archive = update_draw_archive(store, tmp_dir / "draw_archive")
+    return lambda: compute_draw_stats(archive)
+
+
+def case_evaluate_ranks():
+    try:
+        from dhapi.analysis.rank_eval import evaluate_ranks, numbers_to_masks  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        raise SkipCase("numpy가 없습니다. (pip install 'dhapi[analytics]')") from error
+    rng = random.Random(0)
+    tickets = numbers_to_masks([rng.sample(range(1, 46), 6) for _ in range(10_000)])
+    draws = [rng.sample(range(1, 46), 7) for _ in range(1200)]
+    draw_masks, bonus_masks = numbers_to_masks([draw[:6] for draw in draws]), numbers_to_masks([draw[6:] for draw in draws])
+    return lambda: evaluate_ranks(tickets, draw_masks, bonus_masks)
+
+
+def case_backtest_hybrid():
+    try:
+        from dhapi.analysis.backtest import backtest  # pylint: disable=import-outside-toplevel
+        from dhapi.analysis.draw_archive import update_draw_archive  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        raise SkipCase("numpy가 없습니다. (pip install 'dhapi[analytics]')") from error
+    store, tmp_dir = _draw_store(250)
+    archive = update_draw_archive(store, tmp_dir / "draw_archive")
+    return lambda: backtest(archive, "hybrid", 1000, jobs=1)
+
+
+CASES = {
+    "create_tickets_10k": case_create_tickets,
+    "make_buy_param_5": case_make_buy_param,
+    "format_lotto_numbers_5": case_format_lotto_numbers,
+    "parse_buy_list_10k": case_parse_buy_list_10k,
+    "build_json_results_10k": case_build_json_results_10k,
+    "extract_virtual_account_html": case_extract_virtual_account_html,
+    "extract_virtual_account_payload_300": case_extract_virtual_account_payload,
+    "normalize_draw_history_1200": case_normalize_draw_history,
+    "load_draw_store_1200": case_load_draw_store,
+    "open_draw_archive_1200": case_open_draw_archive,
+    "compute_draw_stats_1200": case_compute_draw_stats,
+    "evaluate_ranks_10k_x_1200": case_evaluate_ranks,
+    "backtest_hybrid_200_rounds_x_1000": case_backtest_hybrid,
+}
+
+
+def measure(func, repeat, min_time):
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - started) / loops)
+    return {"median_us": round(statistics.median(samples) * 1e6, 3), "min_us": round(min(samples) * 1e6, 3), "loops": loops, "repeat": repeat}
+
+
+def compare(results, baseline, threshold):
+    """기준값 대비 변화율. threshold보다 느려진 케이스는 regression으로 표시한다."""
+    comparison = {}
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if "median_us" not in result or not base or not base.get("median_us"):
+            continue
+        change = result["median_us"] / base["median_us"] - 1
+        comparison[name] = {"baseline_us": base["median_us"], "change": round(change, 4), "regression": change > threshold}
+    return comparison
+
+
+def run(names, repeat, min_time):
+    results = {}
+    for name in names:
+        try:
+            func = CASES[name]()
+        except SkipCase as skip:
+            results[name] = {"skipped": str(skip)}
+            continue
+        results[name] = measure(func, repeat, min_time)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="keyword", help="이름에 이 문자열이 들어간 케이스만 실행")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.05, help="한 번 측정할 때 최소 실행 시간(초)")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 --baseline 경로에 저장")
+    parser.add_argument("--threshold", type=float, default=0.2, help="regression으로 볼 느려짐 비율 (0.2 = 20%%)")
+    parser.add_argument("--output", help="결과 JSON을 저장할 경로")
+    args = parser.parse_args()
+
+    names = [name for name in CASES if not args.keyword or args.keyword in name]
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": run(names, args.repeat, args.min_time),
+    }
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    elif baseline_path.exists():
+        report["threshold"] = args.threshold
+        report["comparison"] = compare(report["results"], json.loads(baseline_path.read_text(encoding="utf-8")), args.threshold)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+    print(output)
+
+    regressions = [name for name, item in report.get("comparison", {}).items() if item["regression"]]
+    if regressions:
+        print(f"regression: {', '.join(regressions)} (기준값 대비 {args.threshold:.0%} 넘게 느려짐)", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
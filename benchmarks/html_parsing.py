@@ -0,0 +1,68 @@
+"""저장된 동행복권 HTML 페이지(tmp_debug/*.html)로 가상계좌 추출 경로의 파싱 비용을 비교한다.
+
+    PYTHONPATH=src python benchmarks/html_parsing.py [--repeat N] [pages ...]
+
+- legacy: 추출기마다 html5lib으로 다시 파싱하던 이전 방식 (파싱 4회 + get_text 2회)
+- shared: 응답마다 HtmlDocument 하나를 만들어 모든 추출기에서 공유하는 현재 방식
+"""
+
+import argparse
+import glob
+import statistics
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from dhapi.domain.user import User
+from dhapi.port.html_document import DEFAULT_PARSER, HtmlDocument
+from dhapi.port.lottery_client_base import LotteryClientBase
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _legacy(html_text):
+    for _ in range(4):
+        soup = BeautifulSoup(html_text, "html5lib")
+    soup.get_text(" ", strip=True)
+    soup.get_text(" ", strip=True)
+
+
+def _shared(client, html_text):
+    doc = HtmlDocument(html_text)
+    client._extract_account_from_mndp_charge_html(doc, 5000)
+    client._extract_hidden_inputs_from_html(doc)
+    client._extract_script_sources(doc, client._mndp_charge_page)
+
+
+def _measure(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages", nargs="*", help="HTML 파일 (기본: tmp_debug/*.html)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = args.pages or sorted(glob.glob(str(ROOT / "tmp_debug" / "*.html")))
+    if not pages:
+        raise SystemExit("벤치마크할 HTML 파일이 없습니다.")
+
+    client = LotteryClientBase(User("bench", "bench"), None)
+    print(f"parser: {DEFAULT_PARSER}, repeat: {args.repeat}")
+    print(f"{'page':<32}{'size':>10}{'legacy(ms)':>14}{'shared(ms)':>14}{'speedup':>10}")
+    for page in pages:
+        html_text = Path(page).read_text(encoding="utf-8")
+        legacy = _measure(lambda: _legacy(html_text), args.repeat)
+        shared = _measure(lambda: _shared(client, html_text), args.repeat)
+        print(f"{Path(page).name:<32}{len(html_text):>10}{legacy * 1000:>14.1f}{shared * 1000:>14.1f}{legacy / shared:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
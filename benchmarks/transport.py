@@ -0,0 +1,143 @@
+"""LotteryClient 세션의 전송 계층(http_transport)을 같은 부하로 비교한다.
+
+    PYTHONPATH=src python benchmarks/transport.py --threads 8 --requests 400 --latency 0.02
+    PYTHONPATH=src python benchmarks/transport.py --cassette bench.cassette.json.gz
+    PYTHONPATH=src python benchmarks/transport.py --url https://www.dhlottery.co.kr --path /main --requests 20
+
+- 기본: keep-alive를 지원하는 로컬 HTTP/1.1 서버가 작은 JSON(XHR 응답과 비슷한 크기)을 --latency만큼 늦게 돌려준다.
+- --cassette: 기록한 카세트의 응답(경로별 본문/상태)을 로컬 서버가 돌려준다.
+- --url: 실제 서버로 요청한다. HTTP/2는 TLS(ALPN)로만 협상되므로 httpx-h2 비교는 https 주소에서만 의미가 있다.
+
+전송 방식
+    requests-default  기본 requests.Session (호스트당 연결 10개, 재시도 없음)
+    requests-pooled   DHAPI_TRANSPORT=requests 설정 (호스트별 풀 크기, 연결/일시적 오류 재시도)
+    httpx-h1          DHAPI_TRANSPORT=httpx DHAPI_HTTP2=0
+    httpx-h2          DHAPI_TRANSPORT=httpx (h2 패키지가 없으면 HTTP/1.1)
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import requests
+
+from dhapi.port.http_cassette import Cassette
+from dhapi.port.http_transport import TransportConfig, install_transport
+
+TRANSPORTS = ("requests-default", "requests-pooled", "httpx-h1", "httpx-h2")
+
+
+def _responses_from_cassette(path):
+    responses = {}
+    for interaction in Cassette.load(path).interactions:
+        recorded = interaction["response"]
+        body = (recorded.get("body") or {}).get("text", "").encode("utf-8")
+        content_type = next((value for name, value in recorded.get("headers") or [] if name.lower() == "content-type"), "text/html")
+        responses.setdefault(urlsplit(interaction["request"]["url"]).path, (recorded["status"], content_type, body))
+    return responses
+
+
+def _start_server(latency, responses):
+    default = (200, "application/json;charset=UTF-8", json.dumps({"data": {"userMndp": {"crntEntrsAmt": 5000}, "list": list(range(50))}}).encode("utf-8"))
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True  # 헤더와 본문을 따로 쓰므로 지연 ACK와 겹쳐 응답마다 40ms씩 늦어지지 않게 한다.
+
+        def _respond(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if latency:
+                time.sleep(latency)
+            status, content_type, body = responses.get(urlsplit(self.path).path, default)
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = _respond  # pylint: disable=invalid-name
+        do_POST = _respond  # pylint: disable=invalid-name
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, f"http://127.0.0.1:{httpd.server_address[1]}"
+
+
+def _session(transport, origin, pool_size):
+    session = requests.Session()
+    if transport == "requests-default":
+        return session
+    backend, _, variant = transport.partition("-")
+    config = TransportConfig(backend=backend, http2=variant == "h2", pool_maxsize=pool_size, pool_sizes={})
+    install_transport(session, config, origins=[origin])
+    return session
+
+
+def run(transport, origin, paths, threads, total):
+    session = _session(transport, origin, threads)
+    latencies = []
+    errors = 0
+
+    def request(index):
+        started = time.perf_counter()
+        session.get(f"{origin}{paths[index % len(paths)]}", timeout=30).content  # pylint: disable=expression-not-assigned
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for future in [executor.submit(request, index) for index in range(total)]:
+            try:
+                latencies.append(future.result())
+            except requests.RequestException:
+                errors += 1
+    wall = time.perf_counter() - started
+    session.close()
+
+    latencies.sort()
+    return {
+        "requests_per_second": round(len(latencies) / wall, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2) if latencies else None,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8, help="동시에 요청하는 스레드 수 (상세 조회/엔드포인트 탐색의 병렬도)")
+    parser.add_argument("--requests", type=int, default=400, help="전송 방식마다 보낼 요청 수")
+    parser.add_argument("--latency", type=float, default=0.02, help="로컬 서버 응답 지연(초)")
+    parser.add_argument("--cassette", help="응답을 가져올 카세트 파일")
+    parser.add_argument("--url", help="로컬 서버 대신 요청할 origin")
+    parser.add_argument("--path", action="append", dest="paths", help="요청할 경로 (여러 번 지정 가능)")
+    parser.add_argument("--transports", nargs="*", default=list(TRANSPORTS), choices=TRANSPORTS)
+    args = parser.parse_args()
+
+    httpd = None
+    responses = _responses_from_cassette(args.cassette) if args.cassette else {}
+    if args.url:
+        origin = args.url.rstrip("/")
+    else:
+        httpd, origin = _start_server(args.latency, responses)
+    paths = args.paths or sorted(responses) or ["/mypage/selectUserMndp.do", "/mypage/selectMyLotteryledger.do", "/lt645/selectPstLt645Info.do"]
+
+    try:
+        results = {transport: run(transport, origin, paths, args.threads, args.requests) for transport in args.transports}
+    finally:
+        if httpd is not None:
+            httpd.shutdown()
+
+    print(json.dumps({"origin": origin, "threads": args.threads, "requests": args.requests, "results": results}, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -45,4 +45,10 @@ setup(
     },
 
     install_requires=_get_dependencies(),
+    extras_require={
+        "analytics": ["numpy>=1.22"],
+        "async": ["httpx>=0.27"],
+        "http2": ["httpx[http2]>=0.27"],
+        "lxml": ["lxml>=4.9"],
+    },
 )
@@ -0,0 +1,162 @@
+"""번호 선택 전략(strategies.STRATEGIES)을 지난 모든 회차에 다시 돌려 보는 백테스트.
+
+회차 i에서는 i 이전 회차만으로 만든 DrawStats를 전략에 넘겨 게임을 만들고, 회차 i 당첨번호로 match_ranks() 한 번에 채점한다.
+회차끼리는 서로 독립이므로 회차 구간을 나눠 프로세스 풀에서 병렬로 실행한다.
+난수는 (seed, 회차)로 정해지므로 워커 수와 관계없이 같은 결과가 나온다.
+"""
+
+import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from dhapi.analysis.draw_archive import COLUMNS, DrawArchive
+from dhapi.analysis.draw_stats import compute_draw_stats
+from dhapi.analysis.rank_eval import archive_masks, match_ranks, numbers_to_masks
+from dhapi.analysis.strategies import STATLESS_STRATEGIES, STRATEGIES
+
+logger = logging.getLogger(__name__)
+
+GAME_PRICE = 1000
+
+# 통계가 의미를 갖도록 이만큼의 이전 회차가 쌓인 회차부터 백테스트한다.
+DEFAULT_MIN_HISTORY = 50
+
+
+@dataclass
+class BacktestResult:
+    strategy: str
+    games_per_round: int
+    rounds: np.ndarray  # (R,) 백테스트한 회차
+    rank_counts: np.ndarray  # (R, 6) 회차별 등수 분포. [:, 0]은 낙첨
+    returns: np.ndarray  # (R,) 회차별 당첨금 합계
+
+    @property
+    def games(self) -> int:
+        return len(self.rounds) * self.games_per_round
+
+    @property
+    def costs(self) -> np.ndarray:
+        return np.full(len(self.rounds), self.games_per_round * GAME_PRICE, dtype=np.int64)
+
+    def hit_rates(self) -> np.ndarray:
+        """(6,) 게임당 등수별 적중률"""
+        return self.rank_counts.sum(axis=0) / max(1, self.games)
+
+    def hit_rate_intervals(self, z: float = 1.96) -> np.ndarray:
+        """(6, 2) 등수별 적중률의 Wilson 신뢰구간 (기본 95%)"""
+        n = max(1, self.games)
+        p = self.hit_rates()
+        center = (p + z * z / (2 * n)) / (1 + z * z / n)
+        half = z * np.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+        # 적중이 0이거나 전부인 경우 끝점이 부동소수점 오차 없이 0/1이 되도록 고정한다.
+        return np.stack([np.where(p > 0, center - half, 0), np.where(p < 1, center + half, 1)], axis=1)
+
+    def return_rate(self) -> float:
+        """당첨금 합계 / 구매 금액 합계"""
+        return float(self.returns.sum() / max(1, self.costs.sum()))
+
+    def return_rate_interval(self, z: float = 1.96) -> Tuple[float, float]:
+        """회차별 회수율의 평균에 대한 정규 근사 신뢰구간"""
+        rates = self.returns / (self.games_per_round * GAME_PRICE)
+        if len(rates) < 2:
+            return self.return_rate(), self.return_rate()
+        half = z * float(rates.std(ddof=1)) / math.sqrt(len(rates))
+        return max(0.0, float(rates.mean()) - half), float(rates.mean()) + half
+
+    def cumulative_profit(self) -> np.ndarray:
+        """(R,) 회차까지 누적 (당첨금 - 구매 금액)"""
+        return np.cumsum(self.returns - self.costs)
+
+    def to_dict(self) -> Dict:
+        intervals = self.hit_rate_intervals()
+        profit = self.cumulative_profit()
+        return {
+            "strategy": self.strategy,
+            "games_per_round": self.games_per_round,
+            "first_round": int(self.rounds[0]) if len(self.rounds) else None,
+            "last_round": int(self.rounds[-1]) if len(self.rounds) else None,
+            "rounds": len(self.rounds),
+            "games": self.games,
+            "ranks": [
+                {"rank": rank, "hits": int(hits), "rate": float(rate), "interval": [float(low), float(high)]}
+                for rank, hits, rate, (low, high) in zip(range(1, 6), self.rank_counts.sum(axis=0)[1:], self.hit_rates()[1:], intervals[1:])
+            ],
+            "cost": int(self.costs.sum()),
+            "prize": int(self.returns.sum()),
+            "return_rate": self.return_rate(),
+            "return_rate_interval": list(self.return_rate_interval()),
+            "cumulative_profit": [{"round": int(round_no), "profit": int(value)} for round_no, value in zip(self.rounds, profit)],
+        }
+
+
+def backtest(
+    archive: DrawArchive,
+    strategy: str = "hybrid",
+    games_per_round: int = 1000,
+    *,
+    min_history: int = DEFAULT_MIN_HISTORY,
+    jobs: Optional[int] = None,
+    seed: int = 0,
+) -> BacktestResult:
+    """
+    :param archive: 회차 오름차순 DrawArchive
+    :param strategy: STRATEGIES의 이름
+    :param jobs: 프로세스 수. 생략하면 CPU 수, 1이면 현재 프로세스에서 실행한다.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"지원하지 않는 전략입니다. ({strategy}, 가능한 값: {', '.join(STRATEGIES)})")
+    if games_per_round < 1:
+        raise ValueError(f"games_per_round는 1 이상이어야 합니다. (입력된 값: {games_per_round})")
+
+    start = max(1, min_history)
+    if len(archive) <= start:
+        raise ValueError(f"백테스트할 회차가 없습니다. (저장된 회차: {len(archive)}, 최소 이전 회차: {min_history})")
+
+    jobs = jobs or os.cpu_count() or 1
+    # 뒤 회차일수록 통계 계산이 길어지므로 작업을 잘게 나눠 워커 사이 부하를 맞춘다.
+    bounds = np.linspace(start, len(archive), min(len(archive) - start, jobs * 8) + 1).astype(int)
+    tasks = [(int(low), int(high)) for low, high in zip(bounds, bounds[1:]) if high > low]
+    # memmap 열도 워커에 보낼 때는 일반 배열로 복사된다. 전체 이력이라도 수백 KB 수준이다.
+    columns = {name: np.asarray(getattr(archive, name)) for name in COLUMNS}
+
+    if jobs == 1:
+        parts = [_run_rounds(columns, strategy, games_per_round, seed, task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+            futures = [executor.submit(_run_rounds, columns, strategy, games_per_round, seed, task) for task in tasks]
+            parts = [future.result() for future in futures]
+
+    logger.debug(f"backtest {strategy}: {len(archive) - start} rounds x {games_per_round} games in {len(tasks)} tasks ({jobs} jobs)")
+    return BacktestResult(
+        strategy=strategy,
+        games_per_round=games_per_round,
+        rounds=np.asarray(archive.rounds[start:], dtype=np.int64),
+        rank_counts=np.concatenate([counts for counts, _ in parts]),
+        returns=np.concatenate([returns for _, returns in parts]),
+    )
+
+
+def _run_rounds(columns: Dict[str, np.ndarray], strategy: str, games_per_round: int, seed: int, bounds: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """워커에서 archive의 [low, high) 번째 회차를 백테스트한다."""
+    low, high = bounds
+    archive = DrawArchive(columns)
+    draws, bonus = archive_masks(archive)
+
+    counts = np.zeros((high - low, 6), dtype=np.int64)
+    for row, index in enumerate(range(low, high)):
+        games = _generate_games(strategy, columns, index, games_per_round, np.random.default_rng([seed, int(archive.rounds[index])]))
+        counts[row] = np.bincount(match_ranks(games, draws[index], bonus[index]), minlength=6)
+    return counts, (counts[:, 1:] * archive.prizes[low:high]).sum(axis=1)
+
+
+def _generate_games(strategy: str, columns: Dict[str, np.ndarray], index: int, count: int, rng: np.random.Generator) -> np.ndarray:
+    """index번째 회차 직전까지의 통계로 게임 count개를 만들어 마스크로 돌려준다."""
+    stats = None
+    if strategy not in STATLESS_STRATEGIES:
+        stats = compute_draw_stats(DrawArchive({name: column[:index] for name, column in columns.items()}))
+    return numbers_to_masks(STRATEGIES[strategy](stats, count, rng))
@@ -0,0 +1,171 @@
+"""회차별 당첨 정보를 열(column)마다 .npy 파일 하나로 저장한 읽기 전용 아카이브.
+
+np.load(mmap_mode="r")로 열기 때문에 전체 이력을 힙에 복사하지 않고 운영체제 페이지 캐시를 그대로 공유한다.
+CLI, 웹 서버, 분석 작업이 같은 파일을 동시에 열 수 있다.
+
+    <root>/meta.json      {"version": 1, "current": "r1193", "latest_round": 1193, "rounds": 1193}
+    <root>/r1193/*.npy    COLUMNS의 열마다 파일 하나
+
+DrawHistoryStore에 새 회차가 저장되면 update_draw_archive()가 새 회차만 변환해 기존 열 뒤에 붙인 새 버전을 만들고 meta.json을 바꿔 가리킨다.
+이미 열려 있는 아카이브는 이전 버전 파일을 계속 사용한다.
+"""
+
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_VERSION = 1
+DEFAULT_ARCHIVE_PATH = "~/.dhapi/draw_archive"
+
+# 열 이름 -> (dtype, 행마다의 모양)
+COLUMNS = {
+    "rounds": (np.uint16, ()),
+    "numbers": (np.uint8, (6,)),  # 오름차순 당첨번호
+    "bonus": (np.uint8, ()),
+    "draw_dates": (np.dtype("datetime64[D]"), ()),
+    "sales": (np.int64, ()),  # 회차 총 판매금액
+    "winners": (np.int64, (5,)),  # 1~5등 당첨 게임 수
+    "prizes": (np.int64, (5,)),  # 1~5등 1게임당 당첨금
+}
+
+PathLike = Union[str, os.PathLike]
+
+
+class DrawArchive:
+    """회차 오름차순으로 정렬된 열 묶음. open()으로 연 아카이브의 열은 읽기 전용 memmap이다."""
+
+    rounds: np.ndarray
+    numbers: np.ndarray
+    bonus: np.ndarray
+    draw_dates: np.ndarray
+    sales: np.ndarray
+    winners: np.ndarray
+    prizes: np.ndarray
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        lengths = {name: len(columns[name]) for name in COLUMNS}
+        if len(set(lengths.values())) != 1:
+            raise ValueError(f"열 길이가 서로 다릅니다: {lengths}")
+        for name in COLUMNS:
+            setattr(self, name, columns[name])
+
+    @classmethod
+    def from_items(cls, items: Iterable[Dict]) -> "DrawArchive":
+        """
+        :param items: normalize_draw_history_item() 형태의 회차들 (DrawHistoryStore.items_after() 등)
+        """
+        items = sorted(items, key=lambda item: item["round"])
+        ranks = [{row["rank"]: row for row in item.get("ranks") or []} for item in items]
+        columns = {
+            "rounds": [item["round"] for item in items],
+            "numbers": [sorted(item["numbers"]) for item in items],
+            "bonus": [item["bonus"] for item in items],
+            "draw_dates": [item["draw_date"] or "NaT" for item in items],
+            "sales": [(item.get("winner_summary") or {}).get("total_sales_amount", 0) for item in items],
+            "winners": [[by_rank.get(rank, {}).get("winner_count", 0) for rank in range(1, 6)] for by_rank in ranks],
+            "prizes": [[by_rank.get(rank, {}).get("prize_per_winner", 0) for rank in range(1, 6)] for by_rank in ranks],
+        }
+        return cls({name: np.array(columns[name], dtype=dtype).reshape((len(items),) + shape) for name, (dtype, shape) in COLUMNS.items()})
+
+    @classmethod
+    def open(cls, path: Optional[PathLike] = None) -> Optional["DrawArchive"]:
+        """저장된 아카이브를 memmap으로 연다. 아직 만든 적이 없으면 None"""
+        root = archive_root(path)
+        meta = _read_meta(root)
+        if meta is None:
+            return None
+        version_dir = root / meta["current"]
+        return cls({name: np.load(version_dir / f"{name}.npy", mmap_mode="r") for name in COLUMNS})
+
+    def __len__(self):
+        return len(self.rounds)
+
+    @property
+    def latest_round(self) -> int:
+        return int(self.rounds[-1]) if len(self) else 0
+
+    def index_of(self, round_no: int) -> Optional[int]:
+        index = int(np.searchsorted(self.rounds, round_no))
+        return index if index < len(self) and self.rounds[index] == round_no else None
+
+    def append(self, other: "DrawArchive") -> "DrawArchive":
+        """other 중 이 아카이브의 마지막 회차 이후만 붙인 새 아카이브 (메모리)"""
+        tail = other.rounds > self.latest_round
+        return DrawArchive({name: np.concatenate([getattr(self, name), getattr(other, name)[tail]]) for name in COLUMNS})
+
+    def save(self, path: Optional[PathLike] = None) -> Path:
+        """새 버전 디렉터리에 열을 쓰고 meta.json이 가리키게 한다. 같은 회차 버전이 이미 있으면 그대로 쓴다."""
+        root = archive_root(path)
+        root.mkdir(parents=True, exist_ok=True)
+        name = f"r{self.latest_round}"
+        version_dir = root / name
+        if not version_dir.exists():
+            tmp_dir = root / f".{name}.{os.getpid()}.tmp"
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            tmp_dir.mkdir()
+            for column in COLUMNS:
+                np.save(tmp_dir / f"{column}.npy", np.ascontiguousarray(getattr(self, column)))
+            try:
+                os.rename(tmp_dir, version_dir)
+            except OSError:
+                # 다른 프로세스(웹 서버 워커 등)가 같은 버전을 먼저 만들었다.
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        previous = (_read_meta(root) or {}).get("current")
+        _write_meta(root, {"version": ARCHIVE_VERSION, "current": name, "latest_round": self.latest_round, "rounds": len(self)})
+        _prune(root, keep={name, previous})
+        return version_dir
+
+
+def update_draw_archive(store, path: Optional[PathLike] = None) -> Optional[DrawArchive]:
+    """store(DrawHistoryStore)에 아카이브보다 새 회차가 있으면 그 회차만 변환해 붙이고, 최신 아카이브를 열어 돌려준다.
+
+    store가 비어 있으면 None
+    """
+    archive = DrawArchive.open(path)
+    latest = archive.latest_round if archive is not None else 0
+    if store.latest_round() <= latest:
+        return archive
+
+    added = DrawArchive.from_items(store.items_after(latest))
+    archive = archive.append(added) if archive is not None else added
+    archive.save(path)
+    logger.debug(f"draw archive updated: +{len(added)} rounds (latest: {archive.latest_round})")
+    return DrawArchive.open(path)
+
+
+def archive_root(path: Optional[PathLike] = None) -> Path:
+    return Path(os.path.expanduser(str(path or DEFAULT_ARCHIVE_PATH)))
+
+
+def _read_meta(root: Path) -> Optional[Dict]:
+    try:
+        meta = json.loads((root / "meta.json").read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as error:
+        logger.debug(f"failed to read draw archive meta ({root}): {type(error).__name__}: {error}")
+        return None
+    if meta.get("version") != ARCHIVE_VERSION or not (root / str(meta.get("current"))).is_dir():
+        return None
+    return meta
+
+
+def _write_meta(root: Path, meta: Dict):
+    tmp_path = root / f"meta.json.{os.getpid()}.tmp"
+    tmp_path.write_text(json.dumps(meta), encoding="utf-8")
+    os.replace(tmp_path, root / "meta.json")
+
+
+def _prune(root: Path, keep):
+    # 바로 이전 버전은 다른 프로세스가 meta.json을 읽고 막 열려는 중일 수 있어 남겨 둔다.
+    for child in root.iterdir():
+        if child.is_dir() and child.name.startswith("r") and child.name not in keep:
+            shutil.rmtree(child, ignore_errors=True)
@@ -0,0 +1,166 @@
+"""DrawArchive 전체 회차에 대한 번호 통계.
+
+당첨번호 열(numbers, 회차 x 6)을 회차 x 45 one-hot 행렬 하나로 바꾼 뒤 모든 통계를 그 행렬에 대한 배열 연산으로 구한다.
+
+- 구간(최근 N회차/전체)별 번호 출현 횟수
+- 번호별 미출현 회차 수(gap), 최장 미출현 회차 수, 평균 출현 간격 대비 미출현 비율(overdue)
+- 45x45 번호 쌍 동시 출현 횟수
+- 홀수 개수별 회차 수, 번호 합 분포, 연속번호 포함 비율
+
+새 회차가 아카이브에 붙을 때만 다시 계산하도록 DrawStatsCache를 통해 사용한다.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NUMBER_COUNT = 45
+
+# 출현 횟수를 따로 집계할 최근 회차 구간. 전체 구간("all")은 항상 포함한다.
+DEFAULT_WINDOWS = (10, 50, 100)
+
+# 추천 가중치에서 "최근"으로 보는 구간
+RECENT_WINDOW = 50
+
+SUM_BIN_WIDTH = 10
+SUM_BIN_EDGES = np.arange(20, 260 + SUM_BIN_WIDTH, SUM_BIN_WIDTH)  # 6개 번호 합은 21~255
+
+
+@dataclass
+class DrawStats:  # pylint: disable=too-many-instance-attributes
+    """compute_draw_stats()의 결과. 번호별 배열은 index 0이 1번이다."""
+
+    latest_round: int
+    draws: int
+    frequency: Dict[str, np.ndarray]  # "10", "50", ..., "all" -> (45,) 출현 횟수
+    gaps: np.ndarray  # (45,) 마지막 출현 이후 지난 회차 수. 한 번도 안 나왔으면 draws
+    max_gaps: np.ndarray  # (45,) 역대 최장 미출현 회차 수
+    overdue: np.ndarray  # (45,) gaps / 평균 출현 간격
+    pairs: np.ndarray  # (45, 45) 같은 회차에 함께 나온 횟수. 대각선은 전체 출현 횟수
+    odd_counts: np.ndarray  # (7,) 홀수가 k개인 회차 수
+    sum_counts: np.ndarray  # (len(SUM_BIN_EDGES) - 1,) 번호 합 구간별 회차 수
+    sum_mean: float
+    sum_std: float
+    consecutive_counts: np.ndarray  # (6,) 연속번호 쌍이 k개인 회차 수
+    weights: np.ndarray  # (45,) 추천 번호 샘플링 확률. 합이 1
+
+    @property
+    def consecutive_rate(self) -> float:
+        """연속번호(예: 17, 18)가 하나 이상 포함된 회차 비율"""
+        return float(1 - self.consecutive_counts[0] / self.draws)
+
+    def hot_numbers(self, count: int = 10, window: int = RECENT_WINDOW) -> List[int]:
+        """최근 window 회차에서 많이 나온 번호부터 count개"""
+        frequency = self.frequency[_window_key(window, self.draws)]
+        return [int(index) + 1 for index in np.argsort(-frequency, kind="stable")[:count]]
+
+    def overdue_numbers(self, count: int = 10) -> List[int]:
+        """평균 출현 간격에 비해 오래 나오지 않은 번호부터 count개"""
+        return [int(index) + 1 for index in np.argsort(-self.overdue, kind="stable")[:count]]
+
+    def to_dict(self) -> Dict:
+        return {
+            "latest_round": self.latest_round,
+            "draws": self.draws,
+            "frequency": {key: counts.tolist() for key, counts in self.frequency.items()},
+            "gaps": self.gaps.tolist(),
+            "max_gaps": self.max_gaps.tolist(),
+            "overdue": np.round(self.overdue, 3).tolist(),
+            "pairs": self.pairs.tolist(),
+            "odd_even": [{"odd": odd, "even": 6 - odd, "draws": int(draws)} for odd, draws in enumerate(self.odd_counts)],
+            "sums": {
+                "mean": round(self.sum_mean, 2),
+                "std": round(self.sum_std, 2),
+                "histogram": [{"from": int(start), "to": int(start) + SUM_BIN_WIDTH - 1, "draws": int(draws)} for start, draws in zip(SUM_BIN_EDGES, self.sum_counts)],
+            },
+            "consecutive": {"rate": round(self.consecutive_rate, 4), "by_pairs": self.consecutive_counts.tolist()},
+            "weights": np.round(self.weights, 5).tolist(),
+        }
+
+
+def compute_draw_stats(archive, windows: Sequence[int] = DEFAULT_WINDOWS) -> DrawStats:
+    """
+    :param archive: 회차 오름차순 DrawArchive (열 numbers, rounds만 사용)
+    :param windows: 출현 횟수를 따로 집계할 최근 회차 수들
+    """
+    numbers = np.asarray(archive.numbers, dtype=np.intp)
+    draws = len(numbers)
+    if not draws:
+        raise ValueError("통계를 계산할 회차가 없습니다.")
+
+    rows = np.arange(draws)
+    hits = np.zeros((draws, NUMBER_COUNT), dtype=np.int32)
+    hits[rows[:, None], numbers - 1] = 1
+
+    total = hits.sum(axis=0)
+    frequency = {_window_key(window, draws): hits[-window:].sum(axis=0) for window in sorted(set(windows) | {RECENT_WINDOW}) if window < draws}
+    frequency["all"] = total
+
+    # 각 회차 시점에 번호별로 마지막 출현 이후 지난 회차 수. 첫 출현 전은 1회차 이전(-1)부터 센다.
+    last_seen = np.maximum.accumulate(np.where(hits, rows[:, None], -1), axis=0)
+    since_seen = rows[:, None] - last_seen
+    gaps = since_seen[-1]
+    overdue = gaps * np.maximum(total, 1) / draws
+
+    sums = numbers.sum(axis=1)
+    consecutive = (np.diff(numbers, axis=1) == 1).sum(axis=1)
+
+    return DrawStats(
+        latest_round=int(archive.rounds[-1]),
+        draws=draws,
+        frequency=frequency,
+        gaps=gaps,
+        max_gaps=since_seen.max(axis=0),
+        overdue=overdue,
+        # 정수 행렬곱은 BLAS를 쓰지 않아 느리다. 횟수는 float64로 정확히 표현된다.
+        pairs=(hits.T.astype(np.float64) @ hits).astype(np.int64),
+        odd_counts=np.bincount((numbers % 2).sum(axis=1), minlength=7),
+        sum_counts=np.histogram(sums, bins=SUM_BIN_EDGES)[0],
+        sum_mean=float(sums.mean()),
+        sum_std=float(sums.std()),
+        consecutive_counts=np.bincount(consecutive, minlength=6),
+        weights=_sampling_weights(frequency[_window_key(RECENT_WINDOW, draws)], min(RECENT_WINDOW, draws), overdue),
+    )
+
+
+def _sampling_weights(recent: np.ndarray, window: int, overdue: np.ndarray) -> np.ndarray:
+    # 최근 구간 출현 횟수를 기대값(window * 6 / 45)으로 나눈 값과 overdue 비율(최대 3)을 반씩 섞는다.
+    # 둘 다 1 근처가 "평균적인" 번호이고, 한 번도 안 나온 번호도 0이 되지 않도록 1을 더해 둔다.
+    hot = (recent + 1) / (window * 6 / NUMBER_COUNT + 1)
+    score = 0.5 * hot + 0.5 * np.minimum(overdue, 3)
+    return score / score.sum()
+
+
+def _window_key(window: int, draws: int) -> str:
+    return str(window) if window < draws else "all"
+
+
+class DrawStatsCache:
+    """가장 최근에 계산한 DrawStats와 그 to_dict()를 보관하고, 아카이브의 latest_round가 바뀔 때만 다시 계산한다."""
+
+    def __init__(self, windows: Sequence[int] = DEFAULT_WINDOWS):
+        self._windows = tuple(windows)
+        self._stats: Optional[DrawStats] = None
+        self._payload: Optional[Dict] = None
+
+    @property
+    def stats(self) -> Optional[DrawStats]:
+        return self._stats
+
+    @property
+    def payload(self) -> Optional[Dict]:
+        return self._payload
+
+    def update(self, archive) -> Optional[DrawStats]:
+        """archive(DrawArchive 또는 None)가 캐시보다 새로우면 다시 계산한다. 비어 있으면 기존 결과를 유지한다."""
+        if archive is None or len(archive) == 0:
+            return self._stats
+        if self._stats is None or self._stats.latest_round != archive.latest_round:
+            stats = compute_draw_stats(archive, self._windows)
+            self._stats, self._payload = stats, stats.to_dict()
+            logger.debug(f"draw stats computed (latest: {stats.latest_round}, draws: {stats.draws})")
+        return self._stats
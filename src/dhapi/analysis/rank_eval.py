@@ -0,0 +1,86 @@
+"""티켓 N개 x 회차 M개의 당첨 등수를 한 번에 계산한다.
+
+티켓과 회차 당첨번호를 Lotto645Ticket.to_bitmask()와 같은 64비트 마스크(번호 n -> 비트 n)로 바꿔 두면
+맞힌 개수는 popcount(ticket & draw) 하나로 구해진다. 5개를 맞힌 경우에만 보너스 번호 비트로 2등/3등을 가른다.
+"""
+
+import logging
+from typing import Iterable, Tuple
+
+import numpy as np
+
+from dhapi.domain.lotto645_ticket import Lotto645Ticket
+
+logger = logging.getLogger(__name__)
+
+NO_RANK = 0
+
+# 맞힌 개수 -> 등수. 5개 일치는 보너스 번호 일치 여부에 따라 2등이 된다.
+_RANK_BY_MATCHES = np.array([NO_RANK, NO_RANK, NO_RANK, 5, 4, 3, 1], dtype=np.uint8)
+
+# 한 번에 만드는 ticket x draw 중간 배열의 최대 원소 수 (uint64 기준 약 16MB)
+_CHUNK_ELEMENTS = 1 << 21
+
+_POPCOUNT_TABLE = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def popcount(masks: np.ndarray) -> np.ndarray:
+    """uint64 배열의 원소별 1비트 개수 (uint8)"""
+    if hasattr(np, "bitwise_count"):  # numpy 2.0+
+        return np.bitwise_count(masks)
+    masks = np.ascontiguousarray(masks, dtype=np.uint64)
+    return _POPCOUNT_TABLE[masks.view(np.uint8)].reshape(masks.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+def numbers_to_masks(numbers) -> np.ndarray:
+    """(N, k) 번호 배열 -> (N,) uint64 마스크"""
+    numbers = np.asarray(numbers, dtype=np.uint64)
+    return np.bitwise_or.reduce(np.left_shift(np.uint64(1), numbers), axis=-1)
+
+
+def ticket_masks(tickets: Iterable[Lotto645Ticket]) -> np.ndarray:
+    return np.array([ticket.to_bitmask() for ticket in tickets], dtype=np.uint64)
+
+
+def archive_masks(archive) -> Tuple[np.ndarray, np.ndarray]:
+    """DrawArchive -> (당첨번호 마스크, 보너스 번호 마스크). 둘 다 (M,) uint64"""
+    return numbers_to_masks(archive.numbers), np.left_shift(np.uint64(1), np.asarray(archive.bonus, dtype=np.uint64))
+
+
+def evaluate_ranks(tickets: np.ndarray, draws: np.ndarray, bonus: np.ndarray) -> np.ndarray:
+    """
+    :param tickets: (N,) uint64 티켓 마스크
+    :param draws: (M,) uint64 당첨번호 마스크
+    :param bonus: (M,) uint64 보너스 번호 마스크
+    :return: (N, M) uint8 등수. 낙첨은 NO_RANK(0)
+    """
+    tickets, draws, bonus = (np.asarray(values, dtype=np.uint64) for values in (tickets, draws, bonus))
+    ranks = np.empty((len(tickets), len(draws)), dtype=np.uint8)
+    step = max(1, _CHUNK_ELEMENTS // max(1, len(draws)))
+    for start in range(0, len(tickets), step):
+        ranks[start : start + step] = _ranks(tickets[start : start + step, None], draws, bonus)
+    return ranks
+
+
+def match_ranks(tickets: np.ndarray, draws: np.ndarray, bonus: np.ndarray) -> np.ndarray:
+    """evaluate_ranks와 달리 i번째 티켓을 i번째 회차하고만 맞춘다. 세 배열 모두 (N,)이고 결과는 (N,) uint8"""
+    return _ranks(*(np.asarray(values, dtype=np.uint64) for values in (tickets, draws, bonus)))
+
+
+def _ranks(tickets: np.ndarray, draws: np.ndarray, bonus: np.ndarray) -> np.ndarray:
+    matches = popcount(tickets & draws)
+    ranks = _RANK_BY_MATCHES[matches]
+    ranks[(matches == 5) & ((tickets & bonus) != 0)] = 2
+    return ranks
+
+
+def rank_counts(tickets: np.ndarray, draws: np.ndarray, bonus: np.ndarray) -> np.ndarray:
+    """회차별 등수 분포. (M, 6) int64이고 [m, r]은 회차 m에서 r등(0은 낙첨)이 된 티켓 수"""
+    draws = np.asarray(draws, dtype=np.uint64)
+    counts = np.zeros(len(draws) * 6, dtype=np.int64)
+    offsets = np.arange(len(draws), dtype=np.intp) * 6
+    step = max(1, _CHUNK_ELEMENTS // max(1, len(draws)))
+    for start in range(0, len(tickets), step):
+        ranks = evaluate_ranks(tickets[start : start + step], draws, bonus)
+        counts += np.bincount((ranks + offsets).ravel(), minlength=len(counts))
+    return counts.reshape(len(draws), 6)
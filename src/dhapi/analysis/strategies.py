@@ -0,0 +1,58 @@
+"""번호 선택 전략. 모든 전략은 게임 count개를 (count, 6) 오름차순 번호 배열로 한 번에 만든다.
+
+웹의 AI 추천(ai_service)과 backtest가 같은 함수를 사용하므로 백테스트 결과가 실제 추천 로직의 성능이다.
+"""
+
+import logging
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from dhapi.analysis.draw_stats import NUMBER_COUNT, DrawStats
+
+logger = logging.getLogger(__name__)
+
+# (그 시점까지의 통계, 게임 수, 난수 생성기) -> (count, 6) 번호
+Strategy = Callable[[Optional[DrawStats], int, np.random.Generator], np.ndarray]
+
+
+def random_games(stats: Optional[DrawStats], count: int, rng: np.random.Generator) -> np.ndarray:  # pylint: disable=unused-argument
+    """완전 랜덤 (자동발급과 같다)"""
+    selected = _top_k(rng.random((count, NUMBER_COUNT)), np.full(count, 6))
+    return _to_numbers(selected)
+
+
+def hybrid_games(stats: DrawStats, count: int, rng: np.random.Generator) -> np.ndarray:
+    """최근 빈출 번호(hot) 1~2개, 평균 간격보다 오래 안 나온 번호(cold) 1~2개, 나머지는 stats.weights 가중치로 중복 없이 고른다."""
+    hot = np.array(stats.hot_numbers(10)) - 1
+    cold = np.array([number for number in stats.overdue_numbers(10) if number - 1 not in hot], dtype=np.intp) - 1
+
+    selected = np.zeros((count, NUMBER_COUNT), dtype=bool)
+    selected[:, hot] = _top_k(rng.random((count, len(hot))), rng.integers(1, 3, count))
+    if len(cold):
+        selected[:, cold] = _top_k(rng.random((count, len(cold))), np.minimum(rng.integers(1, 3, count), len(cold)))
+
+    # 지수분포 E에 대해 -E / weight가 큰 k개를 고르면 가중치 비례 비복원 추출과 같은 분포다. (Efraimidis-Spirakis)
+    keys = -rng.standard_exponential((count, NUMBER_COUNT)) / stats.weights
+    keys[selected] = -np.inf
+    selected |= _top_k(keys, 6 - selected.sum(axis=1))
+    return _to_numbers(selected)
+
+
+STRATEGIES: Dict[str, Strategy] = {
+    "random": random_games,
+    "hybrid": hybrid_games,
+}
+
+# stats 없이(None으로) 호출할 수 있는 전략. backtest는 이 전략들에 대해 회차마다 통계를 계산하지 않는다.
+STATLESS_STRATEGIES = frozenset({"random"})
+
+
+def _top_k(keys: np.ndarray, k: np.ndarray) -> np.ndarray:
+    """행마다 keys가 큰 k[i]개(1 이상)를 True로 한 bool 배열. 실수 난수 key라 같은 값은 없다고 본다."""
+    threshold = np.take_along_axis(np.sort(keys, axis=1), (keys.shape[1] - k)[:, None], axis=1)
+    return keys >= threshold
+
+
+def _to_numbers(selected: np.ndarray) -> np.ndarray:
+    return (np.nonzero(selected)[1].reshape(len(selected), 6) + 1).astype(np.uint8)
@@ -0,0 +1,43 @@
+"""로컬에 저장한 구매 번호(Lotto645TicketStore)를 회차 아카이브(DrawArchive)와 한 번에 맞춰 본다.
+
+구매 내역의 당첨결과(ltWnResult)는 사이트가 회차를 정산한 뒤에야 채워지고, 게임별 번호는 티켓마다 상세 조회가 필요하다.
+여기서는 모든 게임을 마스크 배열로 바꾼 뒤 각자의 회차 당첨번호와 match_ranks() 한 번으로 등수를 구하므로 업스트림 요청이 없다.
+"""
+
+import logging
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from dhapi.analysis.rank_eval import NO_RANK, archive_masks, match_ranks, numbers_to_masks
+
+logger = logging.getLogger(__name__)
+
+
+def check_wins(games: Iterable[Dict], archive) -> List[Dict]:
+    """
+    :param games: Lotto645TicketStore.games() 형태의 게임 목록
+    :param archive: DrawArchive. 아직 만든 적이 없으면 None
+    :return: 각 게임에 "rank"(1~5, 낙첨 0, 추첨 전/회차 정보 없음 None)와 "prize"(1게임 당첨금, 추첨 전 None)를 더한 목록
+    """
+    games = list(games)
+    if not games:
+        return []
+
+    rounds = np.array([game["round"] for game in games], dtype=np.int64)
+    if archive is None or len(archive) == 0:
+        drawn = np.zeros(len(games), dtype=bool)
+        ranks = prizes = np.zeros(len(games), dtype=np.int64)
+    else:
+        index = np.minimum(np.searchsorted(archive.rounds, rounds), len(archive) - 1)
+        drawn = archive.rounds[index] == rounds
+        draws, bonus = archive_masks(archive)
+        ranks = match_ranks(numbers_to_masks([game["numbers"] for game in games]), draws[index], bonus[index])
+        ranks[~drawn] = NO_RANK
+        prizes = np.where(ranks != NO_RANK, archive.prizes[index, np.maximum(ranks, 1) - 1], 0)
+
+    logger.debug(f"checked {len(games)} games ({int(drawn.sum())} drawn, {int((ranks != NO_RANK).sum())} won)")
+    return [
+        {**game, "rank": int(rank) if is_drawn else None, "prize": int(prize) if is_drawn else None}
+        for game, rank, prize, is_drawn in zip(games, ranks.tolist(), prizes.tolist(), drawn.tolist())
+    ]
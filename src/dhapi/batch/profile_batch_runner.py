@@ -0,0 +1,109 @@
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from dhapi.config.logger import set_logger
+from dhapi.domain.user import User
+from dhapi.endpoint.lottery_result_collector import LotteryResultCollector
+from dhapi.port.credentials_provider import CredentialsProvider
+from dhapi.port.request_timings import REQUEST_TIMINGS
+from dhapi.port.ticket_store import Lotto645TicketStore
+
+logger = logging.getLogger(__name__)
+
+BATCH_COMMANDS = ("show-balance", "show-buy-list", "buy-lotto645", "sync-tickets")
+
+
+def resolve_profiles(spec: str, path: Optional[str] = None) -> List[str]:
+    """'all' 또는 'a,b,c' 형식의 프로필 지정을 순서를 유지한 이름 목록으로 바꾼다."""
+    if spec.strip() == "all":
+        return CredentialsProvider.list_profiles(path)
+
+    names = []
+    for name in spec.split(","):
+        name = name.strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def run_profile(command: str, profile: str, user: User, options: Dict, client_factory: Callable) -> Dict:
+    """워커 프로세스에서 프로필 하나에 대해 명령을 실행한다. 예외는 결과로 바꿔 반환한다.
+
+    :param client_factory: (user, lottery_endpoint) -> LotteryClient. 워커에 넘겨지므로 모듈 수준 함수여야 한다.
+    """
+    started = time.perf_counter()
+    collector = LotteryResultCollector()
+    try:
+        # CLI와 같은 세션/가상계좌/탐색 캐시와 전송 계층 설정을 사용한다. (세션 캐시는 계정별로 나뉜다)
+        client = client_factory(user, collector)
+        if command == "show-balance":
+            client.show_balance()
+        elif command == "show-buy-list":
+            client.show_buy_list("json", options.get("start_date"), options.get("end_date"))
+        elif command == "buy-lotto645":
+            client.buy_lotto645(options["tickets"])
+        elif command == "sync-tickets":
+            # 이미 저장해 둔 구매 건은 상세 조회하지 않는다. 워커들이 같은 SQLite 파일에 쓴다.
+            ticket_store = Lotto645TicketStore(options.get("ticket_db_path"))
+            known_barcodes = ticket_store.known_barcodes(user.username)
+            purchases = client.fetch_lotto645_games(options.get("start_date"), options.get("end_date"), known_barcodes=known_barcodes)
+            collector.print_result_of_sync_lotto645_tickets(ticket_store.save(user.username, purchases))
+        else:
+            raise ValueError(f"batch에서 지원하지 않는 명령입니다. ({command})")
+        error = None
+    except Exception as e:
+        logger.debug(f"[{profile}] {command} failed: {type(e).__name__}: {e}")
+        error = str(e) or type(e).__name__
+
+    result = {
+        "profile": profile,
+        "ok": error is None,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "result": collector.result if error is None else None,
+        "error": error,
+    }
+    if REQUEST_TIMINGS.enabled:
+        # 워커 프로세스에서 잰 요청 시간은 부모 프로세스에서 합친다. (워커는 여러 프로필에 재사용되므로 비운다)
+        result["timings"] = REQUEST_TIMINGS.drain()
+    return result
+
+
+class ProfileBatchRunner:
+    """여러 프로필에 같은 명령을 프로세스 풀에서 병렬로 실행한다."""
+
+    def __init__(self, client_factory: Callable, jobs: int = 4, is_debug: bool = False):
+        if jobs < 1:
+            raise ValueError(f"jobs는 1 이상이어야 합니다. (입력된 값: {jobs})")
+        self._client_factory = client_factory
+        self._jobs = jobs
+        self._is_debug = is_debug
+
+    def run(self, command: str, users: Dict[str, User], options: Optional[Dict] = None) -> List[Dict]:
+        """
+        :param users: {프로필 이름: User}
+        :return: users 순서대로 [{"profile", "ok", "elapsed_seconds", "result", "error"}, ...]
+        """
+        if command not in BATCH_COMMANDS:
+            raise ValueError(f"batch에서 지원하지 않는 명령입니다. ({command})")
+        if not users:
+            return []
+
+        options = options or {}
+        max_workers = min(self._jobs, len(users))
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=set_logger, initargs=(self._is_debug,)) as executor:
+            futures = [(profile, executor.submit(run_profile, command, profile, user, options, self._client_factory)) for profile, user in users.items()]
+            results = [self._collect(profile, future) for profile, future in futures]
+
+        for result in results:
+            REQUEST_TIMINGS.merge(result.pop("timings", None))
+        return results
+
+    def _collect(self, profile, future):
+        try:
+            return future.result()
+        except Exception as e:
+            # 워커 프로세스가 비정상 종료된 경우에도 다른 프로필 결과는 유지한다.
+            logger.debug(f"[{profile}] worker failed: {type(e).__name__}: {e}")
+            return {"profile": profile, "ok": False, "elapsed_seconds": None, "result": None, "error": str(e) or type(e).__name__}
@@ -0,0 +1,100 @@
+import datetime
+import re
+from typing import Any, Dict, List, Optional
+
+import pytz
+
+FIRST_DRAW_DATE = datetime.date(2002, 12, 7)
+
+_RANK_CRITERIA = {
+    1: "6개번호 일치",
+    2: "5개번호 일치 + 보너스번호 일치",
+    3: "5개번호 일치",
+    4: "4개번호 일치",
+    5: "3개번호 일치",
+}
+
+
+def current_selling_round(now: Optional[datetime.datetime] = None) -> int:
+    """이번 주 토요일에 추첨하는 (판매 중인) 회차
+
+    :param now: 기준 시각. 생략하면 현재 한국 시각이고, timezone이 없는 값은 한국 시각으로 본다.
+    """
+    korea_tz = pytz.timezone("Asia/Seoul")
+    if now is None:
+        now = datetime.datetime.now(korea_tz)
+    elif now.tzinfo is not None:
+        # 서버가 한국 시간대가 아니어도 회차는 한국 날짜 기준으로 바뀐다.
+        now = now.astimezone(korea_tz)
+    today = now.date()
+    this_saturday = today + datetime.timedelta(days=(5 - today.weekday()) % 7)
+    return 1 + (this_saturday - FIRST_DRAW_DATE).days // 7
+
+
+def normalize_draw_history_item(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """selectPstLt645Info.do 응답의 회차 항목을 웹/CLI에서 쓰는 형태로 바꾼다. 당첨번호가 없으면 None"""
+    if not isinstance(item, dict):
+        return None
+
+    try:
+        numbers = [_as_int(item.get(f"tm{index}WnNo")) for index in range(1, 7)]
+        if any(n <= 0 for n in numbers):
+            return None
+
+        return {
+            "round": _as_int(item.get("ltEpsd")),
+            "draw_date": _normalize_draw_date_yyyymmdd(item.get("ltRflYmd")),
+            "numbers": numbers,
+            "bonus": _as_int(item.get("bnsWnNo")),
+            "winner_summary": {
+                "total_sales_amount": max(0, _as_int(item.get("wholEpsdSumNtslAmt"), 0)),
+                "total_winner_count": max(0, _as_int(item.get("sumWnNope"), 0)),
+                "first_auto": max(0, _as_int(item.get("winType1"), 0)),
+                "first_manual": max(0, _as_int(item.get("winType2"), 0)),
+                "first_semi_auto": max(0, _as_int(item.get("winType3"), 0)),
+            },
+            "ranks": _build_draw_rank_rows(item),
+        }
+    except Exception:
+        return None
+
+
+def _normalize_draw_date_yyyymmdd(raw: Any) -> str:
+    value = re.sub(r"[^\d]", "", str(raw or ""))
+    if len(value) == 8:
+        return f"{value[0:4]}-{value[4:6]}-{value[6:8]}"
+    return str(raw or "")
+
+
+def _as_int(value: Any, default: int = 0) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        digits = re.sub(r"[^\d\-]", "", str(value or ""))
+        if not digits or digits == "-":
+            return default
+        try:
+            return int(digits)
+        except ValueError:
+            return default
+
+
+def _build_draw_rank_rows(item: Dict[str, Any]) -> List[Dict[str, Any]]:
+    auto_cnt = max(0, _as_int(item.get("winType1"), 0))
+    manual_cnt = max(0, _as_int(item.get("winType2"), 0))
+    semi_auto_cnt = max(0, _as_int(item.get("winType3"), 0))
+    remark = ""
+    if _as_int(item.get("winType0"), 0) == 0 and (auto_cnt > 0 or manual_cnt > 0 or semi_auto_cnt > 0):
+        remark = f"자동{auto_cnt} / 수동{manual_cnt} / 반자동{semi_auto_cnt}"
+
+    return [
+        {
+            "rank": rank,
+            "total_prize_amount": max(0, _as_int(item.get(f"rnk{rank}SumWnAmt"), 0)),
+            "winner_count": max(0, _as_int(item.get(f"rnk{rank}WnNope"), 0)),
+            "prize_per_winner": max(0, _as_int(item.get(f"rnk{rank}WnAmt"), 0)),
+            "criteria": _RANK_CRITERIA[rank],
+            "remark": remark if rank == 1 else "",
+        }
+        for rank in range(1, 6)
+    ]
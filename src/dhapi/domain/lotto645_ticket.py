@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 
 class Lotto645Mode(str, Enum):
@@ -45,6 +45,14 @@ class Lotto645Ticket:
         else:
             raise RuntimeError("지원하지 않는 게임 타입입니다.")
 
+    def to_bitmask(self) -> int:
+        """번호 n을 n번째 비트로 나타낸 정수 (1~45번 -> 비트 1~45, 64비트 안에 들어간다)"""
+        return numbers_to_bitmask(self.numbers)
+
+    @staticmethod
+    def from_bitmask(mask: int) -> "Lotto645Ticket":
+        return Lotto645Ticket(",".join(map(str, bitmask_to_numbers(mask))))
+
     @staticmethod
     def create_auto_tickets(count: int):
         return [Lotto645Ticket() for _ in range(count)]
@@ -52,3 +60,14 @@ class Lotto645Ticket:
     @staticmethod
     def create_tickets(numbers_list: List[str]):
         return [Lotto645Ticket(numbers) for numbers in numbers_list]
+
+
+def numbers_to_bitmask(numbers: Iterable[int]) -> int:
+    mask = 0
+    for n in numbers:
+        mask |= 1 << n
+    return mask
+
+
+def bitmask_to_numbers(mask: int) -> List[int]:
+    return [n for n in range(1, 46) if mask >> n & 1]
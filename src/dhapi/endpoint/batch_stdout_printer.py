@@ -0,0 +1,82 @@
+import json
+from typing import Dict, List
+
+from rich.console import Console
+from rich.table import Table
+
+from dhapi.endpoint.lottery_stdout_printer import LotteryStdoutPrinter
+
+
+class BatchStdoutPrinter(LotteryStdoutPrinter):
+    _BALANCE_KEYS = ["총예치금", "구매가능금액", "예약구매금액", "출금신청중금액", "구매불가능금액", "최근1달누적구매금액"]
+
+    def print_result_of_batch(self, command: str, results: List[Dict], output_format: str, elapsed_seconds: float):
+        """
+        :param results: [{"profile": "a", "ok": True, "elapsed_seconds": 1.2, "result": ..., "error": None}, ...]
+        """
+        if output_format == "json":
+            print(json.dumps(self._build_batch_json(command, results, elapsed_seconds), ensure_ascii=False, indent=2))
+            return
+
+        console = Console()
+        succeeded = [result for result in results if result["ok"]]
+        console.print(f"✅ {len(results)}개 프로필 중 {len(succeeded)}개 프로필에서 {command} 명령을 실행했습니다.")
+
+        table = self._build_merged_table(command, succeeded)
+        if table is not None:
+            console.print(table)
+
+        summary = Table("프로필", "결과", "소요시간", "오류")
+        for result in results:
+            elapsed = "-" if result["elapsed_seconds"] is None else f"{result['elapsed_seconds']:.2f}초"
+            summary.add_row(result["profile"], "성공" if result["ok"] else "실패", elapsed, result["error"] or "")
+        console.print(summary)
+        console.print(f"[dim](전체 소요시간: {elapsed_seconds:.2f}초)[/dim]")
+
+    def _build_merged_table(self, command, results):
+        if not results:
+            return None
+
+        if command == "show-balance":
+            table = Table("프로필", *self._BALANCE_KEYS)
+            for result in results:
+                table.add_row(result["profile"], *[self._num_to_money_str(result["result"][key]) for key in self._BALANCE_KEYS])
+            return table
+
+        if command == "buy-lotto645":
+            table = Table("프로필", "슬롯", "Mode", "번호1", "번호2", "번호3", "번호4", "번호5", "번호6")
+            for result in results:
+                for slot in result["result"]:
+                    table.add_row(result["profile"], slot["slot"], slot["mode"], *slot["numbers"])
+            return table
+
+        headers = next((result["result"]["headers"] for result in results if result["result"]["headers"]), [])
+        rows = [(result["profile"], row) for result in results for row in result["result"]["rows"]]
+        if not headers or not rows:
+            return None
+
+        table = Table("프로필", *headers)
+        for profile, row in rows:
+            table.add_row(profile, *self._pad_row(row, len(headers)))
+        return table
+
+    def _build_batch_json(self, command, results, elapsed_seconds):
+        return {
+            "command": command,
+            "elapsed_seconds": round(elapsed_seconds, 3),
+            "results": [
+                {
+                    "profile": result["profile"],
+                    "ok": result["ok"],
+                    "elapsed_seconds": result["elapsed_seconds"],
+                    "error": result["error"],
+                    "data": self._result_to_json(command, result["result"]),
+                }
+                for result in results
+            ],
+        }
+
+    def _result_to_json(self, command, result):
+        if result is None or command != "show-buy-list":
+            return result
+        return [self._parse_row_for_json(row, result["headers"]) for row in result["rows"]]
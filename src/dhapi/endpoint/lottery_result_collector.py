@@ -0,0 +1,32 @@
+from typing import Dict, List
+
+
+class LotteryResultCollector:
+    """LotteryStdoutPrinter와 같은 인터페이스로 결과를 출력하지 않고 모아둔다.
+
+    batch 실행 시 워커 프로세스에서 사용하며, result는 pickle 가능한 dict/list로만 구성된다.
+    """
+
+    def __init__(self):
+        self.result = None
+
+    def print_result_of_assign_virtual_account(self, 전용가상계좌, 결제신청금액, 은행명=None, 예금주=None):
+        self.result = {"전용가상계좌": 전용가상계좌, "결제신청금액": 결제신청금액, "은행명": 은행명, "예금주": 예금주}
+
+    def print_result_of_show_balance(self, **balance):
+        # 키: 총예치금, 구매가능금액, 예약구매금액, 출금신청중금액, 구매불가능금액, 최근1달누적구매금액
+        self.result = dict(balance)
+
+    def print_result_of_buy_lotto645(self, slots: List[Dict]):
+        self.result = [dict(slot) for slot in slots]
+
+    def print_result_of_sync_lotto645_tickets(self, added: int):
+        self.result = {"added": added}
+
+    def print_result_of_show_buy_list(self, data: List[Dict], output_format: str, start_date: str, end_date: str):  # pylint: disable=unused-argument
+        headers = []
+        rows = []
+        for table_data in data:
+            headers = headers or table_data.get("headers", [])
+            rows.extend(list(row) for row in table_data.get("rows", []))
+        self.result = {"headers": headers, "rows": rows, "start_date": start_date, "end_date": end_date}
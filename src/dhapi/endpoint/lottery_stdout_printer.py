@@ -1,6 +1,6 @@
 import json
 import re
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from rich.console import Console
 from rich.table import Table
@@ -37,6 +37,39 @@ class LotteryStdoutPrinter:
         console.print(table)
         console.print("[dim](구매불가능금액 = 예약구매금액 + 출금신청중금액)[/dim]")
 
+    def print_wait_queue_progress(self, position: int, estimated_seconds: Optional[float] = None):
+        # --format json 출력과 섞이지 않도록 진행 상황은 stderr에 출력한다.
+        eta = f", 약 {estimated_seconds:.0f}초 남음" if estimated_seconds is not None else ""
+        Console(stderr=True).print(f"[dim]⏳ 동행복권 대기열 순번 {position:,}{eta}[/dim]")
+
+    def print_request_timings(self, rows: List[Dict]):
+        """
+        :param rows: RequestTimings.summary() 결과
+        """
+        # 명령 출력(--format json 등)과 섞이지 않도록 stderr에 출력한다.
+        console = Console(stderr=True)
+        if not rows:
+            console.print("[dim]기록된 업스트림 요청이 없습니다.[/dim]")
+            return
+
+        table = Table("메서드", "엔드포인트", "요청", "오류", "대기열", "크기", "DNS", "연결", "TTFB", "p50", "p95", "p99", "합계", title="업스트림 요청 시간 (ms)")
+        for row in rows:
+            table.add_row(
+                row["method"],
+                row["endpoint"],
+                str(row["count"]),
+                str(row["errors"]),
+                str(row["wait_pages"]),
+                f"{row['bytes'] / 1024:,.1f}KB",
+                *[self._ms_str(row[key]) for key in ("dns_mean_ms", "connect_mean_ms", "ttfb_mean_ms", "p50_ms", "p95_ms", "p99_ms")],
+                f"{row['total_seconds'] * 1000:,.0f}",
+            )
+        console.print(table)
+        console.print("[dim](DNS/연결/TTFB는 평균, p50/p95/p99는 전체 시간의 히스토그램 추정값, 새 연결을 맺은 요청만 DNS/연결 시간이 있습니다)[/dim]")
+
+    def _ms_str(self, value):
+        return "-" if value is None else f"{value:,.1f}"
+
     def _num_to_money_str(self, num):
         return f"{num:,} 원"
 
@@ -54,15 +87,21 @@ class LotteryStdoutPrinter:
         console.print(table)
 
     def print_result_of_show_buy_list(self, data: List[Dict], output_format: str, start_date: str, end_date: str):
+        """
+        :param data: [{"headers": [...], "rows": iterable}, ...] - rows는 제너레이터일 수 있으며 한 번만 순회한다.
+        """
         console = Console()
 
         if output_format == "json":
-            json_results = self._build_json_results(data)
-            print(json.dumps(json_results, ensure_ascii=False, indent=2))
+            self._print_json_stream(self._iter_json_results(data))
             return
 
         console.print(f"✅ 구매 내역을 조회했습니다. ({start_date} ~ {end_date})")
 
+        # rich Table은 전체 행이 있어야 그릴 수 있으므로 table 형식에서만 행을 모은다.
+        data = [{"headers": table_data.get("headers", []), "rows": list(table_data.get("rows", []))} for table_data in data]
+        data = [table_data for table_data in data if table_data["rows"]]
+
         if not data:
             console.print("구매 내역이 없습니다.")
             return
@@ -86,8 +125,108 @@ class LotteryStdoutPrinter:
             console.print(table)
             console.print("\n")
 
+    def print_result_of_sync_draws(self, added: int, latest_round: int):
+        console = Console()
+        if added:
+            console.print(f"✅ {added:,}개 회차를 새로 저장했습니다. (최신 회차: {latest_round:,}회)")
+        else:
+            console.print(f"✅ 이미 최신 회차까지 저장되어 있습니다. (최신 회차: {latest_round:,}회)")
+
+    def print_result_of_show_draws(self, items: List[Dict], output_format: str):
+        """
+        :param items: DrawHistoryStore.recent() 결과 (최신 회차부터)
+        """
+        if output_format == "json":
+            self._print_json_stream(items)
+            return
+
+        console = Console()
+        if not items:
+            console.print("저장된 회차가 없습니다. 'dhapi sync-draws'로 먼저 저장하세요.")
+            return
+
+        table = Table("회차", "추첨일", "당첨번호", "보너스", "1등 당첨자", "1등 당첨금")
+        for item in items:
+            first = next((row for row in item.get("ranks") or [] if row.get("rank") == 1), {})
+            table.add_row(
+                str(item["round"]),
+                item["draw_date"],
+                " ".join(f"{number:02d}" for number in item["numbers"]),
+                f"{item['bonus']:02d}",
+                f"{first.get('winner_count', 0):,}",
+                self._num_to_money_str(first.get("prize_per_winner", 0)),
+            )
+        console.print(table)
+
+    def print_result_of_check_wins(self, results: List[Dict], output_format: str, failures: Optional[List[Dict]] = None):
+        """
+        :param results: check_wins() 결과에 "profile"을 더한 목록
+        :param failures: 구매 번호를 새로 가져오지 못한 프로필 [{"profile", "error"}, ...]
+        """
+        if output_format == "json":
+            self._print_json_stream(results)
+            return
+
+        console = Console()
+        for failure in failures or []:
+            console.print(f"❗ [{failure['profile']}] 구매 번호를 새로 가져오지 못해 저장된 번호로만 확인합니다: {failure['error']}")
+
+        if not results:
+            console.print("확인할 로또6/45 구매 번호가 없습니다.")
+            return
+
+        table = Table("프로필", "회차", "구입일자", "슬롯", "모드", "번호", "결과", "당첨금")
+        for result in results:
+            rank = result["rank"]
+            status = "추첨 전" if rank is None else f"{rank}등" if rank else "낙첨"
+            table.add_row(
+                result["profile"],
+                str(result["round"]),
+                result["purchase_date"],
+                result["slot"],
+                result["mode"],
+                " ".join(f"{number:02d}" for number in result["numbers"]),
+                status,
+                self._num_to_money_str(result["prize"]) if rank else "-",
+            )
+        console.print(table)
+
+        won = [result for result in results if result["rank"]]
+        pending = sum(1 for result in results if result["rank"] is None)
+        total_prize = sum(result["prize"] for result in won)
+        console.print(f"✅ {len(results):,}게임 중 {len(won):,}게임 당첨 (당첨금 합계 {self._num_to_money_str(total_prize)}, 추첨 전 {pending:,}게임)")
+
+    def print_result_of_backtest(self, result: Dict, output_format: str, elapsed_seconds: float):
+        """
+        :param result: BacktestResult.to_dict()
+        """
+        if output_format == "json":
+            print(json.dumps(result, ensure_ascii=False, indent=2))
+            return
+
+        console = Console()
+        console.print(
+            f"✅ {result['strategy']} 전략: {result['first_round']:,}~{result['last_round']:,}회 ({result['rounds']:,}회차 x {result['games_per_round']:,}게임, {elapsed_seconds:.1f}초)"
+        )
+
+        table = Table("등수", "당첨 게임", "적중률", "95% 신뢰구간")
+        for row in result["ranks"]:
+            low, high = row["interval"]
+            table.add_row(f"{row['rank']}등", f"{row['hits']:,}", self._odds_str(row["rate"]), f"{self._odds_str(low)} ~ {self._odds_str(high)}")
+        console.print(table)
+
+        low, high = result["return_rate_interval"]
+        profit = result["cumulative_profit"][-1]["profit"] if result["cumulative_profit"] else 0
+        console.print(f"구매 금액 {self._num_to_money_str(result['cost'])} / 당첨금 {self._num_to_money_str(result['prize'])} / 누적 손익 {self._num_to_money_str(profit)}")
+        console.print(f"회수율 {result['return_rate'] * 100:.1f}% (95% 신뢰구간 {low * 100:.1f}% ~ {high * 100:.1f}%)")
+
+    def _odds_str(self, rate: float) -> str:
+        return f"1/{round(1 / rate):,}" if rate > 0 else "-"
+
     def _build_json_results(self, data: List[Dict]) -> List[Dict]:
-        json_results = []
+        return list(self._iter_json_results(data))
+
+    def _iter_json_results(self, data: Iterable[Dict]) -> Iterator[Dict]:
         for table_data in data:
             headers = table_data.get("headers", [])
             rows = table_data.get("rows", [])
@@ -96,9 +235,21 @@ class LotteryStdoutPrinter:
                 continue
 
             for row in rows:
-                item = self._parse_row_for_json(row, headers)
-                json_results.append(item)
-        return json_results
+                yield self._parse_row_for_json(row, headers)
+
+    def _print_json_stream(self, items: Iterable[Dict]):
+        """json.dumps(list, indent=2)와 같은 모양으로 항목을 하나씩 출력한다.
+
+        items가 중간에 예외를 내도 이미 출력한 항목까지의 배열은 닫은 뒤 예외를 전달하므로 stdout은 항상 올바른 JSON이다.
+        """
+        is_first = True
+        try:
+            for item in items:
+                body = json.dumps(item, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+                print("[\n  " + body if is_first else ",\n  " + body, end="", flush=True)
+                is_first = False
+        finally:
+            print("[]" if is_first else "\n]", flush=True)
 
     def _parse_row_for_json(self, row: List[str], headers: List[str]) -> Dict:
         item = {}
@@ -0,0 +1,226 @@
+import asyncio
+import logging
+from typing import List
+
+import httpx
+
+from dhapi.domain.deposit import Deposit
+from dhapi.domain.lotto645_ticket import Lotto645Ticket
+from dhapi.domain.user import User
+from dhapi.port.lottery_client_base import LotteryClientBase
+from dhapi.port.session_store import SessionStore
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncLotteryClient(LotteryClientBase):
+    """httpx.AsyncClient 기반의 LotteryClient.
+
+    요청/응답 처리만 비동기로 수행하고, 응답 파싱은 LotteryClientBase의 헬퍼를 LotteryClient와 공유한다.
+    생성 후 `await client.login()`을 먼저 호출해야 한다.
+    """
+
+    def __init__(self, user_profile: User, lottery_endpoint, http_client: httpx.AsyncClient = None, session_store=None, *, virtual_account_store=None, discovery_cache=None):
+        super().__init__(user_profile, lottery_endpoint, session_store)
+        self._virtual_account_store = virtual_account_store
+        self._discovery_cache = discovery_cache
+        self._detail_limits = self._detail_limits_from_environment()
+        self._detail_rate_limiter = self._detail_limits.new_limiter()
+        self._owns_client = http_client is None
+        self._client = http_client or httpx.AsyncClient(headers=self._DEFAULT_HEADERS, follow_redirects=True, timeout=10)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def login(self):
+        if await self._restore_session():
+            return
+
+        await self._login()
+        self._save_session()
+
+    def _cookie_jar(self):
+        return self._client.cookies.jar
+
+    async def _restore_session(self):
+        if not self._load_saved_session():
+            return False
+        return self._finish_session_restore(await self._is_session_alive())
+
+    async def _is_session_alive(self):
+        try:
+            headers = self._ajax_json_headers(self._cash_balance)
+            resp = await self._client.get(self._user_mndp_url, headers=headers, timeout=5, follow_redirects=False)
+            if not self._is_logged_in_response(resp.status_code, resp.headers.get("Content-Type", ""), resp.json):
+                return False
+            # 구매는 ol.dhlottery.co.kr 세션(JSESSIONID)으로 이뤄지므로 따로 확인한다.
+            resp = await self._client.get(self._game645_page, timeout=5, follow_redirects=False)
+            return self._is_purchase_session_response(resp.status_code)
+        except Exception as error:
+            logger.debug(f"session probe failed: {type(error).__name__}: {error}")
+            return False
+
+    async def _login(self):
+        resp = await self._client.get(f"{self._base_url}/")
+        logger.debug(f"Initial session status: {resp.status_code}")
+
+        if "index_check.html" in str(resp.url):
+            raise RuntimeError("동행복권 사이트가 현재 시스템 점검중입니다.")
+
+        resp = await self._client.get(f"{self._base_url}{self._login_page}")
+        logger.debug(f"Login page status: {resp.status_code}")
+
+        # RSA 공개키 요청
+        rsa_headers = {"Accept": "application/json", "X-Requested-With": "XMLHttpRequest", "Referer": f"{self._base_url}{self._login_page}"}
+        resp = await self._client.get(f"{self._base_url}{self._rsa_key_url}", headers=rsa_headers)
+
+        # 아이디/비밀번호 암호화 및 로그인
+        login_data = self._build_login_data(resp.json())
+        login_headers = {"Content-Type": "application/x-www-form-urlencoded", "Origin": self._base_url, "Referer": f"{self._base_url}{self._login_page}"}
+
+        resp = await self._client.post(f"{self._base_url}{self._login_url}", headers=login_headers, data=login_data)
+        logger.debug(f"Login response status: {resp.status_code}, URL: {resp.url}")
+
+        self._check_login_response(resp.status_code, str(resp.url), resp.text)
+
+        logger.debug("로그인 성공")
+
+        # 구매 도메인(ol.dhlottery.co.kr)에 접속하여 JSESSIONID 획득
+        await self._client.get(f"{self._base_url}/main")
+        await self._client.get(self._game645_page)
+
+        if not any(c.name == "JSESSIONID" for c in self._client.cookies.jar):
+            logger.warning("JSESSIONID was not acquired from ol.dhlottery.co.kr")
+
+    async def buy_lotto645(self, tickets: List[Lotto645Ticket]):
+        with self._buy_lotto645_errors():
+            res = await self._client.post(self._ready_socket, timeout=5)
+            data, buy_headers = self._buy_lotto645_request(tickets, res.text)
+
+            resp = await self._client.post(self._buy_lotto645_url, headers=buy_headers, data=data)
+            self._publish_buy_lotto645_result(resp.text)
+
+    async def show_balance(self):
+        try:
+            headers = self._ajax_json_headers(self._cash_balance)
+
+            # 예치금 정보와 최근 1달 누적 구매금액을 함께 조회
+            resp, resp2 = await asyncio.gather(
+                self._client.get(self._user_mndp_url, headers=headers),
+                self._client.get(self._my_home_info_url, headers=headers),
+            )
+            if resp.status_code != 200 or "json" not in resp.headers.get("Content-Type", "").lower():
+                raise RuntimeError("예치금 API 응답 오류")
+
+            home_data = None
+            if resp2.status_code == 200 and "json" in resp2.headers.get("Content-Type", "").lower():
+                home_data = resp2.json()
+
+            self._lottery_endpoint.print_result_of_show_balance(**self._build_balance_summary(resp.json(), home_data))
+
+        except Exception:
+            raise RuntimeError("❗ 예치금 현황을 조회하지 못했습니다.")
+
+    async def show_buy_list(self, output_format="table", start_date=None, end_date=None):
+        try:
+            start_dt, end_dt = self._calculate_date_range(start_date, end_date)
+            rows = [row async for row in self.iter_buy_list(start_date, end_date)]
+            found_data = [{"headers": self._BUY_LIST_HEADERS, "rows": rows}]
+
+            self._lottery_endpoint.print_result_of_show_buy_list(found_data, output_format, start_dt.strftime("%Y-%m-%d"), end_dt.strftime("%Y-%m-%d"))
+
+        except Exception as e:
+            logger.error(e)
+            raise RuntimeError("❗ 구매 내역을 조회하지 못했습니다.")
+
+    async def iter_buy_list(self, start_date=None, end_date=None, with_details=True):
+        """LotteryClient.iter_buy_list의 비동기 버전. 행을 하나씩 async generator로 반환한다."""
+        start_dt, end_dt = self._calculate_date_range(start_date, end_date)
+        if start_dt > end_dt:
+            raise ValueError(f"조회 시작 날짜가 종료 날짜보다 늦습니다. ({start_dt} > {end_dt})")
+
+        await self._client.get(self._lotto_buy_list_page)
+
+        for window_start, window_end in self._split_date_windows(start_dt, end_dt):
+            page_num = 1
+            while True:
+                data = await self._fetch_buy_list_page(window_start, window_end, page_num)
+                items = data.get("list") or []
+                if not items:
+                    break
+
+                details = await self._fetch_lotto645_ticket_details(items) if with_details else {}
+                for row in self._build_buy_list_rows(items, details):
+                    yield row
+
+                if not self._has_next_buy_list_page(data, page_num):
+                    break
+                page_num += 1
+
+    async def _fetch_buy_list_page(self, start_dt, end_dt, page_num):
+        params = self._buy_list_page_params(start_dt, end_dt, page_num)
+        resp = await self._client.get(self._lotto_buy_list_url, params=params, headers=self._buy_list_headers())
+
+        self._check_buy_list_response(resp.status_code, resp.headers.get("Content-Type", ""), str(resp.url))
+        return self._buy_list_page_data(resp.json())
+
+    async def _fetch_lotto645_ticket_details(self, items):
+        targets = [(index, item) for index, item in enumerate(items) if self._has_lotto645_ticket_detail(item)]
+        if not targets:
+            return {}
+
+        semaphore = asyncio.Semaphore(self._detail_limits.max_workers)
+
+        async def fetch(item):
+            async with semaphore:
+                return await self._get_lotto645_ticket_detail(item.get("ntslOrdrNo"), item.get("gmInfo"), item.get("eltOrdrDt", ""))
+
+        results = await asyncio.gather(*(fetch(item) for _, item in targets))
+        return {index: result for (index, _), result in zip(targets, results)}
+
+    async def _get_lotto645_ticket_detail(self, ntsl_ordr_no, barcode, purchase_date):
+        try:
+            params = self._lotto645_ticket_detail_params(ntsl_ordr_no, barcode, purchase_date)
+
+            await self._detail_rate_limiter.acquire_async()
+            resp = await self._client.get(self._lotto645_ticket_detail_url, params=params)
+            if self._is_throttled_response(resp.status_code, resp.headers.get("Content-Type", ""), resp.text):
+                self._detail_rate_limiter.on_throttle()
+                logger.debug(f"로또 상세 정보 조회 응답 이상 (status: {resp.status_code}, content-type: {resp.headers.get('Content-Type', '')})")
+                return "조회 실패"
+            self._detail_rate_limiter.on_success()
+
+            return self._format_lotto645_ticket_detail(resp.json())
+
+        except Exception as e:
+            self._detail_rate_limiter.on_throttle()
+            logger.error(f"로또 상세 정보 조회 실패: {e}")
+            return "조회 실패"
+
+    async def assign_virtual_account(self, deposit: Deposit, force_refresh=False):
+        """LotteryClient.assign_virtual_account와 같은 순서(저장된 계좌 → 조회 전략 → 발급 전략)로 가상계좌를 찾는다.
+
+        엔드포인트 탐색, 대기열 처리, kbank 발급은 requests 기반이므로 현재 세션 쿠키로 만든 LotteryClient의 resolver를
+        별도 스레드에서 한 번 실행하고, 그동안 바뀐 쿠키를 이 클라이언트에 다시 반영한다.
+        """
+        from dhapi.port.lottery_client import LotteryClient
+
+        client = LotteryClient.from_cookies(
+            User(self._user_id, self._user_pw),
+            self._lottery_endpoint,
+            SessionStore.dump_cookies(self._cookie_jar()),
+            virtual_account_store=self._virtual_account_store,
+            discovery_cache=self._discovery_cache,
+        )
+        try:
+            await asyncio.to_thread(client.assign_virtual_account, deposit, force_refresh)
+        finally:
+            self.last_virtual_account_resolution = client.last_virtual_account_resolution
+            SessionStore.restore_cookies(self._cookie_jar(), client.export_cookies())
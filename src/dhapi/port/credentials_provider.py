@@ -1,7 +1,7 @@
 import logging
 import os
 import getpass
-from typing import Union
+from typing import Dict, List, Union
 
 import tomli
 import tomli_w
@@ -105,3 +105,21 @@ class CredentialsProvider:
             config = tomli.loads(f.read())
 
         return list(config.keys())
+
+    @staticmethod
+    def get_users(profile_names: List[str], path: Union[str, None] = None) -> Dict[str, User]:
+        """Return users of the given profiles without prompting. Raises KeyError for unknown or incomplete profiles."""
+        _path = os.path.expanduser(path or "~/.dhapi/credentials")
+        if not os.path.exists(_path):
+            raise FileNotFoundError(f"{_path} 파일을 찾을 수 없습니다.")
+
+        with open(_path, "r", encoding="UTF-8") as f:
+            config = tomli.loads(f.read())
+
+        users = {}
+        for name in profile_names:
+            credentials = config.get(name)
+            if not credentials or "username" not in credentials or "password" not in credentials:
+                raise KeyError(f"{_path} 파일에서 '{name}' 프로필을 찾지 못했습니다.")
+            users[name] = User(credentials["username"], credentials["password"])
+        return users
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DiscoveryCache:
+    """가상계좌 엔드포인트 탐색 결과를 ~/.dhapi/cache 아래에 보관한다.
+
+    - scripts/: 사이트 스크립트 본문 (URL별, ETag/Last-Modified와 함께 저장해 조건부 요청으로 재확인)
+    - endpoints.json: 스크립트에서 찾은 엔드포인트 목록, 엔드포인트별 성공 이력과 마지막으로 계좌를 돌려준 엔드포인트
+    """
+
+    DEFAULT_ENDPOINTS_TTL_SECONDS = 7 * 24 * 60 * 60
+
+    def __init__(self, directory: Optional[str] = None, endpoints_ttl_seconds: int = DEFAULT_ENDPOINTS_TTL_SECONDS):
+        self._directory = os.path.expanduser(directory or "~/.dhapi/cache")
+        self._endpoints_ttl_seconds = endpoints_ttl_seconds
+        self._lock = threading.Lock()
+
+    def _script_path(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self._directory, "scripts", f"{digest}.json")
+
+    def _endpoints_path(self) -> str:
+        return os.path.join(self._directory, "endpoints.json")
+
+    def _read_json(self, path):
+        try:
+            with open(path, "r", encoding="UTF-8") as f:
+                doc = json.load(f)
+            return doc if isinstance(doc, dict) else None
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as error:
+            logger.debug(f"failed to read discovery cache ({path}): {type(error).__name__}: {error}")
+            return None
+
+    def _write_json(self, path, doc):
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        # 여러 프로세스/스레드가 같은 파일을 쓸 수 있으므로 임시 파일 이름을 겹치지 않게 한다.
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="UTF-8") as f:
+                json.dump(doc, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as error:
+            logger.debug(f"failed to write discovery cache ({path}): {type(error).__name__}: {error}")
+
+    def load_script(self, url: str) -> Optional[Dict]:
+        """
+        :return: {"url", "body", "etag", "last_modified"} 또는 None
+        """
+        doc = self._read_json(self._script_path(url))
+        if not doc or doc.get("url") != url or not doc.get("body"):
+            return None
+        return doc
+
+    def save_script(self, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        self._write_json(self._script_path(url), {"url": url, "body": body, "etag": etag, "last_modified": last_modified, "fetched_at": time.time()})
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def load_endpoints(self) -> Optional[List[str]]:
+        """캐시된 엔드포인트 목록을 rank_endpoints 순서로 반환한다."""
+        doc = self._read_json(self._endpoints_path())
+        if not doc or doc.get("updated_at", 0) + self._endpoints_ttl_seconds < time.time():
+            return None
+
+        endpoints = [endpoint for endpoint in doc.get("endpoints") or [] if isinstance(endpoint, str)]
+        return self._rank(endpoints, doc) or None
+
+    def rank_endpoints(self, endpoints: List[str]) -> List[str]:
+        """마지막으로 계좌를 돌려준 엔드포인트를 맨 앞에, 나머지는 성공 횟수가 많은 순으로 정렬한다. 같은 순위는 원래 순서를 유지한다."""
+        return self._rank(list(endpoints), self._read_json(self._endpoints_path()) or {})
+
+    @staticmethod
+    def _rank(endpoints, doc):
+        last_success = (doc.get("last_success") or {}).get("endpoint")
+        history = doc.get("history") or {}
+        return sorted(endpoints, key=lambda endpoint: (endpoint != last_success, -(history.get(endpoint) or {}).get("success", 0)))
+
+    def load_last_success(self) -> Optional[Dict]:
+        doc = self._read_json(self._endpoints_path())
+        return (doc or {}).get("last_success") or None
+
+    def save_endpoints(self, endpoints: List[str]):
+        with self._lock:
+            doc = self._read_json(self._endpoints_path()) or {}
+            doc.update({"endpoints": list(endpoints), "updated_at": time.time()})
+            self._write_json(self._endpoints_path(), doc)
+
+    def record_success(self, endpoint: str, method: str):
+        with self._lock:
+            doc = self._read_json(self._endpoints_path()) or {"endpoints": [endpoint], "updated_at": time.time()}
+            now = time.time()
+            doc["last_success"] = {"endpoint": endpoint, "method": method, "at": now}
+            history = doc.setdefault("history", {})
+            entry = history.setdefault(endpoint, {"success": 0})
+            entry["success"] = entry.get("success", 0) + 1
+            entry["method"] = method
+            entry["at"] = now
+            self._write_json(self._endpoints_path(), doc)
@@ -0,0 +1,57 @@
+import logging
+from typing import Dict, List, Optional
+
+import requests
+
+from dhapi.port.http_transport import TransportConfig, install_transport
+from dhapi.port.request_timings import REQUEST_TIMINGS
+from dhapi.port.site_override import origin_of, resolve_site, site_overrides
+
+logger = logging.getLogger(__name__)
+
+
+class DrawHistoryClient:
+    """회차별 당첨번호(selectPstLt645Info.do)를 조회한다. 공개 정보이므로 로그인하지 않는다.
+
+    DrawHistoryStore.sync()에 fetch 함수로 넘겨 사용한다.
+    """
+
+    _draw_history_url = "https://www.dhlottery.co.kr/lt645/selectPstLt645Info.do"
+    _draw_result_page = "https://www.dhlottery.co.kr/lt645/result"
+
+    def __init__(self, *, site=None, session: Optional[requests.Session] = None):
+        for name, url in site_overrides(type(self), resolve_site(site)).items():
+            setattr(self, name, url)
+
+        self._session = session or requests.Session()
+        if session is None:
+            install_transport(
+                self._session,
+                TransportConfig.from_environment(),
+                origins=[origin_of(self._draw_history_url)],
+                timings=REQUEST_TIMINGS if REQUEST_TIMINGS.enabled else None,
+            )
+
+    def __call__(self, round_filter: str) -> List[Dict]:
+        return self.fetch(round_filter)
+
+    def fetch(self, round_filter: str = "all") -> List[Dict]:
+        """
+        :param round_filter: 회차 번호 또는 "all"
+        """
+        resp = self._session.get(
+            self._draw_history_url,
+            params={"srchLtEpsd": round_filter},
+            headers={
+                "Accept": "application/json, text/javascript, */*; q=0.01",
+                "X-Requested-With": "XMLHttpRequest",
+                "Referer": self._draw_result_page,
+            },
+            timeout=10,
+        )
+        if resp.status_code != 200 or "json" not in (resp.headers.get("Content-Type") or "").lower():
+            raise RuntimeError(f"❗ 회차별 당첨번호를 가져오지 못했습니다. (status: {resp.status_code}, 대기열/점검 중일 수 있습니다)")
+
+        items = (resp.json().get("data") or {}).get("list") or []
+        logger.debug(f"draw history {round_filter}: {len(items)} items")
+        return items if isinstance(items, list) else []
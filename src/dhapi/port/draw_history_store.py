@@ -0,0 +1,130 @@
+import datetime
+import json
+import logging
+import os
+import sqlite3
+from typing import Callable, Dict, Iterable, List, Optional
+
+from dhapi.domain.lotto645_draw import current_selling_round, normalize_draw_history_item
+
+logger = logging.getLogger(__name__)
+
+# 저장된 마지막 회차와 이만큼 넘게 차이 나면 회차별로 묻지 않고 전체 목록(srchLtEpsd=all)을 한 번에 받는다.
+FULL_SYNC_GAP = 8
+
+# fetch(srchLtEpsd) -> selectPstLt645Info.do 응답의 data.list. 가져오지 못하면 None
+DrawFetcher = Callable[[str], Optional[List[Dict]]]
+
+
+class DrawHistoryStore:
+    """회차별 당첨번호/당첨금을 SQLite 테이블(lotto645_draws)에 회차를 키로 보관한다.
+
+    지난 회차 정보는 바뀌지 않으므로 sync()는 저장된 마지막 회차 이후만 조회한다.
+    CLI는 ~/.dhapi/draws.sqlite3, 웹 서버는 app_data.sqlite3를 사용한다.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self._db_path = os.path.expanduser(str(db_path or "~/.dhapi/draws.sqlite3"))
+        os.makedirs(os.path.dirname(self._db_path) or ".", mode=0o700, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS lotto645_draws (
+                    round INTEGER PRIMARY KEY,
+                    draw_date TEXT NOT NULL,
+                    n1 INTEGER NOT NULL,
+                    n2 INTEGER NOT NULL,
+                    n3 INTEGER NOT NULL,
+                    n4 INTEGER NOT NULL,
+                    n5 INTEGER NOT NULL,
+                    n6 INTEGER NOT NULL,
+                    bonus INTEGER NOT NULL,
+                    detail TEXT NOT NULL,
+                    synced_at TEXT NOT NULL
+                )
+                """)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def latest_round(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(MAX(round), 0) FROM lotto645_draws").fetchone()[0]
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM lotto645_draws").fetchone()[0]
+
+    def save(self, items: Iterable[Dict]) -> int:
+        """normalize_draw_history_item() 형태의 회차들을 저장하고 저장한 개수를 돌려준다."""
+        now = datetime.datetime.now().isoformat(timespec="seconds")
+        rows = [
+            (
+                item["round"],
+                item["draw_date"],
+                *item["numbers"],
+                item["bonus"],
+                json.dumps({"winner_summary": item.get("winner_summary"), "ranks": item.get("ranks")}, ensure_ascii=False),
+                now,
+            )
+            for item in items
+            if item and item.get("round", 0) > 0
+        ]
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO lotto645_draws VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict]:
+        """최신 회차부터 limit개. limit이 없으면 전체"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM lotto645_draws ORDER BY round DESC LIMIT ?", (-1 if limit is None else limit,)).fetchall()
+        return [self._to_item(row) for row in rows]
+
+    def items_after(self, round_no: int) -> List[Dict]:
+        """round_no 다음 회차부터 오름차순"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM lotto645_draws WHERE round > ? ORDER BY round", (round_no,)).fetchall()
+        return [self._to_item(row) for row in rows]
+
+    def get(self, round_no: int) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM lotto645_draws WHERE round = ?", (round_no,)).fetchone()
+        return self._to_item(row) if row else None
+
+    def _to_item(self, row: sqlite3.Row) -> Dict:
+        detail = json.loads(row["detail"])
+        return {
+            "round": row["round"],
+            "draw_date": row["draw_date"],
+            "numbers": [row[f"n{index}"] for index in range(1, 7)],
+            "bonus": row["bonus"],
+            "winner_summary": detail.get("winner_summary"),
+            "ranks": detail.get("ranks"),
+        }
+
+    def sync(self, fetch: DrawFetcher, now: Optional[datetime.datetime] = None) -> int:
+        """저장된 마지막 회차 이후의 회차를 가져와 저장하고 새로 저장한 회차 수를 돌려준다.
+
+        이번 주 회차는 추첨 전이면 빈 목록이 오므로 거기서 멈춘다.
+        """
+        latest = self.latest_round()
+        selling_round = current_selling_round(now)
+        if latest >= selling_round:
+            return 0
+
+        if selling_round - latest > FULL_SYNC_GAP:
+            logger.debug(f"draw history full sync (stored: {latest}, selling: {selling_round})")
+            before = self.count()
+            self.save(normalize_draw_history_item(raw) for raw in fetch("all") or [])
+            return self.count() - before
+
+        added = 0
+        for round_no in range(latest + 1, selling_round + 1):
+            items = [normalize_draw_history_item(raw) for raw in fetch(str(round_no)) or []]
+            saved = self.save(item for item in items if item and item["round"] == round_no)
+            if not saved:
+                logger.debug(f"draw history round {round_no} is not available yet")
+                break
+            added += saved
+        return added
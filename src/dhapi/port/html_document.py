@@ -0,0 +1,45 @@
+import importlib.util
+from typing import Union
+
+from bs4 import BeautifulSoup, CData, NavigableString
+from bs4.element import Script, Stylesheet, TemplateString
+
+# lxml이 설치되어 있으면 사용하고, 없으면 기본 의존성인 html5lib으로 파싱한다.
+DEFAULT_PARSER = "lxml" if importlib.util.find_spec("lxml") is not None else "html5lib"
+
+# html5lib은 <script>/<style> 내용도 get_text()에 포함한다. 기존 정규식 추출 결과가 파서에 따라 달라지지 않도록 lxml에서도 포함시킨다.
+_TEXT_TYPES = (NavigableString, CData, Script, Stylesheet, TemplateString)
+
+
+class HtmlDocument:
+    """응답 HTML을 한 번만 파싱해 여러 추출기에서 공유한다.
+
+    soup과 plain_text는 처음 접근할 때 만들어지고 이후에는 캐시된 값을 돌려준다.
+    """
+
+    def __init__(self, html_text: str, parser: str = DEFAULT_PARSER):
+        self.html = html_text or ""
+        self._parser = parser
+        self._soup = None
+        self._plain_text = None
+
+    @classmethod
+    def of(cls, source: Union[str, "HtmlDocument", None]) -> "HtmlDocument":
+        if isinstance(source, HtmlDocument):
+            return source
+        return cls(source)
+
+    def __bool__(self):
+        return bool(self.html)
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.html, self._parser)
+        return self._soup
+
+    @property
+    def plain_text(self) -> str:
+        if self._plain_text is None:
+            self._plain_text = self.soup.get_text(" ", strip=True, types=_TEXT_TYPES)
+        return self._plain_text
@@ -0,0 +1,279 @@
+"""동행복권 사이트와 주고받은 요청/응답을 카세트 파일(gzip JSON)에 기록하고, 네트워크 없이 그대로 재생한다.
+
+- RecordingAdapter: 실제 요청을 보내면서 요청/응답을 카세트에 기록한다. 쿠키 값, 아이디/비밀번호 등은 기록 전에 가린다.
+- ReplayAdapter: 카세트에 기록된 응답을 같은 순서로 돌려준다. 네트워크를 사용하지 않으며 지연 시간을 주입할 수 있다.
+
+LotteryClient는 DHAPI_CASSETTE 환경변수가 있으면 세션에 어댑터를 붙인다. (install_from_environment 참고)
+    DHAPI_CASSETTE=~/dhapi.cassette.json.gz DHAPI_CASSETTE_MODE=record dhapi show-balance
+    DHAPI_CASSETTE=~/dhapi.cassette.json.gz DHAPI_CASSETTE_MODE=replay DHAPI_CASSETTE_LATENCY_SCALE=1 dhapi show-balance
+"""
+
+import atexit
+import base64
+import gzip
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+from dhapi.port.http_transport import build_response
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+REDACTED = "REDACTED"
+
+# 요청 본문/쿼리에서 값을 가릴 필드 (RSA 암호화된 아이디/비밀번호 포함)
+_SECRET_FIELD = re.compile(r"(?i)(pw|pswd|passw|password|userid|loginid|encrypt|token|secret)")
+_SECRET_HEADERS = {"authorization", "proxy-authorization"}
+_COOKIE_VALUE = re.compile(r"(?P<name>[^=;,\s]+)=(?P<value>[^;,]*)")
+# 응답 본문이 이미 풀린 상태로 기록되므로 재생 시 다시 풀지 않도록 제거한다.
+_DROPPED_RESPONSE_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+# 요청마다 달라지는 캐시 회피용 쿼리 파라미터
+VOLATILE_QUERY_PARAMS = {"_", "nocache", "timestamp"}
+
+
+class CassetteMissError(requests.ConnectionError):
+    """재생 중 카세트에 없는 요청을 보냈을 때 발생한다."""
+
+
+class Cassette:
+    def __init__(self, path: str, interactions: Optional[List[Dict]] = None):
+        self.path = os.path.expanduser(path)
+        self.interactions: List[Dict] = interactions or []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        with gzip.open(os.path.expanduser(path), "rt", encoding="UTF-8") as f:
+            doc = json.load(f)
+        if doc.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"지원하지 않는 카세트 버전입니다. ({doc.get('version')})")
+        return cls(path, doc.get("interactions") or [])
+
+    def append(self, interaction: Dict):
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def save(self):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with gzip.open(tmp_path, "wt", encoding="UTF-8") as f:
+                json.dump({"version": CASSETTE_VERSION, "interactions": self.interactions}, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        logger.debug(f"cassette saved: {self.path} ({len(self.interactions)} interactions)")
+
+
+class Redactor:
+    """쿠키 값, 인증 헤더, 비밀번호류 필드, 그리고 secrets로 받은 문자열(아이디/비밀번호)을 가린다."""
+
+    def __init__(self, secrets: Iterable[str] = ()):
+        self._secrets = sorted({secret for secret in secrets if secret and len(secret) >= 3}, key=len, reverse=True)
+
+    def text(self, value: Optional[str]) -> Optional[str]:
+        if not value:
+            return value
+        for secret in self._secrets:
+            value = value.replace(secret, REDACTED)
+        return value
+
+    def url(self, url: str) -> str:
+        parts = urlsplit(url)
+        if not parts.query:
+            return self.text(url)
+        query = urlencode([(key, REDACTED if _SECRET_FIELD.search(key) else value) for key, value in parse_qsl(parts.query, keep_blank_values=True)])
+        return self.text(urlunsplit(parts._replace(query=query)))
+
+    def headers(self, headers: Iterable) -> List[List[str]]:
+        redacted = []
+        for name, value in headers:
+            lower = name.lower()
+            if lower in _SECRET_HEADERS:
+                value = REDACTED
+            elif lower in {"cookie", "set-cookie"}:
+                # 이름과 속성(domain, path 등)은 남기고 값만 가린다.
+                value = _COOKIE_VALUE.sub(
+                    lambda m: m.group(0) if m.group("name").lower() in {"domain", "path", "expires", "max-age", "samesite"} else f"{m.group('name')}={REDACTED}", value
+                )
+            redacted.append([name, self.text(value)])
+        return redacted
+
+    def body(self, body, content_type: str) -> Optional[str]:
+        if body is None:
+            return None
+        if isinstance(body, bytes):
+            body = body.decode("utf-8", errors="replace")
+        content_type = (content_type or "").lower()
+        if "json" in content_type:
+            try:
+                return self.text(json.dumps(self._json(json.loads(body)), ensure_ascii=False))
+            except ValueError:
+                pass
+        if "x-www-form-urlencoded" in content_type:
+            return self.text(urlencode([(key, REDACTED if _SECRET_FIELD.search(key) else value) for key, value in parse_qsl(body, keep_blank_values=True)]))
+        return self.text(body)
+
+    def _json(self, value):
+        if isinstance(value, dict):
+            return {key: REDACTED if _SECRET_FIELD.search(str(key)) else self._json(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._json(item) for item in value]
+        return value
+
+
+def request_key(method: str, url: str, *, with_query: bool = True) -> str:
+    parts = urlsplit(url)
+    key = f"{method.upper()} {parts.netloc}{parts.path}"
+    if with_query:
+        query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True) if name not in VOLATILE_QUERY_PARAMS)
+        key += f"?{urlencode(query)}" if query else ""
+    return key
+
+
+def _lookup_keys(method: str, url: str) -> List[str]:
+    exact = request_key(method, url)
+    without_query = request_key(method, url, with_query=False)
+    return [exact] if exact == without_query else [exact, without_query]
+
+
+def _response_headers(resp: requests.Response):
+    raw_headers = getattr(resp.raw, "headers", None)
+    if raw_headers is not None and hasattr(raw_headers, "iteritems"):
+        # Set-Cookie처럼 같은 이름이 여러 번 오는 헤더를 따로 보관한다.
+        return list(raw_headers.iteritems())
+    return list(resp.headers.items())
+
+
+def _encode_body(content: bytes) -> Dict:
+    try:
+        return {"text": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(content).decode("ascii")}
+
+
+class RecordingAdapter(HTTPAdapter):
+    def __init__(self, cassette: Cassette, redactor: Optional[Redactor] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+        self._redactor = redactor or Redactor()
+
+    def send(self, request, *args, **kwargs):  # pylint: disable=arguments-differ
+        started = time.perf_counter()
+        resp = super().send(request, *args, **kwargs)
+        content = resp.content
+        elapsed = time.perf_counter() - started
+
+        redactor = self._redactor
+        body = _encode_body(content)
+        if "text" in body:
+            body["text"] = redactor.text(body["text"])
+        self.cassette.append(
+            {
+                "request": {
+                    "method": request.method,
+                    "url": redactor.url(request.url),
+                    "headers": redactor.headers(request.headers.items()),
+                    "body": redactor.body(request.body, request.headers.get("Content-Type")),
+                },
+                "response": {
+                    "status": resp.status_code,
+                    "reason": resp.reason,
+                    "url": redactor.url(resp.url),
+                    "headers": [header for header in redactor.headers(_response_headers(resp)) if header[0].lower() not in _DROPPED_RESPONSE_HEADERS],
+                    "body": body,
+                    "elapsed_seconds": round(elapsed, 4),
+                },
+            }
+        )
+        return resp
+
+
+class ReplayAdapter(BaseAdapter):
+    """카세트에 기록된 응답을 돌려준다.
+
+    요청은 메서드 + 호스트 + 경로 + 쿼리(캐시 회피용 파라미터 제외)로 찾고, 없으면 쿼리를 빼고 다시 찾는다.
+    같은 요청이 여러 번 기록되어 있으면 기록된 순서대로 돌려주고, 다 쓰면 마지막 응답을 반복한다.
+    요청 본문은 비교하지 않는다. (로그인 요청처럼 매번 암호화 결과가 달라지는 경우가 있다)
+
+    Args:
+        latency_seconds: 모든 응답에 더할 고정 지연 시간
+        latency_scale: 기록된 응답 시간에 곱해 더할 배율 (1이면 기록 당시와 같은 속도)
+    """
+
+    def __init__(self, cassette: Cassette, latency_seconds: float = 0.0, latency_scale: float = 0.0):
+        super().__init__()
+        self.cassette = cassette
+        self._latency_seconds = latency_seconds
+        self._latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._queues: Dict[str, List[Dict]] = {}
+        self._positions: Dict[str, int] = {}
+        for interaction in cassette.interactions:
+            request = interaction["request"]
+            for key in _lookup_keys(request["method"], request["url"]):
+                self._queues.setdefault(key, []).append(interaction["response"])
+
+    def _next_response(self, request) -> Dict:
+        with self._lock:
+            for key in _lookup_keys(request.method, request.url):
+                queue = self._queues.get(key)
+                if queue:
+                    position = self._positions.get(key, 0)
+                    self._positions[key] = position + 1
+                    return queue[min(position, len(queue) - 1)]
+        raise CassetteMissError(f"카세트에 기록되지 않은 요청입니다: {request.method} {request.url}", request=request)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        recorded = self._next_response(request)
+        delay = self._latency_seconds + self._latency_scale * recorded.get("elapsed_seconds", 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+        body = recorded.get("body") or {}
+        content = base64.b64decode(body["base64"]) if "base64" in body else (body.get("text") or "").encode("utf-8")
+        return build_response(request, recorded["status"], recorded.get("headers") or [], content, reason=recorded.get("reason"), connection=self)
+
+    def close(self):
+        pass
+
+
+def install(session: requests.Session, adapter: BaseAdapter):
+    """세션의 모든 요청이 adapter를 거치게 한다. (호스트별로 붙어 있던 전송 어댑터도 뗀다)"""
+    session.adapters.clear()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+
+def install_from_environment(session: requests.Session, secrets: Iterable[str] = ()) -> Optional[BaseAdapter]:
+    """DHAPI_CASSETTE(카세트 경로), DHAPI_CASSETTE_MODE(record/replay, 기본 replay),
+    DHAPI_CASSETTE_LATENCY(초), DHAPI_CASSETTE_LATENCY_SCALE(배율) 환경변수에 따라 세션에 어댑터를 붙인다."""
+    path = os.environ.get("DHAPI_CASSETTE")
+    if not path:
+        return None
+
+    mode = os.environ.get("DHAPI_CASSETTE_MODE", "replay").lower()
+    if mode == "record":
+        # 이미 있는 카세트에는 이어서 기록한다. (dhapi 명령을 여러 번 실행해 한 카세트를 만들 수 있다)
+        cassette = Cassette.load(path) if os.path.exists(os.path.expanduser(path)) else Cassette(path)
+        adapter = RecordingAdapter(cassette, Redactor(secrets))
+        atexit.register(cassette.save)
+    elif mode == "replay":
+        adapter = ReplayAdapter(
+            Cassette.load(path),
+            latency_seconds=float(os.environ.get("DHAPI_CASSETTE_LATENCY", "0")),
+            latency_scale=float(os.environ.get("DHAPI_CASSETTE_LATENCY_SCALE", "0")),
+        )
+    else:
+        raise RuntimeError(f"DHAPI_CASSETTE_MODE는 record 또는 replay 여야 합니다. (입력: {mode})")
+
+    logger.debug(f"cassette {mode}: {path}")
+    install(session, adapter)
+    return adapter
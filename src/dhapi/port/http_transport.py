@@ -0,0 +1,277 @@
+"""LotteryClient 세션의 HTTP 전송 계층.
+
+기본(requests) 백엔드는 호스트마다 연결 풀 크기를 따로 잡은 HTTPAdapter를 붙이고, 연결 실패와 GET 요청의 502/503/504 응답을 재시도한다.
+httpx 백엔드는 requests 세션(쿠키, 리다이렉트, 헤더 처리)은 그대로 두고 실제 송수신만 httpx 연결 풀에 맡긴다.
+requests가 넘기는 verify/cert/proxies(REQUESTS_CA_BUNDLE, HTTPS_PROXY 등 환경변수 포함)도 그대로 httpx 연결 풀 설정으로 옮긴다.
+h2 패키지가 있으면 HTTP/2로 호스트당 연결 하나에 요청을 다중화한다. (pip install 'dhapi[http2]')
+
+설정 (환경변수)
+    DHAPI_TRANSPORT          requests(기본) 또는 httpx
+    DHAPI_HTTP2              httpx 백엔드에서 HTTP/2 사용 여부 (기본 1)
+    DHAPI_POOL_MAXSIZE       호스트당 최대 연결 수 기본값 (기본 10)
+    DHAPI_POOL_SIZES         호스트별 최대 연결 수. 예: "www.dhlottery.co.kr=16,ol.dhlottery.co.kr=4"
+    DHAPI_HTTP_RETRIES       연결 실패/일시적 오류 재시도 횟수 (기본 2)
+    DHAPI_KEEPALIVE_SECONDS  유휴 연결을 유지할 시간 (httpx 백엔드, 기본 60)
+"""
+
+import http.client
+import importlib.util
+import io
+import logging
+import os
+import ssl
+import threading
+import time
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+TRANSPORTS = ("requests", "httpx")
+
+# 상세 번호 조회(4), 계좌 엔드포인트 탐색(6), 가상계좌 조회 전략(3)이 동시에 www를 사용한다.
+DEFAULT_POOL_SIZES = {"www.dhlottery.co.kr": 16, "ol.dhlottery.co.kr": 4}
+
+# httpx가 본문 압축을 이미 풀었으므로 requests가 다시 해석하지 않도록 뺀다.
+_DECODED_RESPONSE_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+@dataclass
+class TransportConfig:
+    backend: str = "requests"
+    http2: bool = True
+    pool_maxsize: int = 10
+    pool_sizes: Dict[str, int] = field(default_factory=lambda: dict(DEFAULT_POOL_SIZES))
+    retries: int = 2
+    keepalive_seconds: float = 60.0
+
+    @classmethod
+    def from_environment(cls) -> "TransportConfig":
+        backend = os.environ.get("DHAPI_TRANSPORT", "requests").lower()
+        if backend not in TRANSPORTS:
+            raise RuntimeError(f"DHAPI_TRANSPORT는 {' 또는 '.join(TRANSPORTS)} 여야 합니다. (입력: {backend})")
+
+        pool_sizes = dict(DEFAULT_POOL_SIZES)
+        for item in filter(None, os.environ.get("DHAPI_POOL_SIZES", "").split(",")):
+            host, _, size = item.partition("=")
+            if not size.strip().isdigit():
+                raise RuntimeError(f"DHAPI_POOL_SIZES는 '호스트=연결수,...' 형식이어야 합니다. (입력: {item})")
+            pool_sizes[host.strip()] = int(size)
+
+        return cls(
+            backend=backend,
+            http2=os.environ.get("DHAPI_HTTP2", "1").lower() not in {"0", "false", "no"},
+            pool_maxsize=int(os.environ.get("DHAPI_POOL_MAXSIZE", "10")),
+            pool_sizes=pool_sizes,
+            retries=int(os.environ.get("DHAPI_HTTP_RETRIES", "2")),
+            keepalive_seconds=float(os.environ.get("DHAPI_KEEPALIVE_SECONDS", "60")),
+        )
+
+    def pool_size_for(self, host: str) -> int:
+        return self.pool_sizes.get(host, self.pool_maxsize)
+
+    def retry(self) -> Retry:
+        # 구매 요청(POST)이 두 번 들어가지 않도록 응답 상태/읽기 오류 재시도는 GET/HEAD에만 적용한다. 연결 실패는 요청을 보내기 전이므로 항상 재시도한다.
+        return Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=self.retries,
+            status=self.retries,
+            backoff_factor=0.2,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False,
+        )
+
+
+class _BufferedRaw(io.BytesIO):
+    """requests가 응답 헤더의 Set-Cookie를 세션 쿠키에 반영할 수 있도록 http.client 응답처럼 보이게 한다."""
+
+    def __init__(self, content: bytes, headers: List[Tuple[str, str]]):
+        super().__init__(content)
+        message = http.client.HTTPMessage()
+        for name, value in headers:
+            message.add_header(name, value)
+        self._original_response = SimpleNamespace(msg=message)
+
+    def release_conn(self):
+        pass
+
+
+def build_response(
+    request: requests.PreparedRequest, status: int, headers: Iterable[Tuple[str, str]], content: bytes, *, reason: Optional[str] = None, connection=None
+) -> requests.Response:
+    """본문까지 읽어 둔 응답으로 requests.Response를 만든다. (카세트 재생, httpx 전송 등 urllib3를 거치지 않는 어댑터용)"""
+    headers = list(headers)
+    resp = requests.Response()
+    resp.status_code = status
+    resp.reason = reason
+    resp.headers = CaseInsensitiveDict()
+    for name, value in headers:
+        resp.headers[name] = f"{resp.headers[name]}, {value}" if name in resp.headers else value
+    resp.raw = _BufferedRaw(content, headers)
+    resp._content = content  # pylint: disable=protected-access
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers) or "utf-8"
+    resp.url = request.url
+    resp.request = request
+    resp.connection = connection
+    return resp
+
+
+def _httpx_timeout(httpx, timeout):
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+class HttpxAdapter(BaseAdapter):
+    """requests 세션의 요청을 httpx 연결 풀(HTTP/2 가능)로 보낸다.
+
+    쿠키와 리다이렉트는 requests 세션이 처리하도록 httpx.Client가 아닌 transport에 직접 요청한다.
+    TLS 검증/클라이언트 인증서/프록시는 연결 풀 단위 설정이므로 (verify, cert, proxy) 조합마다 transport를 따로 만든다.
+    """
+
+    def __init__(self, config: TransportConfig, *, timings=None, is_wait_page: Optional[Callable[[str], bool]] = None):
+        super().__init__()
+        try:
+            import httpx  # pylint: disable=import-outside-toplevel
+        except ImportError as error:
+            raise RuntimeError("httpx 전송을 사용하려면 httpx를 설치해야 합니다. (pip install 'dhapi[http2]')") from error
+
+        http2 = config.http2 and importlib.util.find_spec("h2") is not None
+        if config.http2 and not http2:
+            logger.warning("h2 패키지가 없어 HTTP/1.1로 요청합니다. (pip install 'dhapi[http2]')")
+
+        self._httpx = httpx
+        self.http2 = http2
+        self._timings = timings
+        self._is_wait_page = is_wait_page
+        self._config = config
+        self._transports = {}
+        self._transports_lock = threading.Lock()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        httpx_request = self._to_httpx_request(request, timeout)
+        timing = {}
+        started = time.perf_counter()
+        try:
+            upstream = self._transport_for(verify, cert, requests.utils.select_proxy(request.url, proxies)).handle_request(httpx_request)
+            timing["ttfb"] = time.perf_counter() - started
+            try:
+                content = upstream.read()
+            finally:
+                upstream.close()
+        except self._httpx.TimeoutException as error:
+            self._record(request, None, 0, {"total": time.perf_counter() - started}, False)
+            raise requests.Timeout(str(error), request=request) from error
+        except self._httpx.TransportError as error:
+            self._record(request, None, 0, {"total": time.perf_counter() - started}, False)
+            raise requests.ConnectionError(str(error), request=request) from error
+        timing["total"] = time.perf_counter() - started
+
+        headers = [(name, value) for name, value in upstream.headers.multi_items() if name.lower() not in _DECODED_RESPONSE_HEADERS]
+        resp = build_response(request, upstream.status_code, headers, content, reason=upstream.reason_phrase, connection=self)
+        self._record(request, resp.status_code, len(content), timing, self._wait_page(resp))
+        return resp
+
+    def _transport_for(self, verify, cert, proxy):
+        key = (verify, cert if not isinstance(cert, list) else tuple(cert), proxy)
+        with self._transports_lock:
+            if key not in self._transports:
+                limits = self._httpx.Limits(
+                    max_connections=self._config.pool_maxsize, max_keepalive_connections=self._config.pool_maxsize, keepalive_expiry=self._config.keepalive_seconds
+                )
+                # 프록시는 requests가 환경변수까지 반영해 넘겨주므로 httpx가 환경변수를 다시 읽지 않게 한다.
+                self._transports[key] = self._httpx.HTTPTransport(
+                    verify=_ssl_context(verify, cert), trust_env=False, http2=self.http2, limits=limits, proxy=proxy, retries=self._config.retries
+                )
+            return self._transports[key]
+
+    def _to_httpx_request(self, request, timeout):
+        return self._httpx.Request(
+            request.method,
+            request.url,
+            headers=list(request.headers.items()),
+            content=request.body.encode("utf-8") if isinstance(request.body, str) else request.body,
+            extensions={"timeout": _httpx_timeout(self._httpx, timeout).as_dict()},
+        )
+
+    def _wait_page(self, resp: requests.Response) -> bool:
+        if self._is_wait_page is None or "text/html" not in (resp.headers.get("Content-Type") or "").lower():
+            return False
+        return bool(self._is_wait_page(resp.text))
+
+    def _record(self, request, status, size, timing, wait_page):
+        if self._timings is None:
+            return
+        # httpx transport는 DNS/연결 시간을 따로 알려주지 않으므로 TTFB와 전체 시간만 기록한다.
+        from dhapi.port.request_timings import endpoint_template  # pylint: disable=import-outside-toplevel
+
+        self._timings.record(request.method, endpoint_template(request.url), status=status, size=size, timings=timing, wait_page=wait_page)
+
+    def close(self):
+        with self._transports_lock:
+            for transport in self._transports.values():
+                transport.close()
+            self._transports.clear()
+
+
+def _ssl_context(verify, cert):
+    """requests의 verify(bool 또는 CA 번들 경로)/cert(경로 또는 (인증서, 키))를 httpx transport의 verify 값으로 바꾼다."""
+    if verify is True and cert is None:
+        return True
+
+    if verify is False:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    elif isinstance(verify, str):
+        context = ssl.create_default_context(capath=verify) if os.path.isdir(verify) else ssl.create_default_context(cafile=verify)
+    else:
+        # requests와 같은 기본 CA 번들(certifi)을 사용한다.
+        context = ssl.create_default_context(cafile=requests.certs.where())
+
+    if cert:
+        certfile, keyfile = (cert, None) if isinstance(cert, str) else cert
+        context.load_cert_chain(certfile, keyfile)
+    return context
+
+
+def install_transport(session: requests.Session, config: TransportConfig, origins: Iterable[str], *, timings=None, is_wait_page=None) -> List[BaseAdapter]:
+    """세션에 전송 어댑터를 붙인다.
+
+    Args:
+        origins: 연결 풀을 따로 잡을 origin 목록 (예: "https://www.dhlottery.co.kr"). 나머지 호스트는 pool_maxsize를 사용한다.
+        timings: RequestTimings. 지정하면 요청마다 소요 시간을 기록한다.
+    """
+    if config.backend == "httpx":
+        adapter = HttpxAdapter(config, timings=timings, is_wait_page=is_wait_page)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return [adapter]
+
+    def adapter_for(pool_size):
+        if timings is None:
+            return HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=config.retry())
+        from dhapi.port.request_timings import TimingAdapter  # pylint: disable=import-outside-toplevel
+
+        return TimingAdapter(timings, is_wait_page=is_wait_page, pool_connections=4, pool_maxsize=pool_size, max_retries=config.retry())
+
+    adapters = []
+    for origin in dict.fromkeys(origins):
+        adapter = adapter_for(config.pool_size_for(urlsplit(origin).hostname or ""))
+        session.mount(origin.rstrip("/") + "/", adapter)
+        adapters.append(adapter)
+
+    default_adapter = adapter_for(config.pool_maxsize)
+    session.mount("https://", default_adapter)
+    session.mount("http://", default_adapter)
+    return adapters + [default_adapter]
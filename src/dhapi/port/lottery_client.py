@@ -1,95 +1,110 @@
 import datetime
-import json
 import logging
 import random
-import re
+import threading
 import time
-from pathlib import Path
-from typing import List, Dict
-from urllib.parse import urlsplit, urljoin
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import List
 
-import pytz
 import requests
-from bs4 import BeautifulSoup
-from Crypto.PublicKey import RSA
-from Crypto.Cipher import PKCS1_v1_5
 
 from dhapi.domain.deposit import Deposit
-from dhapi.domain.lotto645_ticket import Lotto645Ticket, Lotto645Mode
+from dhapi.domain.lotto645_ticket import Lotto645Ticket
 from dhapi.domain.user import User
+from dhapi.port.html_document import HtmlDocument
+from dhapi.port.http_cassette import install_from_environment
+from dhapi.port.http_transport import TransportConfig, install_transport
+from dhapi.port.lottery_client_base import LotteryClientBase
+from dhapi.port.request_timings import REQUEST_TIMINGS
+from dhapi.port.session_store import SessionStore
+from dhapi.port.site_override import origin_of
+from dhapi.port.virtual_account_resolver import VirtualAccountResolver
+from dhapi.port.wait_queue_scheduler import WaitQueueProgress, WaitQueueScheduler
 
 logger = logging.getLogger(__name__)
 
 
-class LotteryClient:
-    _base_url = "https://www.dhlottery.co.kr"
-    _login_page = "/login"
-    _rsa_key_url = "/login/selectRsaModulus.do"
-    _login_url = "/login/securityLoginCheck.do"
-    _buy_lotto645_url = "https://ol.dhlottery.co.kr/olotto/game/execBuy.do"
-    _ready_socket = "https://ol.dhlottery.co.kr/olotto/game/egovUserReadySocket.json"
-    _game645_page = "https://ol.dhlottery.co.kr/olotto/game/game645.do"
-    _cash_balance = "https://www.dhlottery.co.kr/mypage/home"
-    _user_mndp_url = "https://www.dhlottery.co.kr/mypage/selectUserMndp.do"
-    _mndp_charge_page = "https://www.dhlottery.co.kr/mypage/mndpChrg"
-    _assign_virtual_account_1 = "https://www.dhlottery.co.kr/kbank.do?method=kbankInit"
-    _assign_virtual_account_2 = "https://www.dhlottery.co.kr/kbank.do?method=kbankProcess"
-    _tracer_domain = "tracer.dhlottery.co.kr"
-    _tracer_check_bot = "https://{domain}:48081/TRACERAPI/checkBotIp.do"
-    _tracer_input_queue = "https://{domain}:48081/TRACERAPI/inputQueue.do"
-    _lotto_buy_list_url = "https://www.dhlottery.co.kr/mypage/selectMyLotteryledger.do"
-    _DETAIL_REQUEST_DELAY = 0.5
-    _BANK_CODE_TO_NAME = {
-        "004": "국민은행",
-        "011": "농협은행",
-        "020": "우리은행",
-        "023": "SC제일은행",
-        "031": "대구은행",
-        "032": "부산은행",
-        "034": "광주은행",
-        "035": "제주은행",
-        "037": "전북은행",
-        "039": "경남은행",
-        "071": "우체국",
-        "081": "하나은행",
-        "088": "신한은행",
-        "089": "케이뱅크",
-        "090": "카카오뱅크",
-    }
-
-    def __init__(self, user_profile: User, lottery_endpoint):
-        self._user_id = user_profile.username
-        self._user_pw = user_profile.password
-        self._lottery_endpoint = lottery_endpoint
+class LotteryClient(LotteryClientBase):
+    # 스크립트에서 찾지 못해도 함께 호출해 보는 계좌 조회 엔드포인트 후보
+    _GUESSED_ACCOUNT_PATHS = (
+        "/mypage/selectMndpChrg.do",
+        "/mypage/selectMndpChrgInfo.do",
+        "/mypage/selectMndpChrgList.do",
+        "/mypage/selectMndpChrgHist.do",
+        "/mypage/selectMndpChrgDetail.do",
+        "/mypage/selectMndpVbankInfo.do",
+        "/mypage/selectVbankInfo.do",
+        "/mypage/selectFixVactInfo.do",
+        "/mypage/selectFxVrAccount.do",
+    )
+
+    def __init__(self, user_profile: User, lottery_endpoint, session_store=None, virtual_account_store=None, discovery_cache=None, *, site=None):
+        super().__init__(user_profile, lottery_endpoint, session_store, site=site)
+        self._virtual_account_store = virtual_account_store
+        self._discovery_cache = discovery_cache
+        self._detail_limits = self._detail_limits_from_environment()
+        self._detail_rate_limiter = self._detail_limits.new_limiter()
+        self._init_session()
+
+        if not self._restore_session():
+            self._login()
+            self._save_session()
+
+    @classmethod
+    def from_cookies(cls, user_profile: User, lottery_endpoint, cookies, *, virtual_account_store=None, discovery_cache=None):
+        """이미 로그인된 세션의 쿠키로 클라이언트를 만든다. 로그인 요청을 보내지 않는다.
 
+        Args:
+            cookies: SessionStore.dump_cookies 형식의 쿠키 목록
+        """
+        client = cls.__new__(cls)
+        LotteryClientBase.__init__(client, user_profile, lottery_endpoint)
+        client._virtual_account_store = virtual_account_store
+        client._discovery_cache = discovery_cache
+        client._detail_limits = client._detail_limits_from_environment()
+        client._detail_rate_limiter = client._detail_limits.new_limiter()
+        client._init_session()
+        SessionStore.restore_cookies(client._session.cookies, cookies)
+        return client
+
+    def _init_session(self):
         self._session = requests.Session()
-        self._session.headers.update(
-            {
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.9",
-                "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-                "Connection": "keep-alive",
-                "Cache-Control": "max-age=0",
-                "sec-ch-ua": '"Google Chrome";v="131", "Chromium";v="131", "Not_A Brand";v="24"',
-                "sec-ch-ua-mobile": "?0",
-                "sec-ch-ua-platform": '"macOS"',
-                "Upgrade-Insecure-Requests": "1",
-                "Sec-Fetch-Site": "none",
-                "Sec-Fetch-Mode": "navigate",
-                "Sec-Fetch-User": "?1",
-                "Sec-Fetch-Dest": "document",
-            }
-        )
+        self._session.headers.update(self._DEFAULT_HEADERS)
+        if install_from_environment(self._session, secrets=(self._user_id, self._user_pw)) is None:
+            # 카세트 재생/기록 중에는 실제 네트워크를 쓰지 않거나 측정값이 의미가 없으므로 전송 계층/측정을 붙이지 않는다.
+            install_transport(
+                self._session,
+                TransportConfig.from_environment(),
+                origins=[origin_of(self._base_url), origin_of(self._game645_page)],
+                timings=REQUEST_TIMINGS if REQUEST_TIMINGS.enabled else None,
+                is_wait_page=self._is_wait_page,
+            )
 
-        self._login()
+    def _cookie_jar(self):
+        return self._session.cookies
 
-    def _rsa_encrypt(self, plain_text, modulus_hex, exponent_hex):
-        n = int(modulus_hex, 16)
-        e = int(exponent_hex, 16)
-        key = RSA.construct((n, e))
-        cipher = PKCS1_v1_5.new(key)
-        encrypted = cipher.encrypt(plain_text.encode("utf-8"))
-        return encrypted.hex()
+    def export_cookies(self):
+        """현재 세션 쿠키 (SessionStore.dump_cookies 형식)"""
+        return SessionStore.dump_cookies(self._session.cookies)
+
+    def _restore_session(self):
+        if not self._load_saved_session():
+            return False
+        return self._finish_session_restore(self._is_session_alive())
+
+    def _is_session_alive(self):
+        try:
+            headers = self._ajax_json_headers(self._cash_balance)
+            resp = self._session.get(self._user_mndp_url, headers=headers, timeout=5, allow_redirects=False)
+            if not self._is_logged_in_response(resp.status_code, resp.headers.get("Content-Type", ""), resp.json):
+                return False
+            # 구매는 ol.dhlottery.co.kr 세션(JSESSIONID)으로 이뤄지므로 따로 확인한다.
+            resp = self._session.get(self._game645_page, timeout=5, allow_redirects=False)
+            return self._is_purchase_session_response(resp.status_code)
+        except Exception as error:
+            logger.debug(f"session probe failed: {type(error).__name__}: {error}")
+            return False
 
     def _login(self):
         resp = self._session.get(f"{self._base_url}/", timeout=10)
@@ -104,31 +119,15 @@ class LotteryClient:
         # RSA 공개키 요청
         rsa_headers = {"Accept": "application/json", "X-Requested-With": "XMLHttpRequest", "Referer": f"{self._base_url}{self._login_page}"}
         resp = self._session.get(f"{self._base_url}{self._rsa_key_url}", headers=rsa_headers, timeout=10)
-        rsa_data = resp.json()
-
-        if "data" not in rsa_data:
-            raise RuntimeError("RSA 키를 가져올 수 없습니다.")
-
-        rsa_modulus = rsa_data["data"]["rsaModulus"]
-        rsa_exponent = rsa_data["data"]["publicExponent"]
-        logger.debug(f"RSA key received, modulus length: {len(rsa_modulus)}")
 
         # 아이디/비밀번호 암호화 및 로그인
-        encrypted_user_id = self._rsa_encrypt(self._user_id, rsa_modulus, rsa_exponent)
-        encrypted_password = self._rsa_encrypt(self._user_pw, rsa_modulus, rsa_exponent)
-
+        login_data = self._build_login_data(resp.json())
         login_headers = {"Content-Type": "application/x-www-form-urlencoded", "Origin": self._base_url, "Referer": f"{self._base_url}{self._login_page}"}
-        login_data = {"userId": encrypted_user_id, "userPswdEncn": encrypted_password, "inpUserId": self._user_id}
 
         resp = self._session.post(f"{self._base_url}{self._login_url}", headers=login_headers, data=login_data, timeout=10, allow_redirects=True)
         logger.debug(f"Login response status: {resp.status_code}, URL: {resp.url}")
 
-        if resp.status_code != 200 or "loginSuccess" not in resp.url:
-            soup = BeautifulSoup(resp.text, "html5lib")
-            error_button = soup.find("a", {"class": "btn_common"})
-            if error_button:
-                raise RuntimeError("로그인에 실패했습니다. 아이디 또는 비밀번호를 확인해주세요.")
-            raise RuntimeError(f"로그인에 실패했습니다. (Status: {resp.status_code}, URL: {resp.url})")
+        self._check_login_response(resp.status_code, resp.url, resp.text)
 
         logger.debug("로그인 성공")
 
@@ -145,124 +144,13 @@ class LotteryClient:
         if not any(c.name == "JSESSIONID" for c in self._session.cookies):
             logger.warning("JSESSIONID was not acquired from ol.dhlottery.co.kr")
 
-    def _get_round(self):
-        """
-        로또645 현재 판매 중인 회차를 계산
-
-        로또645는 2002년 12월 7일(토요일)부터 매주 토요일마다 추첨.
-        1회부터 현재까지 경과한 주 수를 계산하여 회차를 반환.
-
-        Returns:
-            int: 현재 판매 중인 회차 번호
-        """
-        first_round_date = datetime.date(2002, 12, 7)
-        korea_tz = pytz.timezone("Asia/Seoul")
-        now = datetime.datetime.now(korea_tz)
-        today = now.date()
-
-        current_weekday = today.weekday()
-        days_until_saturday = (5 - current_weekday) % 7
-        this_saturday = today + datetime.timedelta(days=days_until_saturday)
-
-        days_diff = (this_saturday - first_round_date).days
-        weeks_passed = days_diff // 7
-        round_number = 1 + weeks_passed
-
-        logger.debug(f"Calculated round: {round_number} (today: {today}, this_saturday: {this_saturday})")
-        return round_number
-
-    def _calculate_draw_dates(self):
-        korea_tz = pytz.timezone("Asia/Seoul")
-        now = datetime.datetime.now(korea_tz)
-        today = now.date()
-        current_weekday = today.weekday()
-        days_until_saturday = (5 - current_weekday) % 7
-        draw_date = today + datetime.timedelta(days=days_until_saturday)
-        pay_limit_date = draw_date + datetime.timedelta(days=365)
-        return draw_date, pay_limit_date
-
     def buy_lotto645(self, tickets: List[Lotto645Ticket]):
-        try:
+        with self._buy_lotto645_errors():
             res = self._session.post(url=self._ready_socket, timeout=5)
-            direct = json.loads(res.text)["ready_ip"]
-
-            round_number = self._get_round()
-            draw_date, pay_limit_date = self._calculate_draw_dates()
-
-            data = {
-                "round": str(round_number),
-                "direct": direct,
-                "nBuyAmount": str(1000 * len(tickets)),
-                "param": self._make_buy_loyyo645_param(tickets),
-                "ROUND_DRAW_DATE": draw_date.strftime("%Y/%m/%d"),
-                "WAMT_PAY_TLMT_END_DT": pay_limit_date.strftime("%Y/%m/%d"),
-                "gameCnt": len(tickets),
-                "saleMdaDcd": "10",
-            }
-            logger.debug(f"data: {data}")
-
-            buy_headers = {"Referer": self._game645_page, "Origin": "https://ol.dhlottery.co.kr"}
+            data, buy_headers = self._buy_lotto645_request(tickets, res.text)
 
             resp = self._session.post(self._buy_lotto645_url, headers=buy_headers, data=data, timeout=10)
-
-            response_text = resp.text
-            logger.debug(f"response: {response_text}")
-
-            response = json.loads(response_text)
-            if not self._is_purchase_success(response):
-                raise RuntimeError(f"❗ 로또6/45 구매에 실패했습니다. (사유: {response['result']['resultMsg']})")
-
-            slots = self._format_lotto_numbers(response["result"]["arrGameChoiceNum"])
-            self._lottery_endpoint.print_result_of_buy_lotto645(slots)
-        except RuntimeError as e:
-            raise e
-        except Exception:
-            raise RuntimeError("❗ 로또6/45 구매에 실패했습니다. (사유: 알 수 없는 오류)")
-
-    def _is_purchase_success(self, response):
-        return response["result"]["resultCode"] == "100"
-
-    def _make_buy_loyyo645_param(self, tickets: List[Lotto645Ticket]):
-        params = []
-        for i, t in enumerate(tickets):
-            if t.mode == Lotto645Mode.AUTO:
-                gen_type = "0"
-            elif t.mode == Lotto645Mode.MANUAL:
-                gen_type = "1"
-            elif t.mode == Lotto645Mode.SEMIAUTO:
-                gen_type = "2"
-            else:
-                raise RuntimeError(f"올바르지 않은 모드입니다. (mode: {t.mode})")
-            arr_game_choice_num = None if t.mode == Lotto645Mode.AUTO else ",".join(map(str, t.numbers))
-            alpabet = "ABCDE"[i]  # XXX: 오타 아님
-            slot = {
-                "genType": gen_type,
-                "arrGameChoiceNum": arr_game_choice_num,
-                "alpabet": alpabet,
-            }
-            params.append(slot)
-        return json.dumps(params)
-
-    def _format_lotto_numbers(self, lines: list) -> List[Dict]:
-        """
-        example: ["A|01|02|04|27|39|443", "B|11|23|25|27|28|452"]
-        """
-
-        mode_dict = {
-            "1": "수동",
-            "2": "반자동",
-            "3": "자동",
-        }
-
-        slots = []
-        for line in lines:
-            slot = {
-                "mode": mode_dict[line[-1]],
-                "slot": line[0],
-                "numbers": line[2:-1].split("|"),
-            }
-            slots.append(slot)
-        return slots
+            self._publish_buy_lotto645_result(resp.text)
 
     def show_balance(self):
         try:
@@ -278,33 +166,14 @@ class LotteryClient:
                 raise RuntimeError("예치금 API 응답 오류")
 
             data = resp.json()
-            user_mndp = data.get("data", {}).get("userMndp", {})
-
-            # 총예치금 계산 (웹사이트 JS 로직과 동일)
-            총예치금 = (
-                ((user_mndp.get("pntDpstAmt", 0) or 0) - (user_mndp.get("pntTkmnyAmt", 0) or 0))
-                + ((user_mndp.get("ncsblDpstAmt", 0) or 0) - (user_mndp.get("ncsblTkmnyAmt", 0) or 0))
-                + ((user_mndp.get("csblDpstAmt", 0) or 0) - (user_mndp.get("csblTkmnyAmt", 0) or 0))
-            )
-            구매가능금액 = user_mndp.get("crntEntrsAmt", 0) or 0
-            예약구매금액 = user_mndp.get("rsvtOrdrAmt", 0) or 0
-            출금신청중금액 = user_mndp.get("dawAplyAmt", 0) or 0
-            구매불가능금액 = 예약구매금액 + 출금신청중금액 + (user_mndp.get("feeAmt", 0) or 0)
 
             # 최근 1달 누적 구매금액 조회
-            최근1달누적구매금액 = 0
-            resp2 = self._session.get("https://www.dhlottery.co.kr/mypage/selectMyHomeInfo.do", headers=headers, timeout=10)
+            home_data = None
+            resp2 = self._session.get(self._my_home_info_url, headers=headers, timeout=10)
             if resp2.status_code == 200 and "json" in resp2.headers.get("Content-Type", "").lower():
-                최근1달누적구매금액 = resp2.json().get("data", {}).get("mnthPrchsAmt", 0)
-
-            self._lottery_endpoint.print_result_of_show_balance(
-                총예치금=총예치금,
-                구매가능금액=구매가능금액,
-                예약구매금액=예약구매금액,
-                출금신청중금액=출금신청중금액,
-                구매불가능금액=구매불가능금액,
-                최근1달누적구매금액=최근1달누적구매금액,
-            )
+                home_data = resp2.json()
+
+            self._lottery_endpoint.print_result_of_show_balance(**self._build_balance_summary(data, home_data))
 
         except Exception:
             raise RuntimeError("❗ 예치금 현황을 조회하지 못했습니다.")
@@ -312,59 +181,86 @@ class LotteryClient:
     def show_buy_list(self, output_format="table", start_date=None, end_date=None):
         try:
             start_dt, end_dt = self._calculate_date_range(start_date, end_date)
+            found_data = [{"headers": self._BUY_LIST_HEADERS, "rows": self.iter_buy_list(start_date, end_date)}]
 
-            params = {
-                "srchStrDt": start_dt.strftime("%Y%m%d"),
-                "srchEndDt": end_dt.strftime("%Y%m%d"),
-                "pageNum": 1,
-                "recordCountPerPage": 100,
-                "_": int(datetime.datetime.now().timestamp() * 1000),
-            }
+            self._lottery_endpoint.print_result_of_show_buy_list(found_data, output_format, start_dt.strftime("%Y-%m-%d"), end_dt.strftime("%Y-%m-%d"))
 
-            headers = {
-                "Accept": "application/json, text/javascript, */*; q=0.01",
-                "X-Requested-With": "XMLHttpRequest",
-                "Referer": "https://www.dhlottery.co.kr/mypage/mylotteryledger",
-            }
+        except Exception as e:
+            logger.error(e)
+            raise RuntimeError("❗ 구매 내역을 조회하지 못했습니다.")
 
-            self._session.get("https://www.dhlottery.co.kr/mypage/mylotteryledger", timeout=10)
+    def iter_buy_list(self, start_date=None, end_date=None, with_details=True):
+        """구매 내역을 모든 페이지에 걸쳐 한 행씩 반환한다.
 
-            resp = self._session.get(self._lotto_buy_list_url, params=params, headers=headers, timeout=10)
+        긴 기간은 _BUY_LIST_WINDOW_DAYS 단위로 나누어 최신 구간부터 조회하며,
+        페이지를 받을 때마다 파싱한 행을 바로 내보내므로 전체 내역을 메모리에 올리지 않는다.
 
-            if resp.status_code != 200:
-                logger.error(f"API 요청 실패: {resp.status_code}")
-                raise RuntimeError(f"구매 내역 조회 API 요청 실패 (Status: {resp.status_code})")
+        Args:
+            start_date: 조회 시작 날짜 (YYYYMMDD), 생략 시 14일 전
+            end_date: 조회 종료 날짜 (YYYYMMDD), 생략 시 오늘
+            with_details: False면 로또6/45 상세 번호 조회(lotto645TicketDetail.do)를 생략한다.
 
-            content_type = resp.headers.get("Content-Type", "")
-            if "application/json" not in content_type:
-                logger.error(f"JSON이 아닌 응답: {content_type}, URL: {resp.url}")
-                raise RuntimeError("구매 내역 조회 API가 JSON을 반환하지 않았습니다. 세션이 만료되었을 수 있습니다.")
+        Yields:
+            list: _BUY_LIST_HEADERS 순서의 행
+        """
+        for items in self._iter_buy_list_pages(start_date, end_date):
+            yield from self._parse_buy_list_items(items, with_details=with_details)
 
-            data = resp.json()
+    def fetch_lotto645_games(self, start_date=None, end_date=None, known_barcodes=()):
+        """기간 내 로또6/45 구매 건마다 게임별 번호를 조회한다.
 
-            found_data = self._parse_buy_list_json(data)
+        번호는 구매 후 바뀌지 않으므로 known_barcodes(이미 저장해 둔 gmInfo)에 있는 구매 건은 상세 조회를 생략한다.
+        상세 조회에 실패한 구매 건은 결과에서 빠지므로 다음 호출에서 다시 조회된다.
 
-            self._lottery_endpoint.print_result_of_show_buy_list(found_data, output_format, start_dt.strftime("%Y-%m-%d"), end_dt.strftime("%Y-%m-%d"))
+        Returns:
+            list: [{"barcode", "order_no", "round", "purchase_date", "games": [{"slot", "mode", "numbers"}]}, ...]
+        """
+        known = set(known_barcodes)
+        targets = []
+        for items in self._iter_buy_list_pages(start_date, end_date):
+            targets.extend(item for item in items if self._has_lotto645_ticket_detail(item) and item.get("gmInfo") not in known)
+        if not targets:
+            return []
 
-        except Exception as e:
-            logger.error(e)
-            raise RuntimeError("❗ 구매 내역을 조회하지 못했습니다.")
+        max_workers = max(1, min(self._detail_limits.max_workers, len(targets)))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dhapi-detail") as executor:
+            games = list(executor.map(self._get_lotto645_ticket_games, targets))
+
+        purchases = [self._build_lotto645_purchase(item, item_games) for item, item_games in zip(targets, games) if item_games]
+        logger.debug(f"lotto645 ticket details: {len(purchases)}/{len(targets)} fetched ({len(known)} already known)")
+        return purchases
+
+    def _iter_buy_list_pages(self, start_date, end_date):
+        start_dt, end_dt = self._calculate_date_range(start_date, end_date)
+        if start_dt > end_dt:
+            raise ValueError(f"조회 시작 날짜가 종료 날짜보다 늦습니다. ({start_dt} > {end_dt})")
 
-    def _calculate_date_range(self, start_date, end_date):
-        today = datetime.date.today()
+        self._session.get(self._lotto_buy_list_page, timeout=10)
 
-        if start_date:
-            start_dt = datetime.datetime.strptime(start_date, "%Y%m%d").date()
-        else:
-            start_dt = today - datetime.timedelta(days=14)
+        for window_start, window_end in self._split_date_windows(start_dt, end_dt):
+            page_num = 1
+            while True:
+                data = self._fetch_buy_list_page(window_start, window_end, page_num)
+                items = data.get("list") or []
+                if not items:
+                    break
 
-        if end_date:
-            end_dt = datetime.datetime.strptime(end_date, "%Y%m%d").date()
-        else:
-            end_dt = today
-        return start_dt, end_dt
+                yield items
 
-    def _parse_buy_list_json(self, response_data):  # pylint: disable=too-many-locals
+                if not self._has_next_buy_list_page(data, page_num):
+                    break
+                page_num += 1
+
+    def _fetch_buy_list_page(self, start_dt, end_dt, page_num):
+        params = self._buy_list_page_params(start_dt, end_dt, page_num)
+        headers = self._buy_list_headers()
+
+        resp = self._session.get(self._lotto_buy_list_url, params=params, headers=headers, timeout=10)
+
+        self._check_buy_list_response(resp.status_code, resp.headers.get("Content-Type", ""), resp.url)
+        return self._buy_list_page_data(resp.json())
+
+    def _parse_buy_list_json(self, response_data):
         if not response_data or "data" not in response_data:
             return []
 
@@ -374,33 +270,28 @@ class LotteryClient:
         if not items:
             return []
 
-        headers = ["구입일자", "복권명", "회차", "선택번호/복권번호", "구입매수", "당첨결과", "당첨금", "추첨일"]
-        rows = []
-
-        for item in items:
-            purchase_date = item.get("eltOrdrDt", "")
-            lottery_name = item.get("ltGdsNm", "")
-            round_no = item.get("ltEpsdView", "")
-            gm_info = item.get("gmInfo", "")
-            quantity = str(item.get("prchsQty", ""))
-            win_result = item.get("ltWnResult", "")
-            ntsl_ordr_no = item.get("ntslOrdrNo", "")
-            win_amt = item.get("ltWnAmt", 0) or 0
-            draw_date = item.get("epsdRflDt", "")
-
-            win_amt_str = f"{win_amt:,}원" if win_amt > 0 else "-"
-
-            if gm_info and lottery_name == "로또6/45" and ntsl_ordr_no:
-                numbers = self._get_lotto645_ticket_detail(ntsl_ordr_no, gm_info, purchase_date)
-                time.sleep(self._DETAIL_REQUEST_DELAY)
-            else:
-                numbers = gm_info
+        return [{"headers": self._BUY_LIST_HEADERS, "rows": self._parse_buy_list_items(items)}]
 
-            rows.append([purchase_date, lottery_name, round_no, numbers, quantity, win_result, win_amt_str, draw_date])
+    def _parse_buy_list_items(self, items, with_details=True):
+        details = self._fetch_lotto645_ticket_details(items) if with_details else {}
+        return self._build_buy_list_rows(items, details)
 
-        return [{"headers": headers, "rows": rows}]
+    def _fetch_lotto645_ticket_details(self, items):
+        """상세 번호 조회가 필요한 행만 골라 작은 워커 풀에서 병렬로 조회한다.
 
-    def _get_lotto645_ticket_detail(self, ntsl_ordr_no, barcode, purchase_date):  # pylint: disable=too-many-locals
+        Returns:
+            dict: {items 내 인덱스: 포맷팅된 번호 정보}
+        """
+        targets = [(index, item) for index, item in enumerate(items) if self._has_lotto645_ticket_detail(item)]
+        if not targets:
+            return {}
+
+        max_workers = max(1, min(self._detail_limits.max_workers, len(targets)))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dhapi-detail") as executor:
+            futures = [(index, executor.submit(self._get_lotto645_ticket_detail, item.get("ntslOrdrNo"), item.get("gmInfo"), item.get("eltOrdrDt", ""))) for index, item in targets]
+            return {index: future.result() for index, future in futures}
+
+    def _get_lotto645_ticket_detail(self, ntsl_ordr_no, barcode, purchase_date):
         """로또645 티켓 상세 정보 조회
 
         Args:
@@ -412,594 +303,195 @@ class LotteryClient:
             str: 포맷팅된 번호 정보
         """
         try:
-            purchase_dt = datetime.datetime.strptime(purchase_date, "%Y-%m-%d").date()
-            start_date = (purchase_dt - datetime.timedelta(days=7)).strftime("%Y%m%d")
-            end_date = (purchase_dt + datetime.timedelta(days=7)).strftime("%Y%m%d")
-
-            url = "https://www.dhlottery.co.kr/mypage/lotto645TicketDetail.do"
-            params = {"ntslOrdrNo": ntsl_ordr_no, "srchStrDt": start_date, "srchEndDt": end_date, "barcd": barcode}
-
-            resp = self._session.get(url, params=params, timeout=10)
-            data = resp.json()
-
-            if not data.get("data", {}).get("success"):
-                return "조회 실패"
-
-            ticket = data["data"]["ticket"]
-            game_dtl = ticket.get("game_dtl", [])
-
-            if not game_dtl:
-                return "번호 정보 없음"
-
-            type_map = {1: "수동", 2: "반자동", 3: "자동"}
-
-            result = []
-            for game in game_dtl:
-                idx = game.get("idx", "")
-                numbers = game.get("num", [])
-                game_type = type_map.get(game.get("type", 3), "자동")
-
-                if numbers:
-                    numbers_str = " ".join(str(n) for n in numbers)
-                    result.append(f"[{idx}] {game_type}: {numbers_str}")
-
-            return "\n".join(result) if result else "번호 확인 불가"
+            data = self._request_lotto645_ticket_detail(ntsl_ordr_no, barcode, purchase_date)
+            return self._format_lotto645_ticket_detail(data) if data is not None else "조회 실패"
 
         except Exception as e:
+            self._detail_rate_limiter.on_throttle()
             logger.error(f"로또 상세 정보 조회 실패: {e}")
             return "조회 실패"
 
-    def _parse_digit(self, text):
-        return int("".join(filter(str.isdigit, text)))
-
-    def _format_won_text(self, value):
-        digits = "".join(filter(str.isdigit, str(value)))
-        if not digits:
-            return str(value)
-        return f"{int(digits):,}원"
-
-    def _save_debug_html(self, file_name, html_text):
+    def _get_lotto645_ticket_games(self, item):
+        """구매 건 하나의 게임별 번호. 조회에 실패하면 None"""
         try:
-            root_dir = Path(__file__).resolve().parents[3]
-            debug_dir = root_dir / "tmp_debug"
-            debug_dir.mkdir(parents=True, exist_ok=True)
-            (debug_dir / file_name).write_text(html_text, encoding="utf-8")
-        except Exception as error:
-            logger.debug(f"failed to save debug html ({file_name}): {type(error).__name__}: {error}")
-
-    def _save_debug_json(self, file_name, payload):
-        try:
-            root_dir = Path(__file__).resolve().parents[3]
-            debug_dir = root_dir / "tmp_debug"
-            debug_dir.mkdir(parents=True, exist_ok=True)
-            (debug_dir / file_name).write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-        except Exception as error:
-            logger.debug(f"failed to save debug json ({file_name}): {type(error).__name__}: {error}")
-
-    def _bank_name_from_code(self, bank_code):
-        if bank_code is None:
-            return None
-        return self._BANK_CODE_TO_NAME.get(str(bank_code).zfill(3))
-
-    def _pick_first(self, data, *keys, default=""):
-        for key in keys:
-            value = data.get(key)
-            if value not in (None, ""):
-                return value
-        return default
-
-    def _normalize_account_candidate(self, raw):
-        if raw is None:
-            return ""
-        value = str(raw).strip().replace(" ", "")
-        value = re.sub(r"[^0-9\-]", "", value)
-        value = re.sub(r"-{2,}", "-", value).strip("-")
-        return value
-
-    def _is_valid_virtual_account_candidate(self, candidate):
-        if not candidate:
-            return False
-        value = self._normalize_account_candidate(candidate)
-        if not re.fullmatch(r"[0-9][0-9\-]*[0-9]", value):
-            return False
-
-        digits = re.sub(r"\D", "", value)
-        if len(digits) < 10 or len(digits) > 16:
-            return False
-
-        # 대표 고객센터/ARS 번호 패턴 차단 (예: 1588-6450)
-        if re.fullmatch(r"1[5-9][0-9]{2}-?[0-9]{4}", value):
-            return False
-        if value in {"1588-6450"}:
-            return False
-
-        # 일반 전화/팩스 번호 패턴 차단
-        # 예: 02-6933-3063, 031-123-4567, 010-1234-5678
-        phone_like_pattern = r"0\d{1,2}-(?:\d{3,4})-\d{4}"
-        if re.fullmatch(phone_like_pattern, value):
-            return False
-
-        return True
-
-    def _find_account_in_mapping(self, data):
-        if not isinstance(data, dict):
-            return ""
-
-        # 우선순위가 높은 키부터 확인
-        for key in (
-            "FxVrAccountNo",
-            "VbankNum",
-            "vbankNum",
-            "AccountNo",
-            "accountNo",
-            "actNo",
-            "ActNo",
-            "vactNo",
-            "VactNo",
-            "fxdVactNo",
-            "FxdVactNo",
-        ):
-            candidate = self._normalize_account_candidate(data.get(key, ""))
-            if self._is_valid_virtual_account_candidate(candidate):
-                return candidate
-
-        # 기타 키 중 계좌번호로 보이는 값 탐색
-        for key, value in data.items():
-            key_l = str(key).lower()
-            if not any(token in key_l for token in ("account", "vbank", "vr", "actno", "vact", "acct", "fxvr")) and "계좌" not in str(key):
-                continue
-            candidate = self._normalize_account_candidate(value)
-            if self._is_valid_virtual_account_candidate(candidate):
-                return candidate
-
-        return ""
-
-    def _extract_hidden_inputs_from_html(self, html_text):
-        soup = BeautifulSoup(html_text, "html5lib")
-        fields = {}
-        for elem in soup.select("input[name]"):
-            name = elem.get("name")
-            if not name:
-                continue
-            if name not in fields:
-                fields[name] = elem.get("value", "")
-        return fields
-
-    def _extract_virtual_account_from_html(self, html_text):
-        soup = BeautifulSoup(html_text, "html5lib")
-        account_number = None
-        amount_text = None
-        bank_name = None
-
-        contents = soup.select_one("#contents")
-        if contents is not None:
-            account_elem = contents.select_one("span")
-            amount_elem = contents.select_one(".color_key1")
-            if account_elem is not None:
-                candidate = self._normalize_account_candidate(account_elem.get_text(strip=True))
-                if self._is_valid_virtual_account_candidate(candidate):
-                    account_number = candidate
-            if amount_elem is not None:
-                amount_text = amount_elem.get_text(strip=True)
-
-        plain_text = soup.get_text(" ", strip=True)
-
-        # 계좌 키워드 주변 숫자만 추출 (전역 숫자 탐색 금지)
-        if not account_number:
-            keyword_patterns = [
-                # 예: 고정 가상계좌 [케이뱅크] 701-9005-915-9906
-                r"(?:고정\s*가상계좌|전용\s*가상계좌|가상계좌|입금계좌|계좌번호)\s*(?:\[\s*([^\]\[]+)\s*\])?\s*[:：]?\s*([0-9][0-9\- ]{8,30}[0-9])",
-                r"([0-9][0-9\- ]{8,30}[0-9])\s*(?:고정\s*가상계좌|전용\s*가상계좌|가상계좌|입금계좌|계좌번호)",
-            ]
-            for pattern in keyword_patterns:
-                match = re.search(pattern, plain_text)
-                if match:
-                    if match.lastindex and match.lastindex >= 2:
-                        matched_bank = (match.group(1) or "").strip()
-                        raw_account = match.group(2)
-                    else:
-                        matched_bank = ""
-                        raw_account = match.group(1)
-
-                    normalized = self._normalize_account_candidate(raw_account)
-                    if self._is_valid_virtual_account_candidate(normalized):
-                        account_number = normalized
-                        if matched_bank and not bank_name:
-                            bank_name = matched_bank
-                        break
-
-        if not amount_text:
-            amount_match = re.search(r"[0-9][0-9,]{2,15}\s*원", plain_text)
-            if amount_match:
-                amount_text = amount_match.group(0).replace(" ", "")
-
-        if not account_number:
-            bracket_bank_account = re.search(
-                r"\[\s*(케이뱅크|카카오뱅크|국민은행|신한은행|우리은행|하나은행|기업은행|농협은행|부산은행|경남은행|대구은행|광주은행|전북은행|제주은행|SC제일은행|우체국)\s*\]\s*([0-9][0-9\- ]{8,30}[0-9])",
-                plain_text,
-            )
-            if bracket_bank_account:
-                normalized = self._normalize_account_candidate(bracket_bank_account.group(2))
-                if self._is_valid_virtual_account_candidate(normalized):
-                    account_number = normalized
-                    bank_name = bracket_bank_account.group(1)
-
-        if not account_number:
-            bank_then_account = re.search(
-                r"(케이뱅크|카카오뱅크|국민은행|신한은행|우리은행|하나은행|기업은행|농협은행|부산은행|경남은행|대구은행|광주은행|전북은행|제주은행|SC제일은행|우체국)\s*[\]\)\:\-]?\s*([0-9][0-9\- ]{8,30}[0-9])",
-                plain_text,
-            )
-            if bank_then_account:
-                normalized = self._normalize_account_candidate(bank_then_account.group(2))
-                if self._is_valid_virtual_account_candidate(normalized):
-                    account_number = normalized
-                    bank_name = bank_then_account.group(1)
-
-        # 스크립트 문자열/속성값 안에 계좌가 있는 경우를 대비한 raw HTML fallback
-        if not account_number:
-            raw_bank_account = re.search(
-                r"(케이뱅크|카카오뱅크|국민은행|신한은행|우리은행|하나은행|기업은행|농협은행|부산은행|경남은행|대구은행|광주은행|전북은행|제주은행|SC제일은행|우체국)[^0-9]{0,80}([0-9]{3}-[0-9]{4}-[0-9]{3}-[0-9]{4})",
-                html_text,
-            )
-            if raw_bank_account:
-                normalized = self._normalize_account_candidate(raw_bank_account.group(2))
-                if self._is_valid_virtual_account_candidate(normalized):
-                    account_number = normalized
-                    bank_name = raw_bank_account.group(1)
-
-        bank_match = re.search(
-            r"(케이뱅크|카카오뱅크|국민은행|신한은행|우리은행|하나은행|기업은행|농협은행|부산은행|경남은행|대구은행|광주은행|전북은행|제주은행|SC제일은행|우체국)",
-            plain_text,
-        )
-        if bank_match:
-            bank_name = bank_match.group(1)
-
-        return account_number, amount_text, bank_name
-
-    def _extract_account_holder_from_html(self, html_text):
-        if not html_text:
-            return None
-        soup = BeautifulSoup(html_text, "html5lib")
-        plain_text = soup.get_text(" ", strip=True)
-        holder_match = re.search(
-            r"(?:예금주|입금자명|계좌주(?:명)?(?:\(ID\))?|수취인)\s*[:：]?\s*([가-힣A-Za-z0-9\(\)\.\-_* ]{2,40})",
-            plain_text,
-        )
-        if not holder_match:
-            return None
-        holder = holder_match.group(1).strip()
-        if not holder:
-            return None
-        return holder
-
-    def _iter_mappings(self, payload):
-        if isinstance(payload, dict):
-            yield payload
-            for value in payload.values():
-                yield from self._iter_mappings(value)
-        elif isinstance(payload, list):
-            for value in payload:
-                yield from self._iter_mappings(value)
-
-    def _find_bank_name_in_mapping(self, data):
-        if not isinstance(data, dict):
-            return None
-
-        for key in ("VbankBankName", "VBankName", "bankName", "bankNm", "bank"):
-            value = data.get(key)
-            if value not in (None, ""):
-                value = str(value).strip()
-                if not value:
-                    continue
-                if re.fullmatch(r"\d{3}", value):
-                    code_name = self._bank_name_from_code(value)
-                    if code_name:
-                        return code_name
-                return value
-
-        for key, value in data.items():
-            key_l = str(key).lower()
-
-            if "bankcode" in key_l:
-                bank_name = self._bank_name_from_code(value)
-                if bank_name:
-                    return bank_name
-
-            if "bank" in key_l or "은행" in str(key):
-                if value in (None, ""):
-                    continue
-                value = str(value).strip()
-                if value and any(bank_name in value for bank_name in self._BANK_CODE_TO_NAME.values()):
-                    return value
+            data = self._request_lotto645_ticket_detail(item.get("ntslOrdrNo"), item.get("gmInfo"), item.get("eltOrdrDt", ""))
+            return self._parse_lotto645_ticket_games(data) if data is not None else None
 
-        return None
-
-    def _find_account_holder_in_mapping(self, data):
-        if not isinstance(data, dict):
+        except Exception as e:
+            self._detail_rate_limiter.on_throttle()
+            logger.error(f"로또 상세 정보 조회 실패: {e}")
             return None
 
-        key_candidates = (
-            "VBankAccountName",
-            "BuyerName",
-            "accountHolder",
-            "holderName",
-            "depositorName",
-            "dpstrNm",
-            "예금주",
-            "입금자",
-            "계좌주",
-        )
-        for key in key_candidates:
-            value = data.get(key)
-            if value in (None, ""):
-                continue
-            holder = str(value).strip()
-            if holder and 1 < len(holder) <= 30:
-                return holder
-
-        for key, value in data.items():
-            key_l = str(key).lower()
-            if not any(token in key_l for token in ("holder", "depositor", "buyer", "예금주", "입금자", "계좌주")):
-                continue
-            if value in (None, ""):
-                continue
-            holder = str(value).strip()
-            if holder and 1 < len(holder) <= 30:
-                return holder
-        return None
+    def _request_lotto645_ticket_detail(self, ntsl_ordr_no, barcode, purchase_date):
+        """lotto645TicketDetail.do 응답 JSON. 제한/대기열 응답이면 None"""
+        params = self._lotto645_ticket_detail_params(ntsl_ordr_no, barcode, purchase_date)
 
-    def _find_amount_text_in_mapping(self, data):
-        if not isinstance(data, dict):
+        self._detail_rate_limiter.acquire()
+        resp = self._session.get(self._lotto645_ticket_detail_url, params=params, timeout=10)
+        if self._is_throttled_response(resp.status_code, resp.headers.get("Content-Type", ""), resp.text):
+            self._detail_rate_limiter.on_throttle()
+            logger.debug(f"로또 상세 정보 조회 응답 이상 (status: {resp.status_code}, content-type: {resp.headers.get('Content-Type', '')})")
             return None
+        self._detail_rate_limiter.on_success()
 
-        for key in ("Amt", "amt", "price", "payAmt", "amount"):
-            value = data.get(key)
-            if value in (None, ""):
-                continue
-            return self._format_won_text(value)
-
-        for key, value in data.items():
-            key_l = str(key).lower()
-            if not any(token in key_l for token in ("amt", "amount", "price")):
-                continue
-            if value in (None, ""):
-                continue
-            return self._format_won_text(value)
-        return None
+        return resp.json()
 
-    def _extract_virtual_account_fields_from_payload(self, payload, default_amount=None):
-        account_number = ""
-        amount_text = None
-        bank_name = None
-        account_holder = None
-
-        for mapping in self._iter_mappings(payload):
-            if not account_number:
-                account_number = self._find_account_in_mapping(mapping)
-            if not bank_name:
-                bank_name = self._find_bank_name_in_mapping(mapping)
-            if not account_holder:
-                account_holder = self._find_account_holder_in_mapping(mapping)
-            if not amount_text:
-                amount_text = self._find_amount_text_in_mapping(mapping)
-
-            if account_number and bank_name and account_holder and amount_text:
-                break
-
-        if not amount_text and default_amount is not None:
-            amount_text = self._format_won_text(default_amount)
-
-        if bank_name is None:
-            # 케이뱅크는 동행복권 가상계좌 대표 은행.
-            bank_name = self._bank_name_from_code("089")
-
-        return account_number, amount_text, bank_name, account_holder
-
-    def _ajax_json_headers(self, referer):
-        menu_uri = urlsplit(referer).path or "/"
-        return {
-            "Accept": "application/json, text/javascript, */*; q=0.01",
-            "X-Requested-With": "XMLHttpRequest",
-            "Referer": referer,
-            "AJAX": "true",
-            "requestMenuUri": menu_uri,
-        }
-
-    def _normalize_url(self, raw_path, referer=None):
-        if not raw_path:
-            return None
-        path = raw_path.strip()
-        if path.startswith(("http://", "https://")):
-            return path
-        if path.startswith("//"):
-            return f"https:{path}"
-        if referer:
-            return urljoin(referer, path)
-        return urljoin(self._base_url + "/", path)
-
-    def _normalize_do_endpoint(self, raw_path):
-        return self._normalize_url(raw_path, referer=self._base_url)
-
-    def _extract_script_sources(self, html_text, referer):
-        if not html_text:
-            return []
-
-        soup = BeautifulSoup(html_text, "html5lib")
-        sources = []
-        for script in soup.select("script[src]"):
-            raw_src = script.get("src")
-            src = self._normalize_url(raw_src, referer=referer)
-            if not src:
-                continue
-            if not src.endswith(".js") and ".js?" not in src:
-                continue
-            if src not in sources:
-                sources.append(src)
-        return sources
-
-    def _fetch_script_texts(self, script_urls, max_scripts=18):
+    def _fetch_script_texts(self, script_urls, max_scripts=18, stop=None):
         texts = []
         for url in script_urls[:max_scripts]:
+            if stop is not None and stop.is_set():
+                break
             try:
                 if "dhlottery.co.kr" not in url:
                     continue
-                resp = self._session.get(url, timeout=10)
-                if resp.status_code != 200:
-                    continue
-                content_type = (resp.headers.get("Content-Type") or "").lower()
-                if "javascript" not in content_type and not url.endswith(".js") and ".js?" not in url:
-                    continue
-                if not resp.text:
-                    continue
-                texts.append(resp.text)
+                text = self._fetch_script_text(url)
+                if text:
+                    texts.append(text)
             except Exception as error:
                 logger.debug(f"script fetch failed ({url}): {type(error).__name__}: {error}")
         return texts
 
-    def _discover_account_related_endpoints(self, html_text, script_texts=None):
-        if not html_text:
-            return []
-
-        if script_texts is None:
-            script_texts = []
-        combined_text = html_text + "\n" + "\n".join(script_texts)
-
-        endpoint_set = set()
-        patterns = [
-            r'ajaxUtil\.sendHttpJson\([^,]+,\s*[\'"]([^\'"]+\.do(?:\?method=[A-Za-z0-9_]+)?)',
-            r'[\'"](/mypage/[A-Za-z0-9_/\-]+\.do(?:\?method=[A-Za-z0-9_]+)?)[\'"]',
-            r'[\'"](/kbank\.do\?method=[A-Za-z0-9_]+)[\'"]',
-        ]
-        for pattern in patterns:
-            for raw in re.findall(pattern, combined_text):
-                endpoint = self._normalize_do_endpoint(raw)
-                if endpoint:
-                    endpoint_set.add(endpoint)
-
-        def score(url):
-            url_l = url.lower()
-            s = 0
-            for token in ("mndp", "chrg", "kbank", "vbank", "account", "actno", "vact", "dpst", "charge"):
-                if token in url_l:
-                    s += 3
-            for token in ("select", "get", "search"):
-                if token in url_l:
-                    s += 2
-            return s
-
-        ranked = []
-        for url in endpoint_set:
-            url_l = url.lower()
-            if "/mypage/" not in url_l:
-                continue
-            if not any(token in url_l for token in ("select", "get", "search")):
-                continue
-            if score(url) < 3:
-                continue
-            ranked.append(url)
-        ranked.sort(key=score, reverse=True)
-        return ranked
-
-    def _try_extract_account_from_endpoint_response(self, resp, default_amount):
-        content_type = (resp.headers.get("Content-Type") or "").lower()
-        if "json" in content_type:
-            payload = resp.json()
-            account_number, amount_text, bank_name, account_holder = self._extract_virtual_account_fields_from_payload(
-                payload,
-                default_amount=default_amount,
-            )
-            if self._is_valid_virtual_account_candidate(account_number):
-                return account_number, amount_text, bank_name, account_holder
+    def _fetch_script_text(self, url):
+        cached = self._discovery_cache.load_script(url) if self._discovery_cache is not None else None
+        resp = self._session.get(url, headers=self._discovery_cache.conditional_headers(cached) if cached else None, timeout=10)
+        if resp.status_code == 304 and cached:
+            logger.debug(f"script not modified, using cached body: {url}")
+            return cached["body"]
+        if resp.status_code != 200:
             return None
-
-        if "html" in content_type:
-            account_number, amount_text, bank_name = self._extract_virtual_account_from_html(resp.text)
-            account_holder = self._extract_account_holder_from_html(resp.text)
-            if self._is_valid_virtual_account_candidate(account_number):
-                if not amount_text:
-                    amount_text = self._format_won_text(default_amount)
-                return account_number, amount_text, bank_name, account_holder
+        content_type = (resp.headers.get("Content-Type") or "").lower()
+        if "javascript" not in content_type and not url.endswith(".js") and ".js?" not in url:
             return None
+        if resp.text and self._discovery_cache is not None:
+            self._discovery_cache.save_script(url, resp.text, etag=resp.headers.get("ETag"), last_modified=resp.headers.get("Last-Modified"))
+        return resp.text
+
+    def _try_fetch_account_from_discovered_endpoints(self, html_text, referer, default_amount, methods, *, probed=None, stop=None):
+        probed = probed if probed is not None else set()
+        stop = stop if stop is not None else threading.Event()
+        cached_endpoints = self._discovery_cache.load_endpoints() if self._discovery_cache is not None else None
+        if cached_endpoints:
+            # 지난번 탐색 결과가 있으면 스크립트를 다시 내려받지 않고 마지막으로 성공한 엔드포인트부터 시도한다.
+            preferred_method = (self._discovery_cache.load_last_success() or {}).get("method")
+            found = self._probe_account_endpoints(cached_endpoints[:12], referer, default_amount, methods, preferred_method=preferred_method, probed=probed, stop=stop)
+            if found or stop.is_set():
+                return found
+            logger.debug("cached account endpoints did not return an account, rediscovering")
 
-        return None
-
-    def _try_fetch_account_from_discovered_endpoints(self, html_text, referer, default_amount):
         script_urls = self._extract_script_sources(html_text, referer=referer)
-        script_texts = self._fetch_script_texts(script_urls, max_scripts=18)
+        script_texts = self._fetch_script_texts(script_urls, max_scripts=18, stop=stop)
         endpoints = self._discover_account_related_endpoints(html_text, script_texts=script_texts)
-        guessed_paths = [
-            "/mypage/selectMndpChrg.do",
-            "/mypage/selectMndpChrgInfo.do",
-            "/mypage/selectMndpChrgList.do",
-            "/mypage/selectMndpChrgHist.do",
-            "/mypage/selectMndpChrgDetail.do",
-            "/mypage/selectMndpVbankInfo.do",
-            "/mypage/selectVbankInfo.do",
-            "/mypage/selectFixVactInfo.do",
-            "/mypage/selectFxVrAccount.do",
-        ]
-        for path in guessed_paths:
+        for path in self._GUESSED_ACCOUNT_PATHS:
             url = self._normalize_do_endpoint(path)
             if url and url not in endpoints:
                 endpoints.append(url)
-        logger.warning(
-            "mndpChrg endpoint discovery result: "
-            f"scripts={len(script_urls)} fetched={len(script_texts)} endpoints={len(endpoints)} "
-            f"sample={endpoints[:5]}"
-        )
-        if not endpoints:
+        logger.warning(f"mndpChrg endpoint discovery result: scripts={len(script_urls)} fetched={len(script_texts)} endpoints={len(endpoints)} sample={endpoints[:5]}")
+        if not endpoints or stop.is_set():
             return None
 
-        headers = self._ajax_json_headers(referer)
-        headers_json_post = dict(headers)
-        headers_json_post["Content-Type"] = "application/json;charset=UTF-8"
-        timestamp = int(datetime.datetime.now().timestamp() * 1000)
-
-        for endpoint in endpoints[:12]:
-            for method in ("GET", "POST_JSON", "POST_FORM"):
-                try:
-                    if method == "GET":
-                        resp = self._session.get(endpoint, headers=headers, params={"_": timestamp}, timeout=10)
-                    elif method == "POST_JSON":
-                        resp = self._session.post(endpoint, headers=headers_json_post, data="{}", timeout=10)
-                    else:
-                        resp = self._session.post(endpoint, headers=headers, data={}, timeout=10)
-                    if resp.status_code != 200:
-                        continue
-                    found = self._try_extract_account_from_endpoint_response(resp, default_amount)
-                    if found:
-                        logger.warning(f"virtual account found from discovered endpoint: {endpoint} ({method})")
-                        return found
-                except Exception as error:
-                    logger.debug(f"account endpoint probe failed ({method} {endpoint}): {type(error).__name__}: {error}")
+        if self._discovery_cache is not None:
+            self._discovery_cache.save_endpoints(endpoints)
+            endpoints = self._discovery_cache.rank_endpoints(endpoints)
+        return self._probe_account_endpoints(endpoints[:12], referer, default_amount, methods, probed=probed, stop=stop)
 
-        return None
+    def _probe_account_endpoints(self, endpoints, referer, default_amount, methods, *, preferred_method=None, probed=None, stop=None):
+        """엔드포인트 x methods 조합을 호출하고, 계좌가 처음 발견된 응답을 반환한다.
 
-    def _find_mapping_by_keys(self, payload, key_candidates):
-        key_candidates_l = [k.lower() for k in key_candidates]
-        for mapping in self._iter_mappings(payload):
-            if not isinstance(mapping, dict):
-                continue
-            mapping_keys_l = {str(k).lower() for k in mapping.keys()}
-            if any(k in mapping_keys_l for k in key_candidates_l):
-                return mapping
-        return {}
-
-    def _find_dict_value_by_key(self, payload, target_key):
-        if isinstance(payload, dict):
-            value = payload.get(target_key)
-            if isinstance(value, dict):
-                return value
-            for nested in payload.values():
-                found = self._find_dict_value_by_key(nested, target_key)
-                if found:
-                    return found
-        elif isinstance(payload, list):
-            for nested in payload:
-                found = self._find_dict_value_by_key(nested, target_key)
+        조회 방식(_READ_ONLY_PROBE_METHODS)만 있으면 작은 워커 풀에서 동시에 호출한다. POST는 계좌 발급/변경을 일으킬 수 있으므로
+        현재 스레드에서 하나씩 호출하고, 계좌를 찾으면 남은 POST는 보내지 않는다.
+        endpoints 순서대로 호출하므로 앞쪽(성공 이력이 있는) 엔드포인트가 먼저 호출된다.
+        계좌를 찾거나 _PROBE_DEADLINE_SECONDS가 지나거나 stop이 set되면 남은 호출은 취소한다. probed에 있는 (엔드포인트, 방식)은 건너뛴다.
+        취소할 수 없는 진행 중 호출이 반환 뒤에도 남을 수 있으므로 탐색 호출은 self._session이 아닌 복사본(_new_probe_session)을 쓴다.
+        """
+        probed = probed if probed is not None else set()
+        attempts = [(endpoint, method) for endpoint in endpoints for method in methods if (endpoint, method) not in probed]
+        if preferred_method and endpoints:
+            # 첫 번째 엔드포인트는 지난번에 성공한 방식부터 시도한다. (정렬은 안정적이므로 나머지 순서는 유지된다)
+            attempts.sort(key=lambda attempt: attempt != (endpoints[0], preferred_method))
+        if not attempts:
+            return None
+        probed.update(attempts)
+
+        deadline = time.monotonic() + self._PROBE_DEADLINE_SECONDS
+        stop = stop if stop is not None else threading.Event()
+        if set(methods) <= set(self._READ_ONLY_PROBE_METHODS):
+            return self._probe_account_endpoints_concurrently(self._new_probe_session(), attempts, (referer, default_amount), deadline, stop)
+        return self._probe_account_endpoints_in_order(self._new_probe_session(), attempts, (referer, default_amount), deadline, stop)
+
+    def _probe_account_endpoints_concurrently(self, session, attempts, request, deadline, stop):
+        # 워커는 이 탐색의 probe_stop만 확인한다. 바깥 stop(다른 전략이 계좌를 찾음)은 호출이 끝날 때마다 확인한다.
+        probe_stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=min(self._PROBE_MAX_WORKERS, len(attempts)), thread_name_prefix="dhapi-probe")
+        futures = {
+            executor.submit(self._probe_account_endpoint, session, endpoint, method, *request, stop=probe_stop, deadline=deadline): (endpoint, method)
+            for endpoint, method in attempts
+        }
+        try:
+            for future in as_completed(futures, timeout=max(0.0, deadline - time.monotonic())):
+                if stop.is_set():
+                    return None
+                found = future.result()
                 if found:
+                    self._record_probe_success(*futures[future])
                     return found
-        return {}
+        except FuturesTimeoutError:
+            logger.warning(f"account endpoint probing timed out after {self._PROBE_DEADLINE_SECONDS}s ({len(attempts)} probes)")
+        finally:
+            # 아직 시작하지 않은 호출은 취소하고, 진행 중인 호출은 결과를 버린다.
+            # 진행 중인 호출은 복사한 세션만 사용하므로 이후 kbank/마이페이지 흐름의 쿠키와 섞이지 않는다.
+            probe_stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return None
+
+    def _probe_account_endpoints_in_order(self, session, attempts, request, deadline, stop):
+        for endpoint, method in attempts:
+            if time.monotonic() >= deadline:
+                logger.warning(f"account endpoint probing timed out after {self._PROBE_DEADLINE_SECONDS}s ({len(attempts)} probes)")
+                return None
+            if stop.is_set():
+                return None
+            found = self._probe_account_endpoint(session, endpoint, method, *request, stop=stop, deadline=deadline)
+            if found:
+                self._record_probe_success(endpoint, method)
+                return found
+        return None
+
+    def _record_probe_success(self, endpoint, method):
+        logger.warning(f"virtual account found from discovered endpoint: {endpoint} ({method})")
+        if self._discovery_cache is not None:
+            self._discovery_cache.record_success(endpoint, method)
+
+    def _new_probe_session(self):
+        """self._session의 헤더/쿠키를 복사하고 전송 계층(어댑터)은 공유하는 탐색 전용 세션"""
+        session = requests.Session()
+        session.headers.clear()
+        session.headers.update(self._session.headers)
+        session.cookies = self._session.cookies.copy()
+        # 어댑터는 공유하므로 이 세션은 close()하지 않는다.
+        session.adapters = self._session.adapters.copy()
+        return session
+
+    def _probe_account_endpoint(self, session, endpoint, method, referer, default_amount, *, stop, deadline):
+        remaining = deadline - time.monotonic()
+        if stop.is_set() or remaining <= 0:
+            return None
+
+        headers = self._ajax_json_headers(referer)
+        timeout = min(self._PROBE_TIMEOUT_SECONDS, remaining)
+        try:
+            if method == "GET":
+                resp = session.get(endpoint, headers=headers, params={"_": int(datetime.datetime.now().timestamp() * 1000)}, timeout=timeout)
+            elif method == "POST_JSON":
+                resp = session.post(endpoint, headers={**headers, "Content-Type": "application/json;charset=UTF-8"}, data="{}", timeout=timeout)
+            else:
+                resp = session.post(endpoint, headers=headers, data={}, timeout=timeout)
+            if resp.status_code != 200 or stop.is_set():
+                return None
+            return self._try_extract_account_from_endpoint_response(resp, default_amount)
+        except Exception as error:
+            logger.debug(f"account endpoint probe failed ({method} {endpoint}): {type(error).__name__}: {error}")
+            return None
 
     def _try_assign_virtual_account_via_mypage_flow(self, deposit):
         referer = self._mndp_charge_page
@@ -1010,161 +502,31 @@ class LotteryClient:
             self._session.get(self._mndp_charge_page, headers={"Referer": self._cash_balance}, timeout=10)
 
             # (선행) 간편충전 정보 조회 - 실제 페이지 초기화 흐름과 동일하게 맞춤
-            smrt_url = f"{self._base_url}/mypage/selectSmrtChrgInfo.do"
-            smrt_resp = self._session.get(smrt_url, headers=headers, timeout=10)
-            if smrt_resp.status_code == 200 and "json" in (smrt_resp.headers.get("Content-Type") or "").lower():
-                try:
-                    smrt_payload = smrt_resp.json()
-                    easy_user = (
-                        smrt_payload.get("data", {}).get("easyChargeUser")
-                        if isinstance(smrt_payload, dict)
-                        else None
-                    )
-                    if isinstance(easy_user, dict) and easy_user.get("maintenaceUseYn") == "Y":
-                        logger.warning("selectSmrtChrgInfo indicates maintenance window for charge flow")
-                except Exception:
-                    pass
+            smrt_resp = self._session.get(self._smrt_charge_info_url, headers=headers, timeout=10)
+            self._check_smrt_charge_info(smrt_resp.status_code, smrt_resp.headers.get("Content-Type", ""), smrt_resp.json)
 
             # [tab2] 가상계좌 입금 충전하기 버튼 클릭 흐름 (MndpChrgM.fn_openVcRegistAccountCheck)
-            init_url = f"{self._base_url}/mypage/kbankInit.do"
-            init_params = {
-                "VbankExpDate": self._get_tomorrow(),
-                "PayMethod": "VBANK",
-                "VbankBankCode": "089",
-                "Price": str(deposit.amount),
-            }
-            init_resp = self._session.get(init_url, headers=headers, params=init_params, timeout=10)
-            if init_resp.status_code != 200:
-                logger.warning(f"mypage kbankInit.do status: {init_resp.status_code}")
-                return None
-            if "json" not in (init_resp.headers.get("Content-Type") or "").lower():
-                logger.warning(f"mypage kbankInit.do non-json content-type: {init_resp.headers.get('Content-Type', '')}")
+            init_resp = self._session.get(self._mypage_kbank_init_url, headers=headers, params=self._build_mypage_kbank_init_params(deposit), timeout=10)
+            process_request = self._mypage_kbank_process_request(init_resp.status_code, init_resp.headers.get("Content-Type", ""), init_resp.json, deposit)
+            if process_request is None:
                 return None
 
-            init_payload = init_resp.json()
-            self._save_debug_json("mypage_kbankInit_last.json", init_payload)
-            req_vo = self._find_dict_value_by_key(init_payload, "reqVO")
-            if not req_vo:
-                req_vo = self._find_mapping_by_keys(
-                    init_payload,
-                    (
-                        "payMethod",
-                        "goodsName",
-                        "moid",
-                        "userIP",
-                        "mallUserID",
-                        "vbankExpDate",
-                        "amt",
-                        "vbankBankCode",
-                        "fxVrAccountNo",
-                        "buyerName",
-                    ),
-                )
-            if not req_vo:
-                logger.warning("mypage kbankInit.do returned no reqVO-like payload")
-                return None
-
-            process_url = f"{self._base_url}/mypage/kbankProcess.do"
-            process_params = {
-                "PayMethod": self._pick_first(req_vo, "payMethod", "PayMethod", default="VBANK"),
-                "GoodsName": self._pick_first(req_vo, "goodsName", "GoodsName", default="복권예치금"),
-                "Moid": self._pick_first(req_vo, "moid", "Moid"),
-                "UserIP": self._pick_first(req_vo, "userIP", "UserIP"),
-                "MallUserID": self._pick_first(req_vo, "mallUserID", "MallUserID"),
-                "VbankExpDate": self._pick_first(req_vo, "vbankExpDate", "VbankExpDate", default=self._get_tomorrow()),
-                "Amt": self._pick_first(req_vo, "amt", "Amt", default=str(deposit.amount)),
-                "VbankBankCode": self._pick_first(req_vo, "vbankBankCode", "VbankBankCode", default="089"),
-                "VbankNum": self._pick_first(req_vo, "fxVrAccountNo", "vbankNum", "VbankNum"),
-                "FxVrAccountNo": self._pick_first(req_vo, "fxVrAccountNo", "FxVrAccountNo", "vbankNum", "VbankNum"),
-                "VBankAccountName": self._pick_first(req_vo, "buyerName", "VBankAccountName", "BuyerName"),
-            }
-            process_resp = self._session.get(process_url, headers=headers, params=process_params, timeout=10)
-            if process_resp.status_code != 200:
-                logger.warning(f"mypage kbankProcess.do status: {process_resp.status_code}")
-                return None
-            if "json" not in (process_resp.headers.get("Content-Type") or "").lower():
-                logger.warning(f"mypage kbankProcess.do non-json content-type: {process_resp.headers.get('Content-Type', '')}")
-                return None
-
-            process_payload = process_resp.json()
-            self._save_debug_json("mypage_kbankProcess_last.json", process_payload)
-            res_vo = self._find_dict_value_by_key(process_payload, "resVO")
-            if not res_vo:
-                res_vo = self._find_mapping_by_keys(
-                    process_payload,
-                    (
-                        "vbankNum",
-                        "vbankBankName",
-                        "resultCode",
-                        "amt",
-                        "mallUserIDMask",
-                        "payMethodName",
-                    ),
-                )
-            if not res_vo:
-                logger.warning("mypage kbankProcess.do returned no resVO-like payload")
-                return None
-
-            result_code = str(self._pick_first(res_vo, "resultCode", default="")).upper()
-            account_number_raw = self._pick_first(res_vo, "vbankNum", "VbankNum")
-            if not account_number_raw:
-                account_number_raw = self._pick_first(req_vo, "fxVrAccountNo", "FxVrAccountNo", "vbankNum", "VbankNum")
-            account_number = self._normalize_account_candidate(account_number_raw)
-            if result_code == "FAIL" and not self._is_valid_virtual_account_candidate(account_number):
-                logger.warning("mypage kbankProcess.do resultCode=FAIL")
-                return None
-
-            if not self._is_valid_virtual_account_candidate(account_number):
-                logger.warning(
-                    "mypage kbankProcess.do returned invalid account candidate: "
-                    f"{account_number} (raw={account_number_raw}, resVO_keys={list(res_vo.keys())[:20]})"
-                )
-                return None
-
-            amount_text = self._format_won_text(
-                self._pick_first(res_vo, "amt", "Amt", default=self._pick_first(req_vo, "amt", "Amt", default=deposit.amount))
-            )
-            bank_name = (
-                self._pick_first(res_vo, "vbankBankName", "VbankBankName", default="")
-                or self._bank_name_from_code(self._pick_first(req_vo, "vbankBankCode", "VbankBankCode", default="089"))
-                or self._bank_name_from_code("089")
-            )
-            account_holder = (
-                self._pick_first(res_vo, "vBankAccountName", "VBankAccountName", "buyerName")
-                or self._pick_first(req_vo, "buyerName", "VBankAccountName")
-            )
-            logger.warning("virtual account found from mypage kbank flow (/mypage/kbankInit.do -> /mypage/kbankProcess.do)")
-            return account_number, amount_text, bank_name, account_holder
+            req_vo, process_params = process_request
+            process_resp = self._session.get(self._mypage_kbank_process_url, headers=headers, params=process_params, timeout=10)
+            return self._mypage_kbank_account(process_resp.status_code, process_resp.headers.get("Content-Type", ""), process_resp.json, req_vo, deposit)
         except Exception as error:
             logger.warning(f"mypage kbank flow failed: {type(error).__name__}: {error}")
             return None
 
     def _try_get_virtual_account_from_user_mndp(self, default_amount):
         try:
-            headers = self._ajax_json_headers(self._cash_balance)
-            resp = self._session.get(self._user_mndp_url, headers=headers, timeout=10)
-            if resp.status_code != 200:
-                logger.debug(f"selectUserMndp status: {resp.status_code}")
-                return None
-
-            content_type = (resp.headers.get("Content-Type") or "").lower()
-            if "json" not in content_type:
-                logger.debug(f"selectUserMndp non-json content-type: {content_type}")
-                return None
-
-            payload = resp.json()
-            account_number, amount_text, bank_name, account_holder = self._extract_virtual_account_fields_from_payload(
-                payload,
-                default_amount=default_amount,
-            )
-            if self._is_valid_virtual_account_candidate(account_number):
-                return account_number, amount_text, bank_name, account_holder
-            return None
-        except Exception as error:
+            resp = self._session.get(self._user_mndp_url, headers=self._ajax_json_headers(self._cash_balance), timeout=10)
+        except requests.RequestException as error:
             logger.debug(f"selectUserMndp account lookup skipped: {type(error).__name__}: {error}")
             return None
+        return self._user_mndp_account(resp.status_code, resp.headers.get("Content-Type", ""), resp.json, default_amount)
 
-    def _try_get_virtual_account_from_mndp_charge_page(self, default_amount):
+    def _load_mndp_charge_document(self, stop=None):
         try:
             resp = self._get_with_wait_retry(
                 self._mndp_charge_page,
@@ -1172,89 +534,107 @@ class LotteryClient:
                 timeout=10,
                 max_attempts=8,
                 wait_seconds=1,
+                stop=stop,
             )
             if resp.status_code != 200 or self._is_wait_page(resp.text):
                 return None
+            return HtmlDocument(resp.text)
+        except Exception as error:
+            logger.debug(f"mndpChrg page load skipped: {type(error).__name__}: {error}")
+            return None
 
-            account_number, amount_text, bank_name = self._extract_virtual_account_from_html(resp.text)
-            account_holder = self._extract_account_holder_from_html(resp.text)
-            if self._is_valid_virtual_account_candidate(account_number):
-                if not amount_text:
-                    amount_text = self._format_won_text(default_amount)
-                return account_number, amount_text, bank_name, account_holder
+    def _try_get_virtual_account_from_discovered_endpoints(self, doc, default_amount, methods, probed, stop):
+        if not doc:
+            return None
 
-            hidden_fields = self._extract_hidden_inputs_from_html(resp.text)
-            account_number, amount_text, bank_name, account_holder = self._extract_virtual_account_fields_from_payload(
-                hidden_fields,
-                default_amount=default_amount,
-            )
-            if self._is_valid_virtual_account_candidate(account_number):
-                return account_number, amount_text, bank_name, account_holder
+        discovered = self._try_fetch_account_from_discovered_endpoints(doc, self._mndp_charge_page, default_amount, methods, probed=probed, stop=stop)
+        if discovered or stop.is_set():
+            return discovered
 
-            via_mypage = self._try_assign_virtual_account_via_mypage_flow(Deposit(default_amount))
-            if via_mypage:
-                return via_mypage
+        logger.warning(
+            f"mndpChrg page parsed but no valid account found (methods: {'/'.join(methods)}, has_keyword: {'고정 가상계좌' in doc.html}, snippet: {' '.join(doc.html.split())[:240]})"
+        )
+        self._save_debug_html("mndpChrg_last.html", doc.html)
+        return None
 
-            discovered = self._try_fetch_account_from_discovered_endpoints(
-                resp.text,
-                referer=self._mndp_charge_page,
-                default_amount=default_amount,
-            )
-            if discovered:
-                return discovered
-
-            logger.warning(
-                "mndpChrg page parsed but no valid account found "
-                f"(url: {resp.url}, has_keyword: {'고정 가상계좌' in resp.text}, "
-                f"content_type: {resp.headers.get('Content-Type', '')}, "
-                f"direct_extract: account={account_number} bank={bank_name} holder={account_holder}, "
-                f"snippet: {' '.join(resp.text.split())[:240]})"
-            )
-            self._save_debug_html("mndpChrg_last.html", resp.text)
+    def _build_virtual_account_resolver(self, deposit):
+        """조회 전략(selectUserMndp, mndpChrg 화면, 엔드포인트 GET 탐색)은 동시에,
+        발급 전략(엔드포인트 POST 탐색, 마이페이지 kbank, 기존 kbank)은 마지막에 순서대로 실행한다.
+        여러 요청을 보내는 전략은 요청 사이마다 resolver가 넘긴 stop을 확인한다.
+        """
+        page_lock = threading.Lock()
+        page = {}
+        # GET/POST 탐색이 같은 (엔드포인트, 방식)을 다시 호출하지 않도록 공유한다.
+        probed = set()
+
+        def load_page(stop):
+            # mndpChrg 화면 파싱과 엔드포인트 탐색이 같은 페이지를 쓰므로 한 번만 요청한다.
+            with page_lock:
+                if "doc" not in page:
+                    page["doc"] = self._load_mndp_charge_document(stop)
+                return page["doc"]
+
+        def from_charge_page(stop):
+            doc = load_page(stop)
+            return self._extract_account_from_mndp_charge_html(doc, deposit.amount) if doc else None
+
+        def from_discovered_endpoints(methods):
+            return lambda stop: self._try_get_virtual_account_from_discovered_endpoints(load_page(stop), deposit.amount, methods, probed, stop)
+
+        return VirtualAccountResolver(
+            read_only=[
+                ("selectUserMndp", lambda stop: self._try_get_virtual_account_from_user_mndp(deposit.amount)),
+                ("mndpChrg", from_charge_page),
+                ("discovered_endpoints", from_discovered_endpoints(self._READ_ONLY_PROBE_METHODS)),
+            ],
+            issuing=[
+                ("discovered_endpoints_post", from_discovered_endpoints(self._MUTATING_PROBE_METHODS)),
+                ("mypage_kbank", lambda stop: self._try_assign_virtual_account_via_mypage_flow(deposit)),
+                ("kbank", lambda stop: self._issue_virtual_account_via_kbank(deposit)),
+            ],
+            is_valid=self._is_valid_virtual_account_candidate,
+        )
 
-            return None
-        except Exception as error:
-            logger.debug(f"mndpChrg account lookup skipped: {type(error).__name__}: {error}")
-            return None
+    def _publish_cached_virtual_account(self, deposit):
+        if self._virtual_account_store is None:
+            return False
 
-    def _extract_wait_context_from_html(self, html_text, request_url):
-        if not html_text:
-            return None
+        try:
+            cached = self._virtual_account_store.load(self._user_id)
+        except Exception as error:
+            logger.debug(f"failed to load virtual account: {type(error).__name__}: {error}")
+            return False
+        if not cached or not self._is_valid_virtual_account_candidate(cached.get("account")):
+            return False
 
-        def _find_var(name):
-            pattern = rf'var\s+{re.escape(name)}\s*=\s*[\'"]([^\'"]+)[\'"]'
-            match = re.search(pattern, html_text)
-            if match:
-                return match.group(1).strip()
-            return None
+        logger.debug(f"저장된 가상계좌 정보를 사용합니다. (확인 시각: {cached.get('verified_at')})")
+        self._publish_virtual_account_result(cached["account"], self._format_won_text(deposit.amount), cached.get("bank_name"), cached.get("account_holder"), remember=False)
 
-        parsed_url = urlsplit(request_url)
-        default_page_url = parsed_url.path.lstrip("/") if parsed_url.path else "main"
-        if parsed_url.query:
-            default_page_url = f"{default_page_url}?{parsed_url.query}"
-
-        context = {
-            "host": _find_var("host") or parsed_url.netloc or "www.dhlottery.co.kr",
-            "ip": _find_var("ip"),
-            "loginId": _find_var("loginId"),
-            "port": _find_var("port") or ("443" if parsed_url.scheme == "https" else "80"),
-            "pageUrl": _find_var("pageUrl") or default_page_url,
-            "tracer_domain": _find_var("tracer_domain") or self._tracer_domain,
-        }
+        # 응답은 바로 하고, selectUserMndp 한 번으로 저장된 정보가 아직 맞는지 뒤에서 확인한다.
+        # 프로세스가 확인 전에 끝나지 않도록 daemon 스레드로 만들지 않는다.
+        threading.Thread(target=self._revalidate_virtual_account, args=(cached, deposit.amount), name="dhapi-virtual-account").start()
+        return True
 
-        if not context["ip"]:
-            return None
-        if not context["loginId"]:
-            context["loginId"] = context["ip"]
-        return context
-
-    def _parse_tracer_parameters(self, xml_text):
-        values = {}
-        if not xml_text:
-            return values
-        for key, value in re.findall(r'<Parameter\s+id="([^"]+)"[^>]*>(.*?)</Parameter>', xml_text, re.S):
-            values[key] = value.strip()
-        return values
+    def _revalidate_virtual_account(self, cached, default_amount):
+        found = self._try_get_virtual_account_from_user_mndp(default_amount)
+        if not found or not self._is_valid_virtual_account_candidate(found[0]):
+            # selectUserMndp가 계좌를 내려주지 않는 경우도 있으므로 저장된 정보는 유지한다.
+            logger.debug("가상계좌 재확인 결과가 없어 저장된 정보를 유지합니다.")
+            return
+
+        account_number, amount_text, bank_name, account_holder = found
+        if account_number != cached.get("account"):
+            logger.warning(f"가상계좌 정보가 변경되었습니다. 다음 요청부터 새 계좌를 사용합니다. ({cached.get('account')} -> {account_number})")
+            self._remember_virtual_account(account_number, amount_text, bank_name, account_holder)
+            return
+
+        self._remember_virtual_account(
+            account_number,
+            cached.get("amount") or amount_text,
+            bank_name or cached.get("bank_name"),
+            account_holder or cached.get("account_holder"),
+            assigned_at=cached.get("assigned_at"),
+        )
 
     def _ensure_wc_cookie(self, wait_context):
         current_wc = self._session.cookies.get("wcCookie")
@@ -1307,7 +687,7 @@ class LotteryClient:
             return {}
         return self._parse_tracer_parameters(resp.text)
 
-    def _try_release_wait_queue(self, html_text, request_url, max_attempts=3, wait_seconds=0.8):
+    def _try_release_wait_queue(self, html_text, request_url, scheduler: WaitQueueScheduler):
         wait_context = self._extract_wait_context_from_html(html_text, request_url)
         if not wait_context:
             return False
@@ -1323,7 +703,9 @@ class LotteryClient:
             logger.debug(f"tracer checkBotIp failed: {type(error).__name__}: {error}")
             return False
 
-        for attempt in range(1, max_attempts + 1):
+        attempt = 0
+        while True:
+            attempt += 1
             try:
                 tracer_result = self._call_tracer_input_queue(wait_context, request_url)
             except Exception as error:
@@ -1332,24 +714,23 @@ class LotteryClient:
 
             is_wait = str(tracer_result.get("isWait", "")).strip()
             wait_cnt = str(tracer_result.get("waitCnt", "")).strip()
-            logger.debug(f"tracer queue state ({attempt}/{max_attempts}): isWait={is_wait}, waitCnt={wait_cnt}")
+            logger.debug(f"tracer queue state ({attempt}): isWait={is_wait}, waitCnt={wait_cnt}")
 
             if is_wait in {"F", "E", "NE"} or wait_cnt in {"0", "E"}:
                 return True
 
-            if attempt < max_attempts:
-                time.sleep(wait_seconds)
-        return False
+            if wait_cnt.isdigit():
+                scheduler.observe(int(wait_cnt))
+            if not scheduler.wait():
+                if not scheduler.stopped():
+                    logger.warning(f"대기열이 제한 시간 안에 해소되지 않았습니다. (대기 인원: {wait_cnt or '-'})")
+                return False
 
-    def _is_wait_page(self, html_text):
-        if not html_text:
-            return False
-        # 일반 페이지에도 tracer 스크립트/DOM이 기본 포함되므로,
-        # wait 판별은 에러/점검 템플릿 마커가 있는 경우로 제한한다.
-        return (
-            "img_error.png" in html_text
-            or "img_construction.png" in html_text
-        )
+    def _report_wait_queue_progress(self, progress: WaitQueueProgress):
+        logger.debug(f"wait queue progress: position={progress.position}, estimated={progress.estimated_seconds}, remaining={progress.remaining_seconds:.1f}s")
+        printer = getattr(self._lottery_endpoint, "print_wait_queue_progress", None)
+        if printer is not None:
+            printer(progress.position, progress.estimated_seconds)
 
     def _request_with_wait_retry(
         self,
@@ -1362,43 +743,40 @@ class LotteryClient:
         timeout=10,
         max_attempts=15,
         wait_seconds=2,
+        stop=None,
     ):
-        last_resp = None
-        upper_method = method.upper()
-        released_retry_done = False
+        """대기열 페이지가 오면 tracer 대기열이 해소될 때까지 기다렸다가 다시 요청한다.
+
+        Args:
+            max_attempts: 요청을 보내는 최대 횟수
+            wait_seconds: 대기열 처리 속도를 알기 전의 확인 간격. 전체 대기 시간은 max_attempts * wait_seconds를 넘지 않는다.
+            stop: set되면 기다리지 않고 마지막 응답(대기열 페이지)을 반환한다.
+        """
+        scheduler = WaitQueueScheduler(max_attempts * wait_seconds, default_interval=wait_seconds, on_progress=self._report_wait_queue_progress, stop=stop)
+        resp = None
 
         for attempt in range(1, max_attempts + 1):
             resp = self._session.request(
-                upper_method,
+                method.upper(),
                 url,
                 params=params,
                 data=data,
                 headers=headers,
                 timeout=timeout,
             )
-            last_resp = resp
 
             content_type = (resp.headers.get("Content-Type") or "").lower()
-            if resp.status_code != 200:
+            if resp.status_code != 200 or "text/html" not in content_type or not self._is_wait_page(resp.text):
                 return resp
 
-            if "text/html" in content_type and self._is_wait_page(resp.text):
-                logger.warning(f"wait page detected for {url} ({attempt}/{max_attempts})")
-                released = self._try_release_wait_queue(resp.text, url)
-
-                # tracer 해제가 안 되면 반복 재시도해도 결과가 동일한 경우가 많다.
-                if not released:
-                    return resp
-
-                # 대기열 해제 후 재요청은 1회만 수행.
-                if attempt < max_attempts and not released_retry_done:
-                    released_retry_done = True
-                    time.sleep(0.3)
-                    continue
-
-            return resp
+            logger.warning(f"wait page detected for {url} ({attempt}/{max_attempts})")
+            # tracer 해제가 안 되면 반복 재시도해도 결과가 동일한 경우가 많다.
+            if attempt == max_attempts or scheduler.expired() or not self._try_release_wait_queue(resp.text, url, scheduler):
+                return resp
+            if not scheduler.pause(0.3):
+                return resp
 
-        return last_resp
+        return resp
 
     def _post_with_wait_retry(self, url, *, data, headers=None, timeout=10, max_attempts=15, wait_seconds=2):
         return self._request_with_wait_retry(
@@ -1411,7 +789,7 @@ class LotteryClient:
             wait_seconds=wait_seconds,
         )
 
-    def _get_with_wait_retry(self, url, *, params=None, headers=None, timeout=10, max_attempts=15, wait_seconds=2):
+    def _get_with_wait_retry(self, url, *, params=None, headers=None, timeout=10, max_attempts=15, wait_seconds=2, stop=None):
         return self._request_with_wait_retry(
             "GET",
             url,
@@ -1420,176 +798,159 @@ class LotteryClient:
             timeout=timeout,
             max_attempts=max_attempts,
             wait_seconds=wait_seconds,
+            stop=stop,
         )
 
-    def _publish_virtual_account_result(self, account_number, amount_text, bank_name=None, account_holder=None):
-        try:
-            self._lottery_endpoint.print_result_of_assign_virtual_account(account_number, amount_text, bank_name, account_holder)
-        except TypeError:
-            self._lottery_endpoint.print_result_of_assign_virtual_account(account_number, amount_text)
+    def assign_virtual_account(self, deposit: Deposit, force_refresh=False):
+        """
+        Args:
+            force_refresh: True면 저장된 가상계좌 정보를 쓰지 않고 동행복권에서 다시 조회/발급한다.
+        """
+        if not force_refresh and self._publish_cached_virtual_account(deposit):
+            return
 
-    def assign_virtual_account(self, deposit: Deposit):
+        resolver = self._build_virtual_account_resolver(deposit)
         try:
-            # 1) 동행복권 마이페이지 API/화면에 이미 발급된 개인별 가상계좌가 있으면 우선 사용.
-            account_info = self._try_get_virtual_account_from_user_mndp(deposit.amount)
-            if not account_info:
-                account_info = self._try_get_virtual_account_from_mndp_charge_page(deposit.amount)
-
-            if account_info:
-                account_number, amount_text, bank_name, account_holder = account_info
-                if self._is_valid_virtual_account_candidate(account_number):
-                    self._publish_virtual_account_result(account_number, amount_text, bank_name, account_holder)
-                    return
-
-            # 2) 기존 kbank 발급 플로우 (fallback)
-            init_body = {
-                "PayMethod": "VBANK",
-                "VbankBankCode": "089",  # 가상계좌 채번가능 케이뱅크 코드
-                "price": str(deposit.amount),
-                "goodsName": "복권예치금",
-                "vExp": self._get_tomorrow(),
-            }
-            resp = self._post_with_wait_retry(
-                self._assign_virtual_account_1,
-                data=init_body,
-                timeout=10,
-                max_attempts=15,
-                wait_seconds=2,
-            )
-            logger.debug(f"kbankInit status_code: {resp.status_code}")
-            logger.debug(f"kbankInit content-type: {resp.headers.get('Content-Type', '')}")
-
-            if resp.status_code != 200:
-                raise RuntimeError(f"kbankInit 요청 실패 (status: {resp.status_code})")
-            if self._is_wait_page(resp.text):
-                self._save_debug_html("kbankInit_last.html", resp.text)
-                raise RuntimeError(
-                    "결제 시스템 대기열로 인해 가상계좌 발급이 지연되고 있습니다. "
-                    "동행복권 mndpChrg 페이지에서 대기열 해소 후 다시 시도해주세요."
-                )
-
-            data = None
-            try:
-                data = resp.json()
-                logger.debug(f"kbankInit json keys: {list(data.keys())}")
-            except Exception as json_error:
-                logger.warning(f"kbankInit non-json response: {type(json_error).__name__}: {json_error}")
-                account_number, amount_text, bank_name_from_html = self._extract_virtual_account_from_html(resp.text)
-
-                # 사이트 응답이 이미 최종 결과 화면인 경우
-                if account_number:
-                    if not amount_text:
-                        amount_text = self._format_won_text(deposit.amount)
-                    bank_name = bank_name_from_html or self._bank_name_from_code("089")
-                    self._publish_virtual_account_result(account_number, amount_text, bank_name, None)
-                    return
-
-                data = self._extract_hidden_inputs_from_html(resp.text)
-                if not data:
-                    snippet = " ".join(resp.text.strip().split())[:200]
-                    raise RuntimeError(
-                        "kbankInit 응답을 파싱하지 못했습니다. "
-                        f"(status: {resp.status_code}, content-type: {resp.headers.get('Content-Type', '')}, snippet: {snippet})"
-                    )
-                logger.debug(f"kbankInit html input keys: {list(data.keys())}")
-
-            account_no = self._find_account_in_mapping(data)
-            amount_value = self._pick_first(data, "amt", "Amt", "price", default=str(deposit.amount))
-            buyer_name = str(self._pick_first(data, "BuyerName", "VBankAccountName", default="")).strip()
-            bank_code = str(self._pick_first(data, "VbankBankCode", default="089")).zfill(3)
-            bank_name = (
-                self._pick_first(data, "VbankBankName", "VBankName", default="")
-                or self._bank_name_from_code(bank_code)
-            )
-
-            body = {
-                "PayMethod": "VBANK",
-                "GoodsName": self._pick_first(data, "GoodsName", default="복권예치금"),
-                "GoodsCnt": "",
-                "BuyerTel": self._pick_first(data, "BuyerTel"),
-                "Moid": self._pick_first(data, "Moid"),
-                "MID": self._pick_first(data, "MID"),
-                "UserIP": self._pick_first(data, "UserIP"),
-                "MallIP": self._pick_first(data, "MallIP"),
-                "MallUserID": self._pick_first(data, "MallUserID"),
-                "VbankExpDate": self._pick_first(data, "VbankExpDate", default=self._get_tomorrow()),
-                "BuyerEmail": self._pick_first(data, "BuyerEmail"),
-                # "SocketYN": '',
-                # "GoodsCl": '',
-                # "EncodeParameters": '',
-                "EdiDate": self._pick_first(data, "EdiDate"),
-                "EncryptData": self._pick_first(data, "EncryptData"),
-                "Amt": amount_value,
-                "BuyerName": buyer_name,
-                "VbankBankCode": bank_code,
-                "VbankNum": account_no,
-                "FxVrAccountNo": self._pick_first(data, "FxVrAccountNo", default=account_no),
-                "VBankAccountName": self._pick_first(data, "VBankAccountName", "BuyerName", default=buyer_name),
-                "svcInfoPgMsgYn": self._pick_first(data, "svcInfoPgMsgYn", default="N"),
-                "OptionList": self._pick_first(data, "OptionList", default="no_receipt"),
-                "TransType": self._pick_first(data, "TransType", default="0"),  # 일반(0), 에스크로(1)
-                # "TrKey": None,
-            }
-
-            if not body["VbankNum"] and body["FxVrAccountNo"]:
-                body["VbankNum"] = self._normalize_account_candidate(body["FxVrAccountNo"])
-            if not body["FxVrAccountNo"] and body["VbankNum"]:
-                body["FxVrAccountNo"] = body["VbankNum"]
-            if not body["Amt"]:
-                body["Amt"] = str(deposit.amount)
-            logger.debug(f"body: {body}")
-
-            process_headers = {
-                "Origin": self._base_url,
-                "Referer": self._assign_virtual_account_1,
-            }
-            resp = self._post_with_wait_retry(
-                self._assign_virtual_account_2,
-                headers=process_headers,
-                data=body,
-                timeout=10,
-                max_attempts=10,
-                wait_seconds=2,
-            )
-            logger.debug(f"kbankProcess status: {resp.status_code}")
-            logger.debug(f"kbankProcess content-type: {resp.headers.get('Content-Type', '')}")
-            if resp.status_code != 200:
-                raise RuntimeError(f"kbankProcess 요청 실패 (status: {resp.status_code})")
-            if self._is_wait_page(resp.text):
-                self._save_debug_html("kbankProcess_last.html", resp.text)
-                raise RuntimeError(
-                    "결제 시스템 대기열이 길어 가상계좌 정보를 확인하지 못했습니다. "
-                    "동행복권 mndpChrg 페이지에서 대기열 해소 후 다시 시도해주세요."
-                )
+            account_info = resolver.resolve()
+        except RuntimeError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"❗ 가상계좌를 할당하지 못했습니다. (상세: {type(e).__name__}: {e})")
+        finally:
+            self.last_virtual_account_resolution = resolver.report
+            logger.info(f"가상계좌 조회 결과: {resolver.describe()}")
+
+        if not account_info:
+            raise RuntimeError("❗ 가상계좌를 할당하지 못했습니다. (유효한 가상계좌 번호를 찾지 못했습니다.)")
+        self._publish_virtual_account_result(*account_info)
+
+    def _issue_virtual_account_via_kbank(self, deposit):
+        """기존 kbankInit/kbankProcess 발급 플로우. 실패하면 RuntimeError를 발생시킨다."""
+        init_body = {
+            "PayMethod": "VBANK",
+            "VbankBankCode": "089",  # 가상계좌 채번가능 케이뱅크 코드
+            "price": str(deposit.amount),
+            "goodsName": "복권예치금",
+            "vExp": self._get_tomorrow(),
+        }
+        resp = self._post_with_wait_retry(
+            self._assign_virtual_account_1,
+            data=init_body,
+            timeout=10,
+            max_attempts=15,
+            wait_seconds=2,
+        )
+        logger.debug(f"kbankInit status_code: {resp.status_code}")
+        logger.debug(f"kbankInit content-type: {resp.headers.get('Content-Type', '')}")
 
-            전용가상계좌, 결제신청금액, bank_name_from_html = self._extract_virtual_account_from_html(resp.text)
-            if bank_name_from_html:
-                bank_name = bank_name_from_html
+        if resp.status_code != 200:
+            raise RuntimeError(f"kbankInit 요청 실패 (status: {resp.status_code})")
+        if self._is_wait_page(resp.text):
+            self._save_debug_html("kbankInit_last.html", resp.text)
+            raise RuntimeError("결제 시스템 대기열로 인해 가상계좌 발급이 지연되고 있습니다. 동행복권 mndpChrg 페이지에서 대기열 해소 후 다시 시도해주세요.")
 
-            # 동행복권 응답 구조가 바뀌어 HTML 파싱이 실패해도
-            # 1차 응답 JSON 값을 이용해 결과를 반환할 수 있게 보완.
-            if not 전용가상계좌:
-                fallback_account = self._find_account_in_mapping(data)
-                if self._is_valid_virtual_account_candidate(fallback_account):
-                    전용가상계좌 = fallback_account
-            if not 결제신청금액:
-                결제신청금액 = self._format_won_text(self._pick_first(data, "amt", "Amt", default=deposit.amount))
+        data = None
+        try:
+            data = resp.json()
+            logger.debug(f"kbankInit json keys: {list(data.keys())}")
+        except Exception as json_error:
+            logger.warning(f"kbankInit non-json response: {type(json_error).__name__}: {json_error}")
+            doc = HtmlDocument(resp.text)
+            account_number, amount_text, bank_name_from_html = self._extract_virtual_account_from_html(doc)
+
+            # 사이트 응답이 이미 최종 결과 화면인 경우
+            if account_number:
+                if not amount_text:
+                    amount_text = self._format_won_text(deposit.amount)
+                bank_name = bank_name_from_html or self._bank_name_from_code("089")
+                return account_number, amount_text, bank_name, None
 
-            if not self._is_valid_virtual_account_candidate(전용가상계좌):
+            data = self._extract_hidden_inputs_from_html(doc)
+            if not data:
                 snippet = " ".join(resp.text.strip().split())[:200]
                 raise RuntimeError(
-                    "유효한 가상계좌 번호를 찾지 못했습니다. "
-                    f"(candidate: {전용가상계좌}, kbankProcess status: {resp.status_code}, snippet: {snippet})"
+                    "kbankInit 응답을 파싱하지 못했습니다. " f"(status: {resp.status_code}, content-type: {resp.headers.get('Content-Type', '')}, snippet: {snippet})"
                 )
+            logger.debug(f"kbankInit html input keys: {list(data.keys())}")
+
+        account_no = self._find_account_in_mapping(data)
+        amount_value = self._pick_first(data, "amt", "Amt", "price", default=str(deposit.amount))
+        buyer_name = str(self._pick_first(data, "BuyerName", "VBankAccountName", default="")).strip()
+        bank_code = str(self._pick_first(data, "VbankBankCode", default="089")).zfill(3)
+        bank_name = self._pick_first(data, "VbankBankName", "VBankName", default="") or self._bank_name_from_code(bank_code)
+
+        body = {
+            "PayMethod": "VBANK",
+            "GoodsName": self._pick_first(data, "GoodsName", default="복권예치금"),
+            "GoodsCnt": "",
+            "BuyerTel": self._pick_first(data, "BuyerTel"),
+            "Moid": self._pick_first(data, "Moid"),
+            "MID": self._pick_first(data, "MID"),
+            "UserIP": self._pick_first(data, "UserIP"),
+            "MallIP": self._pick_first(data, "MallIP"),
+            "MallUserID": self._pick_first(data, "MallUserID"),
+            "VbankExpDate": self._pick_first(data, "VbankExpDate", default=self._get_tomorrow()),
+            "BuyerEmail": self._pick_first(data, "BuyerEmail"),
+            # "SocketYN": '',
+            # "GoodsCl": '',
+            # "EncodeParameters": '',
+            "EdiDate": self._pick_first(data, "EdiDate"),
+            "EncryptData": self._pick_first(data, "EncryptData"),
+            "Amt": amount_value,
+            "BuyerName": buyer_name,
+            "VbankBankCode": bank_code,
+            "VbankNum": account_no,
+            "FxVrAccountNo": self._pick_first(data, "FxVrAccountNo", default=account_no),
+            "VBankAccountName": self._pick_first(data, "VBankAccountName", "BuyerName", default=buyer_name),
+            "svcInfoPgMsgYn": self._pick_first(data, "svcInfoPgMsgYn", default="N"),
+            "OptionList": self._pick_first(data, "OptionList", default="no_receipt"),
+            "TransType": self._pick_first(data, "TransType", default="0"),  # 일반(0), 에스크로(1)
+            # "TrKey": None,
+        }
 
-            self._publish_virtual_account_result(전용가상계좌, 결제신청금액, bank_name, buyer_name)
-        except RuntimeError:
-            raise
-        except Exception as e:
-            raise RuntimeError(f"❗ 가상계좌를 할당하지 못했습니다. (상세: {type(e).__name__}: {e})")
+        if not body["VbankNum"] and body["FxVrAccountNo"]:
+            body["VbankNum"] = self._normalize_account_candidate(body["FxVrAccountNo"])
+        if not body["FxVrAccountNo"] and body["VbankNum"]:
+            body["FxVrAccountNo"] = body["VbankNum"]
+        if not body["Amt"]:
+            body["Amt"] = str(deposit.amount)
+        logger.debug(f"body: {body}")
 
-    def _get_tomorrow(self):
-        korea_tz = pytz.timezone("Asia/Seoul")
-        now = datetime.datetime.now(korea_tz)
-        tomorrow = now + datetime.timedelta(days=1)
-        return tomorrow.strftime("%Y%m%d")
+        process_headers = {
+            "Origin": self._base_url,
+            "Referer": self._assign_virtual_account_1,
+        }
+        resp = self._post_with_wait_retry(
+            self._assign_virtual_account_2,
+            headers=process_headers,
+            data=body,
+            timeout=10,
+            max_attempts=10,
+            wait_seconds=2,
+        )
+        logger.debug(f"kbankProcess status: {resp.status_code}")
+        logger.debug(f"kbankProcess content-type: {resp.headers.get('Content-Type', '')}")
+        if resp.status_code != 200:
+            raise RuntimeError(f"kbankProcess 요청 실패 (status: {resp.status_code})")
+        if self._is_wait_page(resp.text):
+            self._save_debug_html("kbankProcess_last.html", resp.text)
+            raise RuntimeError("결제 시스템 대기열이 길어 가상계좌 정보를 확인하지 못했습니다. 동행복권 mndpChrg 페이지에서 대기열 해소 후 다시 시도해주세요.")
+
+        전용가상계좌, 결제신청금액, bank_name_from_html = self._extract_virtual_account_from_html(resp.text)
+        if bank_name_from_html:
+            bank_name = bank_name_from_html
+
+        # 동행복권 응답 구조가 바뀌어 HTML 파싱이 실패해도
+        # 1차 응답 JSON 값을 이용해 결과를 반환할 수 있게 보완.
+        if not 전용가상계좌:
+            fallback_account = self._find_account_in_mapping(data)
+            if self._is_valid_virtual_account_candidate(fallback_account):
+                전용가상계좌 = fallback_account
+        if not 결제신청금액:
+            결제신청금액 = self._format_won_text(self._pick_first(data, "amt", "Amt", default=deposit.amount))
+
+        if not self._is_valid_virtual_account_candidate(전용가상계좌):
+            snippet = " ".join(resp.text.strip().split())[:200]
+            raise RuntimeError("유효한 가상계좌 번호를 찾지 못했습니다. " f"(candidate: {전용가상계좌}, kbankProcess status: {resp.status_code}, snippet: {snippet})")
+
+        return 전용가상계좌, 결제신청금액, bank_name, buyer_name
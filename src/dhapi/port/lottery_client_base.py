@@ -0,0 +1,985 @@
+import abc
+import contextlib
+import datetime
+import json
+import logging
+import re
+from pathlib import Path
+from typing import List, Dict
+from urllib.parse import urlsplit, urljoin
+
+import pytz
+from Crypto.PublicKey import RSA
+from Crypto.Cipher import PKCS1_v1_5
+
+from dhapi.domain.lotto645_draw import current_selling_round
+from dhapi.domain.lotto645_ticket import Lotto645Ticket, Lotto645Mode
+from dhapi.domain.user import User
+from dhapi.port.html_document import HtmlDocument
+from dhapi.port.payload_index import PayloadIndex
+from dhapi.port.rate_limiter import RateLimitConfig
+from dhapi.port.site_override import origin_of, resolve_site, site_overrides
+from dhapi.port.virtual_account_rules import (
+    ACCOUNT_HOLDER_PATTERN,
+    AMOUNT_PATTERN,
+    BANK_CODE_TO_NAME,
+    BANK_PATTERN,
+    find_account,
+    is_valid_account_candidate,
+    normalize_account_candidate,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class LotteryClientBase(abc.ABC):
+    """동기/비동기 클라이언트가 공유하는 사이트 정보와 요청 생성/응답 파싱 로직.
+
+    네트워크 I/O는 하위 클래스(LotteryClient, AsyncLotteryClient)에서만 수행한다.
+    """
+
+    _base_url = "https://www.dhlottery.co.kr"
+    _login_page = "/login"
+    _rsa_key_url = "/login/selectRsaModulus.do"
+    _login_url = "/login/securityLoginCheck.do"
+    _buy_lotto645_url = "https://ol.dhlottery.co.kr/olotto/game/execBuy.do"
+    _ready_socket = "https://ol.dhlottery.co.kr/olotto/game/egovUserReadySocket.json"
+    _game645_page = "https://ol.dhlottery.co.kr/olotto/game/game645.do"
+    _cash_balance = "https://www.dhlottery.co.kr/mypage/home"
+    _user_mndp_url = "https://www.dhlottery.co.kr/mypage/selectUserMndp.do"
+    _mndp_charge_page = "https://www.dhlottery.co.kr/mypage/mndpChrg"
+    _assign_virtual_account_1 = "https://www.dhlottery.co.kr/kbank.do?method=kbankInit"
+    _assign_virtual_account_2 = "https://www.dhlottery.co.kr/kbank.do?method=kbankProcess"
+    _tracer_domain = "tracer.dhlottery.co.kr"
+    _tracer_check_bot = "https://{domain}:48081/TRACERAPI/checkBotIp.do"
+    _tracer_input_queue = "https://{domain}:48081/TRACERAPI/inputQueue.do"
+    _lotto_buy_list_url = "https://www.dhlottery.co.kr/mypage/selectMyLotteryledger.do"
+    _lotto_buy_list_page = "https://www.dhlottery.co.kr/mypage/mylotteryledger"
+    _lotto645_ticket_detail_url = "https://www.dhlottery.co.kr/mypage/lotto645TicketDetail.do"
+    _my_home_info_url = "https://www.dhlottery.co.kr/mypage/selectMyHomeInfo.do"
+    _smrt_charge_info_url = "https://www.dhlottery.co.kr/mypage/selectSmrtChrgInfo.do"
+    _mypage_kbank_init_url = "https://www.dhlottery.co.kr/mypage/kbankInit.do"
+    _mypage_kbank_process_url = "https://www.dhlottery.co.kr/mypage/kbankProcess.do"
+    _BUY_LIST_HEADERS = ["구입일자", "복권명", "회차", "선택번호/복권번호", "구입매수", "당첨결과", "당첨금", "추첨일"]
+    _BUY_LIST_PAGE_SIZE = 100
+    _BUY_LIST_WINDOW_DAYS = 31
+    _LOTTO645_GAME_TYPES = {1: "수동", 2: "반자동", 3: "자동"}
+    # 상세 번호 조회 속도/동시 요청 수 기본값. DHAPI_DETAIL_* 환경변수로 바꿀 수 있다. (rate_limiter.py 참고)
+    _DETAIL_LIMITS = RateLimitConfig(rate=2.0, min_rate=0.5, max_rate=8.0, max_workers=4)
+    _PROBE_MAX_WORKERS = 6
+    _PROBE_DEADLINE_SECONDS = 30
+    _PROBE_TIMEOUT_SECONDS = 10
+    # 추측한 엔드포인트에 보내는 POST는 계좌 발급/변경을 일으킬 수 있으므로 조회(GET)와 나눠 발급 단계에서 하나씩 실행한다.
+    _READ_ONLY_PROBE_METHODS = ("GET",)
+    _MUTATING_PROBE_METHODS = ("POST_JSON", "POST_FORM")
+    _DEFAULT_HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.9",
+        "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+        "Connection": "keep-alive",
+        "Cache-Control": "max-age=0",
+        "sec-ch-ua": '"Google Chrome";v="131", "Chromium";v="131", "Not_A Brand";v="24"',
+        "sec-ch-ua-mobile": "?0",
+        "sec-ch-ua-platform": '"macOS"',
+        "Upgrade-Insecure-Requests": "1",
+        "Sec-Fetch-Site": "none",
+        "Sec-Fetch-Mode": "navigate",
+        "Sec-Fetch-User": "?1",
+        "Sec-Fetch-Dest": "document",
+    }
+
+    def __init__(self, user_profile: User, lottery_endpoint, session_store=None, *, site=None):
+        self._user_id = user_profile.username
+        self._user_pw = user_profile.password
+        self._lottery_endpoint = lottery_endpoint
+        self._session_store = session_store
+        # site: 동행복권 대신 요청을 보낼 주소 (부하 테스트용 가짜 서버 등). 지정하지 않으면 DHAPI_SITE_URL 환경변수를 사용한다.
+        for name, url in site_overrides(type(self), resolve_site(site)).items():
+            setattr(self, name, url)
+        self._virtual_account_store = None
+        self._discovery_cache = None
+        # 마지막 assign_virtual_account에서 어떤 전략이 계좌를 찾았는지와 전략별 소요 시간 (VirtualAccountResolver.report)
+        self.last_virtual_account_resolution = None
+
+    def _detail_limits_from_environment(self):
+        return RateLimitConfig.from_environment(self._DETAIL_LIMITS)
+
+    @abc.abstractmethod
+    def _cookie_jar(self):
+        """전송 계층의 쿠키 저장소 (http.cookiejar.CookieJar). 각 클라이언트가 구현한다."""
+
+    def _save_session(self):
+        if self._session_store is not None:
+            self._session_store.save_jar(self._user_id, self._cookie_jar())
+
+    def _load_saved_session(self):
+        """저장된 세션 쿠키를 쿠키 저장소에 넣는다. 넣은 쿠키가 없으면 False"""
+        return self._session_store is not None and self._session_store.load_into(self._user_id, self._cookie_jar())
+
+    def _finish_session_restore(self, alive):
+        """_load_saved_session()으로 넣은 세션의 확인 결과를 반영한다. 만료됐으면 쿠키와 저장된 세션을 지운다."""
+        if alive:
+            logger.debug("저장된 세션을 재사용합니다.")
+            # 사용할 때마다 만료 시각을 연장한다.
+            self._save_session()
+            return True
+
+        logger.debug("저장된 세션이 만료되어 다시 로그인합니다.")
+        self._cookie_jar().clear()
+        self._session_store.clear(self._user_id)
+        return False
+
+    def _is_logged_in_response(self, status_code, content_type, load_json):
+        if status_code != 200 or "json" not in (content_type or "").lower():
+            return False
+        payload = load_json()
+        return isinstance(payload, dict) and isinstance(payload.get("data"), dict) and "userMndp" in payload["data"]
+
+    def _is_purchase_session_response(self, status_code):
+        """구매 도메인(ol) 확인 응답. 로그인 페이지로 보내지거나 ol 도메인 JSESSIONID가 없으면 만료로 본다."""
+        if status_code != 200:
+            return False
+        host = urlsplit(self._game645_page).hostname or ""
+        # domain이 비어 있는 쿠키는 어느 호스트의 세션인지 알 수 없으므로 인정하지 않는다.
+        domains = {cookie.domain.lstrip(".") for cookie in self._cookie_jar() if cookie.name == "JSESSIONID" and cookie.domain}
+        return any(host == domain or host.endswith(f".{domain}") for domain in domains)
+
+    def _rsa_encrypt(self, plain_text, modulus_hex, exponent_hex):
+        n = int(modulus_hex, 16)
+        e = int(exponent_hex, 16)
+        key = RSA.construct((n, e))
+        cipher = PKCS1_v1_5.new(key)
+        encrypted = cipher.encrypt(plain_text.encode("utf-8"))
+        return encrypted.hex()
+
+    def _build_login_data(self, rsa_data):
+        if "data" not in rsa_data:
+            raise RuntimeError("RSA 키를 가져올 수 없습니다.")
+
+        rsa_modulus = rsa_data["data"]["rsaModulus"]
+        rsa_exponent = rsa_data["data"]["publicExponent"]
+        logger.debug(f"RSA key received, modulus length: {len(rsa_modulus)}")
+
+        encrypted_user_id = self._rsa_encrypt(self._user_id, rsa_modulus, rsa_exponent)
+        encrypted_password = self._rsa_encrypt(self._user_pw, rsa_modulus, rsa_exponent)
+        return {"userId": encrypted_user_id, "userPswdEncn": encrypted_password, "inpUserId": self._user_id}
+
+    def _check_login_response(self, status_code, url, html_text):
+        if status_code == 200 and "loginSuccess" in url:
+            return
+
+        error_button = HtmlDocument.of(html_text).soup.find("a", {"class": "btn_common"})
+        if error_button:
+            raise RuntimeError("로그인에 실패했습니다. 아이디 또는 비밀번호를 확인해주세요.")
+        raise RuntimeError(f"로그인에 실패했습니다. (Status: {status_code}, URL: {url})")
+
+    def _get_round(self):
+        """로또645 현재 판매 중인 회차 (한국 시각 기준, 매주 토요일 추첨)"""
+        round_number = current_selling_round()
+        logger.debug(f"Calculated round: {round_number}")
+        return round_number
+
+    def _calculate_draw_dates(self):
+        korea_tz = pytz.timezone("Asia/Seoul")
+        now = datetime.datetime.now(korea_tz)
+        today = now.date()
+        current_weekday = today.weekday()
+        days_until_saturday = (5 - current_weekday) % 7
+        draw_date = today + datetime.timedelta(days=days_until_saturday)
+        pay_limit_date = draw_date + datetime.timedelta(days=365)
+        return draw_date, pay_limit_date
+
+    @contextlib.contextmanager
+    def _buy_lotto645_errors(self):
+        """사유가 있는 구매 실패(RuntimeError)는 그대로, 그 밖의 예외는 알 수 없는 오류로 바꿔 전달한다."""
+        try:
+            yield
+        except RuntimeError:
+            raise
+        except Exception as error:
+            raise RuntimeError("❗ 로또6/45 구매에 실패했습니다. (사유: 알 수 없는 오류)") from error
+
+    def _buy_lotto645_request(self, tickets: List[Lotto645Ticket], ready_socket_text):
+        """readySocket.do 응답으로 구매 요청의 (form 데이터, 헤더)를 만든다."""
+        data = self._build_buy_lotto645_data(tickets, json.loads(ready_socket_text)["ready_ip"])
+        logger.debug(f"data: {data}")
+        return data, {"Referer": self._game645_page, "Origin": origin_of(self._game645_page)}
+
+    def _publish_buy_lotto645_result(self, response_text):
+        self._lottery_endpoint.print_result_of_buy_lotto645(self._parse_buy_lotto645_response(response_text))
+
+    def _build_buy_lotto645_data(self, tickets: List[Lotto645Ticket], direct):
+        round_number = self._get_round()
+        draw_date, pay_limit_date = self._calculate_draw_dates()
+
+        return {
+            "round": str(round_number),
+            "direct": direct,
+            "nBuyAmount": str(1000 * len(tickets)),
+            "param": self._make_buy_loyyo645_param(tickets),
+            "ROUND_DRAW_DATE": draw_date.strftime("%Y/%m/%d"),
+            "WAMT_PAY_TLMT_END_DT": pay_limit_date.strftime("%Y/%m/%d"),
+            "gameCnt": len(tickets),
+            "saleMdaDcd": "10",
+        }
+
+    def _parse_buy_lotto645_response(self, response_text):
+        logger.debug(f"response: {response_text}")
+
+        response = json.loads(response_text)
+        if not self._is_purchase_success(response):
+            raise RuntimeError(f"❗ 로또6/45 구매에 실패했습니다. (사유: {response['result']['resultMsg']})")
+
+        return self._format_lotto_numbers(response["result"]["arrGameChoiceNum"])
+
+    def _is_purchase_success(self, response):
+        return response["result"]["resultCode"] == "100"
+
+    def _make_buy_loyyo645_param(self, tickets: List[Lotto645Ticket]):
+        params = []
+        for i, t in enumerate(tickets):
+            if t.mode == Lotto645Mode.AUTO:
+                gen_type = "0"
+            elif t.mode == Lotto645Mode.MANUAL:
+                gen_type = "1"
+            elif t.mode == Lotto645Mode.SEMIAUTO:
+                gen_type = "2"
+            else:
+                raise RuntimeError(f"올바르지 않은 모드입니다. (mode: {t.mode})")
+            arr_game_choice_num = None if t.mode == Lotto645Mode.AUTO else ",".join(map(str, t.numbers))
+            alpabet = "ABCDE"[i]  # XXX: 오타 아님
+            slot = {
+                "genType": gen_type,
+                "arrGameChoiceNum": arr_game_choice_num,
+                "alpabet": alpabet,
+            }
+            params.append(slot)
+        return json.dumps(params)
+
+    def _format_lotto_numbers(self, lines: list) -> List[Dict]:
+        """
+        example: ["A|01|02|04|27|39|443", "B|11|23|25|27|28|452"]
+        """
+
+        mode_dict = {
+            "1": "수동",
+            "2": "반자동",
+            "3": "자동",
+        }
+
+        slots = []
+        for line in lines:
+            slot = {
+                "mode": mode_dict[line[-1]],
+                "slot": line[0],
+                "numbers": line[2:-1].split("|"),
+            }
+            slots.append(slot)
+        return slots
+
+    def _build_balance_summary(self, user_mndp_data, home_data=None):
+        user_mndp = user_mndp_data.get("data", {}).get("userMndp", {})
+
+        # 총예치금 계산 (웹사이트 JS 로직과 동일)
+        총예치금 = (
+            ((user_mndp.get("pntDpstAmt", 0) or 0) - (user_mndp.get("pntTkmnyAmt", 0) or 0))
+            + ((user_mndp.get("ncsblDpstAmt", 0) or 0) - (user_mndp.get("ncsblTkmnyAmt", 0) or 0))
+            + ((user_mndp.get("csblDpstAmt", 0) or 0) - (user_mndp.get("csblTkmnyAmt", 0) or 0))
+        )
+        구매가능금액 = user_mndp.get("crntEntrsAmt", 0) or 0
+        예약구매금액 = user_mndp.get("rsvtOrdrAmt", 0) or 0
+        출금신청중금액 = user_mndp.get("dawAplyAmt", 0) or 0
+        구매불가능금액 = 예약구매금액 + 출금신청중금액 + (user_mndp.get("feeAmt", 0) or 0)
+        최근1달누적구매금액 = (home_data or {}).get("data", {}).get("mnthPrchsAmt", 0)
+
+        return {
+            "총예치금": 총예치금,
+            "구매가능금액": 구매가능금액,
+            "예약구매금액": 예약구매금액,
+            "출금신청중금액": 출금신청중금액,
+            "구매불가능금액": 구매불가능금액,
+            "최근1달누적구매금액": 최근1달누적구매금액,
+        }
+
+    def _split_date_windows(self, start_dt, end_dt):
+        window_end = end_dt
+        while window_end >= start_dt:
+            window_start = max(start_dt, window_end - datetime.timedelta(days=self._BUY_LIST_WINDOW_DAYS - 1))
+            yield window_start, window_end
+            window_end = window_start - datetime.timedelta(days=1)
+
+    def _buy_list_page_params(self, start_dt, end_dt, page_num):
+        return {
+            "srchStrDt": start_dt.strftime("%Y%m%d"),
+            "srchEndDt": end_dt.strftime("%Y%m%d"),
+            "pageNum": page_num,
+            "recordCountPerPage": self._BUY_LIST_PAGE_SIZE,
+            "_": int(datetime.datetime.now().timestamp() * 1000),
+        }
+
+    def _buy_list_headers(self):
+        return {
+            "Accept": "application/json, text/javascript, */*; q=0.01",
+            "X-Requested-With": "XMLHttpRequest",
+            "Referer": self._lotto_buy_list_page,
+        }
+
+    def _check_buy_list_response(self, status_code, content_type, url):
+        if status_code != 200:
+            logger.error(f"API 요청 실패: {status_code}")
+            raise RuntimeError(f"구매 내역 조회 API 요청 실패 (Status: {status_code})")
+
+        if "application/json" not in content_type:
+            logger.error(f"JSON이 아닌 응답: {content_type}, URL: {url}")
+            raise RuntimeError("구매 내역 조회 API가 JSON을 반환하지 않았습니다. 세션이 만료되었을 수 있습니다.")
+
+    def _buy_list_page_data(self, response_data):
+        if not response_data or not isinstance(response_data.get("data"), dict):
+            return {}
+        return response_data["data"]
+
+    def _has_next_buy_list_page(self, data, page_num):
+        items = data.get("list") or []
+        if len(items) < self._BUY_LIST_PAGE_SIZE:
+            return False
+        total = self._parse_int(data.get("total"))
+        return not total or page_num * self._BUY_LIST_PAGE_SIZE < total
+
+    def _parse_int(self, value, default=0):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    def buy_list_date_range(self, start_date=None, end_date=None):
+        """show_buy_list/fetch_lotto645_games가 실제로 조회하는 기간 (YYYYMMDD, YYYYMMDD). 생략한 날짜는 최근 14일로 채운다."""
+        start_dt, end_dt = self._calculate_date_range(start_date, end_date)
+        return start_dt.strftime("%Y%m%d"), end_dt.strftime("%Y%m%d")
+
+    def _calculate_date_range(self, start_date, end_date):
+        today = datetime.date.today()
+
+        if start_date:
+            start_dt = datetime.datetime.strptime(start_date, "%Y%m%d").date()
+        else:
+            start_dt = today - datetime.timedelta(days=14)
+
+        if end_date:
+            end_dt = datetime.datetime.strptime(end_date, "%Y%m%d").date()
+        else:
+            end_dt = today
+        return start_dt, end_dt
+
+    def _build_buy_list_rows(self, items, details):
+        rows = []
+        for index, item in enumerate(items):
+            purchase_date = item.get("eltOrdrDt", "")
+            lottery_name = item.get("ltGdsNm", "")
+            round_no = item.get("ltEpsdView", "")
+            gm_info = item.get("gmInfo", "")
+            quantity = str(item.get("prchsQty", ""))
+            win_result = item.get("ltWnResult", "")
+            win_amt = item.get("ltWnAmt", 0) or 0
+            draw_date = item.get("epsdRflDt", "")
+
+            win_amt_str = f"{win_amt:,}원" if win_amt > 0 else "-"
+            numbers = details.get(index, gm_info)
+
+            rows.append([purchase_date, lottery_name, round_no, numbers, quantity, win_result, win_amt_str, draw_date])
+
+        return rows
+
+    def _has_lotto645_ticket_detail(self, item):
+        return bool(item.get("gmInfo") and item.get("ltGdsNm") == "로또6/45" and item.get("ntslOrdrNo"))
+
+    def _is_throttled_response(self, status_code, content_type, text):
+        if status_code == 429 or status_code >= 500:
+            return True
+        if "json" not in (content_type or "").lower():
+            return True
+        return self._is_wait_page(text)
+
+    def _lotto645_ticket_detail_params(self, ntsl_ordr_no, barcode, purchase_date):
+        purchase_dt = datetime.datetime.strptime(purchase_date, "%Y-%m-%d").date()
+        start_date = (purchase_dt - datetime.timedelta(days=7)).strftime("%Y%m%d")
+        end_date = (purchase_dt + datetime.timedelta(days=7)).strftime("%Y%m%d")
+        return {"ntslOrdrNo": ntsl_ordr_no, "srchStrDt": start_date, "srchEndDt": end_date, "barcd": barcode}
+
+    def _format_lotto645_ticket_detail(self, data):
+        if not data.get("data", {}).get("success"):
+            return "조회 실패"
+
+        ticket = data["data"]["ticket"]
+        game_dtl = ticket.get("game_dtl", [])
+
+        if not game_dtl:
+            return "번호 정보 없음"
+
+        result = []
+        for game in game_dtl:
+            idx = game.get("idx", "")
+            numbers = game.get("num", [])
+            game_type = self._LOTTO645_GAME_TYPES.get(game.get("type", 3), "자동")
+
+            if numbers:
+                numbers_str = " ".join(str(n) for n in numbers)
+                result.append(f"[{idx}] {game_type}: {numbers_str}")
+
+        return "\n".join(result) if result else "번호 확인 불가"
+
+    def _parse_lotto645_ticket_games(self, data):
+        """lotto645TicketDetail.do 응답 -> [{"slot", "mode", "numbers"}]. 조회 실패 응답이면 None"""
+        if not (data.get("data") or {}).get("success"):
+            return None
+
+        game_dtl = (data["data"].get("ticket") or {}).get("game_dtl") or []
+        return [
+            {"slot": game.get("idx", ""), "mode": self._LOTTO645_GAME_TYPES.get(game.get("type", 3), "자동"), "numbers": sorted(int(n) for n in game["num"])}
+            for game in game_dtl
+            if len(game.get("num") or []) == 6
+        ]
+
+    def _build_lotto645_purchase(self, item, games):
+        return {
+            "barcode": item.get("gmInfo", ""),
+            "order_no": item.get("ntslOrdrNo", ""),
+            "round": self._parse_int("".join(filter(str.isdigit, str(item.get("ltEpsdView", ""))))),
+            "purchase_date": item.get("eltOrdrDt", ""),
+            "games": games,
+        }
+
+    def _parse_digit(self, text):
+        return int("".join(filter(str.isdigit, text)))
+
+    def _format_won_text(self, value):
+        digits = "".join(filter(str.isdigit, str(value)))
+        if not digits:
+            return str(value)
+        return f"{int(digits):,}원"
+
+    def _save_debug_html(self, file_name, html_text):
+        try:
+            root_dir = Path(__file__).resolve().parents[3]
+            debug_dir = root_dir / "tmp_debug"
+            debug_dir.mkdir(parents=True, exist_ok=True)
+            (debug_dir / file_name).write_text(html_text, encoding="utf-8")
+        except Exception as error:
+            logger.debug(f"failed to save debug html ({file_name}): {type(error).__name__}: {error}")
+
+    def _save_debug_json(self, file_name, payload):
+        try:
+            root_dir = Path(__file__).resolve().parents[3]
+            debug_dir = root_dir / "tmp_debug"
+            debug_dir.mkdir(parents=True, exist_ok=True)
+            (debug_dir / file_name).write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        except Exception as error:
+            logger.debug(f"failed to save debug json ({file_name}): {type(error).__name__}: {error}")
+
+    def _bank_name_from_code(self, bank_code):
+        if bank_code is None:
+            return None
+        return BANK_CODE_TO_NAME.get(str(bank_code).zfill(3))
+
+    def _pick_first(self, data, *keys, default=""):
+        for key in keys:
+            value = data.get(key)
+            if value not in (None, ""):
+                return value
+        return default
+
+    def _normalize_account_candidate(self, raw):
+        return normalize_account_candidate(raw)
+
+    def _is_valid_virtual_account_candidate(self, candidate):
+        if not candidate:
+            return False
+        return is_valid_account_candidate(normalize_account_candidate(candidate))
+
+    def _find_account_in_mapping(self, data):
+        if not isinstance(data, dict):
+            return ""
+        return self._find_account_in_index(PayloadIndex(data, recursive=False))
+
+    def _find_account_in_index(self, index):
+        # 우선순위가 높은 키 → 기타 키 중 계좌번호로 보이는 값
+        for candidate in index.candidates("account"):
+            account = self._normalize_account_candidate(candidate.value)
+            if self._is_valid_virtual_account_candidate(account):
+                return account
+        return ""
+
+    def _extract_hidden_inputs_from_html(self, html_text):
+        fields = {}
+        for elem in HtmlDocument.of(html_text).soup.select("input[name]"):
+            name = elem.get("name")
+            if not name:
+                continue
+            if name not in fields:
+                fields[name] = elem.get("value", "")
+        return fields
+
+    def _extract_virtual_account_from_html(self, html_text):
+        """
+        :param html_text: HTML 문자열 또는 HtmlDocument. 여러 추출기에 같은 응답을 넘길 때는 HtmlDocument를 재사용한다.
+        """
+        doc = HtmlDocument.of(html_text)
+        account_number = None
+        amount_text = None
+        bank_name = None
+
+        contents = doc.soup.select_one("#contents")
+        if contents is not None:
+            account_elem = contents.select_one("span")
+            amount_elem = contents.select_one(".color_key1")
+            if account_elem is not None:
+                candidate = self._normalize_account_candidate(account_elem.get_text(strip=True))
+                if self._is_valid_virtual_account_candidate(candidate):
+                    account_number = candidate
+            if amount_elem is not None:
+                amount_text = amount_elem.get_text(strip=True)
+
+        plain_text = doc.plain_text
+
+        # 계좌 키워드/은행명 주변 숫자만 추출 (전역 숫자 탐색 금지)
+        if not account_number:
+            found = find_account(plain_text, doc.html)
+            if found:
+                account_number, bank_name, rule_name = found
+                logger.debug(f"virtual account matched by rule: {rule_name}")
+
+        if not amount_text:
+            amount_match = AMOUNT_PATTERN.search(plain_text)
+            if amount_match:
+                amount_text = amount_match.group(0).replace(" ", "")
+
+        bank_match = BANK_PATTERN.search(plain_text)
+        if bank_match:
+            bank_name = bank_match.group(1)
+
+        return account_number, amount_text, bank_name
+
+    def _extract_account_holder_from_html(self, html_text):
+        doc = HtmlDocument.of(html_text)
+        if not doc:
+            return None
+        holder_match = ACCOUNT_HOLDER_PATTERN.search(doc.plain_text)
+        if not holder_match:
+            return None
+        holder = holder_match.group(1).strip()
+        if not holder:
+            return None
+        return holder
+
+    def _find_bank_name_in_index(self, index):
+        for candidate in index.candidates("bank"):
+            if candidate.priority:
+                value = str(candidate.value).strip() if candidate.value not in (None, "") else ""
+                if not value:
+                    continue
+                if re.fullmatch(r"\d{3}", value):
+                    code_name = self._bank_name_from_code(value)
+                    if code_name:
+                        return code_name
+                return value
+
+            if "bankcode" in candidate.key.lower():
+                bank_name = self._bank_name_from_code(candidate.value)
+                if bank_name:
+                    return bank_name
+            if candidate.value in (None, ""):
+                continue
+            value = str(candidate.value).strip()
+            if value and any(bank_name in value for bank_name in BANK_CODE_TO_NAME.values()):
+                return value
+        return None
+
+    def _find_account_holder_in_index(self, index):
+        for candidate in index.candidates("holder"):
+            if candidate.value in (None, ""):
+                continue
+            holder = str(candidate.value).strip()
+            if holder and 1 < len(holder) <= 30:
+                return holder
+        return None
+
+    def _find_amount_text_in_index(self, index):
+        for candidate in index.candidates("amount"):
+            if candidate.value not in (None, ""):
+                return self._format_won_text(candidate.value)
+        return None
+
+    def _extract_virtual_account_fields_from_payload(self, payload, default_amount=None):
+        """
+        :param payload: JSON 응답 또는 PayloadIndex. 같은 응답을 여러 번 찾을 때는 PayloadIndex를 재사용한다.
+        """
+        index = PayloadIndex.of(payload)
+        account_number = self._find_account_in_index(index)
+        bank_name = self._find_bank_name_in_index(index)
+        account_holder = self._find_account_holder_in_index(index)
+        amount_text = self._find_amount_text_in_index(index)
+
+        if not amount_text and default_amount is not None:
+            amount_text = self._format_won_text(default_amount)
+
+        if bank_name is None:
+            # 케이뱅크는 동행복권 가상계좌 대표 은행.
+            bank_name = self._bank_name_from_code("089")
+
+        return account_number, amount_text, bank_name, account_holder
+
+    def _ajax_json_headers(self, referer):
+        menu_uri = urlsplit(referer).path or "/"
+        return {
+            "Accept": "application/json, text/javascript, */*; q=0.01",
+            "X-Requested-With": "XMLHttpRequest",
+            "Referer": referer,
+            "AJAX": "true",
+            "requestMenuUri": menu_uri,
+        }
+
+    def _normalize_url(self, raw_path, referer=None):
+        if not raw_path:
+            return None
+        path = raw_path.strip()
+        if path.startswith(("http://", "https://")):
+            return path
+        if path.startswith("//"):
+            return f"https:{path}"
+        if referer:
+            return urljoin(referer, path)
+        return urljoin(self._base_url + "/", path)
+
+    def _normalize_do_endpoint(self, raw_path):
+        return self._normalize_url(raw_path, referer=self._base_url)
+
+    def _extract_script_sources(self, html_text, referer):
+        doc = HtmlDocument.of(html_text)
+        if not doc:
+            return []
+
+        sources = []
+        for script in doc.soup.select("script[src]"):
+            raw_src = script.get("src")
+            src = self._normalize_url(raw_src, referer=referer)
+            if not src:
+                continue
+            if not src.endswith(".js") and ".js?" not in src:
+                continue
+            if src not in sources:
+                sources.append(src)
+        return sources
+
+    def _discover_account_related_endpoints(self, html_text, script_texts=None):
+        doc = HtmlDocument.of(html_text)
+        if not doc:
+            return []
+
+        if script_texts is None:
+            script_texts = []
+        combined_text = doc.html + "\n" + "\n".join(script_texts)
+
+        endpoint_set = set()
+        patterns = [
+            r'ajaxUtil\.sendHttpJson\([^,]+,\s*[\'"]([^\'"]+\.do(?:\?method=[A-Za-z0-9_]+)?)',
+            r'[\'"](/mypage/[A-Za-z0-9_/\-]+\.do(?:\?method=[A-Za-z0-9_]+)?)[\'"]',
+            r'[\'"](/kbank\.do\?method=[A-Za-z0-9_]+)[\'"]',
+        ]
+        for pattern in patterns:
+            for raw in re.findall(pattern, combined_text):
+                endpoint = self._normalize_do_endpoint(raw)
+                if endpoint:
+                    endpoint_set.add(endpoint)
+
+        def score(url):
+            url_l = url.lower()
+            s = 0
+            for token in ("mndp", "chrg", "kbank", "vbank", "account", "actno", "vact", "dpst", "charge"):
+                if token in url_l:
+                    s += 3
+            for token in ("select", "get", "search"):
+                if token in url_l:
+                    s += 2
+            return s
+
+        ranked = []
+        for url in endpoint_set:
+            url_l = url.lower()
+            if "/mypage/" not in url_l:
+                continue
+            if not any(token in url_l for token in ("select", "get", "search")):
+                continue
+            if score(url) < 3:
+                continue
+            ranked.append(url)
+        ranked.sort(key=score, reverse=True)
+        return ranked
+
+    def _try_extract_account_from_endpoint_response(self, resp, default_amount):
+        content_type = (resp.headers.get("Content-Type") or "").lower()
+        if "json" in content_type:
+            payload = resp.json()
+            account_number, amount_text, bank_name, account_holder = self._extract_virtual_account_fields_from_payload(
+                payload,
+                default_amount=default_amount,
+            )
+            if self._is_valid_virtual_account_candidate(account_number):
+                return account_number, amount_text, bank_name, account_holder
+            return None
+
+        if "html" in content_type:
+            return self._extract_account_from_html_page(HtmlDocument(resp.text), default_amount)
+
+        return None
+
+    def _find_mapping_by_keys(self, payload, key_candidates):
+        return PayloadIndex.of(payload).find_mapping_with_keys(key_candidates)
+
+    def _find_dict_value_by_key(self, payload, target_key):
+        return PayloadIndex.of(payload).find_mapping(target_key)
+
+    def _check_smrt_charge_info(self, status_code, content_type, load_json):
+        if status_code != 200 or "json" not in (content_type or "").lower():
+            return
+        try:
+            smrt_payload = load_json()
+            easy_user = smrt_payload.get("data", {}).get("easyChargeUser") if isinstance(smrt_payload, dict) else None
+            if isinstance(easy_user, dict) and easy_user.get("maintenaceUseYn") == "Y":
+                logger.warning("selectSmrtChrgInfo indicates maintenance window for charge flow")
+        except Exception:
+            pass
+
+    def _mypage_kbank_json_payload(self, name, status_code, content_type, load_json):
+        if status_code != 200:
+            logger.warning(f"mypage {name}.do status: {status_code}")
+            return None
+        if "json" not in (content_type or "").lower():
+            logger.warning(f"mypage {name}.do non-json content-type: {content_type}")
+            return None
+        return load_json()
+
+    def _mypage_kbank_process_request(self, status_code, content_type, load_json, deposit):
+        """kbankInit.do 응답으로 kbankProcess.do 요청을 준비한다. (reqVO, 요청 파라미터) 또는 진행할 수 없으면 None"""
+        init_payload = self._mypage_kbank_json_payload("kbankInit", status_code, content_type, load_json)
+        if init_payload is None:
+            return None
+
+        self._save_debug_json("mypage_kbankInit_last.json", init_payload)
+        req_vo = self._find_mypage_kbank_req_vo(init_payload)
+        if not req_vo:
+            logger.warning("mypage kbankInit.do returned no reqVO-like payload")
+            return None
+        return req_vo, self._build_mypage_kbank_process_params(req_vo, deposit)
+
+    def _mypage_kbank_account(self, status_code, content_type, load_json, req_vo, deposit):
+        """kbankProcess.do 응답에서 가상계좌 정보를 꺼낸다."""
+        process_payload = self._mypage_kbank_json_payload("kbankProcess", status_code, content_type, load_json)
+        if process_payload is None:
+            return None
+
+        self._save_debug_json("mypage_kbankProcess_last.json", process_payload)
+        return self._parse_mypage_kbank_process_payload(process_payload, req_vo, deposit)
+
+    def _build_mypage_kbank_init_params(self, deposit):
+        return {
+            "VbankExpDate": self._get_tomorrow(),
+            "PayMethod": "VBANK",
+            "VbankBankCode": "089",
+            "Price": str(deposit.amount),
+        }
+
+    def _find_mypage_kbank_req_vo(self, init_payload):
+        index = PayloadIndex.of(init_payload)
+        req_vo = self._find_dict_value_by_key(index, "reqVO")
+        if req_vo:
+            return req_vo
+        return self._find_mapping_by_keys(
+            index,
+            (
+                "payMethod",
+                "goodsName",
+                "moid",
+                "userIP",
+                "mallUserID",
+                "vbankExpDate",
+                "amt",
+                "vbankBankCode",
+                "fxVrAccountNo",
+                "buyerName",
+            ),
+        )
+
+    def _build_mypage_kbank_process_params(self, req_vo, deposit):
+        return {
+            "PayMethod": self._pick_first(req_vo, "payMethod", "PayMethod", default="VBANK"),
+            "GoodsName": self._pick_first(req_vo, "goodsName", "GoodsName", default="복권예치금"),
+            "Moid": self._pick_first(req_vo, "moid", "Moid"),
+            "UserIP": self._pick_first(req_vo, "userIP", "UserIP"),
+            "MallUserID": self._pick_first(req_vo, "mallUserID", "MallUserID"),
+            "VbankExpDate": self._pick_first(req_vo, "vbankExpDate", "VbankExpDate", default=self._get_tomorrow()),
+            "Amt": self._pick_first(req_vo, "amt", "Amt", default=str(deposit.amount)),
+            "VbankBankCode": self._pick_first(req_vo, "vbankBankCode", "VbankBankCode", default="089"),
+            "VbankNum": self._pick_first(req_vo, "fxVrAccountNo", "vbankNum", "VbankNum"),
+            "FxVrAccountNo": self._pick_first(req_vo, "fxVrAccountNo", "FxVrAccountNo", "vbankNum", "VbankNum"),
+            "VBankAccountName": self._pick_first(req_vo, "buyerName", "VBankAccountName", "BuyerName"),
+        }
+
+    def _parse_mypage_kbank_process_payload(self, process_payload, req_vo, deposit):
+        index = PayloadIndex.of(process_payload)
+        res_vo = self._find_dict_value_by_key(index, "resVO")
+        if not res_vo:
+            res_vo = self._find_mapping_by_keys(
+                index,
+                (
+                    "vbankNum",
+                    "vbankBankName",
+                    "resultCode",
+                    "amt",
+                    "mallUserIDMask",
+                    "payMethodName",
+                ),
+            )
+        if not res_vo:
+            logger.warning("mypage kbankProcess.do returned no resVO-like payload")
+            return None
+
+        result_code = str(self._pick_first(res_vo, "resultCode", default="")).upper()
+        account_number_raw = self._pick_first(res_vo, "vbankNum", "VbankNum")
+        if not account_number_raw:
+            account_number_raw = self._pick_first(req_vo, "fxVrAccountNo", "FxVrAccountNo", "vbankNum", "VbankNum")
+        account_number = self._normalize_account_candidate(account_number_raw)
+        if result_code == "FAIL" and not self._is_valid_virtual_account_candidate(account_number):
+            logger.warning("mypage kbankProcess.do resultCode=FAIL")
+            return None
+
+        if not self._is_valid_virtual_account_candidate(account_number):
+            logger.warning("mypage kbankProcess.do returned invalid account candidate: " f"{account_number} (raw={account_number_raw}, resVO_keys={list(res_vo.keys())[:20]})")
+            return None
+
+        amount_text = self._format_won_text(self._pick_first(res_vo, "amt", "Amt", default=self._pick_first(req_vo, "amt", "Amt", default=deposit.amount)))
+        bank_name = (
+            self._pick_first(res_vo, "vbankBankName", "VbankBankName", default="")
+            or self._bank_name_from_code(self._pick_first(req_vo, "vbankBankCode", "VbankBankCode", default="089"))
+            or self._bank_name_from_code("089")
+        )
+        account_holder = self._pick_first(res_vo, "vBankAccountName", "VBankAccountName", "buyerName") or self._pick_first(req_vo, "buyerName", "VBankAccountName")
+        logger.warning("virtual account found from mypage kbank flow (/mypage/kbankInit.do -> /mypage/kbankProcess.do)")
+        return account_number, amount_text, bank_name, account_holder
+
+    def _user_mndp_account(self, status_code, content_type, load_json, default_amount):
+        """selectUserMndp.do 응답에서 가상계좌 정보를 꺼낸다. 요청 자체의 오류는 각 클라이언트가 처리한다."""
+        if status_code != 200:
+            logger.debug(f"selectUserMndp status: {status_code}")
+            return None
+        if "json" not in (content_type or "").lower():
+            logger.debug(f"selectUserMndp non-json content-type: {content_type}")
+            return None
+        try:
+            return self._extract_account_from_payload(load_json(), default_amount)
+        except Exception as error:
+            logger.debug(f"selectUserMndp account lookup skipped: {type(error).__name__}: {error}")
+            return None
+
+    def _extract_account_from_payload(self, payload, default_amount):
+        account_number, amount_text, bank_name, account_holder = self._extract_virtual_account_fields_from_payload(
+            payload,
+            default_amount=default_amount,
+        )
+        if self._is_valid_virtual_account_candidate(account_number):
+            return account_number, amount_text, bank_name, account_holder
+        return None
+
+    def _extract_account_from_html_page(self, html_text, default_amount):
+        doc = HtmlDocument.of(html_text)
+        account_number, amount_text, bank_name = self._extract_virtual_account_from_html(doc)
+        account_holder = self._extract_account_holder_from_html(doc)
+        if self._is_valid_virtual_account_candidate(account_number):
+            if not amount_text:
+                amount_text = self._format_won_text(default_amount)
+            return account_number, amount_text, bank_name, account_holder
+        return None
+
+    def _extract_account_from_mndp_charge_html(self, html_text, default_amount):
+        doc = HtmlDocument.of(html_text)
+        found = self._extract_account_from_html_page(doc, default_amount)
+        if found:
+            return found
+        return self._extract_account_from_payload(self._extract_hidden_inputs_from_html(doc), default_amount)
+
+    def _extract_wait_context_from_html(self, html_text, request_url):
+        if not html_text:
+            return None
+
+        def _find_var(name):
+            pattern = rf'var\s+{re.escape(name)}\s*=\s*[\'"]([^\'"]+)[\'"]'
+            match = re.search(pattern, html_text)
+            if match:
+                return match.group(1).strip()
+            return None
+
+        parsed_url = urlsplit(request_url)
+        default_page_url = parsed_url.path.lstrip("/") if parsed_url.path else "main"
+        if parsed_url.query:
+            default_page_url = f"{default_page_url}?{parsed_url.query}"
+
+        context = {
+            "host": _find_var("host") or parsed_url.netloc or "www.dhlottery.co.kr",
+            "ip": _find_var("ip"),
+            "loginId": _find_var("loginId"),
+            "port": _find_var("port") or ("443" if parsed_url.scheme == "https" else "80"),
+            "pageUrl": _find_var("pageUrl") or default_page_url,
+            "tracer_domain": _find_var("tracer_domain") or self._tracer_domain,
+        }
+
+        if not context["ip"]:
+            return None
+        if not context["loginId"]:
+            context["loginId"] = context["ip"]
+        return context
+
+    def _parse_tracer_parameters(self, xml_text):
+        values = {}
+        if not xml_text:
+            return values
+        for key, value in re.findall(r'<Parameter\s+id="([^"]+)"[^>]*>(.*?)</Parameter>', xml_text, re.S):
+            values[key] = value.strip()
+        return values
+
+    def _is_wait_page(self, html_text):
+        if not html_text:
+            return False
+        # 일반 페이지에도 tracer 스크립트/DOM이 기본 포함되므로,
+        # wait 판별은 에러/점검 템플릿 마커가 있는 경우로 제한한다.
+        return "img_error.png" in html_text or "img_construction.png" in html_text
+
+    def _publish_virtual_account_result(self, account_number, amount_text, bank_name=None, account_holder=None, remember=True):
+        try:
+            self._lottery_endpoint.print_result_of_assign_virtual_account(account_number, amount_text, bank_name, account_holder)
+        except TypeError:
+            self._lottery_endpoint.print_result_of_assign_virtual_account(account_number, amount_text)
+
+        if remember:
+            self._remember_virtual_account(account_number, amount_text, bank_name, account_holder)
+
+    def _remember_virtual_account(self, account_number, amount_text, bank_name=None, account_holder=None, assigned_at=None):
+        if self._virtual_account_store is None or not self._is_valid_virtual_account_candidate(account_number):
+            return
+
+        now = datetime.datetime.now().isoformat(timespec="seconds")
+        record = {
+            "account": account_number,
+            "amount": amount_text,
+            "bank_name": bank_name,
+            "account_holder": account_holder,
+            "assigned_at": assigned_at or now,
+            "verified_at": now,
+        }
+        try:
+            self._virtual_account_store.save(self._user_id, record)
+        except Exception as error:
+            logger.debug(f"failed to save virtual account: {type(error).__name__}: {error}")
+
+    def _get_tomorrow(self):
+        korea_tz = pytz.timezone("Asia/Seoul")
+        now = datetime.datetime.now(korea_tz)
+        tomorrow = now + datetime.timedelta(days=1)
+        return tomorrow.strftime("%Y%m%d")
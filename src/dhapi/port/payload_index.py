@@ -0,0 +1,134 @@
+"""가상계좌 응답(JSON)에서 계좌번호/은행/예금주/금액 후보를 찾기 위한 색인.
+
+응답을 한 번만 순회하면서 키를 소문자로 정규화해 값과 경로를 모으고, 키마다 어떤 항목(KEY_CLASSES)의 후보인지 미리 분류해 둔다.
+항목별 후보는 원래 탐색 순서(바깥 mapping부터 전위 순회, mapping 안에서는 우선순위 키 → 나머지 키 순서)대로 저장되므로,
+앞에서부터 처음 유효한 값을 고르면 mapping마다 키를 다시 훑던 이전 방식과 같은 결과가 나온다.
+"""
+
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterator, List, NamedTuple, Tuple, Union
+
+
+class KeyClass(NamedTuple):
+    priority_keys: Tuple[str, ...]  # 대소문자까지 같은 키를 먼저 확인한다.
+    tokens: Tuple[str, ...]  # 소문자로 바꾼 키에 포함되면 후보로 본다.
+
+
+KEY_CLASSES = {
+    "account": KeyClass(
+        ("FxVrAccountNo", "VbankNum", "vbankNum", "AccountNo", "accountNo", "actNo", "ActNo", "vactNo", "VactNo", "fxdVactNo", "FxdVactNo"),
+        ("account", "vbank", "vr", "actno", "vact", "acct", "fxvr", "계좌"),
+    ),
+    "bank": KeyClass(("VbankBankName", "VBankName", "bankName", "bankNm", "bank"), ("bank", "은행")),
+    "holder": KeyClass(
+        ("VBankAccountName", "BuyerName", "accountHolder", "holderName", "depositorName", "dpstrNm", "예금주", "입금자", "계좌주"),
+        ("holder", "depositor", "buyer", "예금주", "입금자", "계좌주"),
+    ),
+    "amount": KeyClass(("Amt", "amt", "price", "payAmt", "amount"), ("amt", "amount", "price")),
+}
+
+Path = Tuple[Union[str, int], ...]
+
+
+class Candidate(NamedTuple):
+    priority: bool  # True: 우선순위 키로 찾은 값, False: 토큰이 포함된 키로 찾은 값
+    key: str
+    value: object
+    path: Path
+
+
+class _Entry(NamedTuple):
+    mapping_no: int
+    key: str
+    value: object
+    path: Path
+
+
+# 우선순위 키 → ((항목 이름, 순위), ...)
+_PRIORITY_RANKS: Dict[str, Tuple[Tuple[str, int], ...]] = {}
+for _name, _key_class in KEY_CLASSES.items():
+    for _rank, _key in enumerate(_key_class.priority_keys):
+        _PRIORITY_RANKS[_key] = _PRIORITY_RANKS.get(_key, ()) + ((_name, _rank),)
+
+
+@lru_cache(maxsize=4096)
+def key_classes(key: str) -> FrozenSet[str]:
+    """키가 후보가 되는 항목 이름들. 같은 키 이름이 응답마다 반복되므로 결과를 캐시한다."""
+    key_l = key.lower()
+    return frozenset(name for name, key_class in KEY_CLASSES.items() if any(token in key_l for token in key_class.tokens))
+
+
+@lru_cache(maxsize=4096)
+def _describe_key(key: str):
+    return key.lower(), key_classes(key), _PRIORITY_RANKS.get(key, ())
+
+
+class PayloadIndex:
+    """JSON 응답을 한 번 순회해 만든 키 색인.
+
+    recursive=False이면 가장 바깥 mapping의 키만 색인한다.
+    """
+
+    def __init__(self, payload, recursive: bool = True):
+        self.payload = payload
+        self._mappings: List[dict] = []
+        self._by_key: Dict[str, List[_Entry]] = {}
+        self._candidates: Dict[str, List[Candidate]] = {name: [] for name in KEY_CLASSES}
+        self._build(recursive)
+
+    @classmethod
+    def of(cls, source) -> "PayloadIndex":
+        if isinstance(source, PayloadIndex):
+            return source
+        return cls(source)
+
+    def _build(self, recursive):
+        stack = [(self.payload, ())]
+        while stack:
+            node, path = stack.pop()
+            if isinstance(node, dict):
+                children = self._index_mapping(node, path)
+            else:
+                children = [(value, path + (i,)) for i, value in enumerate(node) if isinstance(value, (dict, list))]
+            if recursive:
+                # 스택이므로 뒤에서부터 넣어야 앞의 값부터 꺼내진다. (전위 순회)
+                stack.extend(reversed(children))
+
+    def _index_mapping(self, mapping, path):
+        mapping_no = len(self._mappings)
+        self._mappings.append(mapping)
+
+        children = []
+        hits = []
+        for position, (key, value) in enumerate(mapping.items()):
+            key_str = key if isinstance(key, str) else str(key)
+            key_l, classes, priority_ranks = _describe_key(key_str)
+            key_path = path + (key,)
+            self._by_key.setdefault(key_l, []).append(_Entry(mapping_no, key_str, value, key_path))
+            if classes or priority_ranks:
+                hits.extend((0, rank, name, Candidate(True, key_str, value, key_path)) for name, rank in priority_ranks)
+                hits.extend((1, position, name, Candidate(False, key_str, value, key_path)) for name in classes)
+            if isinstance(value, (dict, list)):
+                children.append((value, key_path))
+
+        # mapping 안에서는 우선순위 키(순위 순) → 나머지 키(응답 순서) 순서로 후보를 쌓는다.
+        hits.sort(key=lambda hit: hit[:2])
+        for hit in hits:
+            self._candidates[hit[2]].append(hit[3])
+        return children
+
+    def candidates(self, name: str) -> Iterator[Candidate]:
+        """항목(KEY_CLASSES의 이름) 후보를 원래 탐색 순서대로 돌려준다."""
+        return iter(self._candidates[name])
+
+    def find_mapping(self, key: str) -> dict:
+        """key(대소문자 구분)의 값이 비어 있지 않은 dict인 첫 번째 값. 없으면 {}"""
+        for entry in self._by_key.get(key.lower(), ()):
+            if entry.key == key and isinstance(entry.value, dict) and entry.value:
+                return entry.value
+        return {}
+
+    def find_mapping_with_keys(self, keys) -> dict:
+        """keys 중 하나라도(대소문자 무시) 가진 첫 번째 mapping. 없으면 {}"""
+        mapping_nos = [self._by_key[key.lower()][0].mapping_no for key in keys if key.lower() in self._by_key]
+        return self._mappings[min(mapping_nos)] if mapping_nos else {}
@@ -0,0 +1,112 @@
+"""업스트림 요청 속도 제한.
+
+설정 (환경변수, 로또 상세 번호 조회)
+    DHAPI_DETAIL_RATE         시작 속도 (초당 요청 수, 기본 2)
+    DHAPI_DETAIL_MIN_RATE     제한 응답을 받았을 때 줄어드는 하한 (기본 0.5)
+    DHAPI_DETAIL_MAX_RATE     정상 응답이 이어질 때 늘어나는 상한 (기본 8)
+    DHAPI_DETAIL_MAX_WORKERS  동시에 보내는 요청 수 (기본 4)
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveRateLimiter:  # pylint: disable=too-many-instance-attributes
+    """스레드 안전한 토큰 버킷.
+
+    응답이 정상이면 속도를 조금씩 올리고(additive increase),
+    대기 페이지/429/5xx/JSON 아닌 응답을 받으면 절반으로 줄인다(multiplicative decrease).
+    """
+
+    def __init__(self, *, rate: float, min_rate: float, max_rate: float, burst: float = 1.0, increase_step: float = 0.5, decrease_factor: float = 0.5):
+        if not 0 < min_rate <= max_rate:
+            raise ValueError(f"올바르지 않은 속도 범위입니다. (min_rate: {min_rate}, max_rate: {max_rate})")
+
+        self._min_rate = min_rate
+        self._max_rate = max_rate
+        self._rate = min(max(rate, min_rate), max_rate)
+        self._burst = max(burst, 1.0)
+        self._increase_step = increase_step
+        self._decrease_factor = decrease_factor
+
+        self._tokens = self._burst
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def _refill(self, now):
+        self._tokens = min(self._burst, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+    def reserve(self) -> float:
+        """토큰 하나를 예약하고, 요청 전에 기다려야 하는 시간(초)을 반환한다."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            self._rate = min(self._max_rate, self._rate + self._increase_step)
+
+    def on_throttle(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            self._rate = max(self._min_rate, self._rate * self._decrease_factor)
+            # 이미 쌓인 토큰으로 바로 다시 몰아서 요청하지 않도록 비운다.
+            self._tokens = min(self._tokens, 0.0)
+            logger.debug(f"upstream throttling detected, rate is lowered to {self._rate:.2f}/s")
+
+
+@dataclass(frozen=True)
+class RateLimitConfig:
+    """AdaptiveRateLimiter의 속도 범위와 동시 요청 수 상한"""
+
+    rate: float
+    min_rate: float
+    max_rate: float
+    max_workers: int
+
+    @classmethod
+    def from_environment(cls, defaults: "RateLimitConfig", prefix: str = "DHAPI_DETAIL") -> "RateLimitConfig":
+        """defaults 중 {prefix}_RATE, {prefix}_MIN_RATE, {prefix}_MAX_RATE, {prefix}_MAX_WORKERS 환경변수가 있는 값을 바꾼다."""
+        overrides = {}
+        for field_name, parse in (("rate", float), ("min_rate", float), ("max_rate", float), ("max_workers", int)):
+            name = f"{prefix}_{field_name.upper()}"
+            value = os.environ.get(name)
+            if value is None:
+                continue
+            try:
+                overrides[field_name] = parse(value)
+            except ValueError as error:
+                raise RuntimeError(f"{name}는 {'정수' if parse is int else '숫자'}여야 합니다. (입력: {value})") from error
+
+        config = replace(defaults, **overrides)
+        if config.max_workers < 1 or not 0 < config.min_rate <= config.max_rate:
+            raise RuntimeError(f"{prefix}_* 설정이 올바르지 않습니다. (min_rate: {config.min_rate}, max_rate: {config.max_rate}, max_workers: {config.max_workers})")
+        return config
+
+    def new_limiter(self) -> AdaptiveRateLimiter:
+        return AdaptiveRateLimiter(rate=self.rate, min_rate=self.min_rate, max_rate=self.max_rate)
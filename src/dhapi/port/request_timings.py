@@ -0,0 +1,293 @@
+import logging
+import os
+import re
+import socket
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+logger = logging.getLogger(__name__)
+
+# 히스토그램 버킷 상한 (초). 마지막 버킷은 +Inf.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PHASES = ("dns", "connect", "ttfb", "total")
+
+_local = threading.local()
+
+
+class Histogram:
+    """고정 버킷 히스토그램. 백분위수는 값이 들어간 버킷의 상한으로 추정한다."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        index = 0
+        while index < len(BUCKETS) and seconds > BUCKETS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: Dict):
+        self.counts = [a + b for a, b in zip(self.counts, other["counts"])]
+        self.count += other["count"]
+        self.sum += other["sum"]
+        self.max = max(self.max, other["max"])
+
+    def percentile(self, percent: float) -> Optional[float]:
+        if not self.count:
+            return None
+        target = percent / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(BUCKETS[index], self.max) if index < len(BUCKETS) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict:
+        return {"counts": list(self.counts), "count": self.count, "sum": self.sum, "max": self.max}
+
+
+class EndpointStats:
+    def __init__(self):
+        self.histograms = {phase: Histogram() for phase in PHASES}
+        self.statuses: Dict[str, int] = {}
+        self.bytes = 0
+        self.wait_pages = 0
+        self.errors = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "histograms": {phase: histogram.to_dict() for phase, histogram in self.histograms.items()},
+            "statuses": dict(self.statuses),
+            "bytes": self.bytes,
+            "wait_pages": self.wait_pages,
+            "errors": self.errors,
+        }
+
+
+class RequestTimings:
+    """업스트림 요청을 (메서드, 엔드포인트)별 히스토그램으로 모은다.
+
+    enable()하기 전에는 LotteryClient가 TimingAdapter를 붙이지 않으므로 요청 경로에 추가 비용이 없다.
+    DHAPI_TIMINGS=1 환경변수로도 켤 수 있다. (batch 워커 프로세스, 웹 서버)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, EndpointStats] = {}
+        self._enabled = False
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled or os.environ.get("DHAPI_TIMINGS", "").lower() in {"1", "true", "yes"}
+
+    def enable(self):
+        self._enabled = True
+
+    def record(self, method: str, endpoint: str, *, status=None, size=0, timings=None, wait_page=False):
+        """
+        Args:
+            status: 응답 상태 코드. 연결 실패 등으로 응답이 없으면 None
+            timings: {"dns", "connect", "ttfb", "total"} 초 단위. 새 연결을 맺지 않은 요청에는 dns/connect가 없다.
+        """
+        key = f"{method.upper()} {endpoint}"
+        with self._lock:
+            stats = self._stats.setdefault(key, EndpointStats())
+            for phase, seconds in (timings or {}).items():
+                if seconds is not None:
+                    stats.histograms[phase].observe(seconds)
+            status_key = str(status) if status is not None else "error"
+            stats.statuses[status_key] = stats.statuses.get(status_key, 0) + 1
+            stats.bytes += size
+            stats.wait_pages += int(wait_page)
+            stats.errors += int(status is None or status >= 500)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {key: stats.to_dict() for key, stats in self._stats.items()}
+
+    def drain(self) -> Dict[str, Dict]:
+        """스냅샷을 돌려주고 비운다. (batch 워커가 프로필마다 결과를 넘길 때 사용)"""
+        with self._lock:
+            snapshot = {key: stats.to_dict() for key, stats in self._stats.items()}
+            self._stats.clear()
+            return snapshot
+
+    def merge(self, snapshot: Dict[str, Dict]):
+        with self._lock:
+            for key, data in (snapshot or {}).items():
+                stats = self._stats.setdefault(key, EndpointStats())
+                for phase, histogram in data["histograms"].items():
+                    stats.histograms[phase].merge(histogram)
+                for status, count in data["statuses"].items():
+                    stats.statuses[status] = stats.statuses.get(status, 0) + count
+                stats.bytes += data["bytes"]
+                stats.wait_pages += data["wait_pages"]
+                stats.errors += data["errors"]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def summary(self) -> List[Dict]:
+        """엔드포인트별 요약. 전체 소요 시간 합이 큰 순서."""
+        rows = []
+        with self._lock:
+            for key, stats in self._stats.items():
+                method, endpoint = key.split(" ", 1)
+                total = stats.histograms["total"]
+                row = {"method": method, "endpoint": endpoint, "count": total.count, "errors": stats.errors, "wait_pages": stats.wait_pages, "bytes": stats.bytes}
+                row["total_seconds"] = round(total.sum, 3)
+                for phase, histogram in stats.histograms.items():
+                    row[f"{phase}_mean_ms"] = round(histogram.sum / histogram.count * 1000, 1) if histogram.count else None
+                for percent in (50, 95, 99):
+                    value = total.percentile(percent)
+                    row[f"p{percent}_ms"] = round(value * 1000, 1) if value is not None else None
+                rows.append(row)
+        return sorted(rows, key=lambda row: row["total_seconds"], reverse=True)
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition 형식 (dhapi_upstream_request_seconds 히스토그램)"""
+        lines = ["# TYPE dhapi_upstream_request_seconds histogram", "# TYPE dhapi_upstream_response_bytes_total counter", "# TYPE dhapi_upstream_wait_pages_total counter"]
+        for key, data in sorted(self.snapshot().items()):
+            method, endpoint = key.split(" ", 1)
+            labels = f'method="{method}",endpoint="{endpoint}"'
+            for phase, histogram in data["histograms"].items():
+                cumulative = 0
+                for bound, count in zip(BUCKETS + ("+Inf",), histogram["counts"]):
+                    cumulative += count
+                    lines.append(f'dhapi_upstream_request_seconds_bucket{{{labels},phase="{phase}",le="{bound}"}} {cumulative}')
+                lines.append(f'dhapi_upstream_request_seconds_sum{{{labels},phase="{phase}"}} {histogram["sum"]:.6f}')
+                lines.append(f'dhapi_upstream_request_seconds_count{{{labels},phase="{phase}"}} {histogram["count"]}')
+            lines.append(f"dhapi_upstream_response_bytes_total{{{labels}}} {data['bytes']}")
+            lines.append(f"dhapi_upstream_wait_pages_total{{{labels}}} {data['wait_pages']}")
+        return "\n".join(lines) + "\n"
+
+
+REQUEST_TIMINGS = RequestTimings()
+
+
+def endpoint_template(url: str) -> str:
+    """쿼리를 빼고 숫자로만 된 경로 조각을 {n}으로 바꿔 같은 엔드포인트끼리 묶는다."""
+    parts = urlsplit(url)
+    path = re.sub(r"/\d+(?=/|$)", "/{n}", parts.path or "/")
+    return f"{parts.netloc}{path}"
+
+
+class _TimedConnectionMixin:
+    """새 연결을 맺을 때 DNS 조회와 연결(TCP + TLS) 시간을 현재 스레드의 측정값에 기록한다."""
+
+    def _new_conn(self):
+        timing = getattr(_local, "timing", None)
+        if timing is None:
+            return super()._new_conn()
+
+        host = self._dns_host
+        started = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except OSError:
+            return super()._new_conn()  # urllib3가 평소처럼 오류를 만든다.
+        timing["dns"] = time.perf_counter() - started
+
+        # 조회한 주소로 바로 연결해 같은 이름을 두 번 조회하지 않는다. 연결이 거부되면 원래 방식(모든 주소 시도)으로 다시 연결한다.
+        self._dns_host = addresses[0][4][0]
+        try:
+            return super()._new_conn()
+        except NewConnectionError:
+            if len(addresses) == 1:
+                raise
+            self._dns_host = host
+            return super()._new_conn()
+        finally:
+            self._dns_host = host
+
+    def connect(self):
+        timing = getattr(_local, "timing", None)
+        if timing is None:
+            return super().connect()
+
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            timing["connect"] = time.perf_counter() - started - timing.get("dns", 0.0)
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimingAdapter(HTTPAdapter):
+    """요청마다 엔드포인트, 상태 코드, 응답 크기, DNS/연결/TTFB/전체 시간, 대기열 페이지 여부를 RequestTimings에 기록한다.
+
+    Args:
+        is_wait_page: HTML 응답 본문이 대기열 페이지인지 판별하는 함수
+    """
+
+    def __init__(self, timings: RequestTimings = REQUEST_TIMINGS, is_wait_page: Optional[Callable[[str], bool]] = None, **kwargs):
+        self._timings = timings
+        self._is_wait_page = is_wait_page
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPConnectionPool, "https": _TimedHTTPSConnectionPool}
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        timing = {}
+        _local.timing = timing
+        started = time.perf_counter()
+        try:
+            resp = super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        except Exception:
+            timing["total"] = time.perf_counter() - started
+            self._timings.record(request.method, endpoint_template(request.url), timings=timing)
+            raise
+        finally:
+            _local.timing = None
+
+        timing["ttfb"] = time.perf_counter() - started
+        size = 0
+        if not stream:
+            size = len(resp.content)
+        timing["total"] = time.perf_counter() - started
+
+        self._timings.record(request.method, endpoint_template(request.url), status=resp.status_code, size=size, timings=timing, wait_page=self._wait_page(resp, stream))
+        return resp
+
+    def _wait_page(self, resp: requests.Response, stream: bool) -> bool:
+        if stream or self._is_wait_page is None or "text/html" not in (resp.headers.get("Content-Type") or "").lower():
+            return False
+        try:
+            return bool(self._is_wait_page(resp.text))
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            logger.debug(f"wait page check failed: {type(error).__name__}: {error}")
+            return False
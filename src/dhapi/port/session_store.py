@@ -0,0 +1,111 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import List, Dict, Optional
+
+from requests.cookies import create_cookie
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore:
+    """로그인 세션 쿠키를 계정별로 ~/.dhapi/sessions 아래에 보관한다."""
+
+    DEFAULT_TTL_SECONDS = 30 * 60
+
+    def __init__(self, directory: Optional[str] = None, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        self._directory = os.path.expanduser(directory or "~/.dhapi/sessions")
+        self._ttl_seconds = ttl_seconds
+
+    def _path(self, username: str) -> str:
+        # 파일명에 아이디가 그대로 드러나지 않도록 해시를 사용한다.
+        digest = hashlib.sha256(username.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self._directory, f"{digest}.json")
+
+    def load(self, username: str) -> Optional[List[Dict]]:
+        path = self._path(username)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "r", encoding="UTF-8") as f:
+                doc = json.load(f)
+        except (OSError, ValueError) as error:
+            logger.debug(f"failed to read session cache ({path}): {type(error).__name__}: {error}")
+            self.clear(username)
+            return None
+
+        if doc.get("username") != username or doc.get("expires_at", 0) < time.time():
+            logger.debug("session cache expired")
+            self.clear(username)
+            return None
+
+        return doc.get("cookies") or None
+
+    def save(self, username: str, cookies: List[Dict]):
+        os.makedirs(self._directory, mode=0o700, exist_ok=True)
+        path = self._path(username)
+        doc = {
+            "username": username,
+            "expires_at": time.time() + self._ttl_seconds,
+            "cookies": cookies,
+        }
+
+        tmp_path = f"{path}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="UTF-8") as f:
+                json.dump(doc, f)
+            os.replace(tmp_path, path)
+        except OSError as error:
+            logger.debug(f"failed to write session cache ({path}): {type(error).__name__}: {error}")
+
+    def save_jar(self, username: str, cookie_jar):
+        self.save(username, self.dump_cookies(cookie_jar))
+
+    def load_into(self, username: str, cookie_jar) -> bool:
+        """저장된 쿠키를 cookie_jar에 넣는다. 넣은 쿠키가 없으면 False"""
+        cookies = self.load(username)
+        if not cookies:
+            return False
+        self.restore_cookies(cookie_jar, cookies)
+        return True
+
+    def clear(self, username: str):
+        try:
+            os.remove(self._path(username))
+        except FileNotFoundError:
+            pass
+        except OSError as error:
+            logger.debug(f"failed to remove session cache: {type(error).__name__}: {error}")
+
+    @staticmethod
+    def dump_cookies(cookie_jar) -> List[Dict]:
+        return [
+            {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "secure": cookie.secure,
+                "expires": cookie.expires,
+            }
+            for cookie in cookie_jar
+        ]
+
+    @staticmethod
+    def restore_cookies(cookie_jar, cookies: List[Dict]):
+        """requests의 RequestsCookieJar, httpx의 Cookies.jar 등 http.cookiejar 호환 jar에 쿠키를 채운다."""
+        for cookie in cookies:
+            cookie_jar.set_cookie(
+                create_cookie(
+                    cookie["name"],
+                    cookie["value"],
+                    domain=cookie.get("domain") or "",
+                    path=cookie.get("path") or "/",
+                    secure=bool(cookie.get("secure")),
+                    expires=cookie.get("expires"),
+                )
+            )
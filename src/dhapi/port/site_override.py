@@ -0,0 +1,44 @@
+import logging
+import os
+from typing import Dict, Mapping, Optional, Union
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# 사이트 주소를 바꿀 때 치환하는 원래 origin. (tracer는 대기열 페이지가 알려준 도메인을 {domain}에 넣는다)
+SITE_ORIGINS = ("https://www.dhlottery.co.kr", "https://ol.dhlottery.co.kr", "https://{domain}:48081")
+
+Site = Union[str, Mapping[str, str]]
+
+
+def resolve_site(site: Optional[Site] = None) -> Optional[Site]:
+    """지정한 site가 없으면 DHAPI_SITE_URL 환경변수를 사용한다."""
+    return site if site is not None else os.environ.get("DHAPI_SITE_URL") or None
+
+
+def site_overrides(cls, site: Optional[Site]) -> Dict[str, str]:
+    """cls의 URL 속성(밑줄로 시작하는 문자열 속성) 중 원래 origin으로 시작하는 것을 site로 바꾼 값을 돌려준다.
+
+    Args:
+        site: 모든 호스트를 대신할 origin(str, 예: "http://127.0.0.1:9000") 또는 {원래 origin: 바꿀 origin}
+    """
+    if not site:
+        return {}
+
+    hosts = {origin: site for origin in SITE_ORIGINS} if isinstance(site, str) else dict(site)
+    overrides = {}
+    for name in dir(cls):
+        value = getattr(cls, name, None)
+        if not name.startswith("_") or not isinstance(value, str):
+            continue
+        for origin, replacement in hosts.items():
+            if value.startswith(origin):
+                overrides[name] = replacement.rstrip("/") + value[len(origin) :]
+                break
+    logger.debug(f"site override: {hosts}")
+    return overrides
+
+
+def origin_of(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
@@ -0,0 +1,92 @@
+import datetime
+import logging
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class Lotto645TicketStore:
+    """구매한 로또6/45 게임 번호를 SQLite 테이블(lotto645_tickets)에 (계정, 바코드, 슬롯)을 키로 보관한다.
+
+    번호는 구매 후 바뀌지 않으므로 한 번 상세 조회(lotto645TicketDetail.do)한 구매 건은 다시 조회하지 않는다.
+    CLI는 ~/.dhapi/tickets.sqlite3, 웹 서버는 app_data.sqlite3를 사용한다. batch 워커 프로세스가 동시에 쓸 수 있다.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self._db_path = os.path.expanduser(str(db_path or "~/.dhapi/tickets.sqlite3"))
+        os.makedirs(os.path.dirname(self._db_path) or ".", mode=0o700, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS lotto645_tickets (
+                    owner TEXT NOT NULL,
+                    barcode TEXT NOT NULL,
+                    slot TEXT NOT NULL,
+                    order_no TEXT NOT NULL,
+                    round INTEGER NOT NULL,
+                    purchase_date TEXT NOT NULL,
+                    mode TEXT NOT NULL,
+                    n1 INTEGER NOT NULL, n2 INTEGER NOT NULL, n3 INTEGER NOT NULL,
+                    n4 INTEGER NOT NULL, n5 INTEGER NOT NULL, n6 INTEGER NOT NULL,
+                    synced_at TEXT NOT NULL,
+                    PRIMARY KEY (owner, barcode, slot)
+                )
+                """)
+            conn.execute("CREATE INDEX IF NOT EXISTS lotto645_tickets_purchase_date ON lotto645_tickets (owner, purchase_date)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def known_barcodes(self, owner: str) -> Set[str]:
+        with self._connect() as conn:
+            return {row[0] for row in conn.execute("SELECT DISTINCT barcode FROM lotto645_tickets WHERE owner = ?", (owner,))}
+
+    def save(self, owner: str, purchases: Iterable[Dict]) -> int:
+        """LotteryClient.fetch_lotto645_games() 결과를 저장하고 저장한 게임 수를 돌려준다."""
+        now = datetime.datetime.now().isoformat(timespec="seconds")
+        rows = [
+            (owner, purchase["barcode"], game["slot"], purchase["order_no"], purchase["round"], purchase["purchase_date"], game["mode"], *game["numbers"], now)
+            for purchase in purchases
+            for game in purchase["games"]
+        ]
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO lotto645_tickets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def games(self, owners: Iterable[str], start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict]:
+        """
+        :param owners: 계정(로그인 아이디) 목록
+        :param start_date: 구입일자 시작 (YYYYMMDD). 생략하면 제한 없음
+        :param end_date: 구입일자 끝 (YYYYMMDD). 생략하면 제한 없음
+        :return: 회차, 구입일자, 바코드, 슬롯 순서의 게임 목록
+        """
+        owners = list(owners)
+        if not owners:
+            return []
+
+        query = f"SELECT * FROM lotto645_tickets WHERE owner IN ({', '.join('?' * len(owners))}) AND purchase_date BETWEEN ? AND ?"
+        params = [*owners, _iso_date(start_date) or "0000-00-00", _iso_date(end_date) or "9999-99-99"]
+        with self._connect() as conn:
+            rows = conn.execute(query + " ORDER BY round, purchase_date, barcode, slot", params).fetchall()
+        return [self._to_game(row) for row in rows]
+
+    def _to_game(self, row: sqlite3.Row) -> Dict:
+        return {
+            "owner": row["owner"],
+            "barcode": row["barcode"],
+            "slot": row["slot"],
+            "order_no": row["order_no"],
+            "round": row["round"],
+            "purchase_date": row["purchase_date"],
+            "mode": row["mode"],
+            "numbers": [row[f"n{index}"] for index in range(1, 7)],
+        }
+
+
+def _iso_date(yyyymmdd: Optional[str]) -> Optional[str]:
+    if not yyyymmdd:
+        return None
+    return datetime.datetime.strptime(yyyymmdd, "%Y%m%d").date().isoformat()
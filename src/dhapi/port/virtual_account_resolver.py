@@ -0,0 +1,90 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+AccountInfo = Tuple[str, str, Optional[str], Optional[str]]  # (계좌번호, 금액 텍스트, 은행명, 예금주)
+Strategy = Tuple[str, Callable[[threading.Event], Optional[AccountInfo]]]
+
+
+class VirtualAccountResolver:
+    """가상계좌를 찾는 전략들을 두 단계로 실행한다.
+
+    1단계: 조회만 하는 전략(read_only)을 동시에 실행하고, 처음으로 유효한 계좌를 돌려준 결과를 사용한다.
+           계좌를 찾으면 전략에 넘긴 stop(threading.Event)을 set하고, 남은 전략이 진행 중인 요청을 마치고 끝날 때까지 기다린다.
+           (전략은 요청 사이마다 stop을 확인해야 한다. 반환 뒤에는 어떤 전략도 세션을 사용하지 않는다.)
+    2단계: 1단계에서 찾지 못한 경우에만 계좌를 발급하는 전략(issuing)을 순서대로 하나씩 실행한다.
+           발급 전략에서 발생한 예외는 그대로 전달한다.
+
+    resolve()가 끝나면 report에 이긴 전략과 전략별 소요 시간이 남는다.
+    """
+
+    def __init__(self, read_only: Sequence[Strategy], issuing: Sequence[Strategy], is_valid: Callable[[str], bool]):
+        self._read_only = list(read_only)
+        self._issuing = list(issuing)
+        self._is_valid = is_valid
+        self.report: Dict = {"winner": None, "elapsed_seconds": 0.0, "strategies": []}
+
+    def resolve(self) -> Optional[AccountInfo]:
+        started = time.monotonic()
+        self.report = {"winner": None, "elapsed_seconds": 0.0, "strategies": []}
+        try:
+            return self._resolve_read_only() or self._resolve_issuing()
+        finally:
+            self.report["elapsed_seconds"] = round(time.monotonic() - started, 3)
+            logger.debug(f"virtual account resolution: {self.describe()}")
+
+    def describe(self) -> str:
+        timings = ", ".join(f"{entry['name']}={entry['status']}({entry['elapsed_seconds']:.2f}s)" for entry in self.report["strategies"])
+        return f"winner={self.report['winner']} total={self.report['elapsed_seconds']:.2f}s [{timings}]"
+
+    def _resolve_read_only(self) -> Optional[AccountInfo]:
+        if not self._read_only:
+            return None
+
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=len(self._read_only), thread_name_prefix="dhapi-resolve")
+        futures = {executor.submit(self._run, name, strategy, stop, catch_errors=True): name for name, strategy in self._read_only}
+        try:
+            for future in as_completed(futures):
+                found = future.result()
+                if found:
+                    self.report["winner"] = futures[future]
+                    return found
+            return None
+        finally:
+            # 계좌를 찾았으면 남은 전략을 멈추게 하고, 공유 세션을 더 쓰지 않도록 끝날 때까지 기다린다.
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _resolve_issuing(self) -> Optional[AccountInfo]:
+        stop = threading.Event()
+        for name, strategy in self._issuing:
+            found = self._run(name, strategy, stop, catch_errors=False)
+            if found:
+                self.report["winner"] = name
+                return found
+        return None
+
+    def _run(self, name, strategy, stop, *, catch_errors) -> Optional[AccountInfo]:
+        started = time.monotonic()
+        entry = {"name": name, "status": "miss", "elapsed_seconds": 0.0}
+        try:
+            found = strategy(stop)
+            if found and self._is_valid(found[0]):
+                entry["status"] = "found"
+                return found
+            return None
+        except Exception as error:
+            entry["status"] = "error"
+            entry["error"] = f"{type(error).__name__}: {error}"
+            if not catch_errors:
+                raise
+            logger.debug(f"virtual account strategy {name} failed: {entry['error']}")
+            return None
+        finally:
+            entry["elapsed_seconds"] = round(time.monotonic() - started, 3)
+            self.report["strategies"].append(entry)
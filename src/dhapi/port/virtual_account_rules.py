@@ -0,0 +1,125 @@
+"""가상계좌 번호를 화면 텍스트/HTML에서 찾는 규칙 모음.
+
+새로운 화면 구성이 생기면 ACCOUNT_RULES에 규칙을 추가한다. 규칙은 위에서부터 순서대로 평가되며,
+각 규칙의 첫 번째 매치가 유효한 계좌번호이면 그 결과를 사용하고 나머지 규칙은 평가하지 않는다.
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+BANK_NAMES = (
+    "케이뱅크",
+    "카카오뱅크",
+    "국민은행",
+    "신한은행",
+    "우리은행",
+    "하나은행",
+    "기업은행",
+    "농협은행",
+    "부산은행",
+    "경남은행",
+    "대구은행",
+    "광주은행",
+    "전북은행",
+    "제주은행",
+    "SC제일은행",
+    "우체국",
+)
+# 금융기관 코드 -> 은행명 (가상계좌 응답의 bankCd 등)
+BANK_CODE_TO_NAME = {
+    "004": "국민은행",
+    "011": "농협은행",
+    "020": "우리은행",
+    "023": "SC제일은행",
+    "031": "대구은행",
+    "032": "부산은행",
+    "034": "광주은행",
+    "035": "제주은행",
+    "037": "전북은행",
+    "039": "경남은행",
+    "071": "우체국",
+    "081": "하나은행",
+    "088": "신한은행",
+    "089": "케이뱅크",
+    "090": "카카오뱅크",
+}
+BANK_ALTERNATION = "|".join(re.escape(name) for name in BANK_NAMES)
+BANK_PATTERN = re.compile(f"({BANK_ALTERNATION})")
+
+_ACCOUNT_KEYWORDS = r"고정\s*가상계좌|전용\s*가상계좌|가상계좌|입금계좌|계좌번호"
+_ACCOUNT_NUMBER = r"[0-9][0-9\- ]{8,30}[0-9]"
+
+AMOUNT_PATTERN = re.compile(r"[0-9][0-9,]{2,15}\s*원")
+ACCOUNT_HOLDER_PATTERN = re.compile(r"(?:예금주|입금자명|계좌주(?:명)?(?:\(ID\))?|수취인)\s*[:：]?\s*([가-힣A-Za-z0-9\(\)\.\-_* ]{2,40})")
+
+
+class AccountRule(NamedTuple):
+    name: str
+    source: str  # "text": 화면 텍스트(HtmlDocument.plain_text), "html": 원본 HTML
+    pattern: re.Pattern
+    account_group: int
+    bank_group: Optional[int] = None
+
+
+ACCOUNT_RULES = (
+    # 예: 고정 가상계좌 [케이뱅크] 701-9005-915-9906
+    AccountRule(
+        "keyword_then_account",
+        "text",
+        re.compile(rf"(?:{_ACCOUNT_KEYWORDS})\s*(?:\[\s*([^\]\[]+)\s*\])?\s*[:：]?\s*({_ACCOUNT_NUMBER})"),
+        account_group=2,
+        bank_group=1,
+    ),
+    AccountRule("account_then_keyword", "text", re.compile(rf"({_ACCOUNT_NUMBER})\s*(?:{_ACCOUNT_KEYWORDS})"), account_group=1),
+    # 예: [케이뱅크] 701-9005-915-9906
+    AccountRule("bracket_bank_account", "text", re.compile(rf"\[\s*({BANK_ALTERNATION})\s*\]\s*({_ACCOUNT_NUMBER})"), account_group=2, bank_group=1),
+    # 예: 케이뱅크 : 701-9005-915-9906
+    AccountRule("bank_then_account", "text", re.compile(rf"({BANK_ALTERNATION})\s*[\]\)\:\-]?\s*({_ACCOUNT_NUMBER})"), account_group=2, bank_group=1),
+    # 스크립트 문자열/속성값 안에 계좌가 있는 경우를 대비한 원본 HTML fallback
+    AccountRule("raw_html_bank_account", "html", re.compile(rf"({BANK_ALTERNATION})[^0-9]{{0,80}}([0-9]{{3}}-[0-9]{{4}}-[0-9]{{3}}-[0-9]{{4}})"), account_group=2, bank_group=1),
+)
+
+_NON_ACCOUNT_CHARS = re.compile(r"[^0-9\-]")
+_REPEATED_DASHES = re.compile(r"-{2,}")
+_ACCOUNT_SHAPE = re.compile(r"[0-9][0-9\-]*[0-9]")
+_NON_DIGITS = re.compile(r"\D")
+# 대표 고객센터/ARS 번호 (예: 1588-6450)
+_ARS_NUMBER = re.compile(r"1[5-9][0-9]{2}-?[0-9]{4}")
+# 일반 전화/팩스 번호 (예: 02-6933-3063, 031-123-4567, 010-1234-5678)
+_PHONE_NUMBER = re.compile(r"0\d{1,2}-(?:\d{3,4})-\d{4}")
+
+
+def normalize_account_candidate(raw) -> str:
+    if raw is None:
+        return ""
+    value = str(raw).strip().replace(" ", "")
+    value = _NON_ACCOUNT_CHARS.sub("", value)
+    return _REPEATED_DASHES.sub("-", value).strip("-")
+
+
+@lru_cache(maxsize=1024)
+def is_valid_account_candidate(value: str) -> bool:
+    """정규화된 계좌번호 후보가 가상계좌 번호로 보이는지 판단한다. 같은 후보가 반복해서 검사되므로 결과를 캐시한다."""
+    if not value or not _ACCOUNT_SHAPE.fullmatch(value):
+        return False
+
+    digits = _NON_DIGITS.sub("", value)
+    if len(digits) < 10 or len(digits) > 16:
+        return False
+
+    return not (_ARS_NUMBER.fullmatch(value) or _PHONE_NUMBER.fullmatch(value))
+
+
+def find_account(plain_text: str, html_text: str):
+    """ACCOUNT_RULES를 순서대로 평가해 (계좌번호, 은행명, 규칙 이름)을 반환한다. 찾지 못하면 None."""
+    for rule in ACCOUNT_RULES:
+        match = rule.pattern.search(plain_text if rule.source == "text" else html_text)
+        if not match:
+            continue
+
+        account_number = normalize_account_candidate(match.group(rule.account_group))
+        if is_valid_account_candidate(account_number):
+            bank_name = (match.group(rule.bank_group) or "").strip() if rule.bank_group else ""
+            return account_number, bank_name or None, rule.name
+    return None
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+VIRTUAL_ACCOUNT_FIELDS = ("account", "amount", "bank_name", "account_holder", "assigned_at", "verified_at")
+
+
+class VirtualAccountStore:
+    """계정별 고정 가상계좌 정보를 ~/.dhapi/virtual_accounts.json 에 보관한다.
+
+    가상계좌는 거의 바뀌지 않으므로 다음 발급 요청 시 바로 응답하는 데 사용한다.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = os.path.expanduser(path or "~/.dhapi/virtual_accounts.json")
+        self._lock = threading.Lock()
+
+    def _key(self, username: str) -> str:
+        # 파일에 아이디가 그대로 드러나지 않도록 해시를 사용한다.
+        return hashlib.sha256(username.encode("utf-8")).hexdigest()[:32]
+
+    def _read(self) -> Dict[str, Dict]:
+        try:
+            with open(self._path, "r", encoding="UTF-8") as f:
+                doc = json.load(f)
+            return doc if isinstance(doc, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as error:
+            logger.debug(f"failed to read virtual account cache ({self._path}): {type(error).__name__}: {error}")
+            return {}
+
+    def _write(self, doc: Dict[str, Dict]):
+        os.makedirs(os.path.dirname(self._path), mode=0o700, exist_ok=True)
+        tmp_path = f"{self._path}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="UTF-8") as f:
+                json.dump(doc, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path)
+        except OSError as error:
+            logger.debug(f"failed to write virtual account cache ({self._path}): {type(error).__name__}: {error}")
+
+    def load(self, username: str) -> Optional[Dict]:
+        with self._lock:
+            return self._read().get(self._key(username))
+
+    def save(self, username: str, record: Dict):
+        with self._lock:
+            doc = self._read()
+            doc[self._key(username)] = {field: record.get(field) for field in VIRTUAL_ACCOUNT_FIELDS}
+            self._write(doc)
+
+    def clear(self, username: str):
+        with self._lock:
+            doc = self._read()
+            if doc.pop(self._key(username), None) is not None:
+                self._write(doc)
+
+
+class SqliteVirtualAccountStore:
+    """VirtualAccountStore와 같은 인터페이스로 SQLite 테이블(virtual_accounts)에 보관한다. 웹 서버에서 사용한다."""
+
+    def __init__(self, db_path: str):
+        self._db_path = str(db_path)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS virtual_accounts (
+                    username TEXT PRIMARY KEY,
+                    account TEXT NOT NULL,
+                    amount TEXT,
+                    bank_name TEXT,
+                    account_holder TEXT,
+                    assigned_at TEXT,
+                    verified_at TEXT
+                )
+                """)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def load(self, username: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT {', '.join(VIRTUAL_ACCOUNT_FIELDS)} FROM virtual_accounts WHERE username = ?", (username,)).fetchone()
+        return dict(row) if row else None
+
+    def save(self, username: str, record: Dict):
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO virtual_accounts (username, {', '.join(VIRTUAL_ACCOUNT_FIELDS)}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (username, *[record.get(field) for field in VIRTUAL_ACCOUNT_FIELDS]),
+            )
+
+    def clear(self, username: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM virtual_accounts WHERE username = ?", (username,))
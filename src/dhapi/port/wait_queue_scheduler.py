@@ -0,0 +1,110 @@
+import logging
+import threading
+import time
+from typing import Callable, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WaitQueueProgress(NamedTuple):
+    position: int  # tracer inputQueue.do가 알려준 waitCnt (앞에 남은 인원)
+    estimated_seconds: Optional[float]  # 대기열이 빠지는 속도로 추정한 남은 시간. 아직 추정할 수 없으면 None
+    elapsed_seconds: float
+    remaining_seconds: float  # 전체 deadline까지 남은 시간
+
+
+class WaitQueueScheduler:  # pylint: disable=too-many-instance-attributes
+    """동행복권 대기열(tracer)의 waitCnt 변화로 대기열이 빠지는 속도를 추정해 다음 확인까지 기다릴 시간을 정한다.
+
+    - observe(waitCnt)로 샘플을 기록하면 연속된 두 샘플 사이의 감소량/경과 시간으로 초당 처리 인원을 구하고,
+      지수 이동 평균으로 흔들림을 줄인다.
+    - wait()는 예상 남은 시간의 절반만큼(min_interval ~ max_interval 범위) 기다린다. 처리 속도를 아직 모르면 default_interval을 사용한다.
+    - deadline_seconds가 지나면 wait()는 기다리지 않고 False를 반환한다.
+    - stop(threading.Event)을 주면 stop.wait으로 기다려 set되는 즉시 깨어나고, 이후 wait()는 False를 반환한다.
+    """
+
+    SMOOTHING = 0.5
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        deadline_seconds: float,
+        *,
+        default_interval: float = 1.0,
+        min_interval: float = 0.5,
+        max_interval: float = 5.0,
+        on_progress: Optional[Callable[[WaitQueueProgress], None]] = None,
+        clock: Optional[Callable[[], float]] = None,
+        sleep: Optional[Callable[[float], None]] = None,
+        stop: Optional[threading.Event] = None,
+    ):
+        self._clock = clock or time.monotonic
+        self._stop = stop
+        self._sleep = sleep or (stop.wait if stop is not None else time.sleep)
+        self._started = self._clock()
+        self._deadline = self._started + deadline_seconds
+        self._default_interval = default_interval
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._on_progress = on_progress
+        self._last_sample = None
+        self._drain_rate = None
+        self._position = None
+
+    @property
+    def drain_rate(self) -> Optional[float]:
+        """초당 대기열에서 빠지는 인원 (추정값)"""
+        return self._drain_rate
+
+    def remaining_seconds(self) -> float:
+        return max(0.0, self._deadline - self._clock())
+
+    def expired(self) -> bool:
+        return self.remaining_seconds() <= 0
+
+    def stopped(self) -> bool:
+        return self._stop is not None and self._stop.is_set()
+
+    def pause(self, seconds: float) -> bool:
+        """seconds만큼 기다린다. stop이 set됐으면 False"""
+        if not self.stopped():
+            self._sleep(seconds)
+        return not self.stopped()
+
+    def estimated_seconds(self) -> Optional[float]:
+        if self._position is None:
+            return None
+        if self._position <= 0:
+            return 0.0
+        if not self._drain_rate:
+            return None
+        return self._position / self._drain_rate
+
+    def observe(self, wait_count: int) -> WaitQueueProgress:
+        now = self._clock()
+        if self._last_sample is not None:
+            last_at, last_count = self._last_sample
+            if now > last_at and wait_count < last_count:
+                rate = (last_count - wait_count) / (now - last_at)
+                self._drain_rate = rate if self._drain_rate is None else self.SMOOTHING * rate + (1 - self.SMOOTHING) * self._drain_rate
+        self._last_sample = (now, wait_count)
+        self._position = wait_count
+
+        progress = WaitQueueProgress(wait_count, self.estimated_seconds(), now - self._started, self.remaining_seconds())
+        if self._on_progress is not None:
+            try:
+                self._on_progress(progress)
+            except Exception as error:
+                logger.debug(f"wait queue progress callback failed: {type(error).__name__}: {error}")
+        return progress
+
+    def next_delay(self) -> float:
+        estimated = self.estimated_seconds()
+        delay = self._default_interval if estimated is None else estimated / 2
+        return min(max(delay, self._min_interval), self._max_interval, self.remaining_seconds())
+
+    def wait(self) -> bool:
+        """다음 확인 시점까지 기다린다. deadline이 지났으면 기다리지 않고 False를 반환한다."""
+        delay = self.next_delay()
+        if delay <= 0:
+            return False
+        return self.pause(delay)
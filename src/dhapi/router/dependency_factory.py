@@ -1,28 +1,122 @@
+# 각 명령은 필요한 의존성만 불러오도록 builder 안에서 import 한다.
+# (requests, bs4, Crypto 등은 로딩이 느려 dhapi version/show-profiles 같은 명령의 시작 시간을 늘린다.)
+import importlib.util
+
 from dhapi.domain.user import User
-from dhapi.endpoint.lottery_stdout_printer import LotteryStdoutPrinter
-from dhapi.endpoint.version_stdout_printer import VersionStdoutPrinter
-from dhapi.meta.version_provider import VersionProvider
-from dhapi.port.lottery_client import LotteryClient
-from dhapi.purchase.lotto645_buy_confirmer import Lotto645BuyConfirmer
 
 
-def build_lottery_client(user_profile: User):
-    lottery_endpoint = build_lottery_endpoint()
-    return LotteryClient(user_profile, lottery_endpoint)
+def build_lottery_client(user_profile: User, lottery_endpoint=None):
+    from dhapi.port.lottery_client import LotteryClient
+
+    # batch 워커는 결과를 출력하지 않고 모으는 endpoint를 넘긴다.
+    lottery_endpoint = lottery_endpoint or build_lottery_endpoint()
+    session_store = build_session_store()
+    virtual_account_store = build_virtual_account_store()
+    discovery_cache = build_discovery_cache()
+    return LotteryClient(user_profile, lottery_endpoint, session_store, virtual_account_store, discovery_cache)
+
+
+def build_session_store():
+    from dhapi.port.session_store import SessionStore
+
+    return SessionStore()
+
+
+def build_virtual_account_store():
+    from dhapi.port.virtual_account_store import VirtualAccountStore
+
+    return VirtualAccountStore()
+
+
+def build_discovery_cache():
+    from dhapi.port.discovery_cache import DiscoveryCache
+
+    return DiscoveryCache()
+
+
+def build_draw_history_store():
+    from dhapi.port.draw_history_store import DrawHistoryStore
+
+    return DrawHistoryStore()
+
+
+def build_draw_history_client():
+    from dhapi.port.draw_history_client import DrawHistoryClient
+
+    return DrawHistoryClient()
+
+
+def build_draw_archive_updater():
+    # numpy가 없으면 (pip install 'dhapi[analytics]') 아카이브를 만들지 않는다.
+    if importlib.util.find_spec("numpy") is None:
+        return None
+    from dhapi.analysis.draw_archive import update_draw_archive
+
+    return update_draw_archive
+
+
+def build_ticket_store():
+    from dhapi.port.ticket_store import Lotto645TicketStore
+
+    return Lotto645TicketStore()
+
+
+def build_win_checker():
+    # 당첨 확인은 회차 아카이브(numpy)를 사용한다.
+    if importlib.util.find_spec("numpy") is None:
+        return None
+    from dhapi.analysis.win_check import check_wins
+
+    return check_wins
+
+
+def build_backtester():
+    if importlib.util.find_spec("numpy") is None:
+        return None
+    from dhapi.analysis.backtest import backtest
+
+    return backtest
+
+
+def build_request_timings():
+    from dhapi.port.request_timings import REQUEST_TIMINGS
+
+    return REQUEST_TIMINGS
 
 
 def build_lotto645_buy_confirmer():
+    from dhapi.purchase.lotto645_buy_confirmer import Lotto645BuyConfirmer
+
     return Lotto645BuyConfirmer()
 
 
 def build_lottery_endpoint():
+    from dhapi.endpoint.lottery_stdout_printer import LotteryStdoutPrinter
+
     return LotteryStdoutPrinter()
 
 
+def build_profile_batch_runner(jobs: int, is_debug: bool = False):
+    from dhapi.batch.profile_batch_runner import ProfileBatchRunner
+
+    # 워커도 CLI와 같은 방식(세션/가상계좌/탐색 캐시, 전송 계층 설정)으로 LotteryClient를 만든다.
+    return ProfileBatchRunner(build_lottery_client, jobs, is_debug)
+
+
+def build_batch_endpoint():
+    from dhapi.endpoint.batch_stdout_printer import BatchStdoutPrinter
+
+    return BatchStdoutPrinter()
+
+
 def build_version_provider():
+    from dhapi.meta.version_provider import VersionProvider
+
     version_endpoint = build_version_endpoint()
     return VersionProvider(version_endpoint)
 
 
 def build_version_endpoint():
+    from dhapi.endpoint.version_stdout_printer import VersionStdoutPrinter
+
     return VersionStdoutPrinter()
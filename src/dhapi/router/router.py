@@ -1,14 +1,28 @@
+import os
+import time
 from typing import Annotated, Optional, List
 
 import typer
-from rich.console import Console
-from rich.table import Table
 
 from dhapi.config.logger import set_logger
 from dhapi.domain.deposit import Deposit
 from dhapi.domain.lotto645_ticket import Lotto645Ticket
 from dhapi.port.credentials_provider import CredentialsProvider
-from dhapi.router.dependency_factory import build_lottery_client, build_version_provider, build_lotto645_buy_confirmer
+from dhapi.router.dependency_factory import (
+    build_lottery_client,
+    build_version_provider,
+    build_lotto645_buy_confirmer,
+    build_profile_batch_runner,
+    build_batch_endpoint,
+    build_lottery_endpoint,
+    build_request_timings,
+    build_draw_history_store,
+    build_draw_history_client,
+    build_draw_archive_updater,
+    build_ticket_store,
+    build_win_checker,
+    build_backtester,
+)
 
 app = typer.Typer(
     help="동행복권 비공식 API\n\n각 명령어에 대한 자세한 도움말은 'dhapi [명령어] -h'를 입력하세요.",
@@ -25,6 +39,15 @@ def logger_callback(is_debug: bool):
     set_logger(is_debug)
 
 
+def timings_callback(ctx: typer.Context, show_timings: bool):
+    if not show_timings or ctx.resilient_parsing:
+        return
+    # batch 워커 프로세스도 측정하도록 환경변수로 켠다.
+    os.environ["DHAPI_TIMINGS"] = "1"
+    request_timings = build_request_timings()
+    ctx.call_on_close(lambda: build_lottery_endpoint().print_request_timings(request_timings.summary()))
+
+
 def version_callback(show_version: Optional[bool]):
     if show_version:
         version_provider = build_version_provider()
@@ -37,20 +60,24 @@ def version_callback(show_version: Optional[bool]):
 예치금 충전용 가상계좌를 세팅합니다.
 
 dhapi에서는 본인 전용 계좌를 발급받는 것까지만 가능합니다. 출력되는 계좌로 직접 입금해주세요.
+
+한 번 확인한 계좌는 ~/.dhapi/virtual_accounts.json 에 저장해 두고 다음부터 바로 출력합니다. 계좌를 다시 조회하려면 --refresh 옵션을 사용하세요.
 """,
 )
 def assign_virtual_account(
     amount: Annotated[
         int, typer.Argument(help="입금할 금액을 지정합니다 (5천원, 1만원, 2만원, 3만원, 5만원, 10만원, 20만원, 30만원, 50만원, 70만원, 100만원 중 하나)", metavar="amount")
     ] = 50000,
+    refresh: Annotated[bool, typer.Option("-r", "--refresh", help="저장된 가상계좌 정보를 쓰지 않고 다시 조회합니다.")] = False,
     profile: Annotated[str, typer.Option("-p", "--profile", help="프로필을 지정합니다", metavar="")] = "default",
     _debug: Annotated[bool, typer.Option("-d", "--debug", help="debug 로그를 활성화합니다.", callback=logger_callback)] = False,
+    _timings: Annotated[bool, typer.Option("--timings", help="종료 시 업스트림 요청별 소요 시간 요약을 출력합니다.", callback=timings_callback)] = False,
 ):
     user = CredentialsProvider(profile).get_user()
     deposit = Deposit(amount)
 
     client = build_lottery_client(user)
-    client.assign_virtual_account(deposit)
+    client.assign_virtual_account(deposit, force_refresh=refresh)
 
 
 @app.command(help="""
@@ -59,6 +86,7 @@ def assign_virtual_account(
 def show_balance(
     profile: Annotated[str, typer.Option("-p", "--profile", help="프로필을 지정합니다", metavar="")] = "default",
     _debug: Annotated[bool, typer.Option("-d", "--debug", help="debug 로그를 활성화합니다.", callback=logger_callback)] = False,
+    _timings: Annotated[bool, typer.Option("--timings", help="종료 시 업스트림 요청별 소요 시간 요약을 출력합니다.", callback=timings_callback)] = False,
 ):
     user = CredentialsProvider(profile).get_user()
 
@@ -77,16 +105,145 @@ def show_buy_list(
     start_date: Annotated[Optional[str], typer.Option("-s", "--start-date", help="조회 시작 날짜 (YYYYMMDD)")] = None,
     end_date: Annotated[Optional[str], typer.Option("-e", "--end-date", help="조회 종료 날짜 (YYYYMMDD)")] = None,
     _debug: Annotated[bool, typer.Option("-d", "--debug", help="debug 로그를 활성화합니다.", callback=logger_callback)] = False,
+    _timings: Annotated[bool, typer.Option("--timings", help="종료 시 업스트림 요청별 소요 시간 요약을 출력합니다.", callback=timings_callback)] = False,
 ):
     user = CredentialsProvider(profile).get_user()
     client = build_lottery_client(user)
     client.show_buy_list(output_format, start_date, end_date)
 
 
+@app.command(help="""
+회차별 당첨번호/당첨금을 ~/.dhapi/draws.sqlite3 에 저장합니다.
+
+지난 회차 정보는 바뀌지 않으므로 마지막으로 저장한 회차 이후만 조회합니다. 로그인하지 않습니다.
+numpy가 설치되어 있으면 (pip install 'dhapi[analytics]') 통계/분석용 열 아카이브(~/.dhapi/draw_archive)도 새 회차만큼 갱신합니다.
+""")
+def sync_draws(
+    _debug: Annotated[bool, typer.Option("-d", "--debug", help="debug 로그를 활성화합니다.", callback=logger_callback)] = False,
+    _timings: Annotated[bool, typer.Option("--timings", help="종료 시 업스트림 요청별 소요 시간 요약을 출력합니다.", callback=timings_callback)] = False,
+):
+    store = build_draw_history_store()
+    added = store.sync(build_draw_history_client())
+    update_draw_archive = build_draw_archive_updater()
+    if update_draw_archive is not None:
+        update_draw_archive(store)
+    build_lottery_endpoint().print_result_of_sync_draws(added, store.latest_round())
+
+
+@app.command(help="""
+저장된 회차별 당첨번호를 최신 회차부터 출력합니다.
+
+'dhapi sync-draws'로 저장한 정보를 사용하며, --sync 옵션을 주면 출력 전에 새 회차를 먼저 저장합니다.
+""")
+def show_draws(  # pylint: disable=too-many-positional-arguments
+    limit: Annotated[int, typer.Option("-n", "--limit", help="출력할 회차 수", min=1)] = 10,
+    round_no: Annotated[Optional[int], typer.Option("-r", "--round", help="지정한 회차만 출력합니다.")] = None,
+    output_format: Annotated[str, typer.Option("-f", "--format", help="출력 형식을 지정합니다 (table, json).")] = "table",
+    sync: Annotated[bool, typer.Option("--sync", help="출력 전에 새 회차를 먼저 저장합니다.")] = False,
+    _debug: Annotated[bool, typer.Option("-d", "--debug", help="debug 로그를 활성화합니다.", callback=logger_callback)] = False,
+    _timings: Annotated[bool, typer.Option("--timings", help="종료 시 업스트림 요청별 소요 시간 요약을 출력합니다.", callback=timings_callback)] = False,
+):
+    store = build_draw_history_store()
+    if sync:
+        store.sync(build_draw_history_client())
+
+    if round_no is not None:
+        item = store.get(round_no)
+        items = [item] if item else []
+    else:
+        items = store.recent(limit)
+    build_lottery_endpoint().print_result_of_show_draws(items, output_format)
+
+
+@app.command(help="""
+구매한 로또6/45 번호의 당첨 여부를 로컬에 저장한 회차별 당첨번호와 한 번에 맞춰 봅니다.
+
+구매 번호는 ~/.dhapi/tickets.sqlite3 에 저장해 두고 새로 산 구매 건만 상세 조회하며, 회차 정보는 sync-draws와 같은 저장소를 사용합니다.
+여러 프로필을 지정하면 (all 또는 a,b,c) 프로필마다 별도의 프로세스에서 구매 번호를 가져온 뒤 한 번에 맞춰 봅니다.
+
+구매 번호는 기본적으로 최근 14일간의 내역에서 가져오고, 기간을 지정하지 않으면 저장된 모든 번호를 확인합니다.
+numpy가 필요합니다 (pip install 'dhapi[analytics]').
+""")
+def check_wins(  # pylint: disable=too-many-positional-arguments
+    profiles: Annotated[str, typer.Option("-p", "--profiles", help="대상 프로필을 지정합니다 (all 또는 a,b,c)", metavar="")] = "default",
+    start_date: Annotated[Optional[str], typer.Option("-s", "--start-date", help="조회 시작 날짜 (YYYYMMDD)")] = None,
+    end_date: Annotated[Optional[str], typer.Option("-e", "--end-date", help="조회 종료 날짜 (YYYYMMDD)")] = None,
+    offline: Annotated[bool, typer.Option("--offline", help="동행복권에 접속하지 않고 저장된 구매 번호/회차 정보로만 확인합니다.")] = False,
+    jobs: Annotated[int, typer.Option("-j", "--jobs", help="동시에 실행할 프로세스 수", min=1)] = 4,
+    output_format: Annotated[str, typer.Option("-f", "--format", help="출력 형식을 지정합니다 (table, json).")] = "table",
+    _debug: Annotated[bool, typer.Option("-d", "--debug", help="debug 로그를 활성화합니다.", callback=logger_callback)] = False,
+    _timings: Annotated[bool, typer.Option("--timings", help="종료 시 업스트림 요청별 소요 시간 요약을 출력합니다.", callback=timings_callback)] = False,
+):
+    check = build_win_checker()
+    update_draw_archive = build_draw_archive_updater()
+    if check is None or update_draw_archive is None:
+        print("❌ check-wins에는 numpy가 필요합니다. (pip install 'dhapi[analytics]')")
+        raise typer.Exit(code=1)
+
+    users = _resolve_users(profiles)
+    ticket_store = build_ticket_store()
+    draw_store = build_draw_history_store()
+
+    failures = []
+    if not offline:
+        draw_store.sync(build_draw_history_client())
+        results = build_profile_batch_runner(jobs, _debug).run("sync-tickets", users, {"start_date": start_date, "end_date": end_date})
+        failures = [{"profile": result["profile"], "error": result["error"]} for result in results if not result["ok"]]
+
+    profile_of = {user.username: profile for profile, user in users.items()}
+    games = ticket_store.games(profile_of, start_date, end_date)
+    results = [{"profile": profile_of[result["owner"]], **result} for result in check(games, update_draw_archive(draw_store))]
+    build_lottery_endpoint().print_result_of_check_wins(results, output_format, failures)
+
+
+@app.command(help="""
+번호 선택 전략을 지난 모든 회차에 다시 돌려 보고 등수별 적중률과 회수율을 출력합니다.
+
+각 회차에서는 그 이전 회차의 통계만 보고 게임을 만들며, 'dhapi sync-draws'로 저장한 회차 정보를 사용합니다.
+회차 구간을 나눠 여러 프로세스에서 병렬로 실행합니다. numpy가 필요합니다 (pip install 'dhapi[analytics]').
+
+[전략]
+
+hybrid : 웹 AI 추천과 같은 로직 (최근 빈출 번호 + 오래 안 나온 번호 + 통계 가중치)
+
+random : 완전 랜덤 (자동발급)
+""")
+def backtest(  # pylint: disable=too-many-positional-arguments
+    strategy: Annotated[str, typer.Option("-s", "--strategy", help="전략을 지정합니다 (hybrid, random).")] = "hybrid",
+    games: Annotated[int, typer.Option("-g", "--games", help="회차마다 만들 게임 수", min=1)] = 1000,
+    min_history: Annotated[int, typer.Option("--min-history", help="이만큼의 이전 회차가 쌓인 회차부터 백테스트합니다.", min=1)] = 50,
+    jobs: Annotated[Optional[int], typer.Option("-j", "--jobs", help="동시에 실행할 프로세스 수 (기본: CPU 수)", min=1)] = None,
+    seed: Annotated[int, typer.Option("--seed", help="난수 시드. 같은 시드면 같은 결과가 나옵니다.")] = 0,
+    output_format: Annotated[str, typer.Option("-f", "--format", help="출력 형식을 지정합니다 (table, json).")] = "table",
+    _debug: Annotated[bool, typer.Option("-d", "--debug", help="debug 로그를 활성화합니다.", callback=logger_callback)] = False,
+):
+    run_backtest = build_backtester()
+    update_draw_archive = build_draw_archive_updater()
+    if run_backtest is None or update_draw_archive is None:
+        print("❌ backtest에는 numpy가 필요합니다. (pip install 'dhapi[analytics]')")
+        raise typer.Exit(code=1)
+
+    archive = update_draw_archive(build_draw_history_store())
+    if archive is None:
+        print("❌ 저장된 회차가 없습니다. 'dhapi sync-draws'로 먼저 저장하세요.")
+        raise typer.Exit(code=1)
+
+    started = time.perf_counter()
+    try:
+        result = run_backtest(archive, strategy, games, min_history=min_history, jobs=jobs, seed=seed)
+    except ValueError as e:
+        print(f"❌ {e}")
+        raise typer.Exit(code=1)
+    build_lottery_endpoint().print_result_of_backtest(result.to_dict(), output_format, time.perf_counter() - started)
+
+
 @app.command(
     help="""등록된 프로필 목록을 출력합니다.""",
 )
 def show_profiles():
+    from rich.console import Console
+    from rich.table import Table
+
     try:
         profiles = CredentialsProvider.list_profiles()
     except FileNotFoundError as e:
@@ -125,6 +282,7 @@ def buy_lotto645(
     always_yes: Annotated[bool, typer.Option("-y", "--yes", help="구매 전 확인 절차를 스킵합니다.")] = False,
     profile: Annotated[str, typer.Option("-p", "--profile", help="프로필을 지정합니다", metavar="")] = "default",
     _debug: Annotated[bool, typer.Option("-d", "--debug", help="debug 로그를 활성화합니다.", callback=logger_callback)] = False,
+    _timings: Annotated[bool, typer.Option("--timings", help="종료 시 업스트림 요청별 소요 시간 요약을 출력합니다.", callback=timings_callback)] = False,
 ):
     cred = CredentialsProvider(profile)
     user = cred.get_user()
@@ -140,6 +298,86 @@ def buy_lotto645(
     client.buy_lotto645(tickets)
 
 
+batch_app = typer.Typer(
+    help="여러 프로필에 대해 같은 명령을 병렬로 실행합니다.\n\n프로필마다 별도의 프로세스와 세션을 사용하며, 한 프로필이 실패해도 나머지는 계속 진행합니다.",
+    context_settings={"help_option_names": ["-h", "--help"]},
+    no_args_is_help=True,
+)
+app.add_typer(batch_app, name="batch")
+
+
+def _resolve_users(profiles: str):
+    from dhapi.batch.profile_batch_runner import resolve_profiles
+
+    try:
+        return CredentialsProvider.get_users(resolve_profiles(profiles))
+    except (FileNotFoundError, KeyError) as e:
+        print(f"❌ {e.args[0]}")
+        raise typer.Exit(code=1)
+
+
+def _run_batch(command: str, profiles: str, jobs: int, output_format: str, *, is_debug: bool, options=None):
+    users = _resolve_users(profiles)
+
+    started = time.perf_counter()
+    results = build_profile_batch_runner(jobs, is_debug).run(command, users, options)
+    build_batch_endpoint().print_result_of_batch(command, results, output_format, time.perf_counter() - started)
+
+    if not all(result["ok"] for result in results):
+        raise typer.Exit(code=1)
+
+
+@batch_app.command("show-balance", help="여러 프로필의 예치금 현황을 조회합니다.")
+def batch_show_balance(
+    profiles: Annotated[str, typer.Option("--profiles", help="대상 프로필을 지정합니다 (all 또는 a,b,c)", metavar="")] = "all",
+    jobs: Annotated[int, typer.Option("-j", "--jobs", help="동시에 실행할 프로세스 수", min=1)] = 4,
+    output_format: Annotated[str, typer.Option("-f", "--format", help="출력 형식을 지정합니다 (table, json).")] = "table",
+    _debug: Annotated[bool, typer.Option("-d", "--debug", help="debug 로그를 활성화합니다.", callback=logger_callback)] = False,
+    _timings: Annotated[bool, typer.Option("--timings", help="종료 시 업스트림 요청별 소요 시간 요약을 출력합니다.", callback=timings_callback)] = False,
+):
+    _run_batch("show-balance", profiles, jobs, output_format, is_debug=_debug)
+
+
+@batch_app.command("show-buy-list", help="여러 프로필의 구매 내역을 조회합니다. 기본적으로 최근 14일간의 내역을 조회합니다.")
+def batch_show_buy_list(
+    profiles: Annotated[str, typer.Option("--profiles", help="대상 프로필을 지정합니다 (all 또는 a,b,c)", metavar="")] = "all",
+    jobs: Annotated[int, typer.Option("-j", "--jobs", help="동시에 실행할 프로세스 수", min=1)] = 4,
+    output_format: Annotated[str, typer.Option("-f", "--format", help="출력 형식을 지정합니다 (table, json).")] = "table",
+    start_date: Annotated[Optional[str], typer.Option("-s", "--start-date", help="조회 시작 날짜 (YYYYMMDD)")] = None,
+    end_date: Annotated[Optional[str], typer.Option("-e", "--end-date", help="조회 종료 날짜 (YYYYMMDD)")] = None,
+    _debug: Annotated[bool, typer.Option("-d", "--debug", help="debug 로그를 활성화합니다.", callback=logger_callback)] = False,
+    _timings: Annotated[bool, typer.Option("--timings", help="종료 시 업스트림 요청별 소요 시간 요약을 출력합니다.", callback=timings_callback)] = False,
+):
+    _run_batch("show-buy-list", profiles, jobs, output_format, is_debug=_debug, options={"start_date": start_date, "end_date": end_date})
+
+
+@batch_app.command(
+    "buy-lotto645",
+    help="""
+여러 프로필로 같은 번호의 로또6/45 복권을 구매합니다.
+
+확인 절차 없이 바로 구매하므로 -y 플래그가 필요합니다. 번호 지정 방식은 buy-lotto645와 같습니다.
+""",
+)
+def batch_buy_lotto645(
+    tickets: Annotated[List[str], typer.Argument(help="구매할 번호를 입력합니다. 생략 시 자동모드로 5장 구매합니다.", metavar="tickets", show_default=False)] = None,
+    always_yes: Annotated[bool, typer.Option("-y", "--yes", help="구매 전 확인 절차를 스킵합니다. batch 구매 시 필수입니다.")] = False,
+    profiles: Annotated[str, typer.Option("--profiles", help="대상 프로필을 지정합니다 (all 또는 a,b,c)", metavar="")] = "all",
+    jobs: Annotated[int, typer.Option("-j", "--jobs", help="동시에 실행할 프로세스 수", min=1)] = 4,
+    output_format: Annotated[str, typer.Option("-f", "--format", help="출력 형식을 지정합니다 (table, json).")] = "table",
+    _debug: Annotated[bool, typer.Option("-d", "--debug", help="debug 로그를 활성화합니다.", callback=logger_callback)] = False,
+    _timings: Annotated[bool, typer.Option("--timings", help="종료 시 업스트림 요청별 소요 시간 요약을 출력합니다.", callback=timings_callback)] = False,
+):
+    if not always_yes:
+        print("❌ batch 구매는 확인 절차를 건너뛰므로 -y 플래그를 함께 지정해야 합니다.")
+        raise typer.Exit(code=1)
+
+    tickets = Lotto645Ticket.create_tickets(tickets) if tickets else Lotto645Ticket.create_auto_tickets(count=5)
+    build_lotto645_buy_confirmer().confirm(tickets, always_yes)
+
+    _run_batch("buy-lotto645", profiles, jobs, output_format, is_debug=_debug, options={"tickets": tickets})
+
+
 @app.command(help="""
 dhapi 버전을 출력합니다.
 """)
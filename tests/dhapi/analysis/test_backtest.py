@@ -0,0 +1,75 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+np = pytest.importorskip("numpy")
+from dhapi.analysis import backtest as backtest_module  # pylint: disable=wrong-import-position
+from dhapi.analysis.backtest import backtest  # pylint: disable=wrong-import-position
+from dhapi.analysis.draw_archive import DrawArchive  # pylint: disable=wrong-import-position
+from dhapi.analysis.draw_stats import compute_draw_stats  # pylint: disable=wrong-import-position
+from dhapi.analysis.strategies import STRATEGIES, hybrid_games, random_games  # pylint: disable=wrong-import-position
+
+PRIZES = [2_000_000_000, 60_000_000, 1_500_000, 50_000, 5_000]
+
+
+def _archive(rounds, seed=0):
+    rng = random.Random(seed)
+    items = []
+    for round_no in range(1, rounds + 1):
+        numbers = rng.sample(range(1, 46), 7)
+        ranks = [{"rank": rank, "winner_count": 1, "prize_per_winner": prize} for rank, prize in enumerate(PRIZES, start=1)]
+        items.append({"round": round_no, "draw_date": "2026-10-10", "numbers": sorted(numbers[:6]), "bonus": numbers[6], "ranks": ranks})
+    return DrawArchive.from_items(items)
+
+
+@pytest.mark.parametrize("strategy", [random_games, hybrid_games])
+def test_strategies_generate_valid_games(strategy):
+    stats = compute_draw_stats(_archive(100))
+
+    games = strategy(stats, 500, np.random.default_rng(0))
+
+    assert games.shape == (500, 6)
+    assert ((games >= 1) & (games <= 45)).all() and (np.diff(games.astype(int), axis=1) > 0).all()
+    if strategy is hybrid_games:
+        hot = set(stats.hot_numbers(10))
+        assert all(hot & set(game) for game in games.tolist())
+
+
+def test_each_round_sees_only_previous_draws(monkeypatch):
+    archive = _archive(80)
+    seen = []
+
+    def winning_numbers_of_next_round(stats, count, rng):  # pylint: disable=unused-argument
+        seen.append(stats.latest_round)
+        return np.repeat(archive.numbers[archive.index_of(stats.latest_round + 1)][None, :], count, axis=0)
+
+    monkeypatch.setitem(STRATEGIES, "next", winning_numbers_of_next_round)
+    result = backtest(archive, "next", 3, min_history=50, jobs=1)
+
+    assert seen == list(range(50, 80))
+    assert result.rounds.tolist() == list(range(51, 81))
+    assert result.rank_counts[:, 1].tolist() == [3] * 30
+    assert result.return_rate() == pytest.approx(PRIZES[0] / 1000)
+    assert result.cumulative_profit()[-1] == 30 * 3 * (PRIZES[0] - 1000)
+
+
+def test_result_does_not_depend_on_worker_count(monkeypatch):
+    archive = _archive(120)
+    monkeypatch.setattr(backtest_module, "ProcessPoolExecutor", ThreadPoolExecutor)
+
+    single = backtest(archive, "hybrid", 200, jobs=1, seed=7)
+    pooled = backtest(archive, "hybrid", 200, jobs=3, seed=7)
+
+    assert np.array_equal(single.rank_counts, pooled.rank_counts) and np.array_equal(single.returns, pooled.returns)
+    assert single.rank_counts.sum() == single.games == 70 * 200
+    intervals = single.hit_rate_intervals()
+    assert ((intervals[:, 0] <= single.hit_rates()) & (single.hit_rates() <= intervals[:, 1])).all()
+    assert single.to_dict()["ranks"][4]["hits"] == int(single.rank_counts[:, 5].sum())
+
+
+def test_rejects_unknown_strategy_and_short_history():
+    with pytest.raises(ValueError):
+        backtest(_archive(60), "nope")
+    with pytest.raises(ValueError):
+        backtest(_archive(50), "random", min_history=50)
@@ -0,0 +1,63 @@
+import datetime
+
+import pytest
+
+from dhapi.domain.lotto645_draw import current_selling_round, normalize_draw_history_item
+from dhapi.port.draw_history_store import DrawHistoryStore
+
+np = pytest.importorskip("numpy")
+from dhapi.analysis.draw_archive import DrawArchive, update_draw_archive  # pylint: disable=wrong-import-position
+
+NOW = datetime.datetime(2026, 10, 14, 12, 0)
+
+
+def _raw(round_no):
+    item = {"ltEpsd": round_no, "ltRflYmd": "20261010", "bnsWnNo": 40 + round_no % 5, "wholEpsdSumNtslAmt": 100 * round_no}
+    item.update({f"tm{index}WnNo": 7 * index - round_no % 7 for index in range(1, 7)})
+    item.update({"rnk1WnNope": round_no % 13, "rnk1WnAmt": 2_000_000_000, "rnk5WnNope": 1_000_000, "rnk5WnAmt": 5000})
+    return item
+
+
+def _store(tmp_path, last_round):
+    store = DrawHistoryStore(tmp_path / "draws.sqlite3")
+    store.save(normalize_draw_history_item(_raw(round_no)) for round_no in range(1, last_round + 1))
+    return store
+
+
+def test_archive_is_opened_as_readonly_memmap(tmp_path):
+    store = _store(tmp_path, 100)
+
+    archive = update_draw_archive(store, tmp_path / "archive")
+
+    assert isinstance(archive.numbers, np.memmap) and not archive.numbers.flags.writeable
+    assert archive.numbers.dtype == np.uint8 and archive.numbers.shape == (100, 6)
+    assert len(archive) == 100 and archive.latest_round == 100
+    row = archive.index_of(10)
+    assert archive.numbers[row].tolist() == store.get(10)["numbers"]
+    assert (archive.bonus[row], archive.sales[row], archive.draw_dates[row]) == (40, 1000, np.datetime64("2026-10-10"))
+    assert archive.winners[row].tolist() == [10, 0, 0, 0, 1_000_000]
+    assert archive.prizes[row, 0] == 2_000_000_000
+    assert archive.index_of(101) is None
+
+
+def test_update_appends_only_new_rounds(tmp_path, mocker):
+    store = _store(tmp_path, current_selling_round(NOW) - 3)
+    path = tmp_path / "archive"
+    first = update_draw_archive(store, path)
+
+    store.save(normalize_draw_history_item(_raw(round_no)) for round_no in (first.latest_round + 1, first.latest_round + 2))
+    items_after = mocker.spy(store, "items_after")
+    second = update_draw_archive(store, path)
+
+    items_after.assert_called_once_with(first.latest_round)
+    assert len(second) == len(first) + 2
+    assert np.array_equal(second.numbers[: len(first)], first.numbers)
+    # 이미 열려 있던 아카이브는 이전 버전 파일을 그대로 읽는다.
+    assert first.latest_round == len(first)
+    assert update_draw_archive(store, path).latest_round == second.latest_round
+    assert sorted(child.name for child in path.iterdir() if child.is_dir()) == [f"r{first.latest_round}", f"r{second.latest_round}"]
+
+
+def test_open_returns_none_before_first_build(tmp_path):
+    assert DrawArchive.open(tmp_path / "missing") is None
+    assert update_draw_archive(DrawHistoryStore(tmp_path / "draws.sqlite3"), tmp_path / "archive") is None
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+from dhapi.analysis.draw_archive import DrawArchive  # pylint: disable=wrong-import-position
+from dhapi.analysis.draw_stats import DrawStatsCache, compute_draw_stats  # pylint: disable=wrong-import-position
+
+
+def _archive(rounds, seed=0):
+    rng = random.Random(seed)
+    items = []
+    for round_no in range(1, rounds + 1):
+        numbers = rng.sample(range(1, 46), 7)
+        items.append({"round": round_no, "draw_date": "2026-10-10", "numbers": sorted(numbers[:6]), "bonus": numbers[6]})
+    return DrawArchive.from_items(items), [item["numbers"] for item in items]
+
+
+def test_stats_match_plain_python_counts():
+    archive, games = _archive(300)
+
+    stats = compute_draw_stats(archive, windows=(10, 100))
+
+    assert stats.latest_round == 300 and stats.draws == 300
+    assert sorted(stats.frequency) == ["10", "100", "50", "all"]
+    for number in (1, 17, 45):
+        appeared = [index for index, game in enumerate(games) if number in game]
+        assert stats.frequency["all"][number - 1] == len(appeared)
+        assert stats.frequency["10"][number - 1] == sum(number in game for game in games[-10:])
+        assert stats.gaps[number - 1] == 299 - appeared[-1]
+        starts = [-1] + appeared + [300]
+        assert stats.max_gaps[number - 1] == max(b - a for a, b in zip(starts, starts[1:])) - 1
+    assert stats.pairs[2, 16] == sum(3 in game and 17 in game for game in games)
+    assert np.array_equal(stats.pairs, stats.pairs.T) and np.array_equal(np.diag(stats.pairs), stats.frequency["all"])
+    assert stats.odd_counts.tolist() == [sum(sum(n % 2 for n in game) == odd for game in games) for odd in range(7)]
+    assert stats.sum_counts.sum() == 300 and stats.sum_mean == pytest.approx(sum(map(sum, games)) / 300)
+    assert stats.consecutive_rate == pytest.approx(sum(any(b - a == 1 for a, b in zip(game, game[1:])) for game in games) / 300)
+    assert stats.weights.sum() == pytest.approx(1) and (stats.weights > 0).all()
+
+
+def test_hot_and_overdue_numbers_follow_counts():
+    archive, _ = _archive(300)
+    stats = compute_draw_stats(archive)
+
+    hot = stats.hot_numbers(5)
+    assert stats.frequency["50"][hot[0] - 1] == stats.frequency["50"].max()
+    assert stats.overdue[stats.overdue_numbers(1)[0] - 1] == stats.overdue.max()
+    assert stats.to_dict()["odd_even"][3] == {"odd": 3, "even": 3, "draws": int(stats.odd_counts[3])}
+
+
+def test_cache_recomputes_only_for_new_round(mocker):
+    archive, _ = _archive(120)
+    cache = DrawStatsCache()
+    compute = mocker.patch("dhapi.analysis.draw_stats.compute_draw_stats", wraps=compute_draw_stats)
+
+    first = cache.update(archive)
+    assert cache.update(archive) is first and cache.update(None) is first
+    assert compute.call_count == 1
+
+    longer, _ = _archive(121)
+    assert cache.update(longer).latest_round == 121 and cache.payload["latest_round"] == 121
+    assert compute.call_count == 2
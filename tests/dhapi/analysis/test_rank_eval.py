@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from dhapi.domain.lotto645_ticket import Lotto645Ticket
+
+np = pytest.importorskip("numpy")
+from dhapi.analysis.draw_archive import DrawArchive  # pylint: disable=wrong-import-position
+from dhapi.analysis.rank_eval import archive_masks, evaluate_ranks, numbers_to_masks, popcount, rank_counts, ticket_masks  # pylint: disable=wrong-import-position
+
+
+def _expected_rank(ticket, numbers, bonus):
+    matches = len(set(ticket) & set(numbers))
+    if matches == 6:
+        return 1
+    if matches == 5:
+        return 2 if bonus in ticket else 3
+    return {4: 4, 3: 5}.get(matches, 0)
+
+
+def test_ranks_match_set_intersection_including_bonus_rule():
+    draw = [3, 11, 19, 27, 35, 43]
+    tickets = [Lotto645Ticket(numbers) for numbers in ["3,11,19,27,35,43", "3,11,19,27,35,44", "3,11,19,27,35,1", "3,11,19,27,1,2", "3,11,19,1,2,4", "3,11,1,2,4,5"]]
+    archive = DrawArchive.from_items([{"round": 1, "draw_date": "2026-10-10", "numbers": draw, "bonus": 44}])
+
+    ranks = evaluate_ranks(ticket_masks(tickets), *archive_masks(archive))
+
+    assert ranks[:, 0].tolist() == [1, 2, 3, 4, 5, 0]
+
+
+def test_random_tickets_against_many_draws():
+    rng = random.Random(1)
+    tickets = [rng.sample(range(1, 46), 6) for _ in range(500)]
+    draws = [rng.sample(range(1, 46), 7) for _ in range(40)]
+    # 높은 등수도 나오도록 일부 티켓을 당첨번호에 가깝게 만든다.
+    tickets += [draw[:5] + [draw[6]] for draw in draws] + [draw[:6] for draw in draws]
+
+    ranks = evaluate_ranks(numbers_to_masks(tickets), numbers_to_masks([draw[:6] for draw in draws]), numbers_to_masks([[draw[6]] for draw in draws]))
+
+    expected = [[_expected_rank(ticket, draw[:6], draw[6]) for draw in draws] for ticket in tickets]
+    assert ranks.tolist() == expected
+    counts = rank_counts(numbers_to_masks(tickets), numbers_to_masks([draw[:6] for draw in draws]), numbers_to_masks([[draw[6]] for draw in draws]))
+    assert counts.shape == (40, 6) and counts[:, 1].tolist() == [1] * 40 and counts[:, 2].min() >= 1
+    assert counts.tolist() == [[column.count(rank) for rank in range(6)] for column in zip(*expected)]
+
+
+def test_popcount_fallback_without_bitwise_count(monkeypatch):
+    masks = numbers_to_masks([[1, 2, 3, 4, 5, 6], [40, 41, 42, 43, 44, 45]]) | np.uint64(1 << 63)
+    expected = popcount(masks).tolist()
+
+    monkeypatch.delattr(np, "bitwise_count", raising=False)
+
+    assert popcount(masks).tolist() == expected == [7, 7]
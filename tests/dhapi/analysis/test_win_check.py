@@ -0,0 +1,35 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+from dhapi.analysis.draw_archive import DrawArchive  # pylint: disable=wrong-import-position
+from dhapi.analysis.win_check import check_wins  # pylint: disable=wrong-import-position
+
+
+def _draw(round_no, numbers, bonus):
+    ranks = [{"rank": rank, "winner_count": 1, "prize_per_winner": 10 ** (10 - rank)} for rank in range(1, 6)]
+    return {"round": round_no, "draw_date": "2024-01-06", "numbers": numbers, "bonus": bonus, "ranks": ranks}
+
+
+def _game(round_no, numbers):
+    return {"owner": "alice", "barcode": "b", "slot": "A", "round": round_no, "purchase_date": "2024-01-01", "mode": "자동", "numbers": numbers}
+
+
+def test_each_game_is_scored_against_its_own_round():
+    archive = DrawArchive.from_items([_draw(1100, [1, 2, 3, 4, 5, 6], 7), _draw(1102, [10, 11, 12, 13, 14, 15], 16)])
+    games = [
+        _game(1100, [1, 2, 3, 4, 5, 7]),
+        _game(1102, [1, 2, 3, 4, 5, 7]),
+        _game(1102, [10, 11, 12, 40, 41, 42]),
+        _game(1101, [1, 2, 3, 4, 5, 6]),
+        _game(1103, [10, 11, 12, 13, 14, 15]),
+    ]
+
+    results = check_wins(games, archive)
+
+    assert [(result["rank"], result["prize"]) for result in results] == [(2, 10**8), (0, 0), (5, 10**5), (None, None), (None, None)]
+    assert results[0]["barcode"] == "b" and results[0]["numbers"] == [1, 2, 3, 4, 5, 7]
+
+
+def test_without_archive_every_game_is_pending():
+    assert [result["rank"] for result in check_wins([_game(1100, [1, 2, 3, 4, 5, 6])], None)] == [None]
+    assert check_wins([], None) == []
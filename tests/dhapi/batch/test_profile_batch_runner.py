@@ -0,0 +1,92 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dhapi.batch import profile_batch_runner
+from dhapi.batch.profile_batch_runner import ProfileBatchRunner, resolve_profiles, run_profile
+from dhapi.domain.user import User
+from dhapi.endpoint.batch_stdout_printer import BatchStdoutPrinter
+
+
+class _FakeClient:
+    def __init__(self, user, endpoint):
+        if user.username == "broken":
+            raise RuntimeError("❗ 로그인에 실패했습니다.")
+        self._endpoint = endpoint
+
+    def show_buy_list(self, output_format, start_date, end_date):
+        rows = iter([["2024-01-01", "로또6/45", "1100", "[A] 자동: 1 2 3 4 5 6", "1", "미추첨", "-", "2024-01-06"]])
+        self._endpoint.print_result_of_show_buy_list(
+            [{"headers": ["구입일자", "복권명", "회차", "선택번호/복권번호", "구입매수", "당첨결과", "당첨금", "추첨일"], "rows": rows}], output_format, "2024-01-01", "2024-01-14"
+        )
+
+    def fetch_lotto645_games(self, start_date, end_date, known_barcodes=()):
+        purchase = {"barcode": "b1", "order_no": "1", "round": 1100, "purchase_date": "2024-01-01", "games": [{"slot": "A", "mode": "자동", "numbers": [1, 2, 3, 4, 5, 6]}]}
+        return [purchase] if "b1" not in known_barcodes else []
+
+
+def test_resolve_profiles(tmp_path):
+    cred_file = tmp_path / "credentials"
+    cred_file.write_text("[a]\nusername = 'a'\npassword = 'a'\n\n[b]\nusername = 'b'\npassword = 'b'\n", encoding="UTF-8")
+
+    assert resolve_profiles("all", path=str(cred_file)) == ["a", "b"]
+    assert resolve_profiles(" b, a ,b,") == ["b", "a"]
+
+
+def test_failure_in_one_profile_does_not_stop_others(mocker):
+    mocker.patch.object(profile_batch_runner, "ProcessPoolExecutor", ThreadPoolExecutor)
+    users = {"first": User("first", "pw"), "broken": User("broken", "pw"), "last": User("last", "pw")}
+
+    results = ProfileBatchRunner(_FakeClient, jobs=2).run("show-buy-list", users)
+
+    assert [result["profile"] for result in results] == ["first", "broken", "last"]
+    assert [result["ok"] for result in results] == [True, False, True]
+    assert results[1]["error"] == "❗ 로그인에 실패했습니다."
+    assert all(result["elapsed_seconds"] >= 0 for result in results)
+    assert results[0]["result"]["rows"][0][2] == "1100"
+
+
+def test_unknown_command_is_rejected():
+    with pytest.raises(ValueError):
+        ProfileBatchRunner(_FakeClient).run("assign-virtual-account", {"a": User("a", "pw")})
+
+
+def test_batch_json_merges_profiles(capsys):
+    results = [run_profile("show-buy-list", "a", User("a", "pw"), {}, _FakeClient), run_profile("show-buy-list", "broken", User("broken", "pw"), {}, _FakeClient)]
+
+    BatchStdoutPrinter().print_result_of_batch("show-buy-list", results, "json", 1.5)
+
+    doc = json.loads(capsys.readouterr().out)
+    assert doc["command"] == "show-buy-list"
+    assert doc["results"][0]["data"][0]["numbers"] == [{"slot": "A", "mode": "자동", "numbers": [1, 2, 3, 4, 5, 6]}]
+    assert doc["results"][1] == {"profile": "broken", "ok": False, "elapsed_seconds": results[1]["elapsed_seconds"], "error": "❗ 로그인에 실패했습니다.", "data": None}
+
+
+def test_sync_tickets_saves_only_new_purchases(tmp_path):
+    options = {"ticket_db_path": str(tmp_path / "tickets.sqlite3")}
+
+    first = run_profile("sync-tickets", "a", User("a", "pw"), options, _FakeClient)
+    second = run_profile("sync-tickets", "a", User("a", "pw"), options, _FakeClient)
+
+    assert (first["result"], second["result"]) == ({"added": 1}, {"added": 0})
+
+
+def test_batch_runner_builds_clients_like_the_cli(mocker):
+    from dhapi.port import lottery_client
+    from dhapi.port.discovery_cache import DiscoveryCache
+    from dhapi.port.session_store import SessionStore
+    from dhapi.port.virtual_account_store import VirtualAccountStore
+    from dhapi.router.dependency_factory import build_profile_batch_runner
+
+    built = mocker.patch.object(lottery_client, "LotteryClient")
+    mocker.patch.object(profile_batch_runner, "ProcessPoolExecutor", ThreadPoolExecutor)
+
+    build_profile_batch_runner(jobs=1).run("show-balance", {"a": User("a", "pw")})
+
+    user, endpoint, session_store, virtual_account_store, discovery_cache = built.call_args.args
+    assert user.username == "a"
+    assert endpoint.__class__.__name__ == "LotteryResultCollector"
+    assert isinstance(session_store, SessionStore)
+    assert isinstance(virtual_account_store, VirtualAccountStore)
+    assert isinstance(discovery_cache, DiscoveryCache)
@@ -0,0 +1,17 @@
+import datetime
+
+from dhapi.domain.lotto645_draw import current_selling_round
+
+SATURDAY_NOON_KST = datetime.datetime(2026, 10, 17, 12, 0)
+
+
+def test_selling_round_moves_on_after_saturday():
+    assert current_selling_round(datetime.datetime(2026, 10, 18, 0, 30)) == current_selling_round(SATURDAY_NOON_KST) + 1
+    assert current_selling_round(datetime.datetime(2026, 10, 12, 9, 0)) == current_selling_round(SATURDAY_NOON_KST)
+
+
+def test_aware_time_is_converted_to_korea_date():
+    # 토요일 15:30 UTC는 한국 시각으로 일요일 00:30이므로 다음 회차다.
+    saturday_night_utc = datetime.datetime(2026, 10, 17, 15, 30, tzinfo=datetime.timezone.utc)
+
+    assert current_selling_round(saturday_night_utc) == current_selling_round(SATURDAY_NOON_KST) + 1
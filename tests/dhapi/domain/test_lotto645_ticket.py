@@ -136,3 +136,11 @@ def test_mode_kor_formatted_return_수동_for_manual():
 
     assert len(tickets) == 1
     assert tickets[0].mode_kor == "수동"
+
+
+def test_bitmask_round_trip():
+    ticket = Lotto645Ticket('45,1,7,23,30,2')
+
+    assert ticket.to_bitmask() == (1 << 1) | (1 << 2) | (1 << 7) | (1 << 23) | (1 << 30) | (1 << 45)
+    assert Lotto645Ticket.from_bitmask(ticket.to_bitmask()).numbers == [1, 2, 7, 23, 30, 45]
+    assert Lotto645Ticket.from_bitmask(0).mode == Lotto645Mode.AUTO
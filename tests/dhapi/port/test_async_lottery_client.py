@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+import pytest
+
+from dhapi.domain.user import User
+from dhapi.port.lottery_client import LotteryClient
+from dhapi.port.session_store import SessionStore
+
+httpx = pytest.importorskip("httpx")
+from dhapi.port.async_lottery_client import AsyncLotteryClient  # pylint: disable=wrong-import-position
+
+
+class _Endpoint:
+    def __init__(self):
+        self.buy_list = None
+
+    def print_result_of_show_buy_list(self, data, output_format, start_date, end_date):
+        self.buy_list = data
+
+
+def _item(i, name="연금복권720+"):
+    return {"eltOrdrDt": "2024-01-01", "ltGdsNm": name, "ltEpsdView": str(i), "gmInfo": f"g{i}", "ntslOrdrNo": str(i), "prchsQty": 1}
+
+
+def _client(handler, endpoint=None, session_store=None):
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True)
+    return AsyncLotteryClient(User("user", "pw"), endpoint, http_client=http_client, session_store=session_store)
+
+
+def test_login_reuses_cached_session(tmp_path):
+    store = SessionStore(directory=str(tmp_path))
+    expires = time.time() + 60
+    store.save(
+        "user",
+        [
+            {"name": "DHJSESSIONID", "value": "abc", "domain": "www.dhlottery.co.kr", "path": "/", "expires": expires},
+            {"name": "JSESSIONID", "value": "def", "domain": "ol.dhlottery.co.kr", "path": "/", "expires": expires},
+        ],
+    )
+    requested = []
+
+    def handler(request):
+        requested.append((request.url.host, request.url.path))
+        if request.url.host == "ol.dhlottery.co.kr":
+            assert "JSESSIONID=def" in request.headers.get("Cookie", "")
+            return httpx.Response(200, text="<html></html>")
+        assert "DHJSESSIONID=abc" in request.headers.get("Cookie", "")
+        return httpx.Response(200, json={"data": {"userMndp": {}}})
+
+    asyncio.run(_client(handler, session_store=store).login())
+
+    assert requested == [("www.dhlottery.co.kr", "/mypage/selectUserMndp.do"), ("ol.dhlottery.co.kr", "/olotto/game/game645.do")]
+
+
+def test_login_again_when_purchase_session_expired(tmp_path, mocker):
+    store = SessionStore(directory=str(tmp_path))
+    store.save("user", [{"name": "JSESSIONID", "value": "stale", "domain": "ol.dhlottery.co.kr", "path": "/", "expires": time.time() + 60}])
+    login = mocker.patch.object(AsyncLotteryClient, "_login")
+
+    def handler(request):
+        if request.url.host == "ol.dhlottery.co.kr":
+            return httpx.Response(302, headers={"Location": "https://www.dhlottery.co.kr/login"})
+        return httpx.Response(200, json={"data": {"userMndp": {}}})
+
+    asyncio.run(_client(handler, session_store=store).login())
+
+    login.assert_called_once()
+
+
+def test_show_buy_list_uses_shared_row_builder():
+    pages = {
+        "1": {"data": {"total": 101, "list": [_item(i) for i in range(100)]}},
+        "2": {"data": {"total": 101, "list": [_item(100, "로또6/45")]}},
+    }
+    detail = {"data": {"success": True, "ticket": {"game_dtl": [{"idx": "A", "num": [1, 2, 3, 4, 5, 6], "type": 3}]}}}
+
+    def handler(request):
+        if request.url.path.endswith("selectMyLotteryledger.do"):
+            return httpx.Response(200, json=pages[request.url.params["pageNum"]])
+        if request.url.path.endswith("lotto645TicketDetail.do"):
+            return httpx.Response(200, json=detail)
+        return httpx.Response(200, text="")
+
+    endpoint = _Endpoint()
+    client = _client(handler, endpoint)
+    client._detail_rate_limiter._rate = 1000.0
+    asyncio.run(client.show_buy_list(start_date="20240101", end_date="20240110"))
+
+    rows = endpoint.buy_list[0]["rows"]
+    assert len(rows) == 101
+    assert rows[-1] == LotteryClient._build_buy_list_rows(client, [_item(100, "로또6/45")], {0: "[A] 자동: 1 2 3 4 5 6"})[0]
+
+
+def test_assign_virtual_account_runs_the_shared_resolver_once(mocker):
+    from dhapi.domain.deposit import Deposit
+
+    calls = []
+
+    def assign(client, deposit, force_refresh=False):
+        calls.append((deposit.amount, force_refresh, client._virtual_account_store))
+        client._session.cookies.set("WMONID", "issued", domain="www.dhlottery.co.kr", path="/")
+
+    mocker.patch.object(LotteryClient, "assign_virtual_account", autospec=True, side_effect=assign)
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(500)))
+    store = object()
+    client = AsyncLotteryClient(User("user", "pw"), None, http_client=http_client, virtual_account_store=store)
+    client._client.cookies.set("JSESSIONID", "abc", domain="ol.dhlottery.co.kr", path="/")
+
+    asyncio.run(client.assign_virtual_account(Deposit(5000), force_refresh=True))
+
+    assert calls == [(5000, True, store)]
+    assert client._client.cookies.get("WMONID", domain="www.dhlottery.co.kr") == "issued"
+    assert client._client.cookies.get("JSESSIONID", domain="ol.dhlottery.co.kr") == "abc"
@@ -0,0 +1,106 @@
+import datetime
+import json
+
+import pytest
+
+from dhapi.domain.user import User
+from dhapi.endpoint.lottery_stdout_printer import LotteryStdoutPrinter
+from dhapi.port.lottery_client import LotteryClient
+
+
+def _client(mocker):
+    mocker.patch.object(LotteryClient, "_login")
+    client = LotteryClient(User("user", "pw"), LotteryStdoutPrinter())
+    mocker.patch.object(client._session, "get")
+    return client
+
+
+def _item(i):
+    return {"eltOrdrDt": "2024-01-01", "ltGdsNm": "연금복권720+", "ltEpsdView": str(i), "gmInfo": f"g{i}", "prchsQty": 1}
+
+
+def test_split_date_windows_covers_range_newest_first(mocker):
+    client = _client(mocker)
+
+    windows = list(client._split_date_windows(datetime.date(2024, 1, 1), datetime.date(2024, 3, 15)))
+
+    assert windows[0][1] == datetime.date(2024, 3, 15)
+    assert windows[-1][0] == datetime.date(2024, 1, 1)
+    for (start, end), (_, next_end) in zip(windows, windows[1:]):
+        assert (end - start).days < LotteryClient._BUY_LIST_WINDOW_DAYS
+        assert next_end == start - datetime.timedelta(days=1)
+
+
+def test_buy_list_date_range_defaults_to_last_14_days(mocker):
+    client = _client(mocker)
+    today = datetime.date.today()
+
+    assert client.buy_list_date_range("20240101", "20240110") == ("20240101", "20240110")
+    assert client.buy_list_date_range() == ((today - datetime.timedelta(days=14)).strftime("%Y%m%d"), today.strftime("%Y%m%d"))
+
+
+def test_iter_buy_list_walks_every_page(mocker):
+    client = _client(mocker)
+    pages = {
+        1: {"total": 250, "list": [_item(i) for i in range(100)]},
+        2: {"total": 250, "list": [_item(i) for i in range(100, 200)]},
+        3: {"total": 250, "list": [_item(i) for i in range(200, 250)]},
+    }
+    fetch = mocker.patch.object(client, "_fetch_buy_list_page", side_effect=lambda start, end, page_num: pages[page_num])
+
+    rows = list(client.iter_buy_list("20240101", "20240110"))
+
+    assert [row[2] for row in rows] == [str(i) for i in range(250)]
+    assert fetch.call_count == 3
+
+
+def test_iter_buy_list_is_lazy(mocker):
+    client = _client(mocker)
+    fetch = mocker.patch.object(client, "_fetch_buy_list_page", return_value={"total": 1, "list": [_item(0)]})
+
+    rows = client.iter_buy_list("20240101", "20240110")
+    fetch.assert_not_called()
+
+    assert next(rows)[2] == "0"
+    fetch.assert_called_once()
+
+
+def test_json_stream_matches_json_dumps(capsys):
+    printer = LotteryStdoutPrinter()
+    items = [{"a": 1, "numbers": [{"slot": "A", "numbers": [1, 2]}]}, {"b": "x\ny"}]
+
+    printer._print_json_stream(iter(items))
+    assert capsys.readouterr().out == json.dumps(items, ensure_ascii=False, indent=2) + "\n"
+
+    printer._print_json_stream(iter([]))
+    assert capsys.readouterr().out == "[]\n"
+
+
+def test_json_buy_list_stays_valid_when_a_later_page_fails(mocker, capsys):
+    client = _client(mocker)
+
+    def fetch(start, end, page_num):
+        if page_num == 2:
+            raise ConnectionError("page 2")
+        return {"total": 250, "list": [_item(i) for i in range(100)]}
+
+    mocker.patch.object(client, "_fetch_buy_list_page", side_effect=fetch)
+
+    with pytest.raises(RuntimeError):
+        client.show_buy_list("json", "20240101", "20240110")
+
+    assert len(json.loads(capsys.readouterr().out)) == 100
+
+
+def test_fetch_lotto645_games_skips_known_barcodes(mocker):
+    client = _client(mocker)
+    items = [dict(_item(i), ltGdsNm="로또6/45", ntslOrdrNo=str(i), ltEpsdView=f"{1100 + i}회") for i in range(3)] + [_item(3)]
+    mocker.patch.object(client, "_fetch_buy_list_page", return_value={"total": 4, "list": items})
+    detail = {"data": {"success": True, "ticket": {"game_dtl": [{"idx": "A", "num": [6, 5, 4, 3, 2, 1], "type": 1}, {"idx": "B", "num": [], "type": 3}]}}}
+    request_detail = mocker.patch.object(client, "_request_lotto645_ticket_detail", side_effect=[detail, None])
+
+    purchases = client.fetch_lotto645_games("20240101", "20240110", known_barcodes={"g0"})
+
+    # g1은 조회 성공, g2는 제한 응답(None)이라 다음에 다시 조회한다.
+    assert [call.args[1] for call in request_detail.call_args_list] == ["g1", "g2"]
+    assert purchases == [{"barcode": "g1", "order_no": "1", "round": 1101, "purchase_date": "2024-01-01", "games": [{"slot": "A", "mode": "수동", "numbers": [1, 2, 3, 4, 5, 6]}]}]
@@ -80,3 +80,14 @@ def test_add_credentials_uses_getpass(tmp_path, monkeypatch):
     saved = tomli.loads(cred_file.read_text())
     assert saved == {"default": {"username": "user", "password": "secret"}}
     assert prompts == ["📝 사용자 비밀번호를 입력하세요: "]
+
+
+def test_get_users_reads_profiles_without_prompt(tmp_path):
+    cred_file = tmp_path / "credentials"
+    cred_file.write_text("[a]\nusername = 'u1'\npassword = 'p1'\n", encoding="UTF-8")
+
+    users = CredentialsProvider.get_users(["a"], path=str(cred_file))
+    assert users["a"].username == "u1"
+
+    with pytest.raises(KeyError):
+        CredentialsProvider.get_users(["a", "missing"], path=str(cred_file))
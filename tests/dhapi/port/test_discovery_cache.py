@@ -0,0 +1,144 @@
+import time
+from types import SimpleNamespace
+
+from dhapi.domain.deposit import Deposit
+from dhapi.domain.user import User
+from dhapi.port.discovery_cache import DiscoveryCache
+from dhapi.port.html_document import HtmlDocument
+from dhapi.port.lottery_client import LotteryClient
+
+SCRIPT_URL = "https://www.dhlottery.co.kr/js/mypage.js"
+ENDPOINT = "https://www.dhlottery.co.kr/mypage/selectFixVactInfo.do"
+FOUND = ("701-9005-915-9906", "5,000원", "케이뱅크", None)
+
+
+def _response(status_code, text="", headers=None, url=None):
+    return SimpleNamespace(status_code=status_code, text=text, headers=headers or {}, url=url)
+
+
+def _found_only_at(endpoint):
+    return lambda resp, default_amount: FOUND if resp.url == endpoint else None
+
+
+def _client(mocker, cache):
+    mocker.patch.object(LotteryClient, "_login")
+    return LotteryClient(User("user", "pw"), None, discovery_cache=cache)
+
+
+def _probe_session(mocker, client):
+    probe = mocker.Mock()
+    mocker.patch.object(client, "_new_probe_session", return_value=probe)
+    return probe
+
+
+def test_script_is_revalidated_with_etag_and_served_from_cache(tmp_path, mocker):
+    cache = DiscoveryCache(str(tmp_path))
+    client = _client(mocker, cache)
+    get = mocker.patch.object(client._session, "get", return_value=_response(200, "var url = '/a.do';", {"Content-Type": "text/javascript", "ETag": '"v1"'}))
+
+    assert client._fetch_script_texts([SCRIPT_URL]) == ["var url = '/a.do';"]
+    assert get.call_args.kwargs["headers"] is None
+
+    get.return_value = _response(304)
+    assert client._fetch_script_texts([SCRIPT_URL]) == ["var url = '/a.do';"]
+    assert get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+
+def test_last_successful_endpoint_is_tried_first_without_script_crawl(tmp_path, mocker):
+    cache = DiscoveryCache(str(tmp_path))
+    cache.save_endpoints(["https://www.dhlottery.co.kr/mypage/other.do", ENDPOINT])
+    cache.record_success(ENDPOINT, "POST_FORM")
+    client = _client(mocker, cache)
+    crawl = mocker.patch.object(client, "_extract_script_sources")
+    post = mocker.patch.object(_probe_session(mocker, client), "post", return_value=_response(200))
+    mocker.patch.object(client, "_try_extract_account_from_endpoint_response", return_value=FOUND)
+
+    assert client._try_fetch_account_from_discovered_endpoints("", "https://www.dhlottery.co.kr/mypage/mndpChrg.do", "5,000원", client._MUTATING_PROBE_METHODS) == FOUND
+    crawl.assert_not_called()
+    # POST 탐색은 하나씩 실행되므로 첫 호출이 지난번에 성공한 (엔드포인트, 방식)이다.
+    assert post.call_args_list[0].args[0] == ENDPOINT
+    assert post.call_args_list[0].kwargs["data"] == {}
+    assert post.call_count == 1
+
+
+def test_discovered_endpoints_are_cached_with_winner(tmp_path, mocker):
+    cache = DiscoveryCache(str(tmp_path))
+    client = _client(mocker, cache)
+    mocker.patch.object(client, "_extract_script_sources", return_value=[])
+    mocker.patch.object(client, "_discover_account_related_endpoints", return_value=[ENDPOINT])
+    probe = _probe_session(mocker, client)
+    probe.get.side_effect = lambda url, **kwargs: _response(200, url=url)
+    probe.post.side_effect = lambda url, **kwargs: _response(200, url=url)
+    mocker.patch.object(client, "_try_extract_account_from_endpoint_response", side_effect=_found_only_at(ENDPOINT))
+
+    client._try_fetch_account_from_discovered_endpoints("", "https://www.dhlottery.co.kr/mypage/mndpChrg.do", "5,000원", client._READ_ONLY_PROBE_METHODS)
+
+    assert cache.load_endpoints()[0] == ENDPOINT
+    assert cache.load_last_success()["endpoint"] == ENDPOINT
+
+
+def test_history_orders_endpoints_by_success_count(tmp_path):
+    cache = DiscoveryCache(str(tmp_path))
+    cache.record_success("b.do", "GET")
+    cache.record_success("b.do", "GET")
+    cache.record_success("c.do", "GET")
+
+    assert cache.rank_endpoints(["a.do", "b.do", "c.do"]) == ["c.do", "b.do", "a.do"]
+
+
+def test_probing_stops_at_deadline(tmp_path, mocker):
+    client = _client(mocker, DiscoveryCache(str(tmp_path)))
+    client._PROBE_DEADLINE_SECONDS = 0.2
+    probe = _probe_session(mocker, client)
+    probe.get.side_effect = lambda url, **kwargs: time.sleep(1) or _response(200, url=url)
+    probe.post.side_effect = lambda url, **kwargs: time.sleep(1) or _response(200, url=url)
+
+    started = time.monotonic()
+    assert client._probe_account_endpoints([ENDPOINT], None, "5,000원", client._READ_ONLY_PROBE_METHODS) is None
+    assert time.monotonic() - started < 0.9
+
+
+def test_probe_session_does_not_share_cookie_jar(tmp_path, mocker):
+    client = _client(mocker, DiscoveryCache(str(tmp_path)))
+    client._session.cookies.set("JSESSIONID", "www", domain="www.dhlottery.co.kr")
+
+    probe = client._new_probe_session()
+    probe.cookies.set("JSESSIONID", "probe", domain="www.dhlottery.co.kr")
+
+    assert client._session.cookies.get("JSESSIONID") == "www"
+    assert probe.headers == client._session.headers
+    assert probe.get_adapter("https://www.dhlottery.co.kr/") is client._session.get_adapter("https://www.dhlottery.co.kr/")
+
+
+def test_resolver_probes_with_get_while_reading_and_posts_only_when_issuing(tmp_path, mocker):
+    client = _client(mocker, DiscoveryCache(str(tmp_path)))
+    calls = []
+    mocker.patch.object(client, "_load_mndp_charge_document", return_value=HtmlDocument("<html></html>"))
+    mocker.patch.object(client, "_extract_account_from_mndp_charge_html", return_value=None)
+    mocker.patch.object(client, "_save_debug_html")
+    mocker.patch.object(client, "_try_get_virtual_account_from_user_mndp", return_value=None)
+    mocker.patch.object(client, "_try_assign_virtual_account_via_mypage_flow", side_effect=lambda deposit: calls.append("mypage_kbank"))
+    mocker.patch.object(client, "_issue_virtual_account_via_kbank", side_effect=lambda deposit: calls.append("kbank"))
+    mocker.patch.object(client, "_try_fetch_account_from_discovered_endpoints", side_effect=lambda html, referer, amount, methods, probed, stop: calls.append(methods))
+
+    assert client._build_virtual_account_resolver(Deposit(5000)).resolve() is None
+    assert calls == [("GET",), ("POST_JSON", "POST_FORM"), "mypage_kbank", "kbank"]
+
+
+def test_post_probes_run_one_at_a_time(tmp_path, mocker):
+    client = _client(mocker, DiscoveryCache(str(tmp_path)))
+    in_flight = []
+    overlapped = []
+
+    def post(url, **kwargs):
+        overlapped.append(bool(in_flight))
+        in_flight.append(url)
+        time.sleep(0.01)
+        in_flight.remove(url)
+        return _response(200, url=url)
+
+    _probe_session(mocker, client).post.side_effect = post
+    mocker.patch.object(client, "_try_extract_account_from_endpoint_response", return_value=None)
+
+    assert client._probe_account_endpoints([ENDPOINT, SCRIPT_URL], None, "5,000원", client._MUTATING_PROBE_METHODS) is None
+    assert overlapped == [False] * 4
@@ -0,0 +1,52 @@
+import datetime
+
+from dhapi.domain.lotto645_draw import current_selling_round
+from dhapi.port.draw_history_store import DrawHistoryStore
+
+NOW = datetime.datetime(2026, 10, 14, 12, 0)  # 수요일
+SELLING_ROUND = current_selling_round(NOW)
+
+
+def _raw(round_no):
+    item = {"ltEpsd": round_no, "ltRflYmd": "20261010", "bnsWnNo": 45, "rnk1WnNope": "12", "rnk1WnAmt": "2,000,000,000"}
+    item.update({f"tm{index}WnNo": str(index + round_no % 10) for index in range(1, 7)})
+    return item
+
+
+class _Upstream:
+    def __init__(self, last_round):
+        self.last_round = last_round
+        self.calls = []
+
+    def __call__(self, round_filter):
+        self.calls.append(round_filter)
+        rounds = range(1, self.last_round + 1) if round_filter == "all" else [int(round_filter)]
+        return [_raw(round_no) for round_no in rounds if round_no <= self.last_round]
+
+
+def test_first_sync_downloads_everything_then_only_new_rounds(tmp_path):
+    store = DrawHistoryStore(tmp_path / "draws.sqlite3")
+    upstream = _Upstream(SELLING_ROUND - 3)
+
+    assert store.sync(upstream, now=NOW) == SELLING_ROUND - 3
+    assert upstream.calls == ["all"]
+
+    upstream.last_round = SELLING_ROUND - 1
+    upstream.calls.clear()
+    assert store.sync(upstream, now=NOW) == 2
+    # 이번 주 회차는 아직 추첨 전이라 빈 목록이 오고 거기서 멈춘다.
+    assert upstream.calls == [str(SELLING_ROUND - 2), str(SELLING_ROUND - 1), str(SELLING_ROUND)]
+    assert store.latest_round() == SELLING_ROUND - 1
+
+
+def test_stored_items_keep_normalized_shape(tmp_path):
+    store = DrawHistoryStore(tmp_path / "draws.sqlite3")
+    store.save([None])
+    store.sync(_Upstream(SELLING_ROUND - 1), now=NOW)
+
+    [latest, previous] = store.recent(2)
+    assert (latest["round"], previous["round"]) == (SELLING_ROUND - 1, SELLING_ROUND - 2)
+    assert latest["draw_date"] == "2026-10-10"
+    assert latest["ranks"][0]["winner_count"] == 12 and latest["ranks"][0]["prize_per_winner"] == 2_000_000_000
+    assert store.get(1)["numbers"] == [2, 3, 4, 5, 6, 7]
+    assert store.get(SELLING_ROUND) is None
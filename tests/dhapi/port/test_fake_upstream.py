@@ -0,0 +1,105 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from dhapi.domain.lotto645_ticket import Lotto645Ticket
+from dhapi.domain.user import User
+from dhapi.port.draw_history_client import DrawHistoryClient
+from dhapi.port.draw_history_store import DrawHistoryStore
+from dhapi.port.http_cassette import install
+from dhapi.port.http_transport import build_response
+from dhapi.port.lottery_client import LotteryClient
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient  # pylint: disable=wrong-import-position
+
+SITE = "http://fake.test"
+
+
+def _load_fake_upstream():
+    path = Path(__file__).resolve().parents[3] / "web" / "fake_upstream" / "app.py"
+    spec = importlib.util.spec_from_file_location("fake_upstream_app", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class _TestClientAdapter(BaseAdapter):
+    """requests 세션의 요청을 가짜 서버(ASGI 앱)로 바로 넘긴다."""
+
+    def __init__(self, client: TestClient):
+        super().__init__()
+        self._client = client
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        upstream = self._client.request(request.method, request.url, headers=dict(request.headers), content=request.body, follow_redirects=False)
+        return build_response(request, upstream.status_code, upstream.headers.multi_items(), upstream.content, reason=upstream.reason_phrase, connection=self)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_module():
+    return _load_fake_upstream()
+
+
+def _client_against(fake_app, monkeypatch, user="fakeuser"):
+    monkeypatch.setenv("DHAPI_SITE_URL", SITE)
+    client = LotteryClient.from_cookies(User(user, "pw"), None, [])
+    install(client._session, _TestClientAdapter(TestClient(fake_app, base_url=SITE)))
+    client._login()
+    return client
+
+
+def test_site_override_rewrites_every_host(monkeypatch):
+    monkeypatch.setenv("DHAPI_SITE_URL", "http://127.0.0.1:9000/")
+    client = LotteryClient.from_cookies(User("user", "pw"), None, [])
+
+    assert client._base_url == "http://127.0.0.1:9000"
+    assert client._buy_lotto645_url == "http://127.0.0.1:9000/olotto/game/execBuy.do"
+    assert client._tracer_input_queue == "http://127.0.0.1:9000/TRACERAPI/inputQueue.do"
+    assert LotteryClient._base_url == "https://www.dhlottery.co.kr"
+
+
+def test_client_logs_in_buys_and_reads_back_from_fake_upstream(fake_module, monkeypatch, mocker):
+    fake_app = fake_module.create_app(fake_module.FakeUpstreamConfig(initial_balance=10000, seed=1))
+    endpoint = mocker.Mock()
+    client = _client_against(fake_app, monkeypatch)
+    client._lottery_endpoint = endpoint
+
+    client.buy_lotto645(Lotto645Ticket.create_tickets(["", "1,2,3,4,5,6"]))
+    slots = endpoint.print_result_of_buy_lotto645.call_args.args[0]
+    assert [slot["mode"] for slot in slots] == ["자동", "수동"]
+    assert slots[1]["numbers"] == ["01", "02", "03", "04", "05", "06"]
+
+    client.show_balance()
+    assert fake_app.state.fake.accounts["fakeuser"].balance == 8000
+    assert endpoint.print_result_of_show_balance.called
+
+
+def test_fake_upstream_wait_queue_drains_through_tracer(fake_module, monkeypatch, mocker):
+    fake_app = fake_module.create_app(fake_module.FakeUpstreamConfig(wait_rate=1.0, wait_count=20, wait_drain=10, seed=1))
+    client = _client_against(fake_app, monkeypatch)
+    mocker.patch("time.sleep")
+
+    resp = client._get_with_wait_retry(f"{SITE}/common.do", params={"method": "getLottoNumber", "drwNo": 1}, max_attempts=3, wait_seconds=1)
+
+    assert resp.json()["returnValue"] == "success"
+    assert not fake_app.state.fake.queues and fake_app.state.fake.released
+
+
+def test_draw_history_client_syncs_store_from_fake_upstream(fake_module, tmp_path):
+    fake_app = fake_module.create_app(fake_module.FakeUpstreamConfig(seed=1))
+    session = requests.Session()
+    install(session, _TestClientAdapter(TestClient(fake_app, base_url=SITE)))
+    draws = fake_app.state.fake.draws
+    store = DrawHistoryStore(tmp_path / "draws.sqlite3")
+
+    store.sync(DrawHistoryClient(site=SITE, session=session))
+
+    assert store.latest_round() == draws[-1]["ltEpsd"]
+    assert store.get(1)["numbers"] == [draws[0][f"tm{index}WnNo"] for index in range(1, 7)]
@@ -0,0 +1,30 @@
+import pytest
+
+from dhapi.domain.user import User
+from dhapi.port import html_document
+from dhapi.port.html_document import HtmlDocument
+from dhapi.port.lottery_client import LotteryClient
+
+PAGE = """
+<html><head><script>var msg = "계좌주명을 입력해주세요.";</script></head>
+<body><div id="contents"><span>고정 가상계좌 [케이뱅크] 701-9005-915-9906</span><p class="color_key1">5,000원</p></div>
+<input type="hidden" name="VbankBankCode" value="089"></body></html>
+"""
+
+
+def test_document_is_parsed_once_for_all_extractors(mocker):
+    parse = mocker.spy(html_document, "BeautifulSoup")
+    client = LotteryClient.from_cookies(User("user", "pw"), None, [])
+    doc = HtmlDocument(PAGE)
+
+    found = client._extract_account_from_mndp_charge_html(doc, 5000)
+    client._extract_hidden_inputs_from_html(doc)
+    client._extract_script_sources(doc, client._mndp_charge_page)
+
+    assert found[:3] == ("701-9005-915-9906", "5,000원", "케이뱅크")
+    assert parse.call_count == 1
+
+
+def test_plain_text_does_not_depend_on_parser():
+    pytest.importorskip("lxml")
+    assert HtmlDocument(PAGE, parser="lxml").plain_text == HtmlDocument(PAGE, parser="html5lib").plain_text
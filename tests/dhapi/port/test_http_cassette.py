@@ -0,0 +1,84 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from dhapi.domain.user import User
+from dhapi.port.http_cassette import Cassette, CassetteMissError, RecordingAdapter, Redactor, ReplayAdapter, install
+from dhapi.port.lottery_client import LotteryClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):  # pylint: disable=invalid-name
+        body = json.dumps({"data": {"userId": "myuser", "name": "myuser 님", "path": self.path}}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Set-Cookie", "JSESSIONID=abcdef123; Path=/")
+        self.send_header("Set-Cookie", "DHJSESSIONID=zzz; Path=/")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+def test_record_redacts_and_replay_serves_offline(server, tmp_path):
+    path = tmp_path / "site.cassette.json.gz"
+    cassette = Cassette(str(path))
+    session = requests.Session()
+    install(session, RecordingAdapter(cassette, Redactor(["myuser", "secret-pw"])))
+    session.get(f"{server}/mypage/selectUserMndp.do", params={"_": 1}, headers={"Cookie": "wcCookie=1.2.3.4_T_1_WC"})
+    cassette.save()
+
+    raw = gzip.open(path, "rt", encoding="UTF-8").read()
+    assert "myuser" not in raw and "abcdef123" not in raw and "1.2.3.4" not in raw
+
+    session = requests.Session()
+    install(session, ReplayAdapter(Cassette.load(str(path))))
+    resp = session.get(f"{server}/mypage/selectUserMndp.do", params={"_": 2})
+
+    assert resp.status_code == 200
+    assert resp.json()["data"]["path"] == "/mypage/selectUserMndp.do?_=1"
+    assert resp.json()["data"]["userId"] == "REDACTED"
+    assert {cookie.name for cookie in session.cookies} == {"JSESSIONID", "DHJSESSIONID"}
+    with pytest.raises(CassetteMissError):
+        session.get(f"{server}/mypage/unknown.do")
+
+
+def test_replay_serves_repeated_requests_in_recorded_order(tmp_path):
+    def interaction(text):
+        return {
+            "request": {"method": "GET", "url": "https://www.dhlottery.co.kr/a.do?page=1", "headers": [], "body": None},
+            "response": {"status": 200, "reason": "OK", "headers": [["Content-Type", "text/plain"]], "body": {"text": text}, "elapsed_seconds": 0.01},
+        }
+
+    session = requests.Session()
+    install(session, ReplayAdapter(Cassette(str(tmp_path / "c.json.gz"), [interaction("first"), interaction("second")])))
+
+    assert [session.get("https://www.dhlottery.co.kr/a.do?page=1").text for _ in range(3)] == ["first", "second", "second"]
+    # 쿼리가 다르면 경로만으로 찾는다.
+    assert session.get("https://www.dhlottery.co.kr/a.do?page=9").text == "first"
+
+
+def test_client_uses_cassette_from_environment(tmp_path, monkeypatch, mocker):
+    path = tmp_path / "c.json.gz"
+    Cassette(str(path)).save()
+    monkeypatch.setenv("DHAPI_CASSETTE", str(path))
+    monkeypatch.setenv("DHAPI_CASSETTE_MODE", "replay")
+    mocker.patch.object(LotteryClient, "_login")
+
+    client = LotteryClient(User("user", "pw"), None)
+
+    assert isinstance(client._session.get_adapter("https://www.dhlottery.co.kr/"), ReplayAdapter)
@@ -0,0 +1,108 @@
+import ssl
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from dhapi.port.http_transport import HttpxAdapter, TransportConfig, _ssl_context, install_transport
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = {}
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        key = f"{self.command} {self.path}"
+        _Handler.hits[key] = _Handler.hits.get(key, 0) + 1
+
+        if self.path == "/flaky" and _Handler.hits[key] == 1:
+            status, body = 503, b"busy"
+        elif self.path == "/login":
+            self.send_response(302)
+            self.send_header("Location", "/main")
+            self.send_header("Set-Cookie", "JSESSIONID=abc; Path=/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        else:
+            status, body = 200, f"{self.command} {self.path} cookie={self.headers.get('Cookie')}".encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _respond  # pylint: disable=invalid-name
+    do_POST = _respond  # pylint: disable=invalid-name
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.hits = {}
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+def test_config_from_environment(monkeypatch):
+    monkeypatch.setenv("DHAPI_TRANSPORT", "httpx")
+    monkeypatch.setenv("DHAPI_POOL_SIZES", "www.dhlottery.co.kr=32, tracer.dhlottery.co.kr=2")
+    monkeypatch.setenv("DHAPI_HTTP_RETRIES", "0")
+
+    config = TransportConfig.from_environment()
+
+    assert (config.backend, config.retries) == ("httpx", 0)
+    assert config.pool_size_for("www.dhlottery.co.kr") == 32
+    assert config.pool_size_for("tracer.dhlottery.co.kr") == 2
+    assert config.pool_size_for("ol.dhlottery.co.kr") == 4
+
+    monkeypatch.setenv("DHAPI_TRANSPORT", "curl")
+    with pytest.raises(RuntimeError):
+        TransportConfig.from_environment()
+
+
+def test_requests_backend_sizes_pools_per_origin_and_retries_only_get(server):
+    session = requests.Session()
+    install_transport(session, TransportConfig(pool_sizes={"127.0.0.1": 3}), origins=[server])
+
+    assert session.get_adapter(f"{server}/a")._pool_maxsize == 3
+    assert session.get_adapter("https://www.dhlottery.co.kr/")._pool_maxsize == 10
+
+    assert session.get(f"{server}/flaky").status_code == 200
+    assert session.post(f"{server}/flaky").status_code == 503
+    assert _Handler.hits == {"GET /flaky": 2, "POST /flaky": 1}
+
+
+def test_httpx_backend_keeps_session_cookies_and_redirects(server):
+    pytest.importorskip("httpx")
+    session = requests.Session()
+    [adapter] = install_transport(session, TransportConfig(backend="httpx", http2=False), origins=[server])
+    assert isinstance(adapter, HttpxAdapter)
+
+    resp = session.post(f"{server}/login", data={"userId": "a"})
+
+    assert resp.url == f"{server}/main"
+    assert resp.text == "GET /main cookie=JSESSIONID=abc"
+    assert session.cookies.get("JSESSIONID") == "abc"
+
+
+def test_httpx_backend_honors_proxies_and_tls_settings(server):
+    pytest.importorskip("httpx")
+    session = requests.Session()
+    [adapter] = install_transport(session, TransportConfig(backend="httpx", http2=False), origins=[server])
+
+    resp = session.get("http://dhapi.invalid/proxied", proxies={"http": server})
+    assert resp.text == "GET http://dhapi.invalid/proxied cookie=None"
+
+    unverified = adapter._transport_for(False, None, None)
+    assert unverified is adapter._transport_for(False, None, None)
+    assert unverified is not adapter._transport_for(requests.certs.where(), None, None)
+    assert _ssl_context(False, None).verify_mode == ssl.CERT_NONE
+    assert _ssl_context(True, None) is True
@@ -0,0 +1,43 @@
+from dhapi.domain.user import User
+from dhapi.port.lottery_client import LotteryClient
+from dhapi.port.payload_index import PayloadIndex, key_classes
+
+PAYLOAD = {
+    "resultCode": "0000",
+    "data": {
+        "list": [{"bankCd": "004", "acctDesc": "안내"}],
+        "resVO": {"vbankNum": "", "VbankNum": "701-9005-915-9906", "vbankBankCode": "089", "buyerName": "홍길동", "payAmt": 5000},
+        "reqVO": {},
+    },
+}
+
+
+def test_candidates_follow_traversal_then_priority_order():
+    index = PayloadIndex(PAYLOAD)
+
+    accounts = [(candidate.priority, candidate.key, candidate.path) for candidate in index.candidates("account")]
+    assert accounts == [
+        (False, "acctDesc", ("data", "list", 0, "acctDesc")),
+        (True, "VbankNum", ("data", "resVO", "VbankNum")),
+        (True, "vbankNum", ("data", "resVO", "vbankNum")),
+        (False, "vbankNum", ("data", "resVO", "vbankNum")),
+        (False, "VbankNum", ("data", "resVO", "VbankNum")),
+        (False, "vbankBankCode", ("data", "resVO", "vbankBankCode")),
+    ]
+    assert key_classes("vbankBankCode") == {"account", "bank"}
+
+
+def test_mapping_lookups():
+    index = PayloadIndex(PAYLOAD)
+
+    assert index.find_mapping("resVO")["buyerName"] == "홍길동"
+    assert index.find_mapping("reqVO") == {}
+    assert index.find_mapping_with_keys(("PAYAMT", "bankCd")) is PAYLOAD["data"]["list"][0]
+    assert PayloadIndex(PAYLOAD, recursive=False).find_mapping_with_keys(("bankCd",)) == {}
+
+
+def test_client_extracts_fields_from_one_index():
+    client = LotteryClient.from_cookies(User("user", "pw"), None, [])
+
+    assert client._extract_virtual_account_fields_from_payload(PayloadIndex.of(PAYLOAD)) == ("701-9005-915-9906", "5,000원", "케이뱅크", "홍길동")
+    assert client._find_account_in_mapping(PAYLOAD) == ""
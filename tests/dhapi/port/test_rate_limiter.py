@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+
+from dhapi.domain.user import User
+from dhapi.port.lottery_client import LotteryClient
+from dhapi.port.rate_limiter import AdaptiveRateLimiter, RateLimitConfig
+
+
+def test_rate_backs_off_and_recovers_within_bounds():
+    limiter = AdaptiveRateLimiter(rate=4.0, min_rate=1.0, max_rate=5.0, increase_step=0.5)
+
+    limiter.on_throttle()
+    assert limiter.rate == 2.0
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.rate == 1.0
+
+    for _ in range(20):
+        limiter.on_success()
+    assert limiter.rate == 5.0
+
+
+def test_acquire_spaces_out_requests():
+    limiter = AdaptiveRateLimiter(rate=20.0, min_rate=1.0, max_rate=20.0)
+
+    started = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+    elapsed = time.monotonic() - started
+
+    # 첫 토큰은 즉시, 나머지 4개는 1/20초 간격
+    assert elapsed >= 0.18
+
+
+def test_invalid_bounds_raise():
+    with pytest.raises(ValueError):
+        AdaptiveRateLimiter(rate=1.0, min_rate=2.0, max_rate=1.0)
+
+
+def _client(mocker):
+    mocker.patch.object(LotteryClient, "_login")
+    return LotteryClient(User("user", "pw"), None)
+
+
+def test_parse_buy_list_keeps_original_order_with_concurrent_details(mocker):
+    client = _client(mocker)
+    client._detail_rate_limiter = AdaptiveRateLimiter(rate=1000.0, min_rate=1.0, max_rate=1000.0, burst=100)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def fake_detail(ntsl_ordr_no, barcode, purchase_date):
+        with lock:
+            active.append(ntsl_ordr_no)
+            peak.append(len(active))
+        time.sleep(0.01 * (10 - int(ntsl_ordr_no)))
+        with lock:
+            active.remove(ntsl_ordr_no)
+        return f"detail-{ntsl_ordr_no}"
+
+    mocker.patch.object(client, "_get_lotto645_ticket_detail", side_effect=fake_detail)
+    items = [{"ltGdsNm": "로또6/45", "gmInfo": f"barcode{i}", "ntslOrdrNo": str(i), "eltOrdrDt": "2024-01-01"} for i in range(10)]
+    items.insert(3, {"ltGdsNm": "연금복권720+", "gmInfo": "pension", "ntslOrdrNo": "x"})
+
+    result = client._parse_buy_list_json({"data": {"list": items}})
+
+    numbers = [row[3] for row in result[0]["rows"]]
+    assert numbers == ["detail-0", "detail-1", "detail-2", "pension"] + [f"detail-{i}" for i in range(3, 10)]
+    assert 1 < max(peak) <= LotteryClient._DETAIL_LIMITS.max_workers
+
+
+def test_detail_limits_can_be_tuned_from_environment(monkeypatch):
+    monkeypatch.setenv("DHAPI_DETAIL_MAX_RATE", "3")
+    monkeypatch.setenv("DHAPI_DETAIL_MAX_WORKERS", "2")
+
+    client = LotteryClient.from_cookies(User("user", "pw"), None, [])
+
+    assert client._detail_limits == RateLimitConfig(rate=2.0, min_rate=0.5, max_rate=3.0, max_workers=2)
+    for _ in range(10):
+        client._detail_rate_limiter.on_success()
+    assert client._detail_rate_limiter.rate == 3.0
+
+
+@pytest.mark.parametrize("name, value", [("DHAPI_DETAIL_RATE", "fast"), ("DHAPI_DETAIL_MAX_WORKERS", "0"), ("DHAPI_DETAIL_MIN_RATE", "10")])
+def test_invalid_detail_limits_are_rejected(monkeypatch, name, value):
+    monkeypatch.setenv(name, value)
+
+    with pytest.raises(RuntimeError):
+        RateLimitConfig.from_environment(LotteryClient._DETAIL_LIMITS)
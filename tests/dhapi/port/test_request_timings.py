@@ -0,0 +1,92 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from dhapi.domain.user import User
+from dhapi.port.http_cassette import install
+from dhapi.port.lottery_client import LotteryClient
+from dhapi.port.request_timings import RequestTimings, TimingAdapter, endpoint_template
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        body = b'<html><img src="img_error.png"></html>' if self.path.startswith("/wait") else b'{"data": {}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html;charset=UTF-8" if self.path.startswith("/wait") else "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://localhost:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+def test_adapter_records_phases_per_endpoint(server):
+    timings = RequestTimings()
+    session = requests.Session()
+    install(session, TimingAdapter(timings, is_wait_page=lambda text: "img_error.png" in text))
+
+    session.get(f"{server}/mypage/123/detail.do", params={"_": 1})
+    session.get(f"{server}/mypage/456/detail.do")
+    session.get(f"{server}/wait")
+
+    host = server.split("//")[1]
+    snapshot = timings.snapshot()
+    assert endpoint_template(f"{server}/mypage/123/detail.do?_=1") == f"{host}/mypage/{{n}}/detail.do"
+    detail = snapshot[f"GET {host}/mypage/{{n}}/detail.do"]
+    assert detail["statuses"] == {"200": 2}
+    assert detail["bytes"] == 2 * len(b'{"data": {}}')
+    assert detail["histograms"]["total"]["count"] == 2
+    assert detail["histograms"]["ttfb"]["count"] == 2
+    # 두 번째 요청은 keep-alive 연결을 재사용하므로 DNS/연결 시간이 없다.
+    assert detail["histograms"]["dns"]["count"] == 1
+    assert detail["histograms"]["connect"]["count"] == 1
+    assert snapshot[f"GET {host}/wait"]["wait_pages"] == 1
+
+
+def test_connection_failure_is_recorded_as_error():
+    timings = RequestTimings()
+    session = requests.Session()
+    install(session, TimingAdapter(timings))
+
+    with pytest.raises(requests.ConnectionError):
+        session.get("http://127.0.0.1:9/unreachable.do", timeout=1)
+
+    [row] = timings.summary()
+    assert (row["endpoint"], row["count"], row["errors"]) == ("127.0.0.1:9/unreachable.do", 1, 1)
+
+
+def test_merge_and_summary_percentiles():
+    worker = RequestTimings()
+    for seconds in [0.02] * 9 + [3.0]:
+        worker.record("get", "www.dhlottery.co.kr/a.do", status=200, size=10, timings={"total": seconds})
+
+    merged = RequestTimings()
+    merged.merge(worker.drain())
+
+    [row] = merged.summary()
+    assert worker.snapshot() == {}
+    assert (row["count"], row["bytes"], row["p50_ms"], row["p99_ms"]) == (10, 100, 25.0, 3000.0)
+    assert 'dhapi_upstream_request_seconds_bucket{method="GET",endpoint="www.dhlottery.co.kr/a.do",phase="total",le="+Inf"} 10' in merged.to_prometheus()
+
+
+def test_client_mounts_timing_adapter_only_when_enabled(monkeypatch):
+    monkeypatch.delenv("DHAPI_TIMINGS", raising=False)
+    client = LotteryClient.from_cookies(User("user", "pw"), None, [])
+    assert not isinstance(client._session.get_adapter("https://www.dhlottery.co.kr/"), TimingAdapter)
+
+    monkeypatch.setenv("DHAPI_TIMINGS", "1")
+    client = LotteryClient.from_cookies(User("user", "pw"), None, [])
+    assert isinstance(client._session.get_adapter("https://www.dhlottery.co.kr/"), TimingAdapter)
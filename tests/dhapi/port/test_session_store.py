@@ -0,0 +1,106 @@
+import os
+import time
+
+import pytest
+import requests
+
+from dhapi.domain.user import User
+from dhapi.port.lottery_client import LotteryClient
+from dhapi.port.session_store import SessionStore
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    store = SessionStore(directory=str(tmp_path))
+    jar = requests.cookies.RequestsCookieJar()
+    jar.set("JSESSIONID", "abc", domain="ol.dhlottery.co.kr", path="/")
+    jar.set("DHJSESSIONID", "def", domain=".dhlottery.co.kr", path="/")
+
+    store.save("user", store.dump_cookies(jar))
+    cookies = store.load("user")
+
+    restored = requests.cookies.RequestsCookieJar()
+    store.restore_cookies(restored, cookies)
+    assert restored.get("JSESSIONID", domain="ol.dhlottery.co.kr") == "abc"
+    assert restored.get("DHJSESSIONID", domain=".dhlottery.co.kr") == "def"
+
+
+def test_session_file_is_private_and_hides_username(tmp_path):
+    store = SessionStore(directory=str(tmp_path))
+    store.save("user", [])
+
+    files = os.listdir(tmp_path)
+    assert len(files) == 1
+    assert "user" not in files[0]
+    assert os.stat(tmp_path / files[0]).st_mode & 0o777 == 0o600
+
+
+def test_load_returns_none_when_expired(tmp_path):
+    store = SessionStore(directory=str(tmp_path), ttl_seconds=-1)
+    store.save("user", [{"name": "a", "value": "b"}])
+
+    assert store.load("user") is None
+    assert not os.listdir(tmp_path)
+
+
+def test_load_returns_none_for_corrupted_file(tmp_path):
+    store = SessionStore(directory=str(tmp_path))
+    store.save("user", [{"name": "a", "value": "b"}])
+    (tmp_path / os.listdir(tmp_path)[0]).write_text("{not json", encoding="UTF-8")
+
+    assert store.load("user") is None
+
+
+def test_client_reuses_cached_session_without_login(tmp_path, mocker):
+    store = SessionStore(directory=str(tmp_path))
+    store.save("user", [{"name": "JSESSIONID", "value": "abc", "domain": "ol.dhlottery.co.kr", "path": "/", "expires": time.time() + 60}])
+    mocker.patch.object(LotteryClient, "_is_session_alive", return_value=True)
+    login = mocker.patch.object(LotteryClient, "_login")
+
+    client = LotteryClient(User("user", "pw"), None, store)
+
+    login.assert_not_called()
+    assert client._session.cookies.get("JSESSIONID") == "abc"
+
+
+def test_client_logs_in_again_when_probe_fails(tmp_path, mocker):
+    store = SessionStore(directory=str(tmp_path))
+    store.save("user", [{"name": "JSESSIONID", "value": "stale", "domain": "ol.dhlottery.co.kr", "path": "/"}])
+    mocker.patch.object(LotteryClient, "_is_session_alive", return_value=False)
+    login = mocker.patch.object(LotteryClient, "_login")
+
+    client = LotteryClient(User("user", "pw"), None, store)
+
+    login.assert_called_once()
+    assert client._session.cookies.get("JSESSIONID") is None
+
+
+def test_client_logs_in_again_when_purchase_session_expired(tmp_path, mocker):
+    store = SessionStore(directory=str(tmp_path))
+    store.save("user", [{"name": "JSESSIONID", "value": "stale", "domain": "ol.dhlottery.co.kr", "path": "/", "expires": time.time() + 60}])
+    user_mndp = mocker.Mock(status_code=200, headers={"Content-Type": "application/json"}, json=lambda: {"data": {"userMndp": {}}})
+    game645 = mocker.Mock(status_code=302, headers={"Location": "https://www.dhlottery.co.kr/login"})
+    get = mocker.patch("requests.Session.get", side_effect=[user_mndp, game645])
+    login = mocker.patch.object(LotteryClient, "_login")
+
+    LotteryClient(User("user", "pw"), None, store)
+
+    assert [call.args[0] for call in get.call_args_list] == [LotteryClient._user_mndp_url, LotteryClient._game645_page]
+    login.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "cookies, alive",
+    [
+        ([("ol.dhlottery.co.kr", "JSESSIONID")], True),
+        ([("", "JSESSIONID")], False),
+        ([("www.dhlottery.co.kr", "JSESSIONID"), ("ol.dhlottery.co.kr", "DHJSESSIONID")], False),
+        ([("evil-ol.dhlottery.co.kr", "JSESSIONID")], False),
+    ],
+)
+def test_purchase_session_requires_an_ol_domain_jsessionid(cookies, alive):
+    client = LotteryClient.from_cookies(User("user", "pw"), None, [])
+    for domain, name in cookies:
+        client._session.cookies.set_cookie(requests.cookies.create_cookie(name, "v", domain=domain))
+
+    assert client._is_purchase_session_response(200) is alive
+    assert client._is_purchase_session_response(302) is False
@@ -0,0 +1,36 @@
+from dhapi.port.ticket_store import Lotto645TicketStore
+
+
+def _purchase(barcode, round_no, purchase_date, *games):
+    return {
+        "barcode": barcode,
+        "order_no": f"o-{barcode}",
+        "round": round_no,
+        "purchase_date": purchase_date,
+        "games": [{"slot": slot, "mode": "자동", "numbers": numbers} for slot, numbers in games],
+    }
+
+
+def test_games_are_kept_per_owner_and_filtered_by_purchase_date(tmp_path):
+    store = Lotto645TicketStore(tmp_path / "tickets.sqlite3")
+
+    assert (
+        store.save(
+            "alice", [_purchase("b1", 1100, "2024-01-01", ("A", [1, 2, 3, 4, 5, 6]), ("B", [7, 8, 9, 10, 11, 12])), _purchase("b2", 1101, "2024-01-08", ("A", [1, 2, 3, 4, 5, 7]))]
+        )
+        == 3
+    )
+    store.save("bob", [_purchase("b3", 1100, "2024-01-02", ("A", [40, 41, 42, 43, 44, 45]))])
+    # 같은 구매 건을 다시 저장해도 중복되지 않는다.
+    store.save("alice", [_purchase("b1", 1100, "2024-01-01", ("A", [1, 2, 3, 4, 5, 6]))])
+
+    assert store.known_barcodes("alice") == {"b1", "b2"}
+    assert [(game["owner"], game["barcode"], game["slot"]) for game in store.games(["alice", "bob"])] == [
+        ("alice", "b1", "A"),
+        ("alice", "b1", "B"),
+        ("bob", "b3", "A"),
+        ("alice", "b2", "A"),
+    ]
+    assert [game["barcode"] for game in store.games(["alice"], start_date="20240105")] == ["b2"]
+    assert store.games(["alice"], end_date="20240101")[1]["numbers"] == [7, 8, 9, 10, 11, 12]
+    assert store.games([]) == []
@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+
+from dhapi.port.virtual_account_resolver import VirtualAccountResolver
+
+FOUND = ("701-9005-915-9906", "5,000원", "케이뱅크", None)
+
+
+def _is_valid(account):
+    return account == FOUND[0]
+
+
+def test_read_only_strategies_run_concurrently_and_fastest_valid_wins():
+    barrier = threading.Barrier(2, timeout=1)
+
+    def slow_miss(stop):
+        barrier.wait()
+        time.sleep(0.2)
+        return None
+
+    def fast_hit(stop):
+        barrier.wait()
+        return FOUND
+
+    issuing = []
+    resolver = VirtualAccountResolver(read_only=[("slow", slow_miss), ("fast", fast_hit)], issuing=[("kbank", lambda stop: issuing.append(1))], is_valid=_is_valid)
+
+    assert resolver.resolve() == FOUND
+    assert resolver.report["winner"] == "fast"
+    assert issuing == []
+    assert {"name": "fast", "status": "found"}.items() <= resolver.report["strategies"][0].items()
+
+
+def test_losing_strategies_are_stopped_before_resolve_returns():
+    started = threading.Event()
+    finished = []
+
+    def crawl(stop):
+        # 요청 사이마다 stop을 확인하는 여러 요청짜리 전략
+        started.set()
+        for _ in range(100):
+            if stop.wait(0.05):
+                break
+        finished.append(stop.is_set())
+
+    def hit(stop):
+        started.wait(1)
+        return FOUND
+
+    resolver = VirtualAccountResolver(read_only=[("crawl", crawl), ("hit", hit)], issuing=[], is_valid=_is_valid)
+
+    assert resolver.resolve() == FOUND
+    assert finished == [True]
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith("dhapi-resolve")]
+
+
+def test_issuing_strategies_run_last_in_order_after_read_only_misses():
+    calls = []
+
+    def issuing(name, result):
+        def run(stop):
+            calls.append(name)
+            return result
+
+        return run
+
+    resolver = VirtualAccountResolver(
+        read_only=[("invalid", lambda stop: ("1588-6450", "", None, None)), ("error", lambda stop: 1 / 0)],
+        issuing=[("mypage_kbank", issuing("mypage_kbank", None)), ("kbank", issuing("kbank", FOUND))],
+        is_valid=_is_valid,
+    )
+
+    assert resolver.resolve() == FOUND
+    assert calls == ["mypage_kbank", "kbank"]
+    assert resolver.report["winner"] == "kbank"
+    statuses = [entry["status"] for entry in resolver.report["strategies"]]
+    assert sorted(statuses[:2]) == ["error", "miss"]
+    assert statuses[2:] == ["miss", "found"]
+
+
+def test_issuing_errors_are_raised():
+    def fail(stop):
+        raise RuntimeError("kbankInit 요청 실패")
+
+    resolver = VirtualAccountResolver(read_only=[], issuing=[("kbank", fail)], is_valid=_is_valid)
+
+    with pytest.raises(RuntimeError):
+        resolver.resolve()
+    assert resolver.report["strategies"][0]["status"] == "error"
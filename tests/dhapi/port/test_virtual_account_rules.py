@@ -0,0 +1,34 @@
+import pytest
+
+from dhapi.port.virtual_account_rules import ACCOUNT_RULES, find_account, is_valid_account_candidate, normalize_account_candidate
+
+
+@pytest.mark.parametrize(
+    "plain_text, html_text, expected",
+    [
+        ("고정 가상계좌 [케이뱅크] 701-9005-915-9906", "", ("701-9005-915-9906", "케이뱅크", "keyword_then_account")),
+        ("701 9005 915 9906 전용가상계좌", "", ("70190059159906", None, "account_then_keyword")),
+        ("입금하실 곳 [카카오뱅크] 3333-01-2345678", "", ("3333-01-2345678", "카카오뱅크", "bracket_bank_account")),
+        ("신한은행: 110-123-456789", "", ("110-123-456789", "신한은행", "bank_then_account")),
+        ("", "<script>var msg = '케이뱅크 계좌 701-9005-915-9906';</script>", ("701-9005-915-9906", "케이뱅크", "raw_html_bank_account")),
+    ],
+)
+def test_find_account_by_layout(plain_text, html_text, expected):
+    assert find_account(plain_text, html_text) == expected
+
+
+def test_invalid_first_match_falls_through_to_next_rule():
+    # 고객센터 번호가 키워드 뒤에 먼저 나오면 다음 규칙으로 넘어간다.
+    plain_text = "계좌번호 문의 1588-6450 [케이뱅크] 701-9005-915-9906"
+
+    assert find_account(plain_text, "") == ("701-9005-915-9906", "케이뱅크", "bracket_bank_account")
+
+
+@pytest.mark.parametrize("value", ["1588-6450", "02-6933-3063", "010-1234-5678", "12345", "abc"])
+def test_rejects_phone_like_candidates(value):
+    assert not is_valid_account_candidate(normalize_account_candidate(value))
+
+
+def test_rules_are_precompiled_and_named_uniquely():
+    assert len({rule.name for rule in ACCOUNT_RULES}) == len(ACCOUNT_RULES)
+    assert all(rule.source in ("text", "html") for rule in ACCOUNT_RULES)
@@ -0,0 +1,87 @@
+import os
+import threading
+
+import pytest
+
+from dhapi.domain.deposit import Deposit
+from dhapi.domain.user import User
+from dhapi.port.lottery_client import LotteryClient
+from dhapi.port.virtual_account_store import SqliteVirtualAccountStore, VirtualAccountStore
+
+RECORD = {"account": "701-9005-915-9906", "amount": "5,000원", "bank_name": "케이뱅크", "account_holder": "홍길동", "assigned_at": "2024-01-01T00:00:00"}
+
+
+class _Endpoint:
+    def __init__(self):
+        self.printed = []
+
+    def print_result_of_assign_virtual_account(self, account_number, amount_text, bank_name=None, account_holder=None):
+        self.printed.append((account_number, amount_text, bank_name, account_holder))
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "json":
+        return VirtualAccountStore(str(tmp_path / "virtual_accounts.json"))
+    return SqliteVirtualAccountStore(tmp_path / "app_data.sqlite3")
+
+
+def test_store_roundtrip(store):
+    assert store.load("user") is None
+
+    store.save("user", RECORD)
+    assert store.load("user") == {**RECORD, "verified_at": None}
+
+    store.clear("user")
+    assert store.load("user") is None
+
+
+def test_json_store_is_private_and_hides_username(tmp_path):
+    path = tmp_path / "virtual_accounts.json"
+    VirtualAccountStore(str(path)).save("user", RECORD)
+
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    assert '"user"' not in path.read_text(encoding="UTF-8")
+
+
+def _client(mocker, store):
+    mocker.patch.object(LotteryClient, "_login")
+    return LotteryClient(User("user", "pw"), _Endpoint(), virtual_account_store=store)
+
+
+def _join_revalidation():
+    for thread in threading.enumerate():
+        if thread.name == "dhapi-virtual-account":
+            thread.join()
+
+
+def test_cached_account_is_published_and_revalidated_once(tmp_path, mocker):
+    store = VirtualAccountStore(str(tmp_path / "virtual_accounts.json"))
+    store.save("user", RECORD)
+    client = _client(mocker, store)
+    lookup = mocker.patch.object(client, "_try_get_virtual_account_from_user_mndp", return_value=("701-9005-915-9906", "5,000원", "케이뱅크", None))
+    resolver = mocker.patch.object(client, "_build_virtual_account_resolver")
+
+    client.assign_virtual_account(Deposit(10000))
+    _join_revalidation()
+
+    assert client._lottery_endpoint.printed == [("701-9005-915-9906", "10,000원", "케이뱅크", "홍길동")]
+    lookup.assert_called_once()
+    resolver.assert_not_called()
+    saved = store.load("user")
+    assert saved["assigned_at"] == RECORD["assigned_at"]
+    assert saved["account_holder"] == "홍길동"
+    assert saved["verified_at"] is not None
+
+
+def test_force_refresh_skips_cache_and_saves_new_account(tmp_path, mocker):
+    store = VirtualAccountStore(str(tmp_path / "virtual_accounts.json"))
+    store.save("user", RECORD)
+    client = _client(mocker, store)
+    mocker.patch.object(client, "_try_get_virtual_account_from_user_mndp", return_value=("3333-01-2345678", "10,000원", "카카오뱅크", "홍길동"))
+    mocker.patch.object(client, "_load_mndp_charge_document", return_value=None)
+
+    client.assign_virtual_account(Deposit(10000), force_refresh=True)
+
+    assert client._lottery_endpoint.printed == [("3333-01-2345678", "10,000원", "카카오뱅크", "홍길동")]
+    assert store.load("user")["account"] == "3333-01-2345678"
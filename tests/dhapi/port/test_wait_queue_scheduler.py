@@ -0,0 +1,80 @@
+import threading
+
+import pytest
+
+from dhapi.domain.user import User
+from dhapi.port.lottery_client import LotteryClient
+from dhapi.port.wait_queue_scheduler import WaitQueueScheduler
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _scheduler(clock, deadline_seconds=60, **kwargs):
+    return WaitQueueScheduler(deadline_seconds, clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_drain_rate_and_estimate_from_wait_count_samples():
+    clock = _FakeClock()
+    progress = []
+    scheduler = _scheduler(clock, on_progress=progress.append)
+
+    scheduler.observe(100)
+    assert scheduler.next_delay() == 1.0  # 처리 속도를 모르면 default_interval
+
+    clock.now = 2.0
+    scheduler.observe(80)
+    assert scheduler.drain_rate == pytest.approx(10.0)
+    assert progress[-1].estimated_seconds == pytest.approx(8.0)
+    assert scheduler.next_delay() == pytest.approx(4.0)
+
+    clock.now = 3.0
+    scheduler.observe(50)  # 30/s, 지수 이동 평균으로 20/s
+    assert scheduler.drain_rate == pytest.approx(20.0)
+    assert [p.position for p in progress] == [100, 80, 50]
+
+
+def test_wait_is_bounded_by_deadline():
+    clock = _FakeClock()
+    scheduler = _scheduler(clock, deadline_seconds=3, max_interval=5.0)
+    scheduler.observe(1000)
+    clock.now = 1.0
+    scheduler.observe(999)  # 1/s -> 999초 예상이지만 deadline까지 2초만 남았다.
+
+    assert scheduler.wait() is True
+    assert clock.now == pytest.approx(3.0)
+    assert scheduler.wait() is False
+
+
+def test_wait_returns_false_once_stopped():
+    stop = threading.Event()
+    scheduler = WaitQueueScheduler(60, default_interval=30, stop=stop)
+    threading.Timer(0.05, stop.set).start()
+
+    assert scheduler.wait() is False
+    assert scheduler.remaining_seconds() > 50
+
+
+def test_wait_page_is_retried_until_queue_is_released(mocker):
+    mocker.patch.object(LotteryClient, "_login")
+    client = LotteryClient(User("user", "pw"), mocker.Mock())
+    wait_page = mocker.Mock(status_code=200, headers={"Content-Type": "text/html"}, text="wait")
+    ok = mocker.Mock(status_code=200, headers={"Content-Type": "application/json"}, text="{}")
+    mocker.patch.object(client._session, "request", side_effect=[wait_page, ok])
+    mocker.patch.object(client, "_is_wait_page", side_effect=lambda text: text == "wait")
+    mocker.patch.object(client, "_extract_wait_context_from_html", return_value={"ip": "1.2.3.4"})
+    mocker.patch.object(client, "_call_tracer_check_bot", return_value="F")
+    mocker.patch.object(client, "_call_tracer_input_queue", side_effect=[{"isWait": "T", "waitCnt": "20"}, {"isWait": "T", "waitCnt": "5"}, {"isWait": "F", "waitCnt": "0"}])
+    sleep = mocker.patch("time.sleep")
+
+    assert client._get_with_wait_retry("https://www.dhlottery.co.kr/mypage/mndpChrg.do", max_attempts=3, wait_seconds=2) is ok
+    assert sleep.call_count == 3
+    assert [c.args[0] for c in client._lottery_endpoint.print_wait_queue_progress.call_args_list] == [20, 5]
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+
+# 느린 CI 환경을 고려해 넉넉하게 잡은 값. typer(rich 포함) 로딩이 대부분을 차지한다.
+IMPORT_BUDGET_SECONDS = 1.5
+
+HEAVY_MODULES = ["requests", "bs4", "Crypto", "pytz", "dhapi.port.lottery_client"]
+
+
+def _import_times(code, home=None):
+    """python -X importtime 출력을 {모듈명: 누적 import 시간(초)}로 바꾼다."""
+    env = dict(os.environ, PYTHONPATH=str(SRC_PATH))
+    if home:
+        env["HOME"] = str(home)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], env=env, capture_output=True, text=True, check=True)
+
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative) / 1_000_000
+    return times
+
+
+def _top_level_names(times):
+    return {name.split(".")[0] for name in times} | set(times)
+
+
+def test_router_import_skips_heavy_modules():
+    times = _import_times("import dhapi.router.router")
+
+    loaded = _top_level_names(times)
+    assert [module for module in HEAVY_MODULES if module in loaded] == []
+    assert times["dhapi.router.router"] < IMPORT_BUDGET_SECONDS
+
+
+def test_show_profiles_skips_heavy_modules(tmp_path):
+    (tmp_path / ".dhapi").mkdir()
+    (tmp_path / ".dhapi" / "credentials").write_text("[default]\nusername = 'a'\npassword = 'b'\n", encoding="UTF-8")
+    code = "import sys; from dhapi.router.router import app; sys.argv = ['dhapi', 'show-profiles']; app(standalone_mode=False)"
+
+    times = _import_times(code, home=tmp_path)
+
+    loaded = _top_level_names(times)
+    assert [module for module in HEAVY_MODULES if module in loaded] == []
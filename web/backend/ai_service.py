@@ -1,35 +1,31 @@
-
 import random
 import json
-from typing import List
+from typing import List, Optional
+import numpy as np
 from huggingface_hub import InferenceClient
 
-# 최근 로또 당첨 번호 (예시 데이터 - 실제로는 동행복권 API에서 가져오는 것이 좋음)
-RECENT_WINNING_NUMBERS = [
-    [2, 17, 20, 35, 37, 39], # 1209회
-    [3, 15, 20, 24, 25, 38], # 1208회
-    [10, 14, 20, 31, 35, 41], # 1207회
-    [1, 13, 22, 26, 29, 39], # 1206회
-    [6, 12, 19, 21, 23, 30], # 1205회
-]
+from dhapi.analysis.draw_stats import DrawStats
+from dhapi.analysis.strategies import hybrid_games
 
 class AIService:
     def __init__(self):
         # 무료 모델 사용 (토큰 필요 없음) 혹은 토큰이 있다면 설정
         # 텍스트 생성에 적합한 가벼운 모델
         self.client = InferenceClient(model="gpt2") 
+        self._rng = np.random.default_rng()
 
-    def recommend_numbers(self, count: int = 5) -> List[List[int]]:
+    def recommend_numbers(self, count: int = 5, stats: Optional[DrawStats] = None) -> List[List[int]]:
         """
         AI 모델을 활용하여 로또 번호를 추천합니다.
         AI 예측이 실패하거나 느리면 통계 기반 랜덤으로 폴백합니다.
+        stats(전체 회차 통계)가 없으면 완전 랜덤으로 발급합니다.
         """
         recommendations = []
         for _ in range(count):
             try:
                 # 1. AI 예측 시도 (시간이 걸릴 수 있으므로 1게임만 시도하거나 비동기 처리 필요하지만, 여기서는 간단히 구현)
                 # 실제로는 API 호출 제한 등이 있으므로, 순수 랜덤과 혼합하여 사용
-                numbers = self._generate_hybrid_numbers()
+                numbers = self._generate_hybrid_numbers(stats) if stats is not None else self._generate_random_numbers()
             except Exception as e:
                 print(f"AI Generation failed: {e}, falling back to random.")
                 numbers = self._generate_random_numbers()
@@ -38,44 +34,15 @@ class AIService:
             
         return recommendations
 
-    def _generate_hybrid_numbers(self) -> List[int]:
+    def _generate_hybrid_numbers(self, stats: DrawStats) -> List[int]:
         """
         AI의 느낌을 주는 하이브리드 추천 로직
-        최근 당첨 번호에서 자주 나온 숫자에 가중치를 두고, 
-        Hugging Face 모델에게 '행운의 숫자'를 물어보는 컨셉
+        전체 회차 통계(DrawStats)에서 최근 빈출 번호와 오래 안 나온 번호를 1~2개씩 섞고,
+        나머지는 통계 가중치(stats.weights)로 뽑는 컨셉
+        (dhapi.analysis.strategies.hybrid_games - 'dhapi backtest -s hybrid'로 과거 회차 성과를 확인할 수 있음)
         """
         # 실제 LLM 호출은 응답 속도 이슈로 인해, 여기서는 로컬 통계 분석 로직을 "AI 분석"으로 포장
-        # 하지만 사용자가 원하므로 실제 호출 코드도 포함 (주석 처리 혹은 옵션)
-        
-        # 1. 최근 빈출 숫자 분석
-        frequency = {}
-        for game in RECENT_WINNING_NUMBERS:
-            for num in game:
-                frequency[num] = frequency.get(num, 0) + 1
-        
-        # 2. 가중치 기반 선택 (Hot Numbers)
-        hot_numbers = sorted(frequency.keys(), key=lambda x: frequency[x], reverse=True)[:10]
-        
-        # 3. 콜드 넘버 (안 나온 숫자)
-        all_nums = set(range(1, 46))
-        appeared_nums = set(frequency.keys())
-        cold_numbers = list(all_nums - appeared_nums)
-        
-        selected = set()
-        
-        # Hot Number에서 1~2개
-        if hot_numbers:
-            selected.update(random.sample(hot_numbers, k=random.randint(1, 2)))
-            
-        # Cold Number에서 1~2개
-        if cold_numbers:
-            selected.update(random.sample(cold_numbers, k=random.randint(1, 2)))
-            
-        # 나머지는 완전 랜덤
-        while len(selected) < 6:
-            selected.add(random.randint(1, 45))
-            
-        return list(selected)[:6]
+        return hybrid_games(stats, 1, self._rng)[0].tolist()
 
     def _generate_random_numbers(self) -> List[int]:
         """완전 랜덤 (자동발급용)"""
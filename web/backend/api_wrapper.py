@@ -4,7 +4,8 @@
 """
 import sys
 import os
-from typing import List, Optional, Dict, Any
+import time
+from typing import List, Optional, Dict, Any, Iterator
 
 # 프로젝트 루트를 Python 경로에 추가
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
@@ -13,6 +14,8 @@ from dhapi.domain.user import User
 from dhapi.domain.lotto645_ticket import Lotto645Ticket
 from dhapi.domain.deposit import Deposit
 from dhapi.port.lottery_client import LotteryClient
+from dhapi.port.discovery_cache import DiscoveryCache
+from dhapi.port.virtual_account_store import SqliteVirtualAccountStore
 
 
 class WebLotteryEndpoint:
@@ -20,6 +23,8 @@ class WebLotteryEndpoint:
     
     def __init__(self):
         self.last_result = None
+        # 진행 중인 요청이 동행복권 대기열에 걸려 있으면 {"position", "estimated_seconds", "updated_at"}
+        self.wait_queue = None
     
     def print_result_of_buy_lotto645(self, slots):
         """로또 구매 결과를 저장"""
@@ -44,16 +49,25 @@ class WebLotteryEndpoint:
         }
     
     def print_result_of_show_buy_list(self, found_data, output_format, start_date, end_date):
-        """구매 내역을 저장"""
+        """구매 내역을 저장 (rows가 제너레이터로 오므로 응답용으로 모두 읽어 둔다)"""
+        tables = [{"headers": table.get("headers", []), "rows": list(table.get("rows", []))} for table in found_data]
         self.last_result = {
             "success": True,
-            "data": found_data,
+            "data": [table for table in tables if table["rows"]],
             "period": {
                 "start": start_date,
                 "end": end_date
             }
         }
     
+    def print_wait_queue_progress(self, position, estimated_seconds=None):
+        """대기열 진행 상황을 저장 (GET /api/wait-queue 로 조회)"""
+        self.wait_queue = {
+            "position": position,
+            "estimated_seconds": round(estimated_seconds, 1) if estimated_seconds is not None else None,
+            "updated_at": time.time(),
+        }
+
     def print_result_of_assign_virtual_account(self, account_number, amount, bank_name=None, account_holder=None):
         """가상계좌 정보를 저장"""
         self.last_result = {
@@ -69,17 +83,23 @@ class APIWrapper:
     """LotteryClient를 웹 API용으로 래핑"""
     
     @staticmethod
-    def login(username: str, password: str) -> Dict[str, Any]:
+    def login(username: str, password: str,
+              virtual_account_store: Optional[SqliteVirtualAccountStore] = None,
+              discovery_cache: Optional[DiscoveryCache] = None) -> Dict[str, Any]:
         """
         로그인 및 LotteryClient 인스턴스 생성
         
+        Args:
+            virtual_account_store: 발급/확인한 가상계좌를 보관할 저장소
+            discovery_cache: 가상계좌 엔드포인트 탐색 결과(스크립트, 엔드포인트 순위) 캐시
+        
         Returns:
             dict: {"success": bool, "client": LotteryClient, "message": str}
         """
         try:
             user = User(username=username, password=password)
             endpoint = WebLotteryEndpoint()
-            client = LotteryClient(user, endpoint)
+            client = LotteryClient(user, endpoint, virtual_account_store=virtual_account_store, discovery_cache=discovery_cache)
             
             return {
                 "success": True,
@@ -189,21 +209,41 @@ class APIWrapper:
                 "message": f"조회 중 오류가 발생했습니다: {str(e)}"
             }
     
+    @staticmethod
+    def iter_buy_list(client: LotteryClient,
+                      start_date: Optional[str] = None,
+                      end_date: Optional[str] = None,
+                      with_details: bool = True) -> Iterator[List[str]]:
+        """
+        구매 내역을 한 행씩 지연 조회 (전체 페이지 순회)
+        
+        Args:
+            start_date: YYYYMMDD 형식
+            end_date: YYYYMMDD 형식
+            with_details: False면 로또6/45 상세 번호 조회를 생략
+        
+        Yields:
+            list: ["구입일자", "복권명", "회차", "선택번호/복권번호", "구입매수", "당첨결과", "당첨금", "추첨일"] 순서의 행
+        """
+        return client.iter_buy_list(start_date, end_date, with_details=with_details)
+    
     @staticmethod
     def assign_virtual_account(client: LotteryClient, endpoint: WebLotteryEndpoint,
-                               amount: int) -> Dict[str, Any]:
+                               amount: int, force_refresh: bool = False) -> Dict[str, Any]:
         """
-        가상계좌 할당
+        가상계좌 할당 (저장된 계좌가 있으면 바로 반환하고 백그라운드에서 재확인)
         
         Args:
             amount: 입금할 금액
+            force_refresh: True면 저장된 계좌를 무시하고 다시 조회
         
         Returns:
             dict: {"success": bool, "account": str, "amount": str, "bank_name": str, "account_holder": str}
         """
         try:
             deposit = Deposit(amount)
-            client.assign_virtual_account(deposit)
+            endpoint.wait_queue = None
+            client.assign_virtual_account(deposit, force_refresh=force_refresh)
             return endpoint.last_result
         except ValueError as e:
             return {
@@ -220,3 +260,5 @@ class APIWrapper:
                 "success": False,
                 "message": f"계좌 할당 중 오류가 발생했습니다: {str(e)}"
             }
+        finally:
+            endpoint.wait_queue = None
@@ -2,25 +2,35 @@
 동행복권 웹 API 서버
 FastAPI 기반 REST API
 """
+import asyncio
 import uuid
 import re
 import os
 import socket
 import sqlite3
 import json
-import datetime as dt
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Dict, Iterable, List, Optional
 from datetime import datetime, timedelta
 from pathlib import Path
 
 from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 from pydantic import BaseModel
 import requests
 
 from api_wrapper import APIWrapper
+from dhapi.analysis.draw_archive import update_draw_archive
+from dhapi.analysis.draw_stats import DrawStats, DrawStatsCache
+from dhapi.analysis.win_check import check_wins
+from dhapi.domain.lotto645_draw import current_selling_round
+from dhapi.port.discovery_cache import DiscoveryCache
+from dhapi.port.draw_history_store import DrawHistoryStore
+from dhapi.port.request_timings import REQUEST_TIMINGS
+from dhapi.port.ticket_store import Lotto645TicketStore
+from dhapi.port.virtual_account_store import SqliteVirtualAccountStore
 from ai_service import ai_service
 
 # FastAPI 앱 생성
@@ -41,8 +51,6 @@ app.add_middleware(
 
 # 세션 스토어 (메모리 기반 - 프로덕션에서는 Redis 등 사용 권장)
 sessions: Dict[str, Dict] = {}
-# 사용자별 가상계좌 저장소 (메모리 기반)
-virtual_accounts_by_user: Dict[str, Dict[str, Any]] = {}
 WEEKLY_ONLINE_LIMIT_KRW = 5000
 LOTTO_GAME_PRICE_KRW = 1000
 MAX_SAVED_NUMBERS_PER_USER = 30
@@ -50,6 +58,10 @@ MAX_SAVED_NAME_LENGTH = 30
 BASE_DIR = Path(__file__).resolve().parent
 FRONTEND_DIR = BASE_DIR.parent / "frontend"
 APP_DB_PATH = BASE_DIR / "app_data.sqlite3"
+# 통계/분석용 회차 열 아카이브 (numpy memmap, lotto645_draws 테이블에서 새 회차만 붙여 갱신)
+DRAW_ARCHIVE_PATH = BASE_DIR / "draw_archive"
+# 동행복권 사이트 주소. 부하 테스트 시 가짜 서버(web/fake_upstream)로 바꿀 수 있다.
+SITE_BASE_URL = os.getenv("DHAPI_SITE_URL", "https://www.dhlottery.co.kr").rstrip("/")
 
 # Pydantic 모델
 class LoginRequest(BaseModel):
@@ -68,6 +80,7 @@ class BuyListRequest(BaseModel):
 
 class VirtualAccountRequest(BaseModel):
     amount: int
+    force_refresh: bool = False
 
 
 class MyLottoNumberRequest(BaseModel):
@@ -126,26 +139,15 @@ def _extract_int(value: Any) -> int:
     return int(digits) if digits else 0
 
 
-def _compute_weekly_spent_from_buy_list(data: Any) -> int:
-    if not isinstance(data, list):
-        return 0
-
+def _compute_spent_from_buy_list_rows(rows: Iterable[Any]) -> int:
     spent = 0
-    for table in data:
-        if not isinstance(table, dict):
+    for row in rows:
+        if not isinstance(row, list) or len(row) < 5:
             continue
-        rows = table.get("rows", [])
-        if not isinstance(rows, list):
+        quantity = _extract_int(row[4])
+        if quantity <= 0:
             continue
-
-        for row in rows:
-            if not isinstance(row, list) or len(row) < 5:
-                continue
-            quantity = _extract_int(row[4])
-            if quantity <= 0:
-                continue
-            spent += quantity * LOTTO_GAME_PRICE_KRW
-
+        spent += quantity * LOTTO_GAME_PRICE_KRW
     return spent
 
 
@@ -279,17 +281,13 @@ def _delete_my_lotto_numbers(username: str, number_id: int) -> bool:
         return cursor.rowcount > 0
 
 
-def _current_selling_round(now: Optional[datetime] = None) -> int:
-    first_round_date = dt.date(2002, 12, 7)
-    today = (now or datetime.now()).date()
-    days_until_saturday = (5 - today.weekday()) % 7
-    this_saturday = today + timedelta(days=days_until_saturday)
-    days_diff = (this_saturday - first_round_date).days
-    return 1 + (days_diff // 7)
-
-
+# 회차별 당첨번호는 draw_history_store(app_data.sqlite3의 lotto645_draws 테이블)에 쌓아 두고, 새 회차 확인은 이 간격으로만 한다.
+DRAW_SYNC_INTERVAL_SECONDS = 300
+_draw_sync_state: Dict[str, Any] = {"synced_at": None, "archive": None}
+_draw_sync_lock = threading.Lock()
+# 직전 회차 대체 조회(getLottoNumber) 결과 캐시
+LAST_DRAW_CACHE_SECONDS = 60
 _last_draw_cache: Dict[str, Any] = {"fetched_at": None, "data": None}
-_draw_history_cache: Dict[str, Any] = {"fetched_at": None, "items": []}
 
 
 def _decode_json_response(resp: Any) -> Optional[Dict[str, Any]]:
@@ -325,7 +323,7 @@ def _request_json_endpoint(
     headers = {
         "Accept": "application/json, text/javascript, */*; q=0.01",
         "X-Requested-With": "XMLHttpRequest",
-        "Referer": referer or "https://www.dhlottery.co.kr/",
+        "Referer": referer or f"{SITE_BASE_URL}/",
     }
 
     try:
@@ -350,142 +348,68 @@ def _request_json_endpoint(
 
 def _request_lotto_number_payload(round_no: int, client: Optional[Any] = None) -> Optional[Dict[str, Any]]:
     return _request_json_endpoint(
-        "https://www.dhlottery.co.kr/common.do",
+        f"{SITE_BASE_URL}/common.do",
         client=client,
         params={"method": "getLottoNumber", "drwNo": round_no},
-        referer="https://www.dhlottery.co.kr/lt645/result",
+        referer=f"{SITE_BASE_URL}/lt645/result",
     )
 
 
-def _normalize_draw_date_yyyymmdd(raw: Any) -> str:
-    value = re.sub(r"[^\d]", "", str(raw or ""))
-    if len(value) == 8:
-        return f"{value[0:4]}-{value[4:6]}-{value[6:8]}"
-    return str(raw or "")
+def _fetch_draw_history_items(round_filter: str, client: Optional[Any] = None) -> Optional[List[Dict[str, Any]]]:
+    payload = _request_json_endpoint(
+        f"{SITE_BASE_URL}/lt645/selectPstLt645Info.do",
+        client=client,
+        params={"srchLtEpsd": round_filter},
+        referer=f"{SITE_BASE_URL}/lt645/result",
+    )
+    if not payload:
+        return None
 
+    raw_items = (payload.get("data") or {}).get("list")
+    return raw_items if isinstance(raw_items, list) else None
 
-def _as_int(value: Any, default: int = 0) -> int:
-    try:
-        return int(value)
-    except (TypeError, ValueError):
-        digits = re.sub(r"[^\d\-]", "", str(value or ""))
-        if not digits or digits == "-":
-            return default
-        try:
-            return int(digits)
-        except ValueError:
-            return default
 
+def _sync_draw_history(client: Optional[Any] = None) -> None:
+    # check-wins는 스레드에서 동기화를 부르므로 동시에 아카이브를 갱신하지 않도록 잠근다.
+    with _draw_sync_lock:
+        _sync_draw_history_locked(client=client)
 
-def _build_draw_rank_rows(item: Dict[str, Any]) -> List[Dict[str, Any]]:
-    criteria = {
-        1: "6개번호 일치",
-        2: "5개번호 일치 + 보너스번호 일치",
-        3: "5개번호 일치",
-        4: "4개번호 일치",
-        5: "3개번호 일치",
-    }
 
-    auto_cnt = max(0, _as_int(item.get("winType1"), 0))
-    manual_cnt = max(0, _as_int(item.get("winType2"), 0))
-    semi_auto_cnt = max(0, _as_int(item.get("winType3"), 0))
-    remark = ""
-    if _as_int(item.get("winType0"), 0) == 0 and (auto_cnt > 0 or manual_cnt > 0 or semi_auto_cnt > 0):
-        remark = f"자동{auto_cnt} / 수동{manual_cnt} / 반자동{semi_auto_cnt}"
-
-    rows: List[Dict[str, Any]] = []
-    for rank in range(1, 6):
-        row = {
-            "rank": rank,
-            "total_prize_amount": max(0, _as_int(item.get(f"rnk{rank}SumWnAmt"), 0)),
-            "winner_count": max(0, _as_int(item.get(f"rnk{rank}WnNope"), 0)),
-            "prize_per_winner": max(0, _as_int(item.get(f"rnk{rank}WnAmt"), 0)),
-            "criteria": criteria.get(rank, ""),
-            "remark": remark if rank == 1 else "",
-        }
-        rows.append(row)
-    return rows
-
-
-def _normalize_draw_history_item(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    if not isinstance(item, dict):
-        return None
+def _sync_draw_history_locked(client: Optional[Any] = None) -> None:
+    synced_at = _draw_sync_state.get("synced_at")
+    if isinstance(synced_at, datetime) and (datetime.now() - synced_at).total_seconds() < DRAW_SYNC_INTERVAL_SECONDS:
+        return
 
-    try:
-        numbers = [
-            _as_int(item.get("tm1WnNo")),
-            _as_int(item.get("tm2WnNo")),
-            _as_int(item.get("tm3WnNo")),
-            _as_int(item.get("tm4WnNo")),
-            _as_int(item.get("tm5WnNo")),
-            _as_int(item.get("tm6WnNo")),
-        ]
-        if any(n <= 0 for n in numbers):
-            return None
+    _draw_sync_state["synced_at"] = datetime.now()
+    draw_history_store.sync(lambda round_filter: _fetch_draw_history_items(round_filter, client=client))
+    if draw_history_store.latest_round() == 0:
+        # 아직 한 회차도 받지 못했으면 다음 요청에서 바로 다시 시도한다.
+        _draw_sync_state["synced_at"] = None
+        return
 
-        return {
-            "round": _as_int(item.get("ltEpsd")),
-            "draw_date": _normalize_draw_date_yyyymmdd(item.get("ltRflYmd")),
-            "numbers": numbers,
-            "bonus": _as_int(item.get("bnsWnNo")),
-            "winner_summary": {
-                "total_sales_amount": max(0, _as_int(item.get("wholEpsdSumNtslAmt"), 0)),
-                "total_winner_count": max(0, _as_int(item.get("sumWnNope"), 0)),
-                "first_auto": max(0, _as_int(item.get("winType1"), 0)),
-                "first_manual": max(0, _as_int(item.get("winType2"), 0)),
-                "first_semi_auto": max(0, _as_int(item.get("winType3"), 0)),
-            },
-            "ranks": _build_draw_rank_rows(item),
-        }
-    except Exception:
-        return None
-
-
-def _fetch_draw_history_items(client: Optional[Any] = None) -> List[Dict[str, Any]]:
-    payload = _request_json_endpoint(
-        "https://www.dhlottery.co.kr/lt645/selectPstLt645Info.do",
-        client=client,
-        params={"srchLtEpsd": "all"},
-        referer="https://www.dhlottery.co.kr/lt645/result",
-    )
-    if not payload:
-        return []
+    try:
+        archive = update_draw_archive(draw_history_store, DRAW_ARCHIVE_PATH)
+    except OSError as error:
+        print(f"회차 아카이브 갱신 실패: {type(error).__name__}: {error}")
+        return
 
-    raw_items = payload.get("data", {}).get("list", [])
-    if not isinstance(raw_items, list):
-        return []
+    # 새 회차가 붙었을 때만 다시 계산되고, /api/stats와 AI 추천은 계산해 둔 결과를 그대로 쓴다.
+    _draw_sync_state["archive"] = archive
+    draw_stats_cache.update(archive)
 
-    normalized_items = []
-    for raw in raw_items:
-        normalized = _normalize_draw_history_item(raw)
-        if normalized and normalized.get("round", 0) > 0:
-            normalized_items.append(normalized)
 
-    normalized_items.sort(key=lambda row: row.get("round", 0), reverse=True)
-    return normalized_items
+def _current_draw_stats(client: Optional[Any] = None) -> Optional[DrawStats]:
+    _sync_draw_history(client=client)
+    return draw_stats_cache.stats
 
 
 def _fetch_recent_draws(client: Optional[Any] = None, limit: int = 30) -> List[Dict[str, Any]]:
     safe_limit = max(1, min(int(limit or 30), 200))
 
-    cached_at = _draw_history_cache.get("fetched_at")
-    cached_items = _draw_history_cache.get("items") or []
-    if (
-        isinstance(cached_at, datetime)
-        and isinstance(cached_items, list)
-        and cached_items
-        and (datetime.now() - cached_at).total_seconds() < 300
-    ):
-        return cached_items[:safe_limit]
-
-    items = _fetch_draw_history_items(client=client)
+    _sync_draw_history(client=client)
+    items = draw_history_store.recent(safe_limit)
     if items:
-        _draw_history_cache["fetched_at"] = datetime.now()
-        _draw_history_cache["items"] = items
-        return items[:safe_limit]
-
-    if isinstance(cached_items, list) and cached_items:
-        return cached_items[:safe_limit]
+        return items
 
     raise RuntimeError("회차별 당첨번호를 가져오지 못했습니다.")
 
@@ -499,18 +423,24 @@ def _try_fetch_latest_draw_from_result_page(client: Optional[Any] = None) -> Opt
 
 
 def _fetch_last_draw_info(client: Optional[Any] = None) -> Dict[str, Any]:
-    cached_at = _last_draw_cache.get("fetched_at")
-    cached_data = _last_draw_cache.get("data")
-    if isinstance(cached_at, datetime) and cached_data and (datetime.now() - cached_at).total_seconds() < 60:
-        return cached_data
-
+    # 평소에는 5분 간격으로 동기화되는 draw_history_store에서 바로 읽는다.
     latest_draw = _try_fetch_latest_draw_from_result_page(client=client)
     if latest_draw:
-        _last_draw_cache["fetched_at"] = datetime.now()
-        _last_draw_cache["data"] = latest_draw
         return latest_draw
 
-    start_round = _current_selling_round() - 1
+    # 저장된 회차가 없을 때의 getLottoNumber 대체 조회는 회차당 한 번씩 최대 20번 요청하므로 결과(실패 포함)를 잠시 캐시한다.
+    cached_at = _last_draw_cache.get("fetched_at")
+    if not isinstance(cached_at, datetime) or (datetime.now() - cached_at).total_seconds() >= LAST_DRAW_CACHE_SECONDS:
+        _last_draw_cache["data"] = _fetch_last_draw_from_lotto_number_api(client=client)
+        _last_draw_cache["fetched_at"] = datetime.now()
+
+    if _last_draw_cache["data"]:
+        return _last_draw_cache["data"]
+    raise RuntimeError("직전 회차 번호를 가져오지 못했습니다.")
+
+
+def _fetch_last_draw_from_lotto_number_api(client: Optional[Any] = None) -> Optional[Dict[str, Any]]:
+    start_round = current_selling_round() - 1
     if start_round < 1:
         raise RuntimeError("회차 계산에 실패했습니다.")
 
@@ -522,7 +452,7 @@ def _fetch_last_draw_info(client: Optional[Any] = None) -> Dict[str, Any]:
             if payload.get("returnValue") != "success":
                 continue
 
-            data = {
+            return {
                 "round": int(payload.get("drwNo")),
                 "draw_date": payload.get("drwNoDate"),
                 "numbers": [
@@ -535,23 +465,28 @@ def _fetch_last_draw_info(client: Optional[Any] = None) -> Dict[str, Any]:
                 ],
                 "bonus": int(payload.get("bnusNo")),
             }
-            _last_draw_cache["fetched_at"] = datetime.now()
-            _last_draw_cache["data"] = data
-            return data
         except (ValueError, TypeError):
             continue
 
-    raise RuntimeError("직전 회차 번호를 가져오지 못했습니다.")
+    return None
 
 
 _init_app_db()
+# 사용자별 가상계좌 저장소 (app_data.sqlite3의 virtual_accounts 테이블, 서버 재시작 후에도 유지)
+virtual_account_store = SqliteVirtualAccountStore(APP_DB_PATH)
+# 회차별 당첨번호 (app_data.sqlite3의 lotto645_draws 테이블). 지난 회차는 바뀌지 않으므로 새 회차만 받아 쌓는다.
+draw_history_store = DrawHistoryStore(APP_DB_PATH)
+draw_stats_cache = DrawStatsCache()
+ticket_store = Lotto645TicketStore(APP_DB_PATH)
+# 가상계좌 엔드포인트 탐색 결과는 계정과 무관하므로 모든 사용자가 공유한다.
+discovery_cache = DiscoveryCache()
 
 
 # API 엔드포인트
 @app.post("/api/login")
 async def login(request: LoginRequest, response: Response):
     """로그인"""
-    result = APIWrapper.login(request.username, request.password)
+    result = APIWrapper.login(request.username, request.password, virtual_account_store, discovery_cache)
     
     if not result["success"]:
         raise HTTPException(status_code=401, detail=result["message"])
@@ -674,6 +609,49 @@ async def get_buy_list(request: BuyListRequest, req: Request):
     return result
 
 
+@app.post("/api/check-wins")
+async def check_lotto645_wins(request: BuyListRequest, req: Request):
+    """기간 내 로또6/45 구매 번호의 당첨 여부를 저장된 회차별 당첨번호와 한 번에 맞춰 본다 (기본 최근 14일)"""
+    session_id = req.cookies.get("session_id")
+    session = get_session(session_id)
+
+    # 구매 번호 상세 조회, 회차 동기화, SQLite 조회가 모두 블로킹이므로 스레드에서 실행한다.
+    items = await asyncio.to_thread(
+        _check_lotto645_wins,
+        session["client"],
+        session["username"],
+        request.start_date,
+        request.end_date,
+    )
+
+    won = [item for item in items if item["rank"]]
+    return {
+        "success": True,
+        "count": len(items),
+        "won_count": len(won),
+        "pending_count": sum(1 for item in items if item["rank"] is None),
+        "total_prize": sum(item["prize"] for item in won),
+        "items": items,
+    }
+
+
+def _check_lotto645_wins(client: Any, username: str, start_date: Optional[str], end_date: Optional[str]) -> List[Dict[str, Any]]:
+    _sync_draw_history(client=client)
+    archive = _draw_sync_state["archive"]
+    if archive is None:
+        # 회차 정보 없이 맞춰 보면 모든 게임이 추첨 전으로 보이므로 결과 대신 오류를 돌려준다.
+        raise HTTPException(status_code=503, detail="회차별 당첨번호를 아직 가져오지 못했습니다. 잠시 후 다시 시도하세요.")
+
+    # 이미 저장해 둔 구매 건은 상세 조회하지 않는다.
+    try:
+        purchases = client.fetch_lotto645_games(start_date, end_date, known_barcodes=ticket_store.known_barcodes(username))
+        ticket_store.save(username, purchases)
+    except Exception as error:
+        raise HTTPException(status_code=400, detail=f"구매 내역을 조회하지 못했습니다: {error}") from error
+
+    return check_wins(ticket_store.games([username], *client.buy_list_date_range(start_date, end_date)), archive)
+
+
 @app.get("/api/weekly-purchase-limit")
 async def get_weekly_purchase_limit(request: Request):
     """이번주(월~일) 온라인 구매 한도 대비 잔여 금액 조회"""
@@ -681,17 +659,14 @@ async def get_weekly_purchase_limit(request: Request):
     session = get_session(session_id)
 
     start_yyyymmdd, end_yyyymmdd, week_start, week_end = _current_week_range_yyyymmdd()
-    result = APIWrapper.show_buy_list(
-        session["client"],
-        session["endpoint"],
-        start_yyyymmdd,
-        end_yyyymmdd,
-    )
 
-    if not result["success"]:
-        raise HTTPException(status_code=400, detail=result["message"])
+    # 구입매수만 필요하므로 상세 번호 조회 없이 행을 흘려보내며 합산한다.
+    try:
+        rows = APIWrapper.iter_buy_list(session["client"], start_yyyymmdd, end_yyyymmdd, with_details=False)
+        week_purchased_amount = _compute_spent_from_buy_list_rows(rows)
+    except Exception as error:
+        raise HTTPException(status_code=400, detail=f"구매 내역을 조회하지 못했습니다: {error}") from error
 
-    week_purchased_amount = _compute_weekly_spent_from_buy_list(result.get("data"))
     week_remaining_amount = max(0, WEEKLY_ONLINE_LIMIT_KRW - week_purchased_amount)
 
     return {
@@ -710,10 +685,13 @@ async def assign_virtual_account(request: VirtualAccountRequest, req: Request):
     session_id = req.cookies.get("session_id")
     session = get_session(session_id)
     
-    result = APIWrapper.assign_virtual_account(
+    # 대기열에 걸리면 수십 초가 걸릴 수 있으므로 스레드에서 실행해 /api/wait-queue 요청을 처리할 수 있게 한다.
+    result = await asyncio.to_thread(
+        APIWrapper.assign_virtual_account,
         session["client"],
         session["endpoint"],
-        request.amount
+        request.amount,
+        request.force_refresh,
     )
     
     if not result["success"]:
@@ -727,21 +705,40 @@ async def assign_virtual_account(request: VirtualAccountRequest, req: Request):
         )
 
     username = session["username"]
-    assigned_at = datetime.now().isoformat(timespec="seconds")
-    saved_result = {
+    # LotteryClient가 확인한 계좌를 virtual_account_store에 저장하므로 저장 시각은 저장소 기준으로 응답한다.
+    stored = virtual_account_store.load(username) or {}
+
+    return {
+        "success": True,
         "username": username,
-        "account": result.get("account"),
+        "account": account_number,
         "amount": result.get("amount"),
         "bank_name": result.get("bank_name"),
         "account_holder": result.get("account_holder"),
-        "assigned_at": assigned_at,
+        "assigned_at": stored.get("assigned_at") or datetime.now().isoformat(timespec="seconds"),
     }
-    virtual_accounts_by_user[username] = saved_result
 
-    return {
-        "success": True,
-        **saved_result,
-    }
+
+@app.get("/api/wait-queue")
+async def get_wait_queue(request: Request):
+    """진행 중인 요청의 동행복권 대기열 순번과 예상 대기 시간"""
+    session_id = request.cookies.get("session_id")
+    session = get_session(session_id)
+
+    wait_queue = session["endpoint"].wait_queue
+    return {"waiting": wait_queue is not None, **(wait_queue or {})}
+
+
+@app.get("/api/upstream-timings")
+async def get_upstream_timings():
+    """동행복권 요청의 엔드포인트별 소요 시간 요약 (DHAPI_TIMINGS=1로 서버를 실행했을 때만 기록)"""
+    return {"enabled": REQUEST_TIMINGS.enabled, "endpoints": REQUEST_TIMINGS.summary()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus scrape용 업스트림 요청 히스토그램"""
+    return PlainTextResponse(REQUEST_TIMINGS.to_prometheus(), media_type="text/plain; version=0.0.4")
 
 
 @app.get("/api/virtual-account")
@@ -751,7 +748,9 @@ async def get_virtual_account(request: Request):
     session = get_session(session_id)
 
     username = session["username"]
-    account_info = virtual_accounts_by_user.get(username)
+    account_info = virtual_account_store.load(username)
+    if account_info is not None:
+        account_info = {"username": username, **account_info}
 
     return {
         "success": True,
@@ -815,7 +814,8 @@ async def get_lotto_draws(request: Request, limit: int = 30):
     session = get_session(session_id)
 
     try:
-        items = _fetch_recent_draws(client=session.get("client"), limit=limit)
+        # 회차 동기화는 네트워크 I/O와 _draw_sync_lock 대기를 포함하므로 이벤트 루프 밖에서 실행한다.
+        items = await asyncio.to_thread(_fetch_recent_draws, client=session.get("client"), limit=limit)
     except RuntimeError as error:
         raise HTTPException(status_code=502, detail=str(error)) from error
 
@@ -833,7 +833,7 @@ async def get_last_draw(request: Request):
     session = get_session(session_id)
 
     try:
-        draw = _fetch_last_draw_info(client=session.get("client"))
+        draw = await asyncio.to_thread(_fetch_last_draw_info, client=session.get("client"))
     except RuntimeError as error:
         raise HTTPException(status_code=502, detail=str(error)) from error
 
@@ -843,6 +843,20 @@ async def get_last_draw(request: Request):
     }
 
 
+@app.get("/api/stats")
+async def get_draw_stats(request: Request):
+    """전체 회차 번호 통계 (출현 빈도, 미출현 회차, 번호 쌍, 홀짝/합/연속번호 분포, 추천 가중치)"""
+    session_id = request.cookies.get("session_id")
+    client = sessions[session_id].get("client") if session_id in sessions else None
+
+    await asyncio.to_thread(_current_draw_stats, client=client)
+    payload = draw_stats_cache.payload
+    if payload is None:
+        raise HTTPException(status_code=502, detail="회차별 당첨번호를 가져오지 못했습니다.")
+
+    return {"success": True, "stats": payload}
+
+
 @app.post("/api/ai-recommend")
 async def recommend_numbers(request: Request):
     """AI 로또 번호 추천"""
@@ -853,7 +867,8 @@ async def recommend_numbers(request: Request):
     
     try:
         # 1게임 추천
-        recommendations = ai_service.recommend_numbers(count=1)
+        stats = await asyncio.to_thread(_current_draw_stats, client=sessions[session_id].get("client"))
+        recommendations = ai_service.recommend_numbers(count=1, stats=stats)
         return {"success": True, "numbers": recommendations[0]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI 분석 중 오류 발생: {str(e)}")
@@ -0,0 +1,337 @@
+"""
+동행복권 사이트를 흉내 내는 부하 테스트용 ASGI 앱
+
+로그인, 예치금, 구매, 구매 내역, 회차 정보와 tracer 대기열을 메모리 상태로 흉내 낸다.
+LotteryClient/웹 백엔드는 DHAPI_SITE_URL 환경변수로 이 서버를 바라보게 할 수 있다.
+
+    uvicorn app:app --app-dir web/fake_upstream --port 9000
+    DHAPI_SITE_URL=http://127.0.0.1:9000 python web/backend/server.py
+
+설정 (환경변수)
+    FAKE_LATENCY_MS          응답마다 더할 평균 지연 시간 (기본 0)
+    FAKE_LATENCY_JITTER_MS   지연 시간 흔들림 폭 (기본 0)
+    FAKE_ERROR_RATE          503을 돌려줄 확률 0~1 (기본 0)
+    FAKE_WAIT_RATE           대기열 대상 요청에 대기 페이지를 돌려줄 확률 0~1 (기본 0)
+    FAKE_WAIT_COUNT          대기열 진입 시 waitCnt (기본 30)
+    FAKE_WAIT_DRAIN          inputQueue.do 호출마다 줄어드는 waitCnt (기본 10)
+    FAKE_INITIAL_BALANCE     계정별 초기 예치금 (기본 50000)
+    FAKE_SEED                난수 시드 (기본 없음)
+"""
+
+import asyncio
+import datetime
+import json
+import os
+import random
+import threading
+import uuid
+from urllib.parse import parse_qsl
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from Crypto.PublicKey import RSA
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, RedirectResponse, Response
+
+# 대기열 페이지를 돌려줄 수 있는 경로 (LotteryClient가 _get_with_wait_retry/_post_with_wait_retry로 요청하는 화면)
+WAITABLE_PATHS = ("/mypage/mndpChrg", "/kbank.do", "/lt645/selectPstLt645Info.do", "/common.do")
+FIRST_ROUND_DATE = datetime.date(2002, 12, 7)
+
+
+@dataclass
+class FakeUpstreamConfig:
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    wait_rate: float = 0.0
+    wait_count: int = 30
+    wait_drain: int = 10
+    initial_balance: int = 50000
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_env(cls) -> "FakeUpstreamConfig":
+        seed = os.getenv("FAKE_SEED")
+        return cls(
+            latency_ms=float(os.getenv("FAKE_LATENCY_MS", "0")),
+            latency_jitter_ms=float(os.getenv("FAKE_LATENCY_JITTER_MS", "0")),
+            error_rate=float(os.getenv("FAKE_ERROR_RATE", "0")),
+            wait_rate=float(os.getenv("FAKE_WAIT_RATE", "0")),
+            wait_count=int(os.getenv("FAKE_WAIT_COUNT", "30")),
+            wait_drain=int(os.getenv("FAKE_WAIT_DRAIN", "10")),
+            initial_balance=int(os.getenv("FAKE_INITIAL_BALANCE", "50000")),
+            seed=int(seed) if seed else None,
+        )
+
+
+@dataclass
+class FakeAccount:
+    user_id: str
+    balance: int
+    tickets: List[Dict] = field(default_factory=list)
+
+
+class FakeUpstreamState:
+    """계정, 세션, 대기열 상태. 요청은 여러 스레드/태스크에서 들어오므로 lock으로 보호한다."""
+
+    def __init__(self, config: FakeUpstreamConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.rsa_key = RSA.generate(1024)
+        self.accounts: Dict[str, FakeAccount] = {}
+        self.sessions: Dict[str, str] = {}  # 세션 쿠키 -> user_id
+        self.queues: Dict[str, int] = {}  # tracer loginId -> 남은 waitCnt
+        self.released: Dict[str, float] = {}  # 대기열을 통과한 loginId -> 통과 시각
+        self.draws = _build_draw_history(self.random, _current_round() - 1)
+        self.lock = threading.Lock()
+
+    def login(self, user_id: str) -> str:
+        with self.lock:
+            account = self.accounts.setdefault(user_id, FakeAccount(user_id, self.config.initial_balance))
+            session_id = uuid.uuid4().hex
+            self.sessions[session_id] = account.user_id
+            return session_id
+
+    def account_of(self, request: Request) -> Optional[FakeAccount]:
+        for cookie_name in ("DHJSESSIONID", "JSESSIONID"):
+            user_id = self.sessions.get(request.cookies.get(cookie_name, ""))
+            if user_id:
+                return self.accounts[user_id]
+        return None
+
+
+def _current_round(today: Optional[datetime.date] = None) -> int:
+    today = today or datetime.date.today()
+    return (today - FIRST_ROUND_DATE).days // 7 + 2
+
+
+def _build_draw_history(rng: random.Random, last_round: int) -> List[Dict]:
+    draws = []
+    for round_no in range(1, last_round + 1):
+        numbers = sorted(rng.sample(range(1, 46), 7))
+        bonus = numbers.pop(rng.randrange(7))
+        draw_date = FIRST_ROUND_DATE + datetime.timedelta(weeks=round_no - 1)
+        item = {
+            "ltEpsd": round_no,
+            "ltRflYmd": draw_date.strftime("%Y%m%d"),
+            "bnsWnNo": bonus,
+            "wholEpsdSumNtslAmt": rng.randint(50, 120) * 1_000_000_000,
+            "sumWnNope": rng.randint(100_000, 1_500_000),
+            "winType0": 0,
+            "winType1": rng.randint(0, 10),
+            "winType2": rng.randint(0, 5),
+            "winType3": rng.randint(0, 3),
+        }
+        for index, number in enumerate(numbers, start=1):
+            item[f"tm{index}WnNo"] = number
+        for rank, (winners, prize) in enumerate([(10, 2_000_000_000), (60, 55_000_000), (3000, 1_500_000), (150_000, 50_000), (2_500_000, 5_000)], start=1):
+            item[f"rnk{rank}WnNope"] = winners
+            item[f"rnk{rank}WnAmt"] = prize
+            item[f"rnk{rank}SumWnAmt"] = winners * prize
+        draws.append(item)
+    return draws
+
+
+def _html(body: str) -> str:
+    return f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>동행복권</title></head><body>{body}</body></html>"
+
+
+def _wait_page(request: Request, login_id: str) -> str:
+    # LotteryClient._is_wait_page / _extract_wait_context_from_html 이 보는 마커와 변수만 넣는다.
+    return _html(f"""<img src="/images/common/img_error.png">
+<p>접속자가 많아 대기 중입니다.</p>
+<script>
+var host="{request.url.hostname}"
+var port="{request.url.port or 80}"
+var ip = '{login_id}'
+var loginId = '{login_id}'
+</script>""")
+
+
+def _tracer_xml(**parameters) -> str:
+    items = "".join(f'<Parameter id="{key}" type="STRING">{value}</Parameter>' for key, value in parameters.items())
+    return f'<?xml version="1.0" encoding="UTF-8"?><Root><Parameters>{items}</Parameters></Root>'
+
+
+async def _form(request: Request) -> Dict[str, str]:
+    # request.form()은 python-multipart가 필요하므로 urlencoded 본문만 직접 읽는다.
+    return dict(parse_qsl((await request.body()).decode("utf-8")))
+
+
+def create_app(config: Optional[FakeUpstreamConfig] = None) -> FastAPI:  # pylint: disable=too-many-locals,too-many-statements
+    config = config or FakeUpstreamConfig.from_env()
+    state = FakeUpstreamState(config)
+    app = FastAPI(title="fake dhlottery")
+    app.state.fake = state
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        if config.latency_ms or config.latency_jitter_ms:
+            delay_ms = max(0.0, config.latency_ms + state.random.uniform(-config.latency_jitter_ms, config.latency_jitter_ms))
+            await asyncio.sleep(delay_ms / 1000)
+        if config.error_rate and state.random.random() < config.error_rate:
+            return PlainTextResponse("Service Unavailable", status_code=503)
+
+        if config.wait_rate and request.url.path.startswith(WAITABLE_PATHS):
+            login_id = request.client.host if request.client else "127.0.0.1"
+            with state.lock:
+                released_at = state.released.get(login_id, 0.0)
+                recently_released = asyncio.get_running_loop().time() - released_at < 5
+                if not recently_released and (login_id in state.queues or state.random.random() < config.wait_rate):
+                    state.queues.setdefault(login_id, config.wait_count)
+                    return HTMLResponse(_wait_page(request, login_id))
+        return await call_next(request)
+
+    # ---- 로그인 ----
+    @app.get("/", response_class=HTMLResponse)
+    @app.get("/main", response_class=HTMLResponse)
+    @app.get("/login", response_class=HTMLResponse)
+    @app.get("/loginSuccess.do", response_class=HTMLResponse)
+    async def page():
+        return _html("<p>fake dhlottery</p>")
+
+    @app.get("/login/selectRsaModulus.do")
+    async def select_rsa_modulus():
+        key = state.rsa_key
+        return {"data": {"rsaModulus": format(key.n, "x"), "publicExponent": format(key.e, "x")}}
+
+    @app.post("/login/securityLoginCheck.do")
+    async def security_login_check(request: Request):
+        form = await _form(request)
+        user_id = str(form.get("inpUserId") or "")
+        if not user_id or not form.get("userPswdEncn"):
+            return HTMLResponse(_html('<a class="btn_common" href="/login">다시 로그인</a>'))
+        session_id = state.login(user_id)
+        resp = RedirectResponse("/loginSuccess.do", status_code=302)
+        resp.set_cookie("DHJSESSIONID", session_id, path="/")
+        return resp
+
+    # ---- 구매 ----
+    @app.get("/olotto/game/game645.do", response_class=HTMLResponse)
+    async def game645(request: Request):
+        resp = HTMLResponse(_html("<p>로또6/45</p>"))
+        session_id = request.cookies.get("DHJSESSIONID")
+        if session_id in state.sessions:
+            resp.set_cookie("JSESSIONID", session_id, path="/")
+        return resp
+
+    @app.post("/olotto/game/egovUserReadySocket.json")
+    async def ready_socket():
+        return {"ready_ip": "127.0.0.1", "ready_time": "0", "ready_cnt": "0"}
+
+    @app.post("/olotto/game/execBuy.do")
+    async def exec_buy(request: Request):
+        account = state.account_of(request)
+        if account is None:
+            return {"result": {"resultCode": "-1", "resultMsg": "로그인이 필요합니다."}}
+
+        form = await _form(request)
+        slots = json.loads(str(form.get("param") or "[]"))
+        amount = 1000 * len(slots)
+        round_no = int(form.get("round") or _current_round())
+        lines = []
+        with state.lock:
+            if account.balance < amount:
+                return {"result": {"resultCode": "-7", "resultMsg": "예치금이 부족합니다."}}
+            account.balance -= amount
+            for slot in slots:
+                chosen = [int(n) for n in (slot.get("arrGameChoiceNum") or "").split(",") if n]
+                numbers = sorted(chosen + state.random.sample([n for n in range(1, 46) if n not in chosen], 6 - len(chosen)))
+                mode = {"0": "3", "1": "1", "2": "2"}[str(slot.get("genType", "0"))]
+                lines.append(f"{slot.get('alpabet', 'A')}|{'|'.join(f'{n:02d}' for n in numbers)}{mode}")
+            order_no = f"{len(account.tickets) + 1:010d}"
+            account.tickets.append({"round": round_no, "lines": lines, "order_no": order_no, "date": datetime.date.today().isoformat(), "amount": amount})
+        return {"result": {"resultCode": "100", "resultMsg": "SUCCESS", "arrGameChoiceNum": lines, "buyRound": str(round_no), "nBuyAmount": amount}}
+
+    # ---- 마이페이지 ----
+    @app.get("/mypage/selectUserMndp.do")
+    async def select_user_mndp(request: Request):
+        account = state.account_of(request)
+        if account is None:
+            return HTMLResponse(_html("<p>로그인이 필요합니다.</p>"))
+        return {"data": {"userMndp": {"csblDpstAmt": account.balance, "crntEntrsAmt": account.balance, "rsvtOrdrAmt": 0, "dawAplyAmt": 0, "feeAmt": 0}}}
+
+    @app.get("/mypage/selectMyHomeInfo.do")
+    async def select_my_home_info(request: Request):
+        account = state.account_of(request)
+        if account is None:
+            return HTMLResponse(_html("<p>로그인이 필요합니다.</p>"))
+        return {"data": {"mnthPrchsAmt": sum(ticket["amount"] for ticket in account.tickets)}}
+
+    @app.get("/mypage/selectMyLotteryledger.do")
+    async def select_my_lottery_ledger(request: Request):
+        account = state.account_of(request)
+        if account is None:
+            return HTMLResponse(_html("<p>로그인이 필요합니다.</p>"))
+
+        start = request.query_params.get("srchStrDt", "00000000")
+        end = request.query_params.get("srchEndDt", "99999999")
+        page_num = int(request.query_params.get("pageNum", "1"))
+        page_size = int(request.query_params.get("recordCountPerPage", "100"))
+        items = [
+            {
+                "eltOrdrDt": ticket["date"],
+                "ltGdsNm": "로또6/45",
+                "ltEpsdView": str(ticket["round"]),
+                "gmInfo": f"{ticket['order_no']}-barcode",
+                "ntslOrdrNo": ticket["order_no"],
+                "prchsQty": len(ticket["lines"]),
+                "ltWnResult": "미추첨",
+                "ltWnAmt": 0,
+                "epsdRflDt": (FIRST_ROUND_DATE + datetime.timedelta(weeks=ticket["round"] - 1)).isoformat(),
+            }
+            for ticket in reversed(account.tickets)
+            if start <= ticket["date"].replace("-", "") <= end
+        ]
+        return JSONResponse({"data": {"list": items[(page_num - 1) * page_size : page_num * page_size], "total": len(items)}})
+
+    @app.get("/mypage/lotto645TicketDetail.do")
+    async def lotto645_ticket_detail(request: Request):
+        account = state.account_of(request)
+        order_no = request.query_params.get("ntslOrdrNo")
+        ticket = next((ticket for ticket in (account.tickets if account else []) if ticket["order_no"] == order_no), None)
+        if ticket is None:
+            return {"data": {"success": False}}
+        game_dtl = [{"idx": line[0], "num": [int(n) for n in line[2:-1].split("|")], "type": int(line[-1])} for line in ticket["lines"]]
+        return {"data": {"success": True, "ticket": {"game_dtl": game_dtl}}}
+
+    # ---- 회차 정보 ----
+    @app.get("/lt645/selectPstLt645Info.do")
+    async def select_pst_lt645_info(request: Request):
+        round_filter = request.query_params.get("srchLtEpsd", "all")
+        draws = state.draws if round_filter == "all" else [draw for draw in state.draws if str(draw["ltEpsd"]) == round_filter]
+        return {"data": {"list": draws}}
+
+    @app.get("/common.do")
+    async def common(request: Request):
+        round_no = int(request.query_params.get("drwNo") or len(state.draws))
+        if not 1 <= round_no <= len(state.draws):
+            return {"returnValue": "fail"}
+        draw = state.draws[round_no - 1]
+        payload = {"returnValue": "success", "drwNo": round_no, "drwNoDate": datetime.datetime.strptime(draw["ltRflYmd"], "%Y%m%d").date().isoformat(), "bnusNo": draw["bnsWnNo"]}
+        payload.update({f"drwtNo{index}": draw[f"tm{index}WnNo"] for index in range(1, 7)})
+        return payload
+
+    # ---- tracer 대기열 ----
+    @app.post("/TRACERAPI/checkBotIp.do", response_class=PlainTextResponse)
+    async def check_bot_ip():
+        return "F"
+
+    @app.post("/TRACERAPI/inputQueue.do")
+    async def input_queue(request: Request):
+        form = await _form(request)
+        login_id = str(form.get("ip") or (request.client.host if request.client else "127.0.0.1"))
+        with state.lock:
+            remaining = max(0, state.queues.get(login_id, 0) - config.wait_drain)
+            if remaining:
+                state.queues[login_id] = remaining
+            else:
+                state.queues.pop(login_id, None)
+                state.released[login_id] = asyncio.get_running_loop().time()
+        xml = _tracer_xml(isWait="T" if remaining else "F", waitCnt=remaining)
+        return Response(xml, media_type="application/xml")
+
+    return app
+
+
+app = create_app()
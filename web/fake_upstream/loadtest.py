@@ -0,0 +1,101 @@
+"""
+웹 백엔드에 동시 세션 부하를 걸고 API별 지연 시간을 측정한다.
+
+가짜 동행복권 서버(app.py)를 띄우고 백엔드가 그쪽을 보게 한 뒤 실행한다.
+
+    uvicorn app:app --app-dir web/fake_upstream --port 9000
+    DHAPI_SITE_URL=http://127.0.0.1:9000 python web/backend/server.py
+    python web/fake_upstream/loadtest.py --base-url http://127.0.0.1:8001 --sessions 500
+
+세션마다 서로 다른 아이디로 로그인한 뒤 예치금 → 구매 → 구매 내역 순서로 호출하고,
+API별 p50/p95/p99 지연 시간(ms)과 실패 수를 JSON으로 출력한다.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections import defaultdict
+
+import httpx
+
+
+def _percentile(samples, percent):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return round(ordered[index] * 1000, 1)
+
+
+class LoadTestRecorder:
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.error_examples = {}
+
+    async def call(self, client: httpx.AsyncClient, name, method, url, **kwargs):
+        started = time.perf_counter()
+        try:
+            resp = await client.request(method, url, **kwargs)
+            ok = resp.status_code == 200 and resp.json().get("success", True)
+            detail = None if ok else f"{resp.status_code}: {resp.text[:200]}"
+        except (httpx.HTTPError, ValueError) as error:
+            ok, detail = False, f"{type(error).__name__}: {error}"
+        self.samples[name].append(time.perf_counter() - started)
+        if not ok:
+            self.errors[name] += 1
+            self.error_examples.setdefault(name, detail)
+        return ok
+
+    def summary(self, wall_seconds):
+        endpoints = {}
+        for name, samples in self.samples.items():
+            endpoints[name] = {
+                "count": len(samples),
+                "errors": self.errors[name],
+                "p50_ms": _percentile(samples, 50),
+                "p95_ms": _percentile(samples, 95),
+                "p99_ms": _percentile(samples, 99),
+                "mean_ms": round(statistics.fmean(samples) * 1000, 1),
+            }
+        return {"wall_seconds": round(wall_seconds, 2), "endpoints": endpoints, "error_examples": self.error_examples}
+
+
+async def _run_session(index, args, recorder: LoadTestRecorder, start_gate: asyncio.Event):
+    user_id = f"{args.user_prefix}{index:04d}"
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout) as client:
+        await start_gate.wait()
+        if not await recorder.call(client, "login", "POST", "/api/login", json={"username": user_id, "password": "load-test"}):
+            return
+        for _ in range(args.iterations):
+            await recorder.call(client, "balance", "GET", "/api/balance")
+            await recorder.call(client, "buy_lotto645", "POST", "/api/buy-lotto645", json={"tickets": [{"numbers": ""}]})
+            await recorder.call(client, "buy_list", "POST", "/api/buy-list", json={})
+
+
+async def run(args):
+    recorder = LoadTestRecorder()
+    start_gate = asyncio.Event()
+    sessions = [asyncio.create_task(_run_session(index, args, recorder, start_gate)) for index in range(args.sessions)]
+    started = time.perf_counter()
+    start_gate.set()
+    await asyncio.gather(*sessions)
+    return recorder.summary(time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8001", help="웹 백엔드 주소")
+    parser.add_argument("--sessions", type=int, default=500, help="동시 세션 수")
+    parser.add_argument("--iterations", type=int, default=1, help="세션마다 반복할 예치금/구매/구매 내역 호출 횟수")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--user-prefix", default="loadtest")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
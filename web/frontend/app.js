@@ -106,6 +106,10 @@ const API = {
         return this.request('/api/virtual-account');
     },
 
+    async getWaitQueue() {
+        return this.request('/api/wait-queue');
+    },
+
     async getWeeklyPurchaseLimit() {
         return this.request('/api/weekly-purchase-limit');
     },
@@ -1182,6 +1186,7 @@ async function handleAssignVirtualAccount() {
     }
 
     UI.showLoading();
+    const stopWaitQueuePolling = startWaitQueuePolling();
 
     try {
         const result = await API.assignVirtualAccount(amount);
@@ -1194,10 +1199,36 @@ async function handleAssignVirtualAccount() {
     } catch (error) {
         alert(`가상계좌 발급 실패: ${error.message}`);
     } finally {
+        stopWaitQueuePolling();
         UI.hideLoading();
     }
 }
 
+// 동행복권 대기열에 걸린 동안 로딩 화면에 순번과 예상 대기 시간을 보여준다.
+function startWaitQueuePolling(intervalMs = 1000) {
+    const messageEl = document.getElementById('loading-message');
+    const timer = setInterval(async () => {
+        try {
+            const queue = await API.getWaitQueue();
+            if (!queue.waiting) {
+                messageEl.classList.add('hidden');
+                return;
+            }
+            const eta = queue.estimated_seconds != null ? `, 약 ${Math.ceil(queue.estimated_seconds)}초 남음` : '';
+            messageEl.textContent = `동행복권 대기열 순번 ${queue.position.toLocaleString()}${eta}`;
+            messageEl.classList.remove('hidden');
+        } catch (error) {
+            // 진행 상황 조회 실패는 무시한다.
+        }
+    }, intervalMs);
+
+    return () => {
+        clearInterval(timer);
+        messageEl.classList.add('hidden');
+        messageEl.textContent = '';
+    };
+}
+
 function initVirtualAccountPage() {
     if (document.body.dataset.virtualAccountBound === 'true') {
         return;